@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Dict, Optional
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from ..services.auth import get_user as auth_get_user, get_admin_user
@@ -131,6 +132,10 @@ def logout_all():
         finally:
             db._return(conn)
 
+        # Cached tokens would otherwise stay valid for up to the cache TTL
+        from ..services.auth import forget_all_tokens
+        forget_all_tokens()
+
         return {"message": "All users logged out successfully", "tokens_cleared": True}
     except Exception as e:
         logger.error(f"Failed to logout all users: {e}")
@@ -149,6 +154,22 @@ def health_check():
     }
 
 
+@router.get("/api/health/live")
+def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+
+
+@router.get("/api/health/ready")
+def readiness_check():
+    """Readiness probe: 200 once all critical startup phases completed, 503 while starting or after a failure"""
+    from ..startup.phases import startup_state
+
+    report = startup_state.report()
+    report["timestamp"] = datetime.utcnow().isoformat()
+    return JSONResponse(status_code=200 if startup_state.ready else 503, content=report)
+
+
 @router.get("/api/sync/health")
 async def sync_health_check(project_id: Optional[str] = None, user=Depends(get_user)):
     """Check vector/SQL synchronization health - CRITICAL for DAS reliability"""
@@ -165,6 +186,33 @@ async def sync_health_check(project_id: Optional[str] = None, user=Depends(get_u
         raise HTTPException(status_code=500, detail=f"Sync health check failed: {str(e)}")
 
 
+@router.get("/api/sync/consistency")
+async def sync_consistency_check(
+    project_id: Optional[str] = None,
+    collection: str = "knowledge_chunks",
+    limit: int = 100,
+    user=Depends(get_admin_user)
+):
+    """Exact doc_chunk vs vector collection comparison: ids missing from the collection and orphaned vectors"""
+    try:
+        from ..services.vector_sql_sync_monitor import get_sync_monitor
+
+        diff = await get_sync_monitor().diff_chunk_ids(collection, project_id)
+        missing, orphaned = diff.pop("missing"), diff.pop("orphaned")
+
+        return {
+            **diff,
+            "missing_count": len(missing),
+            "orphaned_count": len(orphaned),
+            "missing": missing[:limit],
+            "orphaned": orphaned[:limit],
+        }
+
+    except Exception as e:
+        logger.error(f"Sync consistency check failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Sync consistency check failed: {str(e)}")
+
+
 @router.post("/api/sync/emergency-recovery")
 async def emergency_sync_recovery(
     project_id: str = Body(..., description="Project ID to recover"),
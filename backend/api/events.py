@@ -11,20 +11,47 @@ Provides admin-only access to:
 Uses SQL-first approach with project_event table as source of truth.
 """
 
+import base64
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 import json
 
+from ..db.event_queries import rebuild_event_rollup
 from ..services.db import DatabaseService
-from ..services.config import Settings
 from ..services.auth import get_user
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+# Dashboard windows over the hourly rollup (project_event_hourly): the current
+# hour plus the previous 23 (or 167) whole hours.
+ROLLUP_DAY_START = "DATE_TRUNC('hour', NOW()) - INTERVAL '23 hours'"
+ROLLUP_WEEK_START = "DATE_TRUNC('hour', NOW()) - INTERVAL '167 hours'"
+
+# GROUPING(event_type, project_id, hour) for each grouping set
+_BY_TYPE, _BY_PROJECT, _BY_HOUR = 0b011, 0b101, 0b110
+
+EVENT_COLUMNS = """
+    pe.event_id,
+    pe.event_type,
+    pe.semantic_summary,
+    pe.project_id,
+    p.name as project_name,
+    pe.user_id,
+    pe.created_at,
+    pe.event_data,
+    pe.context_snapshot
+"""
+
+
+def get_db_service() -> DatabaseService:
+    """Get the shared database service (one pool per process rather than per request)."""
+    from .core import get_db_service as get_shared_db_service
+    return get_shared_db_service()
+
 
 # ===== RESPONSE MODELS =====
 
@@ -53,12 +80,13 @@ class RecentEvent(BaseModel):
 
 
 class EventHistoryResponse(BaseModel):
-    """Event history with pagination and filtering"""
+    """Event history with keyset pagination and filtering"""
     events: List[RecentEvent]
     total_count: int
-    page: int
     per_page: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
+    total_is_estimate: bool = False  # Counted per hour when date filters are applied
 
 
 class EventTypeConfig(BaseModel):
@@ -90,14 +118,129 @@ def verify_admin_access(user: dict):
         )
 
 
+# ===== QUERY HELPERS =====
+
+def encode_history_cursor(created_at: datetime, event_id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, event_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(event_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def format_event_row(event_row) -> RecentEvent:
+    """Build a RecentEvent from an EVENT_COLUMNS row"""
+    # Handle JSONB data - it might already be parsed or need parsing
+    if isinstance(event_row[7], dict):
+        event_data = event_row[7]
+    elif event_row[7]:
+        event_data = json.loads(event_row[7])
+    else:
+        event_data = {}
+
+    if isinstance(event_row[8], dict):
+        context_snapshot = event_row[8]
+    elif event_row[8]:
+        context_snapshot = json.loads(event_row[8])
+    else:
+        context_snapshot = {}
+
+    return RecentEvent(
+        event_id=event_row[0],
+        event_type=event_row[1],
+        semantic_summary=event_row[2] or "No summary available",
+        project_id=event_row[3],
+        project_name=event_row[4] or "Unknown Project",
+        user_id=event_row[5],
+        created_at=event_row[6],
+        event_data=event_data,
+        context_snapshot=context_snapshot
+    )
+
+
+def format_event_rows(rows) -> List[RecentEvent]:
+    events = []
+    for event_row in rows:
+        try:
+            events.append(format_event_row(event_row))
+        except Exception as parse_error:
+            logger.warning(f"Error parsing event {event_row[0]}: {parse_error}")
+    return events
+
+
+def query_rollup_statistics(cur) -> Dict[str, Any]:
+    """Dashboard statistics from the hourly rollup (three small queries)"""
+    cur.execute(f"""
+        SELECT
+            COALESCE(SUM(event_count) FILTER (WHERE hour >= {ROLLUP_DAY_START}), 0),
+            COALESCE(SUM(event_count), 0),
+            COUNT(DISTINCT project_id) FILTER (WHERE hour >= {ROLLUP_DAY_START})
+        FROM project_event_hourly
+        WHERE hour >= {ROLLUP_WEEK_START}
+    """)
+    total_events_24h, total_events_7d, active_projects_24h = cur.fetchone()
+
+    cur.execute(f"""
+        SELECT event_type, project_id, hour, SUM(event_count),
+               GROUPING(event_type, project_id, hour)
+        FROM project_event_hourly
+        WHERE hour >= {ROLLUP_DAY_START}
+        GROUP BY GROUPING SETS ((event_type), (project_id), (hour))
+    """)
+    by_type, by_project, by_hour = [], [], []
+    for event_type, project_id, hour, count, grouping in cur.fetchall():
+        if grouping == _BY_TYPE:
+            by_type.append((event_type, int(count)))
+        elif grouping == _BY_PROJECT:
+            by_project.append((project_id, int(count)))
+        elif grouping == _BY_HOUR:
+            by_hour.append((hour, int(count)))
+
+    top_event_types = [
+        {"event_type": event_type, "count": count}
+        for event_type, count in sorted(by_type, key=lambda item: (-item[1], item[0]))[:10]
+    ]
+
+    most_active_project = None
+    if by_project:
+        project_id, event_count = min(by_project, key=lambda item: (-item[1], item[0]))
+        cur.execute("SELECT name FROM projects WHERE project_id::text = %s", (project_id,))
+        name_row = cur.fetchone()
+        most_active_project = {
+            "project_id": project_id,
+            "project_name": (name_row[0] if name_row else None) or "Unknown Project",
+            "event_count": event_count
+        }
+
+    return {
+        "total_events_24h": int(total_events_24h),
+        "total_events_7d": int(total_events_7d),
+        "active_projects_24h": int(active_projects_24h),
+        "top_event_types": top_event_types,
+        "most_active_project": most_active_project,
+        "events_by_hour": [{"hour": hour.isoformat(), "count": count} for hour, count in sorted(by_hour)],
+    }
+
+
 # ===== EVENT ANALYTICS ENDPOINTS =====
 
 @router.get("/statistics", response_model=EventStatistics)
 async def get_event_statistics(
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
-    """Get comprehensive event analytics for dashboard"""
+    """
+    Get comprehensive event analytics for dashboard
+
+    Answered from the hourly rollup rather than project_event, so the
+    24-hour window is the current hour plus the 23 before it.
+    """
     verify_admin_access(user)
 
     try:
@@ -105,100 +248,19 @@ async def get_event_statistics(
 
         try:
             with conn.cursor() as cur:
-                # Total events in last 24 hours
-                cur.execute("""
-                    SELECT COUNT(*) FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '24 hours'
-                """)
-                total_events_24h = cur.fetchone()[0]
-
-                # Total events in last 7 days
-                cur.execute("""
-                    SELECT COUNT(*) FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '7 days'
-                """)
-                total_events_7d = cur.fetchone()[0]
-
-                # Active projects (with events in last 24 hours)
-                cur.execute("""
-                    SELECT COUNT(DISTINCT project_id) FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '24 hours'
-                """)
-                active_projects_24h = cur.fetchone()[0]
-
-                # Top event types in last 24 hours
-                cur.execute("""
-                    SELECT event_type, COUNT(*) as count
-                    FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '24 hours'
-                    GROUP BY event_type
-                    ORDER BY count DESC
-                    LIMIT 10
-                """)
-                top_event_types = [
-                    {"event_type": row[0], "count": row[1]}
-                    for row in cur.fetchall()
-                ]
-
-                # Most active project
-                cur.execute("""
-                    SELECT
-                        pe.project_id,
-                        p.name as project_name,
-                        COUNT(*) as event_count
-                    FROM project_event pe
-                    LEFT JOIN projects p ON pe.project_id = p.project_id::text
-                    WHERE pe.created_at > NOW() - INTERVAL '24 hours'
-                    GROUP BY pe.project_id, p.name
-                    ORDER BY event_count DESC
-                    LIMIT 1
-                """)
-                most_active_row = cur.fetchone()
-                most_active_project = None
-                if most_active_row:
-                    most_active_project = {
-                        "project_id": most_active_row[0],
-                        "project_name": most_active_row[1] or "Unknown Project",
-                        "event_count": most_active_row[2]
-                    }
-
-                # Events by hour (last 24 hours)
-                cur.execute("""
-                    SELECT
-                        DATE_TRUNC('hour', created_at) as hour,
-                        COUNT(*) as count
-                    FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '24 hours'
-                    GROUP BY DATE_TRUNC('hour', created_at)
-                    ORDER BY hour
-                """)
-                events_by_hour = [
-                    {
-                        "hour": row[0].isoformat(),
-                        "count": row[1]
-                    }
-                    for row in cur.fetchall()
-                ]
-
+                statistics = query_rollup_statistics(cur)
         finally:
             db._return(conn)
 
         # Determine system health
+        total_events_24h = statistics["total_events_24h"]
         system_health = "healthy"
         if total_events_24h == 0:
             system_health = "warning"
         elif total_events_24h < 5:
             system_health = "warning"
 
-        return EventStatistics(
-            total_events_24h=total_events_24h,
-            total_events_7d=total_events_7d,
-            active_projects_24h=active_projects_24h,
-            top_event_types=top_event_types,
-            most_active_project=most_active_project,
-            events_by_hour=events_by_hour,
-            system_health=system_health
-        )
+        return EventStatistics(**statistics, system_health=system_health)
 
     except Exception as e:
         logger.error(f"Failed to get event statistics: {e}")
@@ -214,7 +276,7 @@ async def get_recent_events(
     event_type: Optional[str] = Query(None),
     project_id: Optional[str] = Query(None),
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
     """Get recent events for live monitoring"""
     verify_admin_access(user)
@@ -225,17 +287,8 @@ async def get_recent_events(
         try:
             with conn.cursor() as cur:
                 # Build dynamic query with optional filters
-                base_query = """
-                    SELECT
-                        pe.event_id,
-                        pe.event_type,
-                        pe.semantic_summary,
-                        pe.project_id,
-                        p.name as project_name,
-                        pe.user_id,
-                        pe.created_at,
-                        pe.event_data,
-                        pe.context_snapshot
+                base_query = f"""
+                    SELECT {EVENT_COLUMNS}
                     FROM project_event pe
                     LEFT JOIN projects p ON pe.project_id = p.project_id::text
                 """
@@ -264,38 +317,7 @@ async def get_recent_events(
             db._return(conn)
 
         # Format events for response
-        recent_events = []
-        for event_row in events:
-            try:
-                # Handle JSONB data - it might already be parsed or need parsing
-                if isinstance(event_row[7], dict):
-                    event_data = event_row[7]
-                elif event_row[7]:
-                    event_data = json.loads(event_row[7])
-                else:
-                    event_data = {}
-
-                if isinstance(event_row[8], dict):
-                    context_snapshot = event_row[8]
-                elif event_row[8]:
-                    context_snapshot = json.loads(event_row[8])
-                else:
-                    context_snapshot = {}
-
-                recent_events.append(RecentEvent(
-                    event_id=event_row[0],
-                    event_type=event_row[1],
-                    semantic_summary=event_row[2] or "No summary available",
-                    project_id=event_row[3],
-                    project_name=event_row[4] or "Unknown Project",
-                    user_id=event_row[5],
-                    created_at=event_row[6],
-                    event_data=event_data,
-                    context_snapshot=context_snapshot
-                ))
-            except Exception as parse_error:
-                logger.warning(f"Error parsing event {event_row[0]}: {parse_error}")
-                continue
+        recent_events = format_event_rows(events)
 
         return recent_events
 
@@ -309,73 +331,85 @@ async def get_recent_events(
 
 @router.get("/history", response_model=EventHistoryResponse)
 async def get_event_history(
-    page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     event_type: Optional[str] = Query(None),
     project_id: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
-    """Get filtered event history with pagination"""
+    """
+    Get filtered event history, newest first, with keyset pagination
+
+    Pages continue from ``cursor`` on (created_at, event_id), so deep pages
+    cost the same as the first. The total comes from the hourly rollup and
+    is per-hour approximate when a date range is given.
+    """
     verify_admin_access(user)
 
+    try:
+        after = decode_history_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     try:
         conn = db._conn()
-        offset = (page - 1) * per_page
 
         try:
             with conn.cursor() as cur:
                 # Build query with filters
-                base_query = """
-                    SELECT
-                        pe.event_id,
-                        pe.event_type,
-                        pe.semantic_summary,
-                        pe.project_id,
-                        p.name as project_name,
-                        pe.user_id,
-                        pe.created_at,
-                        pe.event_data,
-                        pe.context_snapshot
-                    FROM project_event pe
-                    LEFT JOIN projects p ON pe.project_id = p.project_id::text
-                """
-
-                count_query = "SELECT COUNT(*) FROM project_event pe"
-
                 conditions = []
                 params = []
+                rollup_conditions = []
+                rollup_params = []
 
                 if event_type:
                     conditions.append("pe.event_type = %s")
                     params.append(event_type)
+                    rollup_conditions.append("event_type = %s")
+                    rollup_params.append(event_type)
 
                 if project_id:
                     conditions.append("pe.project_id = %s")
                     params.append(project_id)
+                    rollup_conditions.append("project_id = %s")
+                    rollup_params.append(project_id)
 
                 if start_date:
                     conditions.append("pe.created_at >= %s")
                     params.append(start_date)
+                    rollup_conditions.append("hour >= DATE_TRUNC('hour', %s::timestamptz)")
+                    rollup_params.append(start_date)
 
                 if end_date:
                     conditions.append("pe.created_at <= %s")
                     params.append(end_date)
-
-                if conditions:
-                    where_clause = " WHERE " + " AND ".join(conditions)
-                    base_query += where_clause
-                    count_query += where_clause
+                    rollup_conditions.append("hour <= %s")
+                    rollup_params.append(end_date)
 
                 # Get total count
-                cur.execute(count_query, params)
-                total_count = cur.fetchone()[0]
-
-                # Get paginated events
-                base_query += " ORDER BY pe.created_at DESC LIMIT %s OFFSET %s"
-                params.extend([per_page, offset])
+                count_query = "SELECT COALESCE(SUM(event_count), 0) FROM project_event_hourly"
+                if rollup_conditions:
+                    count_query += " WHERE " + " AND ".join(rollup_conditions)
+                cur.execute(count_query, rollup_params)
+                total_count = int(cur.fetchone()[0])
+
+                # Get the page after the cursor (one extra row tells whether there is more)
+                if after:
+                    conditions.append("(pe.created_at, pe.event_id) < (%s, %s)")
+                    params.extend(after)
+
+                base_query = f"""
+                    SELECT {EVENT_COLUMNS}
+                    FROM project_event pe
+                    LEFT JOIN projects p ON pe.project_id = p.project_id::text
+                """
+                if conditions:
+                    base_query += " WHERE " + " AND ".join(conditions)
+                base_query += " ORDER BY pe.created_at DESC, pe.event_id DESC LIMIT %s"
+                params.append(per_page + 1)
 
                 cur.execute(base_query, params)
                 events = cur.fetchall()
@@ -383,48 +417,17 @@ async def get_event_history(
         finally:
             db._return(conn)
 
-        # Format events
-        formatted_events = []
-        for event_row in events:
-            try:
-                # Handle JSONB data safely
-                if isinstance(event_row[7], dict):
-                    event_data = event_row[7]
-                elif event_row[7]:
-                    event_data = json.loads(event_row[7])
-                else:
-                    event_data = {}
-
-                if isinstance(event_row[8], dict):
-                    context_snapshot = event_row[8]
-                elif event_row[8]:
-                    context_snapshot = json.loads(event_row[8])
-                else:
-                    context_snapshot = {}
-
-                formatted_events.append(RecentEvent(
-                    event_id=event_row[0],
-                    event_type=event_row[1],
-                    semantic_summary=event_row[2] or "No summary available",
-                    project_id=event_row[3],
-                    project_name=event_row[4] or "Unknown Project",
-                    user_id=event_row[5],
-                    created_at=event_row[6],
-                    event_data=event_data,
-                    context_snapshot=context_snapshot
-                ))
-            except Exception as parse_error:
-                logger.warning(f"Error parsing event {event_row[0]}: {parse_error}")
-                continue
-
-        has_more = offset + len(formatted_events) < total_count
+        has_more = len(events) > per_page
+        events = events[:per_page]
+        next_cursor = encode_history_cursor(events[-1][6], events[-1][0]) if has_more else None
 
         return EventHistoryResponse(
-            events=formatted_events,
+            events=format_event_rows(events),
             total_count=total_count,
-            page=page,
             per_page=per_page,
-            has_more=has_more
+            has_more=has_more,
+            next_cursor=next_cursor,
+            total_is_estimate=bool(start_date or end_date)
         )
 
     except Exception as e:
@@ -438,7 +441,7 @@ async def get_event_history(
 @router.get("/types", response_model=List[EventTypeConfig])
 async def get_event_types(
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
     """Get available event types with configuration"""
     verify_admin_access(user)
@@ -449,17 +452,14 @@ async def get_event_types(
 
         try:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT
-                        event_type,
-                        COUNT(*) as count_24h
-                    FROM project_event
-                    WHERE created_at > NOW() - INTERVAL '24 hours'
+                cur.execute(f"""
+                    SELECT event_type, SUM(event_count)
+                    FROM project_event_hourly
+                    WHERE hour >= {ROLLUP_DAY_START}
                     GROUP BY event_type
-                    ORDER BY count_24h DESC
                 """)
 
-                active_types = dict(cur.fetchall())
+                active_types = {event_type: int(count) for event_type, count in cur.fetchall()}
 
         finally:
             db._return(conn)
@@ -517,7 +517,7 @@ async def get_event_types(
 @router.get("/health", response_model=EventHealthStatus)
 async def get_event_health(
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
     """Get event system health status"""
     verify_admin_access(user)
@@ -549,9 +549,9 @@ async def get_event_health(
                 """)
                 tables_exist = cur.fetchone()[0]
 
-                # Get event counts
-                cur.execute("SELECT COUNT(*) FROM project_event")
-                total_events = cur.fetchone()[0]
+                # Get event counts (the total from the rollup, not a project_event scan)
+                cur.execute("SELECT COALESCE(SUM(event_count), 0) FROM project_event_hourly")
+                total_events = int(cur.fetchone()[0])
 
                 cur.execute("""
                     SELECT COUNT(*) FROM project_event
@@ -605,7 +605,7 @@ async def get_event_health(
 async def clear_old_events(
     days_old: int = Query(30, ge=1, le=365),
     user: dict = Depends(get_user),
-    db: DatabaseService = Depends(lambda: DatabaseService(Settings()))
+    db: DatabaseService = Depends(get_db_service)
 ):
     """Clear events older than specified days (admin maintenance)"""
     verify_admin_access(user)
@@ -649,6 +649,34 @@ async def clear_old_events(
         )
 
 
+@router.post("/rollup/rebuild")
+def rebuild_event_statistics(
+    hours: Optional[int] = Query(None, ge=1, description="Rebuild only the most recent hours (default: all)"),
+    user: dict = Depends(get_user),
+    db: DatabaseService = Depends(get_db_service)
+):
+    """Recompute the hourly statistics rollup from project_event (admin maintenance)"""
+    verify_admin_access(user)
+
+    try:
+        since = datetime.now().astimezone() - timedelta(hours=hours) if hours else None
+        conn = db._conn()
+        try:
+            rows = rebuild_event_rollup(conn, since)
+        finally:
+            db._return(conn)
+
+        logger.info(f"Rebuilt event rollup ({rows} rows, hours={hours}) by admin {user.get('username')}")
+        return {"success": True, "rollup_rows": rows}
+
+    except Exception as e:
+        logger.error(f"Failed to rebuild event rollup: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rebuild event rollup: {str(e)}"
+        )
+
+
 @router.get("/config")
 async def get_event_config(
     user: dict = Depends(get_user)
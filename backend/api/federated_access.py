@@ -3,12 +3,19 @@ Federated Access API for ODRAS
 Enables cross-installation artifact sharing via IRIs without authentication.
 """
 
+import hashlib
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Response
-from fastapi.responses import StreamingResponse
-import io
+import re
+import uuid
+from collections import OrderedDict
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from psycopg2.extras import RealDictCursor
 
 from ..services.config import Settings
 from ..services.db import DatabaseService
@@ -21,13 +28,154 @@ router = APIRouter(prefix="/federated", tags=["Federated Access"])
 
 
 def get_db_service() -> DatabaseService:
-    """Get database service instance."""
-    return DatabaseService(Settings())
+    """Get the shared database service (one pool per process rather than per request)."""
+    from .core import get_db_service as get_shared_db_service
+    return get_shared_db_service()
+
+
+@lru_cache(maxsize=1)
+def _settings() -> Settings:
+    return Settings()
+
+
+def _iri_service(db: DatabaseService):
+    return get_installation_iri_service(_settings(), db)
+
+
+def _installation_info(db: DatabaseService) -> Dict[str, Any]:
+    iri_service = _iri_service(db)
+    return {
+        "organization": iri_service.settings.installation_organization,
+        "contact": iri_service.settings.authority_contact,
+        "base_uri": iri_service.installation_base_uri,
+    }
+
+
+# =====================================
+# HTTP CACHING HELPERS
+# =====================================
+
+# Assembled knowledge content per asset: asset_id -> (version key, payload)
+_knowledge_content_cache: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _cache_control() -> str:
+    max_age = getattr(_settings(), "federated_cache_max_age_s", 300)
+    return f"public, max-age={max_age}"
+
+
+def _http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)"""
+    if header.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def _not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Evaluate conditional GET headers; If-None-Match takes precedence over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into (start, end) inclusive.
+
+    Returns None for absent, malformed or multi-range headers (served as a
+    full response, which RFC 9110 allows) and raises 416 if unsatisfiable.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _if_range_allows(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """If-Range: only honour Range when the representation is unchanged (strong comparison)"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return etag is not None and not if_range.startswith("W/") and if_range == etag
+    return _http_date(last_modified) == if_range
+
+
+def _get_file_metadata(db: DatabaseService, file_id: str) -> Optional[Dict[str, Any]]:
+    """Validator and public fields for a file, read through the shared pool (no object storage access)"""
+    try:
+        uuid.UUID(file_id)
+    except ValueError:
+        return None
+    conn = db._conn()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT id, filename, content_type, file_size, hash_sha256, created_at, updated_at,
+                       iri, tags, metadata->>'visibility' AS visibility
+                FROM files
+                WHERE id = %s AND NOT COALESCE(is_deleted, FALSE)
+            """, (file_id,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+    finally:
+        db._return(conn)
+
+
+def _installation_headers() -> Dict[str, str]:
+    settings = _settings()
+    return {
+        "X-ODRAS-Installation": settings.installation_name,
+        "X-ODRAS-Authority": settings.authority_contact,
+    }
 
 
 @router.get("/files/{file_id}/download")
 async def federated_download_file(
     file_id: str,
+    request: Request,
     storage_service: FileStorageService = Depends(get_file_storage_service),
     db: DatabaseService = Depends(get_db_service),
 ):
@@ -36,12 +184,17 @@ async def federated_download_file(
 
     Allows external systems to download files using just the file ID
     from an IRI, without authentication (public files only).
+
+    The strong ETag is the stored sha256, so If-None-Match / If-Modified-Since
+    revalidation is answered with 304 from the metadata alone. Single byte
+    ranges (Range / If-Range) are served as 206, and content is streamed from
+    storage rather than loaded into memory.
     """
     try:
         logger.info(f"Federated download request for file: {file_id}")
 
         # Check if file is public
-        file_metadata = await storage_service.get_file_metadata(file_id)
+        file_metadata = _get_file_metadata(db, file_id)
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
 
@@ -51,26 +204,57 @@ async def federated_download_file(
                 detail="File is private. Contact installation for access."
             )
 
-        # Retrieve file content
-        file_data = await storage_service.retrieve_file(file_id)
-        if file_data is None:
+        sha256 = file_metadata.get("hash_sha256")
+        etag = f'"{sha256}"' if sha256 else None
+        last_modified = file_metadata.get("updated_at") or file_metadata.get("created_at")
+        size = file_metadata.get("file_size")
+        filename = file_metadata.get("filename") or f"file_{file_id}"
+        content_type = file_metadata.get("content_type") or "application/octet-stream"
+
+        headers = {
+            "Cache-Control": _cache_control(),
+            "Accept-Ranges": "bytes" if size is not None else "none",
+            **_installation_headers(),
+        }
+        if etag:
+            headers["ETag"] = etag
+        if last_modified:
+            headers["Last-Modified"] = _http_date(last_modified)
+
+        if _not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+        status_code = 200
+        start, end = 0, None
+        byte_range = None
+        if size is not None and _if_range_allows(request, etag, last_modified):
+            byte_range = _parse_range(request.headers.get("range"), size)
+        if byte_range:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+        elif size is not None:
+            headers["Content-Length"] = str(size)
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        if size == 0:
+            return Response(content=b"", media_type=content_type, headers=headers)
+
+        # Pull the first chunk before committing to a response so a missing
+        # object is still reported as 404
+        chunks = storage_service.iter_file(file_id, start, end)
+        try:
+            first_chunk = await chunks.__anext__()
+        except StopAsyncIteration:
             raise HTTPException(status_code=404, detail="File content not found")
 
-        # Create streaming response
-        file_content = file_data["content"]
-        filename = file_metadata.get("filename", f"file_{file_id}")
-        content_type = file_metadata.get("content_type", "application/octet-stream")
-
-        return StreamingResponse(
-            io.BytesIO(file_content),
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(file_content)),
-                "X-ODRAS-Installation": get_installation_iri_service().settings.installation_name,
-                "X-ODRAS-Authority": get_installation_iri_service().settings.authority_contact,
-            },
-        )
+        async def body():
+            yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(body(), status_code=status_code, media_type=content_type, headers=headers)
 
     except HTTPException:
         raise
@@ -82,15 +266,17 @@ async def federated_download_file(
 @router.get("/files/{file_id}/metadata")
 async def federated_get_file_metadata(
     file_id: str,
-    storage_service: FileStorageService = Depends(get_file_storage_service),
+    db: DatabaseService = Depends(get_db_service),
 ):
     """
     Get public file metadata via federated access.
+
+    Visibility is read from files.metadata, as for downloads.
     """
     try:
         logger.info(f"Federated metadata request for file: {file_id}")
 
-        file_metadata = await storage_service.get_file_metadata(file_id)
+        file_metadata = _get_file_metadata(db, file_id)
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
 
@@ -102,18 +288,14 @@ async def federated_get_file_metadata(
 
         # Return sanitized metadata (remove internal fields)
         public_metadata = {
-            "file_id": file_metadata["file_id"],
+            "file_id": str(file_metadata["id"]),
             "filename": file_metadata["filename"],
             "content_type": file_metadata["content_type"],
-            "size": file_metadata["size"],
+            "size": file_metadata["file_size"],
             "created_at": file_metadata["created_at"],
             "iri": file_metadata.get("iri"),
-            "tags": file_metadata.get("tags", {}),
-            "installation": {
-                "organization": get_installation_iri_service().settings.installation_organization,
-                "contact": get_installation_iri_service().settings.authority_contact,
-                "base_uri": get_installation_iri_service().installation_base_uri
-            }
+            "tags": file_metadata.get("tags") or {},
+            "installation": _installation_info(db),
         }
 
         return public_metadata
@@ -125,15 +307,64 @@ async def federated_get_file_metadata(
         raise HTTPException(status_code=500, detail=f"Metadata access failed: {str(e)}")
 
 
+def _assemble_knowledge_content(cur, asset_id: str, asset_dict: Dict[str, Any], iri_service) -> Dict[str, Any]:
+    """Load all chunks of an asset and build the (cacheable) content payload"""
+    cur.execute("""
+        SELECT content, chunk_type, sequence_number, token_count, metadata
+        FROM knowledge_chunks
+        WHERE asset_id = %s
+        ORDER BY sequence_number
+    """, (asset_id,))
+
+    chunks: List[Dict[str, Any]] = []
+    total_tokens = 0
+    for content, chunk_type, seq_num, token_count, metadata in cur.fetchall():
+        chunks.append({
+            "content": content,
+            "chunk_type": chunk_type,
+            "sequence_number": seq_num,
+            "token_count": token_count or 0,
+            "metadata": metadata or {}
+        })
+        total_tokens += token_count or 0
+
+    return jsonable_encoder({
+        "iri": asset_dict.get("iri"),
+        "asset_id": asset_id,
+        "title": asset_dict["title"],
+        "document_type": asset_dict["document_type"],
+        "status": asset_dict["status"],
+        "traceability_status": asset_dict.get("traceability_status", "linked"),
+        # Combine all chunk content
+        "content": "\n\n".join(chunk["content"] for chunk in chunks),
+        "chunks": chunks,
+        "total_chunks": len(chunks),
+        "total_tokens": total_tokens,
+        "created_at": asset_dict["created_at"].isoformat() if asset_dict["created_at"] else None,
+        "source_filename": asset_dict.get("source_filename"),
+        "installation": {
+            "organization": iri_service.settings.installation_organization,
+            "contact": iri_service.settings.authority_contact,
+            "base_uri": iri_service.installation_base_uri
+        },
+    })
+
+
 @router.get("/knowledge/{asset_id}/content")
 async def federated_get_knowledge_content(
     asset_id: str,
+    request: Request,
     db: DatabaseService = Depends(get_db_service),
 ):
     """
     Get public knowledge asset content via federated access.
 
     Enables external systems to access knowledge content and analysis results.
+
+    The asset version is identified by its version/updated_at plus the chunk
+    count and newest chunk; the assembled content is cached per version and
+    If-None-Match / If-Modified-Since are answered with 304 without loading
+    any chunk content.
     """
     try:
         logger.info(f"Federated knowledge content request: {asset_id}")
@@ -141,9 +372,13 @@ async def federated_get_knowledge_content(
         conn = db._conn()
         try:
             with conn.cursor() as cur:
-                # Check if knowledge asset is public
+                # Check if knowledge asset is public and identify its current version
                 cur.execute("""
-                    SELECT ka.*, f.filename as source_filename
+                    SELECT ka.id, ka.iri, ka.title, ka.document_type, ka.status,
+                           ka.traceability_status, ka.created_at, ka.updated_at, ka.version,
+                           f.filename as source_filename,
+                           (SELECT COUNT(*) FROM knowledge_chunks kc WHERE kc.asset_id = ka.id) AS chunk_count,
+                           (SELECT MAX(kc.created_at) FROM knowledge_chunks kc WHERE kc.asset_id = ka.id) AS chunks_changed_at
                     FROM knowledge_assets ka
                     LEFT JOIN files f ON ka.source_file_id = f.id
                     WHERE ka.id = %s AND ka.is_public = TRUE
@@ -157,53 +392,37 @@ async def federated_get_knowledge_content(
                     )
 
                 asset_dict = dict(zip([desc[0] for desc in cur.description], asset_row))
-
-                # Get all chunks for this asset
-                cur.execute("""
-                    SELECT content, chunk_type, sequence_number, token_count, metadata
-                    FROM knowledge_chunks
-                    WHERE asset_id = %s
-                    ORDER BY sequence_number
-                """, (asset_id,))
-
-                chunk_rows = cur.fetchall()
-                chunks = []
-                total_tokens = 0
-
-                for chunk_row in chunk_rows:
-                    content, chunk_type, seq_num, token_count, metadata = chunk_row
-                    chunks.append({
-                        "content": content,
-                        "chunk_type": chunk_type,
-                        "sequence_number": seq_num,
-                        "token_count": token_count or 0,
-                        "metadata": metadata or {}
-                    })
-                    total_tokens += token_count or 0
-
-                # Combine all chunk content
-                full_content = "\\n\\n".join([chunk["content"] for chunk in chunks])
-
-                return {
-                    "iri": asset_dict.get("iri"),
-                    "asset_id": asset_id,
-                    "title": asset_dict["title"],
-                    "document_type": asset_dict["document_type"],
-                    "status": asset_dict["status"],
-                    "traceability_status": asset_dict.get("traceability_status", "linked"),
-                    "content": full_content,
-                    "chunks": chunks,
-                    "total_chunks": len(chunks),
-                    "total_tokens": total_tokens,
-                    "created_at": asset_dict["created_at"].isoformat() if asset_dict["created_at"] else None,
-                    "source_filename": asset_dict.get("source_filename"),
-                    "installation": {
-                        "organization": get_installation_iri_service().settings.installation_organization,
-                        "contact": get_installation_iri_service().settings.authority_contact,
-                        "base_uri": get_installation_iri_service().installation_base_uri
-                    },
-                    "accessed_at": datetime.now().isoformat()
-                }
+                version_key = "|".join(str(asset_dict.get(k)) for k in (
+                    "version", "updated_at", "chunk_count", "chunks_changed_at", "title", "status",
+                    "traceability_status", "iri", "source_filename",
+                ))
+                etag = f'W/"{hashlib.sha256(version_key.encode()).hexdigest()[:32]}"'
+                last_modified = max(
+                    (t for t in (asset_dict.get("updated_at"), asset_dict.get("chunks_changed_at")) if t),
+                    default=None,
+                )
+                headers = {"ETag": etag, "Cache-Control": _cache_control()}
+                if last_modified:
+                    headers["Last-Modified"] = _http_date(last_modified)
+
+                if _not_modified(request, etag, last_modified):
+                    return Response(status_code=304, headers=headers)
+
+                cached = _knowledge_content_cache.get(asset_id)
+                if cached and cached[0] == version_key:
+                    _knowledge_content_cache.move_to_end(asset_id)
+                    payload = cached[1]
+                else:
+                    payload = _assemble_knowledge_content(cur, asset_id, asset_dict, _iri_service(db))
+                    _knowledge_content_cache[asset_id] = (version_key, payload)
+                    max_entries = getattr(_settings(), "federated_content_cache_entries", 64)
+                    while len(_knowledge_content_cache) > max_entries:
+                        _knowledge_content_cache.popitem(last=False)
+
+                return JSONResponse(
+                    content={**payload, "accessed_at": datetime.now().isoformat()},
+                    headers=headers,
+                )
 
         finally:
             db._return(conn)
@@ -257,11 +476,7 @@ async def federated_get_knowledge_metadata(
                     "content_summary": asset_dict.get("content_summary"),
                     "created_at": asset_dict["created_at"].isoformat() if asset_dict["created_at"] else None,
                     "source_filename": asset_dict.get("source_filename"),
-                    "installation": {
-                        "organization": get_installation_iri_service().settings.installation_organization,
-                        "contact": get_installation_iri_service().settings.authority_contact,
-                        "base_uri": get_installation_iri_service().installation_base_uri
-                    },
+                    "installation": _installation_info(db),
                     "accessed_at": datetime.now().isoformat()
                 }
 
@@ -276,7 +491,7 @@ async def federated_get_knowledge_metadata(
 
 
 @router.get("/installations/discover")
-async def discover_installation():
+async def discover_installation(db: DatabaseService = Depends(get_db_service)):
     """
     Installation discovery endpoint for federated systems.
 
@@ -284,7 +499,7 @@ async def discover_installation():
     supported resource types, and contact information.
     """
     try:
-        iri_service = get_installation_iri_service()
+        iri_service = _iri_service(db)
 
         return {
             "installation": {
@@ -17,13 +17,14 @@ from typing import Any, Dict, List, Optional
 
 import psycopg2
 import psycopg2.extras
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel, Field
-from SPARQLWrapper import SPARQLWrapper, JSON as SPARQL_JSON
 
 from ..services.auth import get_user as get_current_user
 from ..services.ontology_manager import OntologyManager
 from ..services.config import Settings
+from ..services.fuseki_gateway import get_fuseki_gateway
+from ..services.individual_bulk_import import SOURCE_FORMATS, IndividualBulkImporter, iter_source_rows
 from ..services.individual_table_manager import IndividualTableManager
 from ..services.constraint_analyzer import ConstraintAnalyzer
 from ..services.property_migration import PropertyMigrationService
@@ -73,11 +74,16 @@ class IndividualUpdate(BaseModel):
 class RequirementImportRequest(BaseModel):
     requirement_ids: List[str] = Field(..., description="Requirements to import as individuals")
     mapping: Dict[str, str] = Field(default={}, description="Field mapping configuration")
+    graph_iri: Optional[str] = Field(None, description="Ontology graph IRI")
 
 class DataMappingRequest(BaseModel):
     source_data: Dict[str, Any] = Field(..., description="External data to map")
     mapping_config: Dict[str, str] = Field(..., description="Mapping configuration")
     target_class: str = Field(..., description="Target ontology class")
+    graph_iri: Optional[str] = Field(None, description="Ontology graph IRI")
+    source_format: Optional[str] = Field(
+        None, description="Format of source_data['content'] (csv, json or jsonl); omit for source_data['records']"
+    )
 
 # =====================================
 # ONTOLOGY ANALYSIS ENDPOINTS
@@ -101,19 +107,9 @@ async def analyze_ontology_schema(
         
         # Get ontology data using the same method as the frontend
         try:
-            # Use the ontology manager to get the actual graph data
-            settings = Settings()
-            ontology_manager = OntologyManager(
-                fuseki_query_url=settings.fuseki_query_url,
-                fuseki_update_url=settings.fuseki_update_url
-            )
-            
             # Try to get ontology from Fuseki using the specific graph IRI
             logger.info(f"🔍 Querying Fuseki for graph: {graph}")
             
-            # Query SPARQL directly using SPARQLWrapper (like we tested)
-            sparql = SPARQLWrapper(settings.fuseki_query_url)
-            
             sparql_query = f"""
             SELECT ?class ?label ?comment WHERE {{
                 GRAPH <{graph}> {{
@@ -124,9 +120,7 @@ async def analyze_ontology_schema(
             }}
             """
             
-            sparql.setQuery(sparql_query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            sparql_result = sparql.query().convert()
+            sparql_result = await get_fuseki_gateway().aquery(sparql_query)
             
             # Build ontology structure from SPARQL results
             classes = []
@@ -481,46 +475,51 @@ async def import_requirements_as_individuals(
         logger.info(f"🔍 Importing {len(request.requirement_ids)} requirements as individuals")
         
         # Get ontology graph
-        graph_iri = await get_project_ontology_graph(project_id)
+        graph_iri = request.graph_iri or await get_project_ontology_graph(project_id)
         if not graph_iri:
             raise HTTPException(404, "No ontology found for project")
         
-        imported_count = 0
-        
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            for req_id in request.requirement_ids:
-                # Get requirement data
+        # Fetch all selected requirements in one query
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT requirement_name, requirement_text, verification_method
-                    FROM requirements_enhanced 
-                    WHERE requirement_id = %s AND project_id = %s
-                """, (req_id, project_id))
-                
-                req_data = cursor.fetchone()
-                if not req_data:
-                    continue
-                
-                # Create individual from requirement
-                individual_data = IndividualCreate(
-                    name=req_data[0] or f"Requirement_{req_id}",
-                    class_type="Requirement",
-                    properties={
-                        "rdfs:comment": req_data[1],
-                        "definition": req_data[2] or req_data[1],
-                        "dc:identifier": req_id,
-                        "source": "requirements_workbench"
-                    }
-                )
-                
-                # Create in Fuseki
-                await create_fuseki_individual(graph_iri, "Requirement", individual_data)
-                imported_count += 1
+                    SELECT requirement_id, requirement_title, requirement_text, verification_method
+                    FROM requirements_enhanced
+                    WHERE project_id = %s AND requirement_id::text = ANY(%s)
+                """, (project_id, list(request.requirement_ids)))
+                requirements = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        rows = [
+            {
+                "name": title or f"Requirement_{req_id}",
+                "rdfs:comment": text,
+                "definition": verification_method or text,
+                "dc:identifier": str(req_id),
+                "source": "requirements_workbench",
+            }
+            for req_id, title, text, verification_method in requirements
+        ]
+        
+        result = await IndividualBulkImporter(Settings(), connect=get_db_connection).import_rows(
+            project_id, graph_iri, "Requirement", rows, request.mapping,
+            source_type="requirements_workbench",
+            source_info={"requirement_ids": request.requirement_ids},
+            created_by=current_user["user_id"],
+        )
         
-        logger.info(f"✅ Imported {imported_count} requirements as individuals")
-        return {"success": True, "imported_count": imported_count}
+        logger.info(f"✅ Imported {result['imported']} requirements as individuals")
+        return {
+            "success": result["status"] != "failed",
+            "imported_count": result["imported"],
+            "not_found": len(request.requirement_ids) - len(requirements),
+            **result,
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error importing requirements: {e}")
         raise HTTPException(
@@ -540,22 +539,31 @@ async def import_external_data(
 ):
     """
     Import external data using mapping configuration
+    
+    source_data holds either "records" (a list of objects) or "content" (CSV,
+    JSON or JSON Lines text, per source_format); any other object is imported
+    as a single record.
     """
     try:
         logger.info(f"🔍 Importing external data for class: {request.target_class}")
         
         # Get ontology graph
-        graph_iri = await get_project_ontology_graph(project_id)
+        graph_iri = request.graph_iri or await get_project_ontology_graph(project_id)
         if not graph_iri:
             raise HTTPException(404, "No ontology found for project")
         
         # Process data mapping and create individuals
-        imported_count = await process_data_mapping(
-            graph_iri, request.source_data, request.mapping_config, request.target_class
+        result = await process_data_mapping(
+            project_id, graph_iri, request.source_data, request.mapping_config, request.target_class,
+            source_format=request.source_format, created_by=current_user["user_id"]
         )
         
-        return {"success": True, "imported_count": imported_count}
+        return {"success": result["status"] != "failed", "imported_count": result["imported"], **result}
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Error importing external data: {e}")
         raise HTTPException(
@@ -563,6 +571,92 @@ async def import_external_data(
             detail=f"Failed to import data: {str(e)}"
         )
 
+@router.post("/{project_id}/individuals/import-file")
+async def import_external_file(
+    project_id: str,
+    file: UploadFile = File(...),
+    target_class: str = Form(...),
+    graph_iri: Optional[str] = Form(None),
+    mapping_config: str = Form("{}", description="JSON object mapping source columns to target properties"),
+    source_format: Optional[str] = Form(None, description="csv, json or jsonl (default: from the file extension)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Import a CSV, JSON or JSON Lines file as individuals, streaming its rows
+    """
+    try:
+        graph_iri = graph_iri or await get_project_ontology_graph(project_id)
+        if not graph_iri:
+            raise HTTPException(404, "No ontology found for project")
+        
+        source_format = source_format or (file.filename or "").rsplit(".", 1)[-1].lower()
+        if source_format == "ndjson":
+            source_format = "jsonl"
+        if source_format not in SOURCE_FORMATS:
+            raise HTTPException(400, f"Unsupported file format; expected one of {', '.join(SOURCE_FORMATS)}")
+        mapping = json.loads(mapping_config or "{}")
+        
+        logger.info(f"🔍 Importing {file.filename} as {target_class} individuals")
+        result = await IndividualBulkImporter(Settings(), connect=get_db_connection).import_rows(
+            project_id, graph_iri, target_class, iter_source_rows(file.file, source_format), mapping,
+            source_info={"filename": file.filename, "format": source_format, "mapping": mapping},
+            created_by=current_user["user_id"],
+        )
+        
+        return {"success": result["status"] != "failed", "imported_count": result["imported"], **result}
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid import file: {str(e)}")
+    except Exception as e:
+        logger.error(f"❌ Error importing file: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import file: {str(e)}"
+        )
+
+@router.get("/{project_id}/individual-imports")
+async def get_import_history(
+    project_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Recent individual imports with their progress and errors
+    """
+    try:
+        conn = get_db_connection()
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT h.import_id, t.graph_iri, h.import_type, h.source_info,
+                           h.records_processed, h.records_successful, h.records_failed,
+                           h.import_status, h.error_log, h.created_at
+                    FROM individual_import_history h
+                    JOIN individual_tables_config t ON t.table_id = h.table_id
+                    WHERE t.project_id = %s
+                    ORDER BY h.created_at DESC
+                    LIMIT %s
+                """, (project_id, limit))
+                imports = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        for item in imports:
+            item["import_id"] = str(item["import_id"])
+            item["created_at"] = item["created_at"].isoformat() if item["created_at"] else None
+        return {"success": True, "imports": imports}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error getting import history: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get import history: {str(e)}"
+        )
+
 # =====================================
 # VALIDATION ENDPOINTS
 # =====================================
@@ -861,9 +955,6 @@ async def query_class_individuals(graph_iri: str, class_name: str) -> List[Dict[
     Query individuals for a specific class from Fuseki
     """
     try:
-        settings = Settings()
-        sparql = SPARQLWrapper(settings.fuseki_query_url)
-        
         query = f"""
         PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
@@ -878,9 +969,7 @@ async def query_class_individuals(graph_iri: str, class_name: str) -> List[Dict[
         }}
         """
         
-        sparql.setQuery(query)
-        sparql.setReturnFormat(SPARQL_JSON)
-        results = sparql.query().convert()
+        results = await get_fuseki_gateway().aquery(query)
         
         # Process results into individual objects
         individuals = {}
@@ -916,10 +1005,6 @@ async def create_fuseki_individual(
     Create individual in Fuseki triplestore
     """
     try:
-        settings = Settings()
-        fuseki_update_url = f"{settings.fuseki_url.rstrip('/')}/update"
-        sparql = SPARQLWrapper(fuseki_update_url)
-        
         # Generate unique URI for individual
         individual_uri = f"{graph_iri}#{individual.name}_{uuid.uuid4().hex[:8]}"
         
@@ -958,11 +1043,8 @@ async def create_fuseki_individual(
         logger.info(f"🔍 Creating Fuseki individual with URI: {individual_uri}")
         logger.info(f"🔍 SPARQL INSERT query:\n{query}")
         
-        sparql.setQuery(query)
-        sparql.method = "POST"
-        result = sparql.query()
+        await get_fuseki_gateway().aupdate(query)
         
-        logger.info(f"✅ Fuseki INSERT result: {result}")
         logger.info(f"✅ Fuseki individual created successfully: {individual_uri}")
         
         return individual_uri
@@ -980,10 +1062,6 @@ async def update_fuseki_individual(
     Update individual in Fuseki triplestore
     """
     try:
-        settings = Settings()
-        fuseki_update_url = f"{settings.fuseki_url}/update"
-        sparql = SPARQLWrapper(fuseki_update_url)
-        
         # Construct individual URI - handle both full URI and ID
         if individual_id.startswith('http://') or individual_id.startswith('https://'):
             # Full URI provided
@@ -1046,10 +1124,7 @@ async def update_fuseki_individual(
         """
         
         logger.info(f"🔍 SPARQL UPDATE query:\n{query}")
-        sparql.setQuery(query)
-        sparql.method = "POST"
-        result = sparql.query()
-        logger.info(f"✅ SPARQL UPDATE result: {result}")
+        await get_fuseki_gateway().aupdate(query)
         
         return True
         
@@ -1062,10 +1137,6 @@ async def delete_fuseki_individual(graph_iri: str, individual_id: str):
     Delete individual from Fuseki triplestore
     """
     try:
-        settings = Settings()
-        fuseki_update_url = f"{settings.fuseki_url.rstrip('/')}/update"
-        sparql = SPARQLWrapper(fuseki_update_url)
-        
         # Handle both full URI and ID
         if individual_id.startswith('http://') or individual_id.startswith('https://'):
             # Full URI provided
@@ -1092,9 +1163,7 @@ async def delete_fuseki_individual(graph_iri: str, individual_id: str):
         }}
         """
         
-        sparql.setQuery(query)
-        sparql.method = "POST"
-        sparql.query()
+        await get_fuseki_gateway().aupdate(query)
         
         logger.info(f"✅ Deleted individual from Fuseki: {individual_id}")
         
@@ -1183,16 +1252,29 @@ async def delete_individual_in_db(project_id: str, graph_iri: str, class_name: s
         # Don't raise - Fuseki deletion succeeded, DB deletion is secondary
 
 async def process_data_mapping(
+    project_id: str,
     graph_iri: str,
     source_data: Dict[str, Any],
     mapping_config: Dict[str, str],
-    target_class: str
-) -> int:
+    target_class: str,
+    source_format: Optional[str] = None,
+    created_by: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Process data mapping and create individuals
     """
-    # Implementation for data mapping and import
-    return 0
+    if "records" in source_data:
+        rows = source_data["records"]
+    elif "content" in source_data:
+        rows = iter_source_rows(source_data["content"], source_format or "json")
+    else:
+        rows = [source_data]
+    
+    return await IndividualBulkImporter(Settings(), connect=get_db_connection).import_rows(
+        project_id, graph_iri, target_class, rows, mapping_config,
+        source_info={"format": source_format or "records", "mapping": mapping_config},
+        created_by=created_by,
+    )
 
 async def validate_individual_constraints(
     graph_iri: str,
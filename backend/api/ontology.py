@@ -3,6 +3,7 @@ Ontology API endpoints for ODRAS
 Provides REST API for ontology management operations.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
@@ -12,10 +13,10 @@ from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from fastapi import Request
 from pydantic import BaseModel, Field
 import httpx
-import requests
 
 from ..services.config import Settings
 from ..services.db import DatabaseService
+from ..services.fuseki_gateway import get_fuseki_gateway
 from ..services.ontology_manager import OntologyManager
 from ..services.ontology_change_detector import OntologyChangeDetector
 from ..services.auth import get_user, get_admin_user
@@ -981,23 +982,16 @@ async def push_turtle_to_fuseki(turtle_content: str = Body(...)):
     except Exception:
         # If that fails, try direct approach via Graph Store Protocol
         try:
-            s = Settings()
-            base = s.fuseki_url.rstrip("/")
-            url = f"{base}/data?default"
-            headers = {"Content-Type": "text/turtle"}
-            resp = requests.put(
-                url, data=turtle_content.encode("utf-8"), headers=headers, timeout=10
-            )
-            if 200 <= resp.status_code < 300:
-                return {
-                    "success": True,
-                    "message": "Ontology pushed to Fuseki successfully (fallback)",
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Fuseki returned {resp.status_code}: {resp.text}",
-                }
+            await get_fuseki_gateway().aput_graph(turtle_content)
+            return {
+                "success": True,
+                "message": "Ontology pushed to Fuseki successfully (fallback)",
+            }
+        except httpx.HTTPStatusError as he:
+            return {
+                "success": False,
+                "error": f"Fuseki returned {he.response.status_code}: {he.response.text}",
+            }
         except Exception as e2:
             return {"success": False, "error": f"Failed to push to Fuseki: {str(e2)}"}
 
@@ -1021,7 +1015,7 @@ async def save_ontology(
         # Detect changes BEFORE saving
         s = Settings()
         change_detector = OntologyChangeDetector(db_service, s.fuseki_url)
-        change_result = change_detector.detect_changes(graph, ttl_content)
+        change_result = await asyncio.to_thread(change_detector.detect_changes, graph, ttl_content)
         
         # Detect property renames and create mappings
         from ..services.property_migration import PropertyMigrationService
@@ -1086,53 +1080,45 @@ async def save_ontology(
             except Exception as e:
                 logger.warning(f"Failed to track class rename: {e}")
         
-        base = s.fuseki_url.rstrip("/")
+        fuseki = get_fuseki_gateway(s.fuseki_url, s)
         # First, DROP the target graph to avoid lingering triples
         try:
-            upd_url = f"{base}/update"
-            upd_headers = {"Content-Type": "application/sparql-update"}
-            drop_q = f"DROP GRAPH <{graph}>"
-            requests.post(upd_url, data=drop_q.encode("utf-8"), headers=upd_headers, timeout=15)
+            await fuseki.aupdate(f"DROP GRAPH <{graph}>", timeout=15)
         except Exception:
             pass
         # Then write via Graph Store PUT
-        url = f"{base}/data"
-        headers = {"Content-Type": "text/turtle"}
-        auth = (s.fuseki_user, s.fuseki_password) if s.fuseki_user and s.fuseki_password else None
-        r = requests.put(
-            url,
-            params={"graph": graph},
-            data=ttl_bytes,
-            headers=headers,
-            timeout=30,
-            auth=auth,
-        )
-        if 200 <= r.status_code < 300:
-            # Return change information along with success
-            response = {
-                "success": True,
-                "graphIri": graph,
-                "message": "Saved to Fuseki",
-                "changes": {
-                    "total": len(change_result.changes),
-                    "added": change_result.total_added,
-                    "deleted": change_result.total_deleted,
-                    "renamed": change_result.total_renamed,
-                    "modified": change_result.total_modified,
-                    "affected_mts": change_result.affected_mts
-                }
+        try:
+            await fuseki.aput_graph(ttl_content, graph=graph, timeout=30)
+        except httpx.HTTPStatusError as he:
+            raise HTTPException(
+                status_code=500, detail=f"Fuseki returned {he.response.status_code}: {he.response.text}"
+            )
+        # The saved version is the baseline for the next save's change detection
+        change_detector.remember_snapshot(graph, change_result.snapshot)
+        # Return change information along with success
+        response = {
+            "success": True,
+            "graphIri": graph,
+            "message": "Saved to Fuseki",
+            "changes": {
+                "total": len(change_result.changes),
+                "added": change_result.total_added,
+                "deleted": change_result.total_deleted,
+                "renamed": change_result.total_renamed,
+                "modified": change_result.total_modified,
+                "affected_mts": change_result.affected_mts
             }
-            
-            # Add pending migrations if any
-            if pending_migrations:
-                response["pending_migrations"] = pending_migrations
-            
-            # Add pending class migrations if any
-            if pending_class_migrations:
-                response["pending_class_migrations"] = pending_class_migrations
-            
-            return response
-        raise HTTPException(status_code=500, detail=f"Fuseki returned {r.status_code}: {r.text}")
+        }
+        
+        # Add pending migrations if any
+        if pending_migrations:
+            response["pending_migrations"] = pending_migrations
+        
+        # Add pending class migrations if any
+        if pending_class_migrations:
+            response["pending_class_migrations"] = pending_class_migrations
+        
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -1143,31 +1129,23 @@ async def save_ontology(
 async def ontology_summary():
     """Return simple class counts summary from Fuseki via SPARQL."""
     try:
-        s = Settings()
-        base = s.fuseki_url.rstrip("/")
-        query_url = f"{base}/query"
         sparql = "SELECT ?type (COUNT(?s) AS ?count) WHERE { ?s a ?type } GROUP BY ?type ORDER BY DESC(?count) LIMIT 100"
-        headers = {"Accept": "application/sparql-results+json"}
-        params = {"query": sparql}
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(query_url, params=params, headers=headers)
-            r.raise_for_status()
-            data = r.json()
-            # Normalize to { rows: [{ type, count }] }
-            vars_ = data.get("head", {}).get("vars", [])
-            rows = []
-            for b in data.get("results", {}).get("bindings", []):
-                type_val = b.get("type", {}).get("value") if "type" in b else None
-                count_val = b.get("count", {}).get("value") if "count" in b else None
-                rows.append(
-                    {
-                        "type": type_val,
-                        "count": (
-                            int(count_val) if count_val and count_val.isdigit() else count_val
-                        ),
-                    }
-                )
-            return {"rows": rows, "vars": vars_}
+        data = await get_fuseki_gateway().aquery(sparql, timeout=20)
+        # Normalize to { rows: [{ type, count }] }
+        vars_ = data.get("head", {}).get("vars", [])
+        rows = []
+        for b in data.get("results", {}).get("bindings", []):
+            type_val = b.get("type", {}).get("value") if "type" in b else None
+            count_val = b.get("count", {}).get("value") if "count" in b else None
+            rows.append(
+                {
+                    "type": type_val,
+                    "count": (
+                        int(count_val) if count_val and count_val.isdigit() else count_val
+                    ),
+                }
+            )
+        return {"rows": rows, "vars": vars_}
     except Exception as e:
         return {"error": str(e)}
 
@@ -1179,18 +1157,7 @@ async def ontology_sparql(body: Dict):
     if not query:
         raise HTTPException(status_code=400, detail="Query required")
     try:
-        s = Settings()
-        base = s.fuseki_url.rstrip("/")
-        query_url = f"{base}/query"
-        headers = {
-            "Accept": "application/sparql-results+json",
-            "Content-Type": "application/sparql-query",
-        }
-        # Prefer POST for longer queries
-        async with httpx.AsyncClient(timeout=60) as client:
-            r = await client.post(query_url, content=query.encode("utf-8"), headers=headers)
-            r.raise_for_status()
-            return r.json()
+        return await get_fuseki_gateway().aquery(query, timeout=60)
     except httpx.HTTPStatusError as he:
         detail = he.response.text if he.response is not None else str(he)
         raise HTTPException(status_code=500, detail=f"SPARQL error: {detail}")
@@ -6,7 +6,6 @@ Provides REST API for ontology registry operations (plural /api/ontologies endpo
 import logging
 from typing import Any, Dict, List, Optional
 import httpx
-import requests
 from rdflib import Graph, RDF
 from rdflib.namespace import OWL, RDFS
 
@@ -14,6 +13,7 @@ from fastapi import APIRouter, Body, Depends, HTTPException, Query
 
 from ..services.config import Settings
 from ..services.db import DatabaseService
+from ..services.fuseki_gateway import get_fuseki_gateway
 from ..services.auth import get_user, get_admin_user
 from ..services.namespace_uri_generator import NamespaceURIGenerator
 from ..services.resource_uri_service import get_resource_uri_service
@@ -59,9 +59,7 @@ async def list_ontologies(
             except Exception:
                 pass
 
-        s = Settings()
-        base = s.fuseki_url.rstrip("/")
-        query_url = f"{base}/query"
+        fuseki = get_fuseki_gateway()
         # Baseline discovery: graphs with owl:Ontology
         filter_clause = ""
         if project:
@@ -79,42 +77,33 @@ async def list_ontologies(
             "  }\n"
             "} ORDER BY LCASE(STR(?label))"
         )
-        headers = {
-            "Accept": "application/sparql-results+json",
-            "Content-Type": "application/sparql-query",
-        }
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.post(query_url, content=sparql.encode("utf-8"), headers=headers)
-            r.raise_for_status()
-            data = r.json()
-            rows = data.get("results", {}).get("bindings", [])
-            ontologies = []
-            for b in rows:
+        data = await fuseki.aquery(sparql)
+        rows = data.get("results", {}).get("bindings", [])
+        ontologies = []
+        for b in rows:
+            graph = b.get("graph", {}).get("value")
+            label = (b.get("label", {}) or {}).get("value")
+            if not label and graph:
+                # Fallback label from IRI tail
+                tail = graph.rsplit("/", 1)[-1]
+                label = tail or graph
+            if graph:
+                ontologies.append({"graphIri": graph, "label": label or graph})
+
+        # Fallback: any non-empty named graph if no owl:Ontology found
+        if not ontologies:
+            sparql2 = "SELECT DISTINCT ?graph WHERE { GRAPH ?graph { ?s ?p ?o } } ORDER BY STR(?graph) LIMIT 200"
+            data2 = await fuseki.aquery(sparql2)
+            for b in data2.get("results", {}).get("bindings", []):
                 graph = b.get("graph", {}).get("value")
-                label = (b.get("label", {}) or {}).get("value")
-                if not label and graph:
-                    # Fallback label from IRI tail
-                    tail = graph.rsplit("/", 1)[-1]
-                    label = tail or graph
-                if graph:
-                    ontologies.append({"graphIri": graph, "label": label or graph})
-
-            # Fallback: any non-empty named graph if no owl:Ontology found
-            if not ontologies:
-                sparql2 = "SELECT DISTINCT ?graph WHERE { GRAPH ?graph { ?s ?p ?o } } ORDER BY STR(?graph) LIMIT 200"
-                r2 = await client.post(query_url, content=sparql2.encode("utf-8"), headers=headers)
-                r2.raise_for_status()
-                data2 = r2.json()
-                for b in data2.get("results", {}).get("bindings", []):
-                    graph = b.get("graph", {}).get("value")
-                    if not graph:
-                        continue
-                    if project and project not in graph:
-                        continue
-                    tail = graph.rsplit("/", 1)[-1]
-                    ontologies.append({"graphIri": graph, "label": tail or graph})
-
-            return {"ontologies": ontologies}
+                if not graph:
+                    continue
+                if project and project not in graph:
+                    continue
+                tail = graph.rsplit("/", 1)[-1]
+                ontologies.append({"graphIri": graph, "label": tail or graph})
+
+        return {"ontologies": ontologies}
     except httpx.HTTPStatusError as he:
         detail = he.response.text if he.response is not None else str(he)
         raise HTTPException(status_code=500, detail=f"SPARQL error: {detail}")
@@ -199,56 +188,45 @@ async def create_ontology(
         # Ensure user is member
         if not db_service.is_user_member(project_id=project, user_id=user["user_id"]):
             raise HTTPException(status_code=403, detail="Not a member of project")
-        s = Settings()
-        base = s.fuseki_url.rstrip("/")
-        url = f"{base}/data?graph={graph_iri}"
-        headers = {"Content-Type": "text/turtle"}
-        auth = (s.fuseki_user, s.fuseki_password) if s.fuseki_user and s.fuseki_password else None
-        resp = requests.put(
-            url, data=turtle.encode("utf-8"), headers=headers, auth=auth, timeout=20
-        )
-        if 200 <= resp.status_code < 300:
-            # Register in ontologies_registry
-            try:
-                db_service.add_ontology(
+        await get_fuseki_gateway().aput_graph(turtle, graph=graph_iri, timeout=20)
+        # Register in ontologies_registry
+        try:
+            db_service.add_ontology(
+                project_id=project,
+                graph_iri=graph_iri,
+                label=label,
+                role="base",
+                is_reference=is_reference,
+            )
+        except Exception:
+            pass
+
+        # EventCapture2: Capture ontology creation event directly
+        try:
+            from ..services.eventcapture2 import get_event_capture
+            event_capture = get_event_capture()
+            if event_capture:
+                await event_capture.capture_ontology_operation(
+                    operation_type="created",
+                    ontology_name=name,
                     project_id=project,
-                    graph_iri=graph_iri,
-                    label=label,
-                    role="base",
-                    is_reference=is_reference,
+                    user_id=user["user_id"],
+                    username=user.get("username", "unknown"),
+                    operation_details={
+                        "label": label,
+                        "is_reference": is_reference,
+                        "graph_iri": graph_iri,
+                        "classes_count": 0,
+                        "properties_count": 0,
+                        "created_via": "gui"
+                    }
                 )
-            except Exception:
-                pass
+                print(f"🔥 DIRECT: EventCapture2 ontology creation captured for {name}")
+        except Exception as e:
+            print(f"🔥 DIRECT: EventCapture2 ontology creation failed: {e}")
+            logger.warning(f"EventCapture2 ontology creation failed: {e}")
 
-            # EventCapture2: Capture ontology creation event directly
-            try:
-                from ..services.eventcapture2 import get_event_capture
-                event_capture = get_event_capture()
-                if event_capture:
-                    await event_capture.capture_ontology_operation(
-                        operation_type="created",
-                        ontology_name=name,
-                        project_id=project,
-                        user_id=user["user_id"],
-                        username=user.get("username", "unknown"),
-                        operation_details={
-                            "label": label,
-                            "is_reference": is_reference,
-                            "graph_iri": graph_iri,
-                            "classes_count": 0,
-                            "properties_count": 0,
-                            "created_via": "gui"
-                        }
-                    )
-                    print(f"🔥 DIRECT: EventCapture2 ontology creation captured for {name}")
-            except Exception as e:
-                print(f"🔥 DIRECT: EventCapture2 ontology creation failed: {e}")
-                logger.warning(f"EventCapture2 ontology creation failed: {e}")
-
-            return {"graphIri": graph_iri, "label": label}
-        raise HTTPException(
-            status_code=500, detail=f"Fuseki returned {resp.status_code}: {resp.text}"
-        )
+        return {"graphIri": graph_iri, "label": label}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create ontology: {str(e)}")
 
@@ -380,21 +358,11 @@ async def import_ontology_from_url(
         base_uri = settings.installation_base_uri.rstrip("/")
         graph_iri = f"{base_uri}/{project_id}/{name}"
 
-        # Store the ontology in Fuseki using the REST API
-        fuseki_url = "http://localhost:3030/odras"
-        fuseki_data_url = f"{fuseki_url}/data"
-
         # Convert graph to turtle format for storage
         turtle_content = graph.serialize(format="turtle")
 
         # Upload the ontology to Fuseki as a named graph
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.put(
-                f"{fuseki_data_url}?graph={graph_iri}",
-                content=turtle_content,
-                headers={"Content-Type": "text/turtle"},
-            )
-            response.raise_for_status()
+        await get_fuseki_gateway(settings.fuseki_url, settings).aput_graph(turtle_content, graph=graph_iri)
 
         # Register the ontology in our database
         db_service.add_ontology(
@@ -434,34 +402,23 @@ async def delete_ontology(
         # Optional membership check if project provided
         if project and not db_service.is_user_member(project_id=project, user_id=user["user_id"]):
             raise HTTPException(status_code=403, detail="Not a member of project")
-        s = Settings()
-        update_url = f"{s.fuseki_url.rstrip('/')}/update"
+        fuseki = get_fuseki_gateway()
 
         # Delete the main ontology graph
-        query = f"DROP GRAPH <{graph}>"
-        headers = {"Content-Type": "application/sparql-update"}
-        r = requests.post(update_url, data=query.encode("utf-8"), headers=headers, timeout=20)
+        await fuseki.aupdate(f"DROP GRAPH <{graph}>", timeout=20)
 
         # Also delete the associated layout graph if it exists
         layout_graph = f"{graph}#layout"
-        layout_query = f"DROP GRAPH <{layout_graph}>"
         try:
-            requests.post(
-                update_url,
-                data=layout_query.encode("utf-8"),
-                headers=headers,
-                timeout=20,
-            )
+            await fuseki.aupdate(f"DROP GRAPH <{layout_graph}>", timeout=20)
         except Exception:
             pass  # Layout graph might not exist, that's okay
 
-        if 200 <= r.status_code < 300:
-            try:
-                db_service.delete_ontology(graph_iri=graph)
-            except Exception:
-                pass
-            return {"deleted": graph}
-        raise HTTPException(status_code=500, detail=f"Fuseki returned {r.status_code}: {r.text}")
+        try:
+            db_service.delete_ontology(graph_iri=graph)
+        except Exception:
+            pass
+        return {"deleted": graph}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete ontology: {str(e)}")
 
@@ -474,8 +431,6 @@ async def relabel_ontology(body: Dict):
     if not graph or not label:
         raise HTTPException(status_code=400, detail="graph and label are required")
     try:
-        s = Settings()
-        update_url = f"{s.fuseki_url.rstrip('/')}/update"
         safe_label = label.replace("\\", "\\\\").replace('"', '\\"')
         sparql = (
             "PREFIX owl: <http://www.w3.org/2002/07/owl#>\n"
@@ -484,17 +439,7 @@ async def relabel_ontology(body: Dict):
             f'INSERT {{ GRAPH <{graph}> {{ ?o rdfs:label "{safe_label}" }} }}\n'
             f"WHERE  {{ GRAPH <{graph}> {{ ?o a owl:Ontology . OPTIONAL {{ ?o rdfs:label ?old }} }} }}\n"
         )
-        headers = {"Content-Type": "application/sparql-update"}
-        auth = (s.fuseki_user, s.fuseki_password) if s.fuseki_user and s.fuseki_password else None
-        r = requests.post(
-            update_url,
-            data=sparql.encode("utf-8"),
-            headers=headers,
-            timeout=20,
-            auth=auth,
-        )
-        if 200 <= r.status_code < 300:
-            return {"graphIri": graph, "label": label}
-        raise HTTPException(status_code=500, detail=f"Fuseki returned {r.status_code}: {r.text}")
+        await get_fuseki_gateway().aupdate(sparql, timeout=20)
+        return {"graphIri": graph, "label": label}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to relabel ontology: {str(e)}")
@@ -18,15 +18,14 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union, Tuple
 from pydantic import BaseModel, Field, validator
 from fastapi import APIRouter, Depends, HTTPException, Query, Body, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from backend.services.requirements_extraction import (
-    RequirementsExtractionEngine, 
-    ExtractionConfig, 
     ExtractionResult,
     RequirementType,
     ConstraintType
 )
+from backend.services.requirements_extraction_jobs import get_extraction_job_manager
 from backend.services.db import DatabaseService
 from backend.services.config import Settings
 from backend.services.das_core_engine import DASCoreEngine
@@ -34,7 +33,7 @@ from backend.services.file_storage import FileStorageService
 from backend.api.das import get_das_engine
 from backend.services.auth import get_user as get_current_user
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
 logger = logging.getLogger(__name__)
 
@@ -695,18 +694,24 @@ async def delete_requirement(
 # REQUIREMENTS EXTRACTION ENDPOINTS
 # =====================================
 
-@router.post("/projects/{project_id}/extract", response_model=Dict[str, Any])
+@router.post(
+    "/projects/{project_id}/extract",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def start_extraction_job(
     project_id: str,
     extraction_request: ExtractionJobCreate,
-    current_user: dict = Depends(get_current_user),
-    file_storage: FileStorageService = Depends(get_file_storage_service)
+    current_user: dict = Depends(get_current_user)
 ):
-    """Start a requirements extraction job from a document."""
+    """
+    Start a requirements extraction job from a document.
     
-    conn = get_db_connection()
-    extraction_engine = RequirementsExtractionEngine()
+    The job runs in the background; poll GET .../extraction-jobs/{job_id} or
+    stream GET .../extraction-jobs/{job_id}/events for progress.
+    """
     
+    conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
             # Verify project access
@@ -720,181 +725,141 @@ async def start_extraction_job(
                     detail="Access denied to this project"
                 )
             
-            # Get document metadata
+            # Verify the document belongs to the project
             cursor.execute(
-                "SELECT * FROM files WHERE id = %s AND project_id = %s",
+                "SELECT 1 FROM files WHERE id = %s AND project_id = %s",
                 [extraction_request.source_document_id, project_id]
             )
-            document = cursor.fetchone()
-            if not document:
+            if not cursor.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Document not found"
                 )
-            
-            # Create extraction job record
-            job_id = str(uuid.uuid4())
-            cursor.execute("""
-                INSERT INTO requirements_extraction_jobs (
-                    job_id, project_id, job_name, source_document_id,
-                    extraction_type, status, created_by
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, [
-                job_id, project_id, extraction_request.job_name,
-                extraction_request.source_document_id,
-                extraction_request.extraction_type, "running",
-                current_user["user_id"]
-            ])
-            
-            # Update job status
-            cursor.execute(
-                "UPDATE requirements_extraction_jobs SET started_at = NOW(), status = 'running' WHERE job_id = %s",
-                [job_id]
-            )
-            conn.commit()
-            
-            # Extract document text content using FileStorageService
-            try:
-                file_content_bytes = await file_storage.get_file_content(extraction_request.source_document_id)
-                if file_content_bytes:
-                    document_text = file_content_bytes.decode("utf-8")
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Document has no extractable content"
-                    )
-            except Exception as e:
-                logger.error(f"Failed to retrieve file content: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to retrieve document content: {str(e)}"
-                )
-            
-            # Configure extraction
-            config = ExtractionConfig()
-            if extraction_request.functional_keywords:
-                config.functional_keywords = extraction_request.functional_keywords
-            if extraction_request.performance_keywords:
-                config.performance_keywords = extraction_request.performance_keywords
-            if extraction_request.constraint_keywords:
-                config.constraint_keywords = extraction_request.constraint_keywords
-            if extraction_request.min_confidence:
-                config.min_confidence = extraction_request.min_confidence
-            config.extract_constraints = extraction_request.extract_constraints
-            
-            # Perform extraction
-            extraction_result = extraction_engine.extract_requirements_from_document(
-                document_text=document_text,
-                config=config,
-                document_filename=document["filename"],
-                project_id=project_id
-            )
-            
-            # Store extracted requirements
-            requirements_created = 0
-            constraints_created = 0
-            
-            for req in extraction_result.requirements:
-                if req.confidence >= config.min_confidence:
-                    req_id = str(uuid.uuid4())
-                    cursor.execute("""
-                        INSERT INTO requirements_enhanced (
-                            requirement_id, project_id, requirement_title, requirement_text,
-                            requirement_type, category, subcategory, priority,
-                            source_document_id, source_section,
-                            extraction_confidence, extraction_method, extraction_job_id,
-                            created_by, updated_by, metadata
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, [
-                        req_id, project_id,
-                        req.title or req.text[:100],
-                        req.text,
-                        req.requirement_type.value,
-                        req.category,
-                        req.subcategory,
-                        req.priority,
-                        extraction_request.source_document_id,
-                        req.source_section,
-                        req.confidence,
-                        "ai_extraction",
-                        job_id,
-                        current_user["user_id"],
-                        current_user["user_id"],
-                        json.dumps(req.metadata)
-                    ])
-                    requirements_created += 1
-                    
-                    # Store associated constraints
-                    for constraint in req.constraints:
-                        constraint_id = str(uuid.uuid4())
-                        cursor.execute("""
-                            INSERT INTO requirements_constraints (
-                                constraint_id, requirement_id, constraint_type,
-                                constraint_name, constraint_description, value_type,
-                                numeric_value, numeric_unit, text_value,
-                                created_by
-                            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """, [
-                            constraint_id, req_id, constraint.constraint_type.value,
-                            constraint.name, constraint.description, constraint.value_type,
-                            constraint.numeric_value, constraint.numeric_unit, constraint.text_value,
-                            current_user["user_id"]
-                        ])
-                        constraints_created += 1
-            
-            # Update job completion status
-            cursor.execute("""
-                UPDATE requirements_extraction_jobs 
-                SET status = 'completed', completed_at = NOW(),
-                    requirements_found = %s, constraints_found = %s,
-                    requirements_created = %s, constraints_created = %s,
-                    processing_duration_seconds = EXTRACT(EPOCH FROM (NOW() - started_at))
-                WHERE job_id = %s
-            """, [
-                len(extraction_result.requirements),
-                len(extraction_result.constraints),
-                requirements_created,
-                constraints_created,
-                job_id
-            ])
-            
-            conn.commit()
-            
-            logger.info(f"Extraction job {job_id} completed: {requirements_created} requirements, {constraints_created} constraints created")
-            
-            return {
-                "job_id": job_id,
-                "status": "completed",
-                "requirements_found": len(extraction_result.requirements),
-                "constraints_found": len(extraction_result.constraints),
-                "requirements_created": requirements_created,
-                "constraints_created": constraints_created,
-                "processing_stats": extraction_result.processing_stats
-            }
-            
+    finally:
+        conn.close()
+    
+    # Extraction options are stored on the job so it can be resumed after a restart
+    options = extraction_request.dict(
+        exclude={"job_name", "source_document_id", "config_name", "extraction_type"},
+        exclude_none=True
+    )
+    try:
+        job_id = await get_extraction_job_manager().submit(
+            project_id=project_id,
+            source_document_id=extraction_request.source_document_id,
+            user_id=current_user["user_id"],
+            job_name=extraction_request.job_name,
+            extraction_type=extraction_request.extraction_type,
+            options=options,
+        )
     except Exception as e:
-        conn.rollback()
-        # Update job status to failed
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE requirements_extraction_jobs 
-                    SET status = 'failed', error_message = %s, completed_at = NOW()
-                    WHERE job_id = %s
-                """, [str(e), job_id])
-                conn.commit()
-        except:
-            pass
-        
-        logger.error(f"Error in extraction job: {str(e)}")
+        logger.error(f"Error starting extraction job: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Extraction job failed: {str(e)}"
+            detail=f"Failed to start extraction job: {str(e)}"
         )
+    
+    logger.info(f"Extraction job {job_id} queued for document {extraction_request.source_document_id}")
+    return {
+        "job_id": job_id,
+        "status": "pending",
+        "status_url": f"/api/requirements/projects/{project_id}/extraction-jobs/{job_id}",
+        "events_url": f"/api/requirements/projects/{project_id}/extraction-jobs/{job_id}/events",
+    }
+
+
+def _require_project_member(project_id: str, user_id: str) -> None:
+    """Raise 403 unless the user is a member of the project."""
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM project_members WHERE project_id = %s AND user_id = %s",
+                [project_id, user_id]
+            )
+            if not cursor.fetchone():
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Access denied to this project"
+                )
     finally:
         conn.close()
 
 
+async def _get_project_job(project_id: str, job_id: str, current_user: dict) -> Dict[str, Any]:
+    """Load an extraction job of the project, checking membership."""
+    _require_project_member(project_id, current_user["user_id"])
+    job = await get_extraction_job_manager().get_status(job_id)
+    if not job or str(job["project_id"]) != project_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Extraction job not found"
+        )
+    return job
+
+
+@router.get("/projects/{project_id}/extraction-jobs/{job_id}", response_model=Dict[str, Any])
+async def get_extraction_job(
+    project_id: str,
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the status and progress of a requirements extraction job."""
+    return await _get_project_job(project_id, job_id, current_user)
+
+
+@router.get("/projects/{project_id}/extraction-jobs/{job_id}/events")
+async def stream_extraction_job(
+    project_id: str,
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream extraction job progress as server-sent events until the job finishes."""
+    await _get_project_job(project_id, job_id, current_user)
+    
+    async def generate_events():
+        async for job in get_extraction_job_manager().watch(job_id):
+            yield f"data: {json.dumps(job, default=str)}\n\n"
+    
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/projects/{project_id}/extraction-jobs/{job_id}/cancel", response_model=Dict[str, Any])
+async def cancel_extraction_job(
+    project_id: str,
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Cancel a pending or running extraction job (requirements already stored are kept)."""
+    await _get_project_job(project_id, job_id, current_user)
+    if not await get_extraction_job_manager().cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Extraction job is not pending or running"
+        )
+    return {"job_id": job_id, "status": "cancelled"}
+
+
+@router.post("/projects/{project_id}/extraction-jobs/{job_id}/resume", response_model=Dict[str, Any])
+async def resume_extraction_job(
+    project_id: str,
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Resume a failed or cancelled extraction job from its last completed section."""
+    await _get_project_job(project_id, job_id, current_user)
+    if not await get_extraction_job_manager().resume(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only failed or cancelled extraction jobs can be resumed"
+        )
+    return {"job_id": job_id, "status": "pending"}
+
+
 @router.get("/projects/{project_id}/extraction-jobs", response_model=List[Dict[str, Any]])
 async def list_extraction_jobs(
     project_id: str,
@@ -1433,6 +1398,112 @@ async def delete_requirement_constraint(
         conn.close()
 
 
+# =====================================
+# BULK PUBLISH / IMPORT HELPERS
+# =====================================
+
+MAX_BULK_REQUIREMENTS = 5000
+
+
+def _normalize_requirement_ids(requirement_ids: List[str]) -> Tuple[Dict[str, str], List[dict]]:
+    """
+    Canonicalize requested requirement IDs for set-based queries.
+
+    Returns a dict of canonical UUID -> requested ID (request order preserved)
+    and skip entries for malformed or duplicate IDs, so a single bad ID can
+    never fail the ``= ANY(%s::uuid[])`` query for the whole batch.
+    """
+    requested: Dict[str, str] = {}
+    skipped: List[dict] = []
+    for req_id in requirement_ids:
+        try:
+            canonical = str(uuid.UUID(str(req_id)))
+        except ValueError:
+            skipped.append({"requirement_id": req_id, "reason": "Invalid requirement ID"})
+            continue
+        if canonical in requested:
+            skipped.append({"requirement_id": req_id, "reason": "Duplicate requirement ID in request"})
+            continue
+        requested[canonical] = req_id
+    return requested, skipped
+
+
+def _plan_batch_publish(
+    requested: Dict[str, str], rows_by_id: Dict[str, dict], force: bool
+) -> Tuple[List[str], List[dict]]:
+    """Split requested requirements into publishable IDs and per-row skip reasons."""
+    to_publish: List[str] = []
+    skipped: List[dict] = []
+    for canonical, req_id in requested.items():
+        requirement = rows_by_id.get(canonical)
+        if not requirement:
+            skipped.append({"requirement_id": req_id, "reason": "Requirement not found"})
+        elif requirement['state'] not in ['approved', 'published'] and not force:
+            skipped.append({
+                "requirement_id": req_id,
+                "requirement_identifier": requirement['requirement_identifier'],
+                "reason": f"Cannot publish requirement in '{requirement['state']}' state (use force=true to override)"
+            })
+        elif requirement['state'] == 'published':
+            skipped.append({
+                "requirement_id": req_id,
+                "requirement_identifier": requirement['requirement_identifier'],
+                "reason": "Already published"
+            })
+        else:
+            to_publish.append(canonical)
+    return to_publish, skipped
+
+
+def _plan_import(
+    requested: Dict[str, str],
+    source_rows: Dict[str, dict],
+    target_rows: List[dict],
+    source_project_id: str,
+    source_project_name: str,
+) -> Tuple[List[Tuple[dict, str]], List[dict]]:
+    """
+    Decide which source requirements can be imported into the target project.
+
+    Returns (source requirement, prefixed identifier) pairs to insert and the
+    per-row failure reasons. Every check that would otherwise surface as a
+    constraint violation mid-transaction is done here up front.
+    """
+    existing_ids = {row["requirement_id"] for row in target_rows}
+    existing_identifiers = {row["requirement_identifier"] for row in target_rows}
+    already_imported = {
+        row["source_requirement_id"] for row in target_rows
+        if row["source_requirement_id"] and row["source_project_id"] == source_project_id
+    }
+
+    to_import: List[Tuple[dict, str]] = []
+    failed: List[dict] = []
+    for canonical, req_id in requested.items():
+        source_req = source_rows.get(canonical)
+        if not source_req:
+            failed.append({"requirement_id": req_id, "reason": "Not found or not published"})
+            continue
+        if canonical in existing_ids:
+            failed.append({"requirement_id": req_id, "reason": "Requirement ID already exists in target project"})
+            continue
+        if canonical in already_imported:
+            failed.append({"requirement_id": req_id, "reason": "Already imported from this source"})
+            continue
+
+        # Prefixed identifier for traceability and conflict avoidance, e.g. "core.me.REQ-001"
+        prefixed_identifier = f"{source_project_name}.{source_req['requirement_identifier']}"
+        if len(prefixed_identifier) > 100:
+            failed.append({"requirement_id": req_id, "reason": "Prefixed identifier exceeds 100 characters"})
+            continue
+        if prefixed_identifier in existing_identifiers:
+            failed.append({"requirement_id": req_id, "reason": f"Identifier {prefixed_identifier} already exists in target project"})
+            continue
+
+        existing_identifiers.add(prefixed_identifier)
+        to_import.append((source_req, prefixed_identifier))
+    return to_import, failed
+
+
 # =====================================
 # PUBLISHING ENDPOINTS
 # =====================================
@@ -1444,7 +1515,7 @@ class PublishRequirementRequest(BaseModel):
 
 class BatchPublishRequest(BaseModel):
     """Model for batch publishing requirements."""
-    requirement_ids: List[str] = Field(..., min_items=1, max_items=50)
+    requirement_ids: List[str] = Field(..., min_items=1, max_items=MAX_BULK_REQUIREMENTS)
     force: bool = Field(default=False, description="Force publish even if not approved")
     published_by: Optional[str] = None
 
@@ -1601,81 +1672,57 @@ async def batch_publish_requirements(
 ):
     """
     Publish multiple requirements in a single operation.
+
+    Validation is one set query and publishing one UPDATE over the eligible
+    IDs, so ineligible rows are skipped with a reason instead of aborting the
+    transaction.
     """
     db = get_db_service()
     conn = get_db_connection()
     
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            requested, skipped_requirements = _normalize_requirement_ids(request.requirement_ids)
             published_requirements = []
-            skipped_requirements = []
             
-            for req_id in request.requirement_ids:
-                try:
-                    # Check requirement state
-                    cursor.execute("""
-                        SELECT requirement_id, state, requirement_identifier, requirement_title
-                        FROM requirements_enhanced
-                        WHERE requirement_id = %s AND project_id = %s
-                    """, (req_id, project_id))
-                    
-                    requirement = cursor.fetchone()
-                    if not requirement:
-                        skipped_requirements.append({
-                            "requirement_id": req_id,
-                            "reason": "Requirement not found"
-                        })
-                        continue
-                    
-                    # Validate publishing conditions
-                    if requirement['state'] not in ['approved', 'published'] and not request.force:
-                        skipped_requirements.append({
-                            "requirement_id": req_id,
-                            "requirement_identifier": requirement['requirement_identifier'],
-                            "reason": f"Cannot publish requirement in '{requirement['state']}' state (use force=true to override)"
-                        })
-                        continue
-                    
-                    if requirement['state'] == 'published':
-                        skipped_requirements.append({
-                            "requirement_id": req_id,
-                            "requirement_identifier": requirement['requirement_identifier'],
-                            "reason": "Already published"
-                        })
-                        continue
-                    
-                    # Publish the requirement
-                    now = datetime.now(timezone.utc)
-                    published_by_id = current_user.get('user_id')
-                    
-                    cursor.execute("""
-                        UPDATE requirements_enhanced 
-                        SET state = 'published',
-                            is_published = true,
-                            published_at = %s,
-                            published_by = %s,
-                            updated_at = %s,
-                            updated_by = %s,
-                            version = version + 1
-                        WHERE requirement_id = %s AND project_id = %s
-                        RETURNING requirement_identifier, requirement_title
-                    """, (now, published_by_id, now, current_user.get('user_id'), req_id, project_id))
-                    
-                    result = cursor.fetchone()
-                    
+            # Check all requirement states at once; rows stay locked until commit
+            cursor.execute("""
+                SELECT requirement_id, state, requirement_identifier, requirement_title
+                FROM requirements_enhanced
+                WHERE project_id = %s AND requirement_id = ANY(%s::uuid[])
+                FOR UPDATE
+            """, (project_id, list(requested)))
+            rows_by_id = {row['requirement_id']: row for row in cursor.fetchall()}
+            
+            to_publish, plan_skipped = _plan_batch_publish(requested, rows_by_id, request.force)
+            skipped_requirements.extend(plan_skipped)
+            
+            if to_publish:
+                now = datetime.now(timezone.utc)
+                user_id = current_user.get('user_id')
+                
+                cursor.execute("""
+                    UPDATE requirements_enhanced r
+                    SET state = 'published',
+                        is_published = true,
+                        published_at = %s,
+                        published_by = %s,
+                        updated_at = %s,
+                        updated_by = %s,
+                        version = r.version + 1
+                    FROM unnest(%s::uuid[]) AS t(requirement_id)
+                    WHERE r.requirement_id = t.requirement_id AND r.project_id = %s
+                    RETURNING r.requirement_id, r.requirement_identifier, r.requirement_title
+                """, (now, user_id, now, user_id, to_publish, project_id))
+                
+                for result in cursor.fetchall():
                     published_requirements.append({
-                        "requirement_id": req_id,
+                        "requirement_id": requested[result['requirement_id']],
                         "requirement_identifier": result['requirement_identifier'],
                         "requirement_title": result['requirement_title'],
                         "published_at": now,
                         "published_by": current_user.get('username', 'unknown')
                     })
-                    
-                except Exception as e:
-                    skipped_requirements.append({
-                        "requirement_id": req_id,
-                        "reason": f"Error: {str(e)}"
-                    })
             
             conn.commit()
             
@@ -1694,6 +1741,7 @@ async def batch_publish_requirements(
             }
             
     except Exception as e:
+        conn.rollback()
         logger.error(f"Error in batch publish: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1787,7 +1835,7 @@ async def list_published_requirements(
 class ImportRequirementsRequest(BaseModel):
     """Model for importing requirements from another project."""
     source_project_id: str = Field(..., description="Source project ID to import from")
-    requirement_ids: List[str] = Field(..., min_items=1, max_items=50, description="List of requirement IDs to import")
+    requirement_ids: List[str] = Field(..., min_items=1, max_items=MAX_BULK_REQUIREMENTS, description="List of requirement IDs to import")
 
 @router.get("/projects/published-summary")
 async def get_projects_with_published_requirements(
@@ -1836,7 +1884,13 @@ async def import_requirements(
     import_request: ImportRequirementsRequest,
     current_user: dict = Depends(get_current_user)
 ):
-    """Import published requirements from another project, preserving original IDs and adding full traceability."""
+    """
+    Import published requirements from another project, preserving original IDs and adding full traceability.
+
+    Source rows, target conflicts and constraints are each fetched with one
+    set query and written with bulk inserts in a single transaction; rows that
+    cannot be imported are reported in ``failed_imports``.
+    """
     db = get_db_service()
     conn = get_db_connection()
     
@@ -1862,7 +1916,7 @@ async def import_requirements(
             
             # Get source project traceability information
             cursor.execute("""
-                SELECT p.name, p.iri, p.namespace_id, nr.path as namespace_path, nr.prefix
+                SELECT p.project_id, p.name, p.iri, p.namespace_id, nr.path as namespace_path, nr.prefix
                 FROM projects p 
                 LEFT JOIN namespace_registry nr ON p.namespace_id = nr.id
                 WHERE p.project_id = %s
@@ -1871,139 +1925,139 @@ async def import_requirements(
             source_project_info = cursor.fetchone()
             if not source_project_info:
                 raise HTTPException(status_code=404, detail="Source project not found")
+            source_project_id = source_project_info["project_id"]
             
-            imported_count = 0
-            failed_imports = []
+            requested, failed_imports = _normalize_requirement_ids(import_request.requirement_ids)
+            requested_ids = list(requested)
             
-            for req_id in import_request.requirement_ids:
-                try:
-                    # Get the source requirement with complete details
-                    cursor.execute("""
-                        SELECT r.*
-                        FROM requirements_enhanced r
-                        WHERE r.requirement_id = %s 
-                        AND r.project_id = %s 
-                        AND r.state = 'published' 
-                        AND r.is_published = true
-                    """, (req_id, import_request.source_project_id))
-                    
-                    source_req = cursor.fetchone()
-                    if not source_req:
-                        failed_imports.append({"requirement_id": req_id, "reason": "Not found or not published"})
-                        continue
-                    
-                    # Check if requirement with this ID already exists in target project
-                    cursor.execute("""
-                        SELECT requirement_id FROM requirements_enhanced 
-                        WHERE project_id = %s AND requirement_id = %s
-                    """, (project_id, req_id))
-                    
-                    if cursor.fetchone():
-                        failed_imports.append({"requirement_id": req_id, "reason": "Requirement ID already exists in target project"})
-                        continue
-                    
-                    # Check if this requirement was already imported from this source
-                    cursor.execute("""
-                        SELECT requirement_id FROM requirements_enhanced 
-                        WHERE project_id = %s 
-                        AND source_requirement_id = %s 
-                        AND source_project_id = %s
-                    """, (project_id, req_id, import_request.source_project_id))
-                    
-                    if cursor.fetchone():
-                        failed_imports.append({"requirement_id": req_id, "reason": "Already imported from this source"})
-                        continue
-                    
-                    # Generate prefixed identifier for traceability and conflict avoidance  
-                    now = datetime.now(timezone.utc)
-                    new_req_id = str(uuid.uuid4())  # New UUID for target project
-                    original_identifier = source_req["requirement_identifier"]  # e.g., "REQ-001"
-                    source_project_prefix = source_project_info["name"]  # e.g., "core.me"
-                    prefixed_identifier = f"{source_project_prefix}.{original_identifier}"  # e.g., "core.me.REQ-001"
-                    
-                    cursor.execute("""
-                        INSERT INTO requirements_enhanced (
-                            requirement_id, project_id, requirement_identifier,
-                            requirement_title, requirement_text, requirement_type,
-                            priority, state, is_immutable, source_requirement_id, 
-                            source_project_id, source_project_iri, source_namespace_path, source_namespace_prefix,
-                            created_at, updated_at, created_by, updated_by,
-                            version, requirement_rationale, verification_criteria, verification_method,
-                            verification_status, tags, metadata
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        )
-                    """, (
-                        new_req_id, project_id, prefixed_identifier,
+            # Get all source requirements with complete details
+            cursor.execute("""
+                SELECT r.*
+                FROM requirements_enhanced r
+                WHERE r.requirement_id = ANY(%s::uuid[])
+                AND r.project_id = %s 
+                AND r.state = 'published' 
+                AND r.is_published = true
+            """, (requested_ids, source_project_id))
+            source_rows = {row["requirement_id"]: row for row in cursor.fetchall()}
+            
+            # Everything in the target project that could collide with the import
+            prefixed_identifiers = [
+                f"{source_project_info['name']}.{row['requirement_identifier']}" for row in source_rows.values()
+            ]
+            cursor.execute("""
+                SELECT requirement_id, requirement_identifier, source_requirement_id, source_project_id
+                FROM requirements_enhanced
+                WHERE project_id = %s
+                AND (
+                    requirement_id = ANY(%s::uuid[])
+                    OR requirement_identifier = ANY(%s)
+                    OR (source_project_id = %s AND source_requirement_id = ANY(%s::uuid[]))
+                )
+            """, (project_id, requested_ids, prefixed_identifiers, source_project_id, requested_ids))
+            target_rows = cursor.fetchall()
+            
+            to_import, plan_failed = _plan_import(
+                requested, source_rows, target_rows, source_project_id, source_project_info["name"]
+            )
+            failed_imports.extend(plan_failed)
+            
+            imported_count = 0
+            if to_import:
+                now = datetime.now(timezone.utc)
+                user_id = current_user["user_id"]
+                
+                requirement_rows = []
+                for source_req, prefixed_identifier in to_import:
+                    requirement_rows.append((
+                        str(uuid.uuid4()), project_id, prefixed_identifier,
                         source_req["requirement_title"], source_req["requirement_text"], source_req["requirement_type"],
-                        source_req["priority"], 'imported', True, req_id,
-                        import_request.source_project_id, source_project_info["iri"], source_project_info["namespace_path"], source_project_info["prefix"],
-                        now, now, current_user["user_id"], current_user["user_id"],
+                        source_req["priority"], 'imported', True, source_req["requirement_id"],
+                        source_project_id, source_project_info["iri"], source_project_info["namespace_path"], source_project_info["prefix"],
+                        now, now, user_id, user_id,
                         source_req["version"] or 1, source_req["requirement_rationale"] or '', source_req["verification_criteria"] or '', source_req["verification_method"] or 'review',
                         'not_started', json.dumps(source_req["tags"] or []), json.dumps(source_req["metadata"] or {})
                     ))
-                    
-                    # Import constraints preserving original constraint IDs
+                
+                # Rows that lose a race with a concurrent import are skipped, not fatal
+                inserted = execute_values(cursor, """
+                    INSERT INTO requirements_enhanced (
+                        requirement_id, project_id, requirement_identifier,
+                        requirement_title, requirement_text, requirement_type,
+                        priority, state, is_immutable, source_requirement_id, 
+                        source_project_id, source_project_iri, source_namespace_path, source_namespace_prefix,
+                        created_at, updated_at, created_by, updated_by,
+                        version, requirement_rationale, verification_criteria, verification_method,
+                        verification_status, tags, metadata
+                    ) VALUES %s
+                    ON CONFLICT DO NOTHING
+                    RETURNING requirement_id, source_requirement_id
+                """, requirement_rows, page_size=1000, fetch=True)
+                new_ids = {row["source_requirement_id"]: row["requirement_id"] for row in inserted}
+                imported_count = len(new_ids)
+                
+                for source_req, _ in to_import:
+                    if source_req["requirement_id"] not in new_ids:
+                        failed_imports.append({
+                            "requirement_id": requested[source_req["requirement_id"]],
+                            "reason": "Conflicts with an existing requirement in target project"
+                        })
+                
+                if new_ids:
+                    # Copy constraints onto the imported requirements
                     cursor.execute("""
                         SELECT * FROM requirements_constraints 
-                        WHERE requirement_id = %s
-                    """, (req_id,))
+                        WHERE requirement_id = ANY(%s::uuid[])
+                    """, (list(new_ids),))
                     
-                    constraints = cursor.fetchall()
-                    for constraint in constraints:
-                        # PRESERVE original constraint ID 
-                        original_constraint_id = constraint["constraint_id"]
-                        cursor.execute("""
+                    constraint_rows = [
+                        (
+                            str(uuid.uuid4()), new_ids[constraint["requirement_id"]], constraint["constraint_type"], constraint["constraint_name"],
+                            constraint["constraint_description"], constraint["value_type"], constraint["numeric_value"],
+                            constraint["numeric_unit"], constraint["range_min"], constraint["range_max"],
+                            constraint["range_unit"], constraint["text_value"], json.dumps(constraint["enumeration_values"]) if constraint["enumeration_values"] else None,
+                            constraint["measurement_method"], constraint["tolerance"], constraint["tolerance_unit"],
+                            constraint["priority"], constraint["equation_expression"], json.dumps(constraint["equation_parameters"]) if constraint["equation_parameters"] else None,
+                            now, now, user_id
+                        )
+                        for constraint in cursor.fetchall()
+                    ]
+                    if constraint_rows:
+                        execute_values(cursor, """
                             INSERT INTO requirements_constraints (
                                 constraint_id, requirement_id, constraint_type, constraint_name,
                                 constraint_description, value_type, numeric_value, numeric_unit,
                                 range_min, range_max, range_unit, text_value, enumeration_values,
                                 measurement_method, tolerance, tolerance_unit, priority,
                                 equation_expression, equation_parameters,
-                                created_at, updated_at, created_by, updated_by
-                            ) VALUES (
-                                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                            )
-                        """, (
-                            original_constraint_id, new_req_id, constraint["constraint_type"], constraint["constraint_name"], 
-                            constraint["constraint_description"], constraint["value_type"], constraint["numeric_value"], 
-                            constraint["numeric_unit"], constraint["range_min"], constraint["range_max"], 
-                            constraint["range_unit"], constraint["text_value"], json.dumps(constraint["enumeration_values"]) if constraint["enumeration_values"] else None, 
-                            constraint["measurement_method"], constraint["tolerance"], constraint["tolerance_unit"], 
-                            constraint["priority"], constraint["equation_expression"], json.dumps(constraint["equation_parameters"]) if constraint["equation_parameters"] else None,
-                            now, now, current_user["user_id"], current_user["user_id"]
-                        ))
+                                created_at, updated_at, created_by
+                            ) VALUES %s
+                        """, constraint_rows, page_size=1000)
                     
-                    # Log the import with full traceability
-                    cursor.execute("""
+                    # Log the imports with full traceability
+                    history_rows = [
+                        (
+                            str(uuid.uuid4()), new_req_id, 'created', user_id, now,
+                            json.dumps({
+                                "source_requirement_id": source_req_id,
+                                "source_project": import_request.source_project_id,
+                                "source_project_name": source_project_info["name"],
+                                "source_namespace": source_project_info["namespace_path"]
+                            }),
+                            json.dumps({
+                                "imported_id": source_rows[source_req_id]["requirement_identifier"],
+                                "state": "imported",
+                                "is_immutable": True,
+                                "preserved_original_id": True
+                            })
+                        )
+                        for source_req_id, new_req_id in new_ids.items()
+                    ]
+                    execute_values(cursor, """
                         INSERT INTO requirements_history (
                             history_id, requirement_id, change_type, changed_by, changed_at, old_value, new_value
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s
-                        )
-                    """, (
-                            str(uuid.uuid4()), new_req_id, 'created',
-                        current_user["user_id"], now,
-                        json.dumps({
-                            "source_requirement_id": req_id, 
-                            "source_project": import_request.source_project_id,
-                            "source_project_name": source_project_info["name"],
-                            "source_namespace": source_project_info["namespace_path"]
-                        }),
-                        json.dumps({
-                            "imported_id": original_identifier, 
-                            "state": "imported",
-                            "is_immutable": True,
-                            "preserved_original_id": True
-                        })
-                    ))
-                    
-                    imported_count += 1
-                    
-                except Exception as import_error:
-                    logger.error(f"Error importing requirement {req_id}: {import_error}")
-                    failed_imports.append({"requirement_id": req_id, "reason": str(import_error)})
-                    continue
+                        ) VALUES %s
+                    """, history_rows, page_size=1000)
             
             conn.commit()
             
@@ -2023,6 +2077,7 @@ async def import_requirements(
     except HTTPException:
         raise
     except Exception as e:
+        conn.rollback()
         logger.error(f"Error importing requirements: {e}")
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
     finally:
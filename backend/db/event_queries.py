@@ -17,12 +17,121 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Hourly project_event counts per (project, event type), kept current by
+# statement-level triggers so dashboard statistics never scan project_event.
+# Installed once (see ensure_event_rollup): the backfill blocks inserts while
+# it runs, so it must not repeat on every startup.
+EVENT_ROLLUP_TRIGGERS = (
+    "project_event_rollup_on_insert",
+    "project_event_rollup_on_delete",
+    "project_event_rollup_on_truncate",
+)
+
+EVENT_ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS project_event_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    project_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, project_id, event_type)
+);
+
+CREATE OR REPLACE FUNCTION project_event_rollup_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO project_event_hourly (hour, project_id, event_type, event_count)
+    SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())), project_id, event_type, COUNT(*)
+    FROM new_events
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, project_id, event_type)
+    DO UPDATE SET event_count = project_event_hourly.event_count + EXCLUDED.event_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_event_rollup_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE project_event_hourly h
+    SET event_count = h.event_count - d.removed
+    FROM (
+        SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())) AS hour, project_id, event_type, COUNT(*) AS removed
+        FROM old_events
+        GROUP BY 1, 2, 3
+    ) d
+    WHERE h.hour = d.hour AND h.project_id = d.project_id AND h.event_type = d.event_type;
+
+    DELETE FROM project_event_hourly
+    WHERE event_count <= 0
+      AND hour IN (SELECT DISTINCT DATE_TRUNC('hour', COALESCE(created_at, NOW())) FROM old_events);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_event_rollup_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE project_event_hourly;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_insert
+    AFTER INSERT ON project_event
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_insert();
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_delete
+    AFTER DELETE ON project_event
+    REFERENCING OLD TABLE AS old_events
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_delete();
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_truncate
+    AFTER TRUNCATE ON project_event
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_truncate();
+
+LOCK TABLE project_event IN SHARE ROW EXCLUSIVE MODE;
+INSERT INTO project_event_hourly (hour, project_id, event_type, event_count)
+SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())), project_id, event_type, COUNT(*)
+FROM project_event
+WHERE NOT EXISTS (SELECT 1 FROM project_event_hourly)
+GROUP BY 1, 2, 3;
+"""
+
+
+def ensure_event_rollup(cur) -> bool:
+    """
+    Install the hourly rollup and backfill it, unless its triggers already exist.
+
+    Returns True when the DDL ran. Changes to the trigger functions need the
+    triggers dropped first so the next startup reinstalls them.
+    """
+    cur.execute("""
+        SELECT COUNT(*) FROM pg_trigger
+        WHERE tgrelid = 'project_event'::regclass AND tgname = ANY(%s)
+    """, (list(EVENT_ROLLUP_TRIGGERS),))
+    if cur.fetchone()[0] == len(EVENT_ROLLUP_TRIGGERS):
+        return False
+
+    cur.execute(EVENT_ROLLUP_DDL)
+    logger.info("Installed project_event hourly rollup")
+    return True
+
 
 def now_utc() -> datetime.datetime:
     """Return current UTC timestamp"""
     return datetime.datetime.now(datetime.timezone.utc)
 
 
+def _as_utc(value: Any) -> Optional[datetime.datetime]:
+    """Timezone-aware UTC timestamp from a datetime or ISO string (naive values are local time)"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.astimezone(datetime.timezone.utc)
+
+
 def create_event_tables(conn) -> bool:
     """
     Create event storage tables following SQL-first RAG pattern.
@@ -83,12 +192,17 @@ def create_event_tables(conn) -> bool:
                 CREATE INDEX IF NOT EXISTS idx_project_event_project ON project_event(project_id);
                 CREATE INDEX IF NOT EXISTS idx_project_event_type ON project_event(event_type);
                 CREATE INDEX IF NOT EXISTS idx_project_event_created ON project_event(created_at);
+                CREATE INDEX IF NOT EXISTS idx_project_event_keyset ON project_event(created_at, event_id);
+                CREATE INDEX IF NOT EXISTS idx_project_event_project_keyset ON project_event(project_id, created_at, event_id);
                 
                 CREATE INDEX IF NOT EXISTS idx_thread_conversation_thread ON thread_conversation(project_thread_id);
                 CREATE INDEX IF NOT EXISTS idx_thread_conversation_role ON thread_conversation(role);
                 CREATE INDEX IF NOT EXISTS idx_thread_conversation_created ON thread_conversation(created_at);
             """)
-            
+
+            # Hourly rollup behind the event statistics endpoints
+            ensure_event_rollup(cur)
+
             # Comments for documentation
             cur.execute("""
                 COMMENT ON TABLE project_thread IS 'SQL-first project thread metadata - no full text content';
@@ -154,6 +268,69 @@ def insert_project_event(
     return event_id
 
 
+def insert_project_events_bulk(conn, events: List[Dict[str, Any]]) -> List[str]:
+    """
+    Insert many project events in a single transaction.
+
+    Each event dict carries the same fields as insert_project_event plus an
+    optional 'event_id' and 'created_at' (when the event happened; defaults to
+    now). Supplying a deterministic event_id makes the insert idempotent:
+    redelivered events hit ON CONFLICT and are skipped. Thread last_activity
+    only moves forward, so late or reclaimed events do not rewind it.
+
+    Returns the event_ids that were actually inserted.
+    """
+    if not events:
+        return []
+
+    from psycopg2.extras import execute_values
+
+    flushed_at = now_utc()
+    rows = [
+        (
+            event.get("event_id") or str(uuid.uuid4()),
+            event["project_thread_id"],
+            event["project_id"],
+            event["user_id"],
+            event["event_type"],
+            json.dumps(event.get("event_data") or {}),
+            json.dumps(event.get("context_snapshot") or {}),
+            event.get("semantic_summary"),
+            _as_utc(event.get("created_at")) or flushed_at,
+        )
+        for event in events
+    ]
+
+    last_activity: Dict[str, datetime.datetime] = {}
+    for row in rows:
+        last_activity[row[1]] = max(last_activity.get(row[1], row[8]), row[8])
+
+    try:
+        with conn.cursor() as cur:
+            inserted = execute_values(cur, """
+                INSERT INTO project_event(event_id, project_thread_id, project_id, user_id, event_type, event_data, context_snapshot, semantic_summary, created_at)
+                VALUES %s
+                ON CONFLICT (event_id) DO NOTHING
+                RETURNING event_id
+            """, rows, page_size=len(rows), fetch=True)
+
+            execute_values(cur, """
+                UPDATE project_thread AS t
+                SET last_activity = GREATEST(t.last_activity, v.last_activity)
+                FROM (VALUES %s) AS v(project_thread_id, last_activity)
+                WHERE t.project_thread_id = v.project_thread_id
+            """, sorted(last_activity.items()), template="(%s, %s::timestamptz)", page_size=len(last_activity))
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    event_ids = [row[0] for row in inserted]
+    logger.debug(f"Bulk inserted {len(event_ids)} of {len(rows)} events")
+    return event_ids
+
+
 def insert_thread_conversation(
     conn,
     project_thread_id: str,
@@ -284,3 +461,36 @@ def get_conversation_history(conn, project_thread_id: str, limit: int = 50) -> L
         
     logger.debug(f"Retrieved {len(results)} conversation messages for thread {project_thread_id}")
     return results
+
+
+def rebuild_event_rollup(conn, since: Optional[datetime.datetime] = None) -> int:
+    """
+    Recompute project_event_hourly from project_event (repair/compaction).
+
+    Only hours from ``since`` on are rebuilt (everything when None). Event
+    writes are blocked for the duration so the triggers cannot double count.
+    Returns the number of rollup rows written.
+    """
+    hour_filter = "WHERE hour >= DATE_TRUNC('hour', %(since)s::timestamptz)" if since else ""
+    event_filter = "WHERE created_at >= DATE_TRUNC('hour', %(since)s::timestamptz)" if since else ""
+    params = {"since": since}
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("LOCK TABLE project_event IN SHARE ROW EXCLUSIVE MODE")
+            cur.execute(f"DELETE FROM project_event_hourly {hour_filter}", params)
+            cur.execute(f"""
+                INSERT INTO project_event_hourly (hour, project_id, event_type, event_count)
+                SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())), project_id, event_type, COUNT(*)
+                FROM project_event
+                {event_filter}
+                GROUP BY 1, 2, 3
+            """, params)
+            rows = cur.rowcount
+    except Exception:
+        conn.rollback()
+        raise
+
+    conn.commit()
+    logger.info(f"Rebuilt {rows} hourly event rollup rows")
+    return rows
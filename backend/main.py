@@ -8,36 +8,21 @@ This module has been refactored to use modular components:
 - backend/api/*: Feature-specific API routers
 """
 
+import asyncio
 import logging
 
 from backend.app_factory import create_app
-from backend.startup import initialize_application, register_routers
+from backend.startup import cancel_startup, initialize_application, register_routers, start_in_background
 from backend.api.core import set_db_instance
-from backend.services.config import Settings
-from backend.services.db import DatabaseService
 
 logger = logging.getLogger(__name__)
 
 # Create application using factory
 app = create_app()
 
-# Initialize database connection early (before routers need it)
-settings = Settings()
-try:
-    db = DatabaseService(settings)
-    logger.info(
-        f"Database connected successfully to {settings.postgres_host}:{settings.postgres_port}/{settings.postgres_database}"
-    )
-    # Set database instance for core API
-    set_db_instance(db)
-except Exception as e:
-    logger.error(f"Database connection failed: {e}")
-    logger.error(
-        f"Database settings: host={settings.postgres_host}, port={settings.postgres_port}, "
-        f"database={settings.postgres_database}, user={settings.postgres_user}"
-    )
-    # Database will be initialized in startup event handler
-    set_db_instance(None)
+# The database is connected by the startup "database" phase; until then core
+# endpoints answer 503 and /api/health/ready reports not ready.
+set_db_instance(None)
 
 # Register all API routers
 register_routers(app)
@@ -46,8 +31,31 @@ register_routers(app)
 # Startup event handler
 @app.on_event("startup")
 async def on_startup():
-    """Initialize application on startup"""
-    await initialize_application(app)
+    """
+    Start initialization without waiting for it, so the server accepts
+    requests (liveness, 503 readiness) while the critical phases run
+    """
+    start_in_background(initialize_application(app))
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Hand running background jobs back so the next process resumes them"""
+    from backend.services.requirements_extraction_jobs import shutdown_extraction_jobs
+    from backend.rag.storage.opensearch_bulk_writer import close_background_bulk_writer
+    from backend.services.auth import flush_token_usage
+    from backend.services.das_tool_registry import close_tool_registries
+    from backend.services.eventcapture2_worker import stop_eventcapture2_worker
+    from backend.services.code_executor import shutdown_code_executors
+    from backend.services.fuseki_gateway import close_fuseki_gateways
+    await cancel_startup()  # stop phases still initializing
+    await shutdown_extraction_jobs()
+    await stop_eventcapture2_worker()  # store and acknowledge the batch being read
+    await shutdown_code_executors()  # stop sandbox worker processes
+    await asyncio.to_thread(close_background_bulk_writer)  # flush queued keyword index writes
+    await asyncio.to_thread(flush_token_usage)  # write pending last_used_at updates
+    await asyncio.to_thread(close_tool_registries)  # write pending tool usage counts
+    await close_fuseki_gateways()  # close pooled Fuseki connections
 
 
 def run():
@@ -12,6 +12,9 @@
 -- Enable UUID extension for auto-generated UUIDs
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram indexes for ILIKE '%term%' workbench search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- =====================================
 -- MULTI-TENANT INFRASTRUCTURE
 -- =====================================
@@ -575,6 +578,9 @@ CREATE INDEX IF NOT EXISTS idx_files_tags ON files USING GIN(tags);
 CREATE INDEX IF NOT EXISTS idx_files_storage_backend ON files(storage_backend);
 CREATE INDEX IF NOT EXISTS idx_files_deleted ON files(is_deleted);
 CREATE INDEX IF NOT EXISTS idx_files_iri ON files(iri);
+-- Workbench search and keyset pagination (sort expressions match backend/services/data_manager.py)
+CREATE INDEX IF NOT EXISTS idx_files_filename_trgm ON files USING GIN (filename gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_files_keyset_created ON files(project_id, (COALESCE(created_at, '-infinity'::timestamptz)), id);
 
 -- Knowledge assets indexes
 CREATE INDEX IF NOT EXISTS idx_knowledge_project ON knowledge_assets(project_id);
@@ -910,6 +916,10 @@ CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_created_by ON das_runtime_tools
 CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_usage_count ON das_runtime_tools(usage_count DESC);
 CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_last_used ON das_runtime_tools(last_used_at DESC);
 CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_active ON das_runtime_tools(is_active) WHERE is_active = TRUE;
+-- Tool discovery (backend/services/das_tool_registry.py): capability/tag filters use @> on the
+-- GIN array indexes above, name and text search use ILIKE on these trigram indexes
+CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_name_trgm ON das_runtime_tools USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_das_runtime_tools_description_trgm ON das_runtime_tools USING GIN (description gin_trgm_ops);
 
 -- Trigger for das_runtime_tools updated_at
 CREATE TRIGGER update_das_runtime_tools_updated_at
@@ -964,6 +974,16 @@ CREATE TRIGGER update_das_knowledge_chunks_updated_at
     BEFORE UPDATE ON das_knowledge_chunks
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Chunk access telemetry (batched increments from KnowledgeReviewWorker; keeps
+-- hot retrieval paths from rewriting das_knowledge_chunks rows)
+CREATE TABLE IF NOT EXISTS chunk_access_stats (
+    chunk_id UUID PRIMARY KEY REFERENCES das_knowledge_chunks(chunk_id) ON DELETE CASCADE,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    last_accessed_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_access_stats_last_accessed ON chunk_access_stats(last_accessed_at);
+
 -- =====================================
 -- TRIGGERS AND FUNCTIONS
 -- =====================================
@@ -1343,6 +1363,16 @@ CREATE TABLE IF NOT EXISTS project_thread (
     current_workbench TEXT
 );
 
+-- Project thread state for ProjectThreadManager (thread context as JSONB, one thread per project)
+CREATE TABLE IF NOT EXISTS project_thread_state (
+    project_thread_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL UNIQUE,
+    created_by TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_activity TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    thread_data JSONB NOT NULL DEFAULT '{}'
+);
+
 -- Individual project events (SQL-first)
 CREATE TABLE IF NOT EXISTS project_event (
     event_id TEXT PRIMARY KEY,
@@ -1381,6 +1411,81 @@ CREATE INDEX IF NOT EXISTS idx_project_event_thread ON project_event(project_thr
 CREATE INDEX IF NOT EXISTS idx_project_event_project ON project_event(project_id);
 CREATE INDEX IF NOT EXISTS idx_project_event_type ON project_event(event_type);
 CREATE INDEX IF NOT EXISTS idx_project_event_created ON project_event(created_at);
+CREATE INDEX IF NOT EXISTS idx_project_event_keyset ON project_event(created_at, event_id);
+CREATE INDEX IF NOT EXISTS idx_project_event_project_keyset ON project_event(project_id, created_at, event_id);
+
+-- Hourly event counts per project and type for the events dashboard, maintained by triggers
+-- (keep in sync with EVENT_ROLLUP_DDL in backend/db/event_queries.py)
+CREATE TABLE IF NOT EXISTS project_event_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    project_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, project_id, event_type)
+);
+
+CREATE OR REPLACE FUNCTION project_event_rollup_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO project_event_hourly (hour, project_id, event_type, event_count)
+    SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())), project_id, event_type, COUNT(*)
+    FROM new_events
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, project_id, event_type)
+    DO UPDATE SET event_count = project_event_hourly.event_count + EXCLUDED.event_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_event_rollup_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE project_event_hourly h
+    SET event_count = h.event_count - d.removed
+    FROM (
+        SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())) AS hour, project_id, event_type, COUNT(*) AS removed
+        FROM old_events
+        GROUP BY 1, 2, 3
+    ) d
+    WHERE h.hour = d.hour AND h.project_id = d.project_id AND h.event_type = d.event_type;
+
+    DELETE FROM project_event_hourly
+    WHERE event_count <= 0
+      AND hour IN (SELECT DISTINCT DATE_TRUNC('hour', COALESCE(created_at, NOW())) FROM old_events);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_event_rollup_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE project_event_hourly;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_insert
+    AFTER INSERT ON project_event
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_insert();
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_delete
+    AFTER DELETE ON project_event
+    REFERENCING OLD TABLE AS old_events
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_delete();
+
+CREATE OR REPLACE TRIGGER project_event_rollup_on_truncate
+    AFTER TRUNCATE ON project_event
+    FOR EACH STATEMENT EXECUTE FUNCTION project_event_rollup_truncate();
+
+BEGIN;
+LOCK TABLE project_event IN SHARE ROW EXCLUSIVE MODE;
+INSERT INTO project_event_hourly (hour, project_id, event_type, event_count)
+SELECT DATE_TRUNC('hour', COALESCE(created_at, NOW())), project_id, event_type, COUNT(*)
+FROM project_event
+WHERE NOT EXISTS (SELECT 1 FROM project_event_hourly)
+GROUP BY 1, 2, 3;
+COMMIT;
 
 CREATE INDEX IF NOT EXISTS idx_thread_conversation_thread ON thread_conversation(project_thread_id);
 CREATE INDEX IF NOT EXISTS idx_thread_conversation_role ON thread_conversation(role);
@@ -1395,6 +1500,8 @@ COMMENT ON TABLE doc IS 'RAG document metadata for SQL-first storage';
 COMMENT ON TABLE doc_chunk IS 'RAG document chunks with full text content as source of truth';
 COMMENT ON TABLE chat_message IS 'RAG chat conversation history';
 COMMENT ON TABLE project_thread IS 'SQL-first project thread metadata - no full text content';
+COMMENT ON TABLE project_thread_state IS 'ProjectThreadManager thread context, updated in place per event; Qdrant holds only its search vector';
+COMMENT ON TABLE project_event_hourly IS 'Hourly project_event counts per project and event type, trigger-maintained';
 COMMENT ON TABLE project_event IS 'Individual project events as source of truth for event content';
 COMMENT ON TABLE thread_conversation IS 'Conversation messages separate from project events';
 COMMENT ON COLUMN doc_chunk.text IS 'Full text content - source of truth for RAG chunks';
@@ -1760,11 +1867,25 @@ CREATE TABLE IF NOT EXISTS requirements_extraction_jobs (
     completed_at TIMESTAMPTZ,
     processing_duration_seconds INTEGER,
     
+    -- Background execution: options for resuming, section checkpoint, heartbeat
+    -- (keep in sync with EXTRACTION_JOB_DDL in backend/services/requirements_extraction_jobs.py)
+    job_config JSONB,
+    sections_total INTEGER DEFAULT 0,
+    sections_completed INTEGER DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    
     -- Auditing
     created_by UUID REFERENCES public.users(user_id) ON DELETE SET NULL,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Databases created before background extraction jobs
+ALTER TABLE requirements_extraction_jobs
+    ADD COLUMN IF NOT EXISTS job_config JSONB,
+    ADD COLUMN IF NOT EXISTS sections_total INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS sections_completed INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
 -- DAS review sessions for tracking AI-assisted requirement reviews
 CREATE TABLE IF NOT EXISTS requirements_das_reviews (
     review_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -1815,6 +1936,11 @@ CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_created_by ON requirements_
 CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_tags ON requirements_enhanced USING GIN(tags);
 CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_metadata ON requirements_enhanced USING GIN(metadata);
 CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_iri ON requirements_enhanced(iri);
+-- Workbench search and keyset pagination (sort expressions match backend/services/data_manager.py)
+CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_title_trgm ON requirements_enhanced USING GIN (requirement_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_text_trgm ON requirements_enhanced USING GIN (requirement_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_keyset_updated ON requirements_enhanced(project_id, (COALESCE(updated_at, '-infinity'::timestamptz)), requirement_id);
+CREATE INDEX IF NOT EXISTS idx_requirements_enhanced_keyset_created ON requirements_enhanced(project_id, (COALESCE(created_at, '-infinity'::timestamptz)), requirement_id);
 
 -- Constraints indexes
 CREATE INDEX IF NOT EXISTS idx_constraints_requirement ON requirements_constraints(requirement_id);
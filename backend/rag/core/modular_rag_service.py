@@ -24,6 +24,7 @@ from ..retrieval.reranker import (
     ReciprocalRankFusionReranker,
     CrossEncoderReranker,
     HybridReranker,
+    collect_rerank_metrics,
 )
 from ..retrieval.retriever import Retriever
 from .rag_service_interface import RAGServiceInterface
@@ -92,9 +93,9 @@ class ModularRAGService(RAGServiceInterface):
         if not reranker:
             reranker_type = getattr(settings, "rag_reranker", "rrf").lower()
             if reranker_type == "cross_encoder":
-                reranker = CrossEncoderReranker()
+                reranker = self._create_cross_encoder(settings)
             elif reranker_type == "hybrid":
-                reranker = HybridReranker(use_cross_encoder=True)
+                reranker = HybridReranker(use_cross_encoder=True, cross_encoder=self._create_cross_encoder(settings))
             elif reranker_type == "rrf":
                 reranker = ReciprocalRankFusionReranker()
             else:
@@ -126,6 +127,18 @@ class ModularRAGService(RAGServiceInterface):
         else:
             logger.info("ModularRAGService initialized with modular components")
 
+    @staticmethod
+    def _create_cross_encoder(settings: Settings) -> CrossEncoderReranker:
+        """Build the cross-encoder reranker with its batching/budget settings."""
+        return CrossEncoderReranker(
+            max_candidates=getattr(settings, "rag_rerank_max_candidates", 50),
+            latency_budget_ms=getattr(settings, "rag_rerank_latency_budget_ms", 250.0),
+            cache_size=getattr(settings, "rag_rerank_cache_size", 10000),
+            batch_window_ms=getattr(settings, "rag_rerank_batch_window_ms", 5.0),
+            max_batch_pairs=getattr(settings, "rag_rerank_max_batch_pairs", 256),
+            max_pending_pairs=getattr(settings, "rag_rerank_max_pending_pairs", 2048),
+        )
+
     async def query_knowledge_base(
         self,
         query: str,
@@ -155,14 +168,15 @@ class ModularRAGService(RAGServiceInterface):
         similarity_threshold = context.get("similarity_threshold", 0.3)
         
         try:
-            # Retrieve chunks using existing method
-            chunk_dicts = await self._retrieve_relevant_chunks(
-                question=query,
-                project_id=project_id,
-                user_id=user_id,
-                max_chunks=max_chunks,
-                similarity_threshold=similarity_threshold,
-            )
+            # Retrieve chunks using existing method, collecting rerank metrics per collection
+            with collect_rerank_metrics() as rerank_metrics:
+                chunk_dicts = await self._retrieve_relevant_chunks(
+                    question=query,
+                    project_id=project_id,
+                    user_id=user_id,
+                    max_chunks=max_chunks,
+                    similarity_threshold=similarity_threshold,
+                )
             
             # Convert chunk dicts to RAGChunk objects
             rag_chunks = []
@@ -231,6 +245,7 @@ class ModularRAGService(RAGServiceInterface):
                     "max_chunks": max_chunks,
                     "similarity_threshold": similarity_threshold,
                     "collections_searched": list(set(c.source.collection_name for c in rag_chunks if c.source.collection_name)),
+                    "rerank": rerank_metrics,
                 }
             )
             
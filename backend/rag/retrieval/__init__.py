@@ -12,6 +12,7 @@ from .reranker import (
     ReciprocalRankFusionReranker,
     CrossEncoderReranker,
     HybridReranker,
+    collect_rerank_metrics,
 )
 
 __all__ = [
@@ -22,4 +23,5 @@ __all__ = [
     "ReciprocalRankFusionReranker",
     "CrossEncoderReranker",
     "HybridReranker",
+    "collect_rerank_metrics",
 ]
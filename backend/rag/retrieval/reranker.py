@@ -6,13 +6,36 @@ results from multiple sources (vector search, keyword search) and reordering
 them based on relevance.
 """
 
+import asyncio
+import hashlib
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Per-query rerank metrics of the current collect_rerank_metrics() block
+_collected_metrics: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("rerank_metrics", default=None)
+
+
+@contextmanager
+def collect_rerank_metrics() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect the metrics of every cross-encoder rerank run inside the block
+    (one per collection searched), e.g. to attach them to a RAG query's metadata.
+    """
+    collected: List[Dict[str, Any]] = []
+    token = _collected_metrics.set(collected)
+    try:
+        yield collected
+    finally:
+        _collected_metrics.reset(token)
+
 
 class Reranker(ABC):
     """Abstract interface for reranking algorithms."""
@@ -130,17 +153,54 @@ class CrossEncoderReranker(Reranker):
 
     Provides more accurate reranking but requires model inference.
     This is a heavier but more accurate approach than RRF.
+
+    Inference never runs on the event loop: (query, text) pairs from all
+    concurrent queries are queued, micro-batched over a short window and
+    scored in a dedicated single-thread executor. Scores are cached in an LRU
+    keyed by (query hash, chunk id). When the pending queue is too deep or a
+    query exceeds its latency budget, the reranker degrades to RRF ordering.
     """
 
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        max_candidates: int = 50,
+        latency_budget_ms: float = 250.0,
+        cache_size: int = 10000,
+        batch_window_ms: float = 5.0,
+        max_batch_pairs: int = 256,
+        max_pending_pairs: int = 2048,
+    ):
         """
         Initialize cross-encoder reranker.
 
         Args:
             model_name: HuggingFace model name for cross-encoder
+            max_candidates: Only the first N results are scored; the rest keep their order
+            latency_budget_ms: Per-query budget before falling back to RRF ordering
+            cache_size: Max entries in the (query hash, chunk id) -> score LRU
+            batch_window_ms: How long the batcher waits to collect pairs from concurrent queries
+            max_batch_pairs: Max pairs scored in a single model call
+            max_pending_pairs: Queue depth above which new queries degrade to RRF immediately
         """
         self.model_name = model_name
         self.model = None
+        self.max_candidates = max_candidates
+        self.latency_budget = latency_budget_ms / 1000.0
+        self.cache_size = cache_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_pairs = max_batch_pairs
+        self.max_pending_pairs = max_pending_pairs
+
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cross-encoder")
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_pairs = 0
+        self._rrf = ReciprocalRankFusionReranker()
+        self.recent_metrics: Deque[Dict[str, Any]] = deque(maxlen=1000)
+
         self._load_model()
 
     def _load_model(self):
@@ -168,24 +228,54 @@ class CrossEncoderReranker(Reranker):
             results.sort(key=lambda x: x.get("score", 0), reverse=True)
             return results[:top_k] if top_k else results
 
-        try:
-            # Extract text content from results
-            pairs = []
-            for result in results:
-                payload = result.get("payload", {})
-                text = payload.get("content") or payload.get("text") or ""
-                pairs.append([query, text])
+        started = time.perf_counter()
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        candidates = results[: self.max_candidates]
+        overflow = results[self.max_candidates :]
+        metrics: Dict[str, Any] = {
+            "query_hash": query_hash[:12],
+            "candidates": len(candidates),
+            "overflow": len(overflow),
+            "cache_hits": 0,
+            "model_pairs": 0,
+            "degraded": None,
+        }
 
-            # Get relevance scores from cross-encoder
-            scores = self.model.predict(pairs)
+        try:
+            scores: List[Optional[float]] = [None] * len(candidates)
+            misses = []
+            for i, result in enumerate(candidates):
+                key = (query_hash, self._chunk_key(result))
+                cached = self._cache_get(key)
+                if cached is not None:
+                    scores[i] = cached
+                else:
+                    misses.append((i, key, self._result_text(result)))
+            metrics["cache_hits"] = len(candidates) - len(misses)
+            metrics["model_pairs"] = len(misses)
+
+            if misses:
+                if self._pending_pairs + len(misses) > self.max_pending_pairs:
+                    metrics["degraded"] = "overloaded"
+                    return await self._degrade(query, results, top_k)
+
+                futures = [self._submit(key, query, text) for _, key, text in misses]
+                try:
+                    predicted = await asyncio.wait_for(asyncio.gather(*futures), timeout=self.latency_budget)
+                except asyncio.TimeoutError:
+                    metrics["degraded"] = "latency_budget"
+                    return await self._degrade(query, results, top_k)
+
+                for (i, _, _), score in zip(misses, predicted):
+                    scores[i] = score
 
             # Update results with cross-encoder scores
-            for i, result in enumerate(results):
-                result["cross_encoder_score"] = float(scores[i])
-                result["rerank_score"] = float(scores[i])  # Primary score for sorting
+            for result, score in zip(candidates, scores):
+                result["cross_encoder_score"] = score
+                result["rerank_score"] = score  # Primary score for sorting
 
-            # Sort by cross-encoder score
-            reranked = sorted(results, key=lambda x: x.get("rerank_score", 0), reverse=True)
+            # Sort by cross-encoder score; unscored overflow keeps its order after them
+            reranked = sorted(candidates, key=lambda x: x.get("rerank_score", 0), reverse=True) + overflow
 
             # Limit to top_k if specified
             if top_k:
@@ -196,10 +286,116 @@ class CrossEncoderReranker(Reranker):
 
         except Exception as e:
             logger.error(f"Cross-encoder reranking failed: {e}")
+            metrics["degraded"] = "error"
             # Fallback to original scores
             results.sort(key=lambda x: x.get("score", 0), reverse=True)
             return results[:top_k] if top_k else results
 
+        finally:
+            metrics["rerank_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self.recent_metrics.append(metrics)
+            collected = _collected_metrics.get()
+            if collected is not None:
+                collected.append(metrics)
+            logger.debug(f"Rerank metrics: {metrics}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Summarize recent per-query rerank metrics"""
+        recent = list(self.recent_metrics)
+        timings = sorted(m["rerank_ms"] for m in recent)
+        scored = sum(m["cache_hits"] + m["model_pairs"] for m in recent)
+        return {
+            "queries": len(recent),
+            "degraded": sum(1 for m in recent if m["degraded"]),
+            "cache_hit_rate": (sum(m["cache_hits"] for m in recent) / scored) if scored else 0.0,
+            "p50_rerank_ms": timings[len(timings) // 2] if timings else 0.0,
+            "p95_rerank_ms": timings[int(len(timings) * 0.95)] if timings else 0.0,
+            "pending_pairs": self._pending_pairs,
+            "cache_entries": len(self._cache),
+            "recent": recent[-20:],
+        }
+
+    async def _degrade(
+        self, query: str, results: List[Dict[str, Any]], top_k: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """RRF-only ordering used when the model cannot answer within budget"""
+        if all("rrf_score" in r for r in results):
+            # Already fused upstream (HybridReranker) - keep the fused order
+            ordered = sorted(results, key=lambda x: x["rrf_score"], reverse=True)
+            return ordered[:top_k] if top_k else ordered
+        return await self._rrf.rerank(query, results, top_k=top_k)
+
+    @staticmethod
+    def _chunk_key(result: Dict[str, Any]) -> str:
+        payload = result.get("payload", {})
+        chunk_id = payload.get("original_chunk_id") or payload.get("chunk_id") or result.get("id")
+        if chunk_id:
+            return str(chunk_id)
+        text = payload.get("content") or payload.get("text") or ""
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _result_text(result: Dict[str, Any]) -> str:
+        payload = result.get("payload", {})
+        return payload.get("content") or payload.get("text") or ""
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        score = self._cache.get(key)
+        if score is not None:
+            self._cache.move_to_end(key)
+        return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float) -> None:
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _submit(self, key: Tuple[str, str], query: str, text: str) -> asyncio.Future:
+        """Queue one pair for the shared micro-batcher"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._batch_task is None or self._batch_task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._pending_pairs = 0
+            self._batch_task = loop.create_task(self._batch_loop())
+
+        future = loop.create_future()
+        self._queue.put_nowait((key, query, text, future))
+        self._pending_pairs += 1
+        return future
+
+    async def _batch_loop(self):
+        """Collect pairs from concurrent queries and score them in one model call"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch_pairs and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            pairs = [[query, text] for _, query, text, _ in batch]
+            try:
+                scores = await loop.run_in_executor(self._executor, self.model.predict, pairs)
+                for (key, _, _, future), score in zip(batch, scores):
+                    # Cache even if the caller gave up on its budget - the next query benefits
+                    self._cache_put(key, float(score))
+                    if not future.done():
+                        future.set_result(float(score))
+            except Exception as e:
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self._pending_pairs -= len(batch)
+
+    def close(self):
+        """Stop the batcher and release the inference thread"""
+        if self._batch_task and not self._batch_task.done():
+            self._batch_task.cancel()
+        self._executor.shutdown(wait=False)
+
 
 class HybridReranker(Reranker):
     """
@@ -208,15 +404,19 @@ class HybridReranker(Reranker):
     Can combine RRF for multi-source fusion and cross-encoder for final reranking.
     """
 
-    def __init__(self, use_cross_encoder: bool = False):
+    def __init__(self, use_cross_encoder: bool = False, cross_encoder: Optional[CrossEncoderReranker] = None):
         """
         Initialize hybrid reranker.
 
         Args:
             use_cross_encoder: Whether to use cross-encoder for final reranking
+            cross_encoder: Preconfigured cross-encoder (defaults to CrossEncoderReranker())
         """
         self.rrf = ReciprocalRankFusionReranker()
-        self.cross_encoder = CrossEncoderReranker() if use_cross_encoder else None
+        if use_cross_encoder:
+            self.cross_encoder = cross_encoder or CrossEncoderReranker()
+        else:
+            self.cross_encoder = None
         logger.info(f"Hybrid reranker initialized (cross-encoder: {use_cross_encoder})")
 
     async def rerank(
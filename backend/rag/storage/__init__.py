@@ -10,6 +10,7 @@ from .factory import create_vector_store
 from .text_search_store import TextSearchStore
 from .opensearch_store import OpenSearchTextStore
 from .text_search_factory import create_text_search_store
+from .opensearch_bulk_writer import OpenSearchBulkWriter
 
 __all__ = [
     "VectorStore",
@@ -18,4 +19,5 @@ __all__ = [
     "TextSearchStore",
     "OpenSearchTextStore",
     "create_text_search_store",
+    "OpenSearchBulkWriter",
 ]
@@ -0,0 +1,226 @@
+"""
+OpenSearch Bulk Writer
+
+Long-lived, batching writer for the keyword index. Documents are queued and
+sent with the bulk API once a batch fills or the flush interval passes since
+its first document, with retries and exponential backoff. Writes never force
+an index refresh; documents become searchable on the index's refresh interval.
+
+OpenSearchBulkWriter runs on the caller's event loop. BackgroundBulkWriter
+hosts one on a dedicated thread and loop for synchronous callers such as
+RAGStoreService, replacing a thread and event loop per document.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .text_search_store import TextSearchStore
+from ...services.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class OpenSearchBulkWriter:
+    """Queue-backed bulk indexer with size- and time-based flushing."""
+
+    def __init__(
+        self,
+        store: TextSearchStore,
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff_s: float = 0.5,
+        queue_size: int = 10000,
+        ensure_indexes: bool = True,
+    ):
+        """
+        Args:
+            store: Text search store the batches are written to
+            batch_size: Documents per bulk request
+            flush_interval_s: Max time a queued document waits for its batch to fill
+            max_retries: Retries of a failed bulk request before its documents are dropped
+            retry_backoff_s: Delay before the first retry, doubled on each further retry
+            queue_size: Queued documents before submit() waits (backpressure)
+            ensure_indexes: Create each index on first write to it
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.ensure_indexes = ensure_indexes
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._task: Optional[asyncio.Task] = None
+        self._ensured: Set[str] = set()
+        self.stats = {"indexed": 0, "failed": 0, "batches": 0, "retries": 0}
+
+    @classmethod
+    def from_settings(cls, store: TextSearchStore, settings: Settings, **overrides) -> "OpenSearchBulkWriter":
+        options = {
+            "batch_size": getattr(settings, "opensearch_bulk_batch_size", 500),
+            "flush_interval_s": getattr(settings, "opensearch_bulk_flush_interval_s", 1.0),
+            "max_retries": getattr(settings, "opensearch_bulk_max_retries", 3),
+            "retry_backoff_s": getattr(settings, "opensearch_bulk_retry_backoff_s", 0.5),
+            "queue_size": getattr(settings, "opensearch_bulk_queue_size", 10000),
+        }
+        options.update(overrides)
+        return cls(store, **options)
+
+    def start(self) -> None:
+        """Start the flush loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, index: str, documents: List[Dict[str, Any]]) -> None:
+        """Queue documents for indexing, waiting while the queue is full."""
+        self.start()
+        for document in documents:
+            await self._queue.put((index, document))
+
+    async def flush(self) -> None:
+        """Wait until every queued document has been written or dropped."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush and stop the flush loop."""
+        if self._task is None:
+            return
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _next_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Block for the first document, then gather until full or the interval passes."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_s
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                by_index: Dict[str, List[Dict[str, Any]]] = {}
+                for index, document in batch:
+                    by_index.setdefault(index, []).append(document)
+                for index, documents in by_index.items():
+                    await self._write(index, documents)
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                logger.error(f"OpenSearch bulk writer dropped {len(batch)} documents: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, index: str, documents: List[Dict[str, Any]]) -> bool:
+        if self.ensure_indexes and index not in self._ensured:
+            if await self.store.ensure_index(index):
+                self._ensured.add(index)
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_backoff_s * 2 ** (attempt - 1))
+            try:
+                if await self.store.bulk_index(index=index, documents=documents):
+                    self.stats["indexed"] += len(documents)
+                    self.stats["batches"] += 1
+                    return True
+            except Exception as e:
+                logger.warning(f"Bulk write to {index} failed (attempt {attempt + 1}): {e}")
+
+        self.stats["failed"] += len(documents)
+        logger.error(f"Dropped {len(documents)} documents for {index} after {self.max_retries} retries")
+        return False
+
+
+class BackgroundBulkWriter:
+    """An OpenSearchBulkWriter on its own thread and event loop, for synchronous callers."""
+
+    def __init__(self, settings: Settings, submit_timeout_s: float = 30.0):
+        from .text_search_factory import create_text_search_store
+
+        self.settings = settings
+        self.submit_timeout_s = submit_timeout_s
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="opensearch-bulk-writer", daemon=True)
+        self._thread.start()
+        # The store's async client is created and used only on the writer's loop
+        self.writer = self._call(self._create_writer(create_text_search_store))
+
+    async def _create_writer(self, create_store) -> Optional[OpenSearchBulkWriter]:
+        store = create_store(self.settings)
+        if store is None:
+            return None
+        writer = OpenSearchBulkWriter.from_settings(store, self.settings)
+        writer.start()
+        return writer
+
+    def _call(self, coroutine, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    @property
+    def available(self) -> bool:
+        return self.writer is not None
+
+    def submit(self, index: str, documents: List[Dict[str, Any]]) -> bool:
+        """
+        Queue documents from any thread. Returns once they are queued (not
+        written), blocking only while the writer's queue is full.
+        """
+        if not self.writer or not documents:
+            return False
+        try:
+            self._call(self.writer.submit(index, documents), self.submit_timeout_s)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not queue {len(documents)} documents for OpenSearch: {e}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        if self.writer:
+            self._call(self.writer.flush(), timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self.writer:
+            self._call(self.writer.close(), timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_background_writer: Optional[BackgroundBulkWriter] = None
+_background_writer_lock = threading.Lock()
+
+
+def get_background_bulk_writer(settings: Settings) -> BackgroundBulkWriter:
+    """Process-wide background writer (created on first use)."""
+    global _background_writer
+    with _background_writer_lock:
+        if _background_writer is None:
+            _background_writer = BackgroundBulkWriter(settings)
+        return _background_writer
+
+
+def close_background_bulk_writer(timeout: float = 30.0) -> None:
+    """Flush queued documents and stop the background writer, if one was started."""
+    global _background_writer
+    with _background_writer_lock:
+        writer, _background_writer = _background_writer, None
+    if writer is not None:
+        writer.close(timeout)
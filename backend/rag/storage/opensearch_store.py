@@ -220,21 +220,23 @@ class OpenSearchTextStore(TextSearchStore):
         index: str,
         document_id: str,
         document: Dict[str, Any],
+        refresh: bool = False,
     ) -> bool:
-        """Index a document for full-text search."""
+        """
+        Index a document for full-text search.
+
+        The document becomes searchable on the index's refresh interval; pass
+        refresh=True only where a caller must read its own write immediately.
+        """
         try:
             # AsyncOpenSearch.index() uses body parameter
             await self.client.index(
                 index=index,
                 id=document_id,
                 body=document,
+                refresh="true" if refresh else "false",
             )
             logger.debug(f"Indexed document {document_id} in {index}")
-            # Refresh index to make document immediately searchable
-            try:
-                await self.client.indices.refresh(index=index)
-            except Exception as e:
-                logger.debug(f"Index refresh failed (non-critical): {e}")
             return True
         except Exception as e:
             logger.error(f"Failed to index document {document_id}: {e}")
@@ -325,8 +327,9 @@ class OpenSearchTextStore(TextSearchStore):
         self,
         index: str,
         documents: List[Dict[str, Any]],
+        refresh: bool = False,
     ) -> bool:
-        """Bulk index multiple documents."""
+        """Bulk index multiple documents (no refresh unless requested)."""
         try:
             actions = []
             for doc in documents:
@@ -349,15 +352,41 @@ class OpenSearchTextStore(TextSearchStore):
                 from opensearchpy.helpers import async_bulk
             except ImportError:
                 from elasticsearch.helpers import async_bulk
-            await async_bulk(self.client, actions)
+            await async_bulk(self.client, actions, refresh="true" if refresh else "false")
             logger.info(f"Bulk indexed {len(actions)} documents to {index}")
-            # Refresh index to make documents immediately searchable
-            try:
-                await self.client.indices.refresh(index=index)
-            except Exception as e:
-                logger.debug(f"Index refresh failed (non-critical): {e}")
             return True
 
         except Exception as e:
             logger.error(f"Bulk indexing failed: {e}")
             return False
+
+    async def update_index_settings(self, index: str, settings: Dict[str, Any]) -> None:
+        """Change dynamic index settings (e.g. refresh_interval, number_of_replicas)."""
+        await self.client.indices.put_settings(index=index, body={"index": settings})
+
+    async def refresh(self, index: str) -> None:
+        await self.client.indices.refresh(index=index)
+
+    async def delete_index(self, index: str) -> None:
+        await self.client.indices.delete(index=index)
+
+    async def swap_alias(self, alias: str, index: str) -> List[str]:
+        """
+        Point alias at index in one atomic update_aliases call.
+
+        Removes the alias from the indices it pointed to and returns them. A
+        concrete index named like the alias (from before aliases were used) is
+        deleted in the same call, so searches through the name never fail.
+        """
+        actions: List[Dict[str, Any]] = [{"add": {"index": index, "alias": alias}}]
+        previous: List[str] = []
+
+        if await self.client.indices.exists_alias(name=alias):
+            previous = [name for name in (await self.client.indices.get_alias(name=alias)) if name != index]
+            actions.extend({"remove": {"index": name, "alias": alias}} for name in previous)
+        elif await self.client.indices.exists(index=alias):
+            actions.append({"remove_index": {"index": alias}})
+
+        await self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Alias '{alias}' now points to '{index}' (was {previous or 'a concrete index or nothing'})")
+        return previous
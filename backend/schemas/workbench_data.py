@@ -23,6 +23,7 @@ class WorkbenchType(str, Enum):
     FILES = "files"
     KNOWLEDGE = "knowledge"
     REQUIREMENTS = "requirements"
+    INDIVIDUALS = "individuals"
     GRAPH = "graph"
     RAG = "rag"
     PROCESS = "process"
@@ -87,6 +88,8 @@ class PaginationParams(BaseModel):
     """Pagination parameters"""
     page: int = Field(1, ge=1, description="Page number (1-indexed)")
     page_size: int = Field(20, ge=1, le=100, description="Number of items per page")
+    cursor: Optional[str] = Field(None, description="Opaque next_cursor from a previous page (keyset pagination; takes precedence over page)")
+    exact_count: bool = Field(False, description="Compute an exact total_count instead of a planner estimate")
 
 
 class WorkbenchQueryRequest(BaseModel):
@@ -109,6 +112,8 @@ class PaginatedResponse(BaseModel):
     total_pages: int = Field(..., description="Total number of pages")
     has_next: bool = Field(..., description="Whether there is a next page")
     has_previous: bool = Field(..., description="Whether there is a previous page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    total_is_estimate: bool = Field(False, description="Whether total_count is a planner estimate")
 
 
 class WorkbenchQueryResponse(BaseModel):
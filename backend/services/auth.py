@@ -1,19 +1,238 @@
+"""
+Bearer token authentication.
+
+Tokens are stored hashed in public.auth_tokens, the source of truth. get_user
+runs on every request, so validated tokens are kept in TOKENS_CACHE, a bounded
+in-process cache that stores each token's expiry with its identity and holds
+entries for at most auth_token_cache_ttl_s. Revocations are broadcast to the
+other workers over Redis pub/sub; without Redis they apply locally and the TTL
+bounds how long other workers keep serving a revoked token. last_used_at is
+recorded in memory and written for all recently used tokens in one batched
+UPDATE per flush interval.
+"""
+
 import hashlib
 import logging
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 from fastapi import Header, HTTPException
+from psycopg2.extras import execute_values
 
 from .db import DatabaseService
 from .config import Settings
 
 logger = logging.getLogger(__name__)
 
-# Keep in-memory cache for performance, but use DB as source of truth
-TOKENS_CACHE: Dict[str, Dict] = {}
-# Rate-limiting cache for token last_used updates (5 minute throttle)
-LAST_UPDATE_CACHE: Dict[str, float] = {}  # token_hash -> last_update_timestamp
+SYSTEM_TENANT_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class TokenCache:
+    """Validated tokens by hash: LRU-bounded, with per-entry TTL and token expiry."""
+
+    def __init__(self, max_entries: int = 10000, ttl_s: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # token_hash -> (user, token expiry as epoch seconds or None, cached until)
+        self._entries: "OrderedDict[str, Tuple[Dict, Optional[float], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token_hash: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            user, expires_at, cached_until = entry
+            now = time.time()
+            if (expires_at is not None and expires_at <= now) or cached_until <= time.monotonic():
+                del self._entries[token_hash]
+                return None
+            self._entries.move_to_end(token_hash)
+            return user
+
+    def put(self, token_hash: str, user: Dict, expires_at: Optional[datetime]) -> None:
+        if self.max_entries <= 0:
+            return
+        expiry = expires_at.timestamp() if expires_at is not None else None
+        with self._lock:
+            self._entries[token_hash] = (user, expiry, time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, token_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(token_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, token_hash: str) -> bool:
+        return self.get(token_hash) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenRevocationBus:
+    """
+    Broadcasts token revocations to every worker over Redis pub/sub. Each
+    worker subscribes on first use and drops revoked hashes from its cache;
+    a message of "*" clears the cache. When Redis is unreachable, publish()
+    returns False and subscribing is retried after retry_s.
+    """
+
+    def __init__(self, redis_url: str, channel: str, cache: TokenCache, retry_s: float = 30.0):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.cache = cache
+        self.retry_s = retry_s
+        self._client = None
+        self._thread = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        import redis
+
+        client = redis.Redis.from_url(self.redis_url, socket_connect_timeout=1, socket_timeout=5)
+        client.ping()
+        return client
+
+    def ensure_subscribed(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            if time.monotonic() < self._next_attempt:
+                return False
+            self._next_attempt = time.monotonic() + self.retry_s
+            try:
+                self._client = self._connect()
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True,
+                                                    exception_handler=self._on_error)
+                # Anything revoked while we were not listening
+                self.cache.clear()
+                return True
+            except Exception as e:
+                logger.warning(f"Token revocation broadcast unavailable, revocations apply to this worker only: {e}")
+                self._client = None
+                return False
+
+    def _on_message(self, message) -> None:
+        token_hash = message.get("data")
+        if isinstance(token_hash, bytes):
+            token_hash = token_hash.decode()
+        if token_hash == "*":
+            self.cache.clear()
+        else:
+            self.cache.discard(token_hash)
+
+    def _on_error(self, error, pubsub, thread) -> None:
+        logger.warning(f"Token revocation subscription lost: {error}")
+        thread.stop()
+        self.cache.clear()
+
+    def publish(self, token_hash: str) -> bool:
+        if not self.ensure_subscribed():
+            return False
+        try:
+            self._client.publish(self.channel, token_hash)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to broadcast token revocation: {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.stop()
+
+
+class TokenUsageRecorder:
+    """Collects token uses and writes last_used_at for all of them in one UPDATE per interval."""
+
+    def __init__(self, flush_interval_s: float = 60.0, max_pending: int = 5000):
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self._pending: Dict[str, float] = {}  # token_hash -> last use (epoch seconds)
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+
+    def record(self, token_hash: str) -> None:
+        with self._lock:
+            self._pending[token_hash] = time.time()
+            due = (len(self._pending) >= self.max_pending
+                   or time.monotonic() - self._last_flush >= self.flush_interval_s)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending uses; returns the number of tokens updated."""
+        if not self._flushing.acquire(blocking=False):
+            return 0  # another request is already writing
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+            if not pending:
+                return 0
+            db = _get_db_service()
+            conn = db._conn()
+            try:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        UPDATE public.auth_tokens AS at
+                        SET last_used_at = GREATEST(at.last_used_at, v.used_at)
+                        FROM (VALUES %s) AS v(token_hash, used_at)
+                        WHERE at.token_hash = v.token_hash
+                    """, list(pending.items()), template="(%s, to_timestamp(%s))", page_size=len(pending))
+                    conn.commit()
+                    return cur.rowcount
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"Failed to update last used time for {len(pending)} tokens: {e}")
+                with self._lock:
+                    for token_hash, used_at in pending.items():
+                        self._pending[token_hash] = max(used_at, self._pending.get(token_hash, used_at))
+                return 0
+            finally:
+                db._return(conn)
+        finally:
+            self._flushing.release()
+
+
+# Validated tokens; the database remains the source of truth. Sized and
+# connected from Settings on first use (see _get_settings).
+TOKENS_CACHE = TokenCache()
+REVOCATIONS = TokenRevocationBus("redis://localhost:6379", "odras:auth:revoked", TOKENS_CACHE)
+TOKEN_USAGE = TokenUsageRecorder()
+
+_settings: Optional[Settings] = None
+_db_service: Optional[DatabaseService] = None
+_db_service_lock = threading.Lock()
+
+
+def _get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        settings = Settings()
+        TOKENS_CACHE.max_entries = getattr(settings, "auth_token_cache_entries", 10000)
+        TOKENS_CACHE.ttl_s = getattr(settings, "auth_token_cache_ttl_s", 60.0)
+        REVOCATIONS.redis_url = getattr(settings, "redis_url", REVOCATIONS.redis_url)
+        REVOCATIONS.channel = getattr(settings, "auth_revocation_channel", REVOCATIONS.channel)
+        TOKEN_USAGE.flush_interval_s = getattr(settings, "auth_last_used_flush_interval_s", 60.0)
+        _settings = settings
+    return _settings
 
 
 def _hash_token(token: str) -> str:
@@ -22,34 +241,22 @@ def _hash_token(token: str) -> str:
 
 
 def _get_db_service() -> DatabaseService:
-    """Get database service instance."""
-    settings = Settings()
-    return DatabaseService(settings)
-
-
-def _update_token_last_used(token_hash: str):
-    """Update the last used timestamp for a token (rate-limited to once per 5 minutes)."""
-    # Check if we updated recently
-    last_update = LAST_UPDATE_CACHE.get(token_hash)
-    if last_update and (time.time() - last_update < 300):  # 5 minutes
-        return  # Skip update
-    
-    try:
-        db = _get_db_service()
-        conn = db._conn()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE public.auth_tokens SET last_used_at = NOW() WHERE token_hash = %s",
-                    (token_hash,),
-                )
-                conn.commit()
-                # Update cache with current time
-                LAST_UPDATE_CACHE[token_hash] = time.time()
-        finally:
-            db._return(conn)
-    except Exception as e:
-        logger.warning(f"Failed to update token last used time: {e}")
+    """Shared database service (one connection pool for authentication)."""
+    global _db_service
+    if _db_service is None:
+        with _db_service_lock:
+            if _db_service is None:
+                _db_service = DatabaseService(_get_settings())
+    return _db_service
+
+
+def _revocations_enabled() -> bool:
+    return getattr(_get_settings(), "auth_revocation_pubsub", True)
+
+
+def flush_token_usage() -> int:
+    """Write recorded token uses now (call on shutdown)."""
+    return TOKEN_USAGE.flush()
 
 
 def create_token(user_id: str, username: str, is_admin: bool, token: str) -> None:
@@ -83,9 +290,9 @@ def create_token(user_id: str, username: str, is_admin: bool, token: str) -> Non
             )
             conn.commit()
 
-            # Cache the user info
-            user = {"user_id": user_id, "username": username, "is_admin": is_admin}
-            TOKENS_CACHE[token_hash] = user
+            # Reissuing a token replaces whatever was cached for it; the
+            # first request loads the identity with its tenant
+            TOKENS_CACHE.discard(token_hash)
 
     finally:
         db._return(conn)
@@ -104,12 +311,21 @@ def invalidate_token(token: str) -> None:
             )
             conn.commit()
 
-            # Remove from cache
-            TOKENS_CACHE.pop(token_hash, None)
-
     finally:
         db._return(conn)
 
+    # Remove from this worker's cache and tell the others
+    TOKENS_CACHE.discard(token_hash)
+    if _revocations_enabled():
+        REVOCATIONS.publish(token_hash)
+
+
+def forget_all_tokens() -> None:
+    """Drop every cached token here and in the other workers (after tokens were deleted in bulk)."""
+    TOKENS_CACHE.clear()
+    if _revocations_enabled():
+        REVOCATIONS.publish("*")
+
 
 def cleanup_expired_tokens() -> None:
     """Clean up expired and inactive tokens."""
@@ -125,8 +341,8 @@ def cleanup_expired_tokens() -> None:
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} expired/inactive tokens")
 
-            # Clear cache of any tokens that might have been deleted
-            TOKENS_CACHE.clear()
+            # Cached entries check their own expiry and revocations are
+            # broadcast, so the cache does not need clearing here
 
     finally:
         db._return(conn)
@@ -139,26 +355,25 @@ def get_user(authorization: Optional[str] = Header(None)):
     token = authorization.split(" ", 1)[1]
     token_hash = _hash_token(token)
 
+    if _revocations_enabled():
+        REVOCATIONS.ensure_subscribed()
+
     # Check cache first for performance
-    if token_hash in TOKENS_CACHE:
-        user = TOKENS_CACHE[token_hash]
-        # If cached user doesn't have tenant_id, fetch from DB (cache migration)
-        if "tenant_id" not in user:
-            # Clear cache entry to force DB fetch
-            TOKENS_CACHE.pop(token_hash, None)
-        else:
-            # Update last used time in background
-            _update_token_last_used(token_hash)
-            return user
+    user = TOKENS_CACHE.get(token_hash)
+    if user is not None:
+        TOKEN_USAGE.record(token_hash)
+        return user
 
-            # Check database
+    # Validate against the database in one statement; expiry is compared
+    # with the database clock
     db = _get_db_service()
     conn = db._conn()
     try:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT at.user_id, at.username, at.is_admin, at.expires_at, at.is_active, u.tenant_id
+                SELECT at.user_id, at.username, at.is_admin, at.expires_at, u.tenant_id,
+                       at.expires_at IS NOT NULL AND at.expires_at < NOW() AS expired
                 FROM public.auth_tokens at
                 JOIN public.users u ON at.user_id = u.user_id
                 WHERE at.token_hash = %s AND at.is_active = TRUE
@@ -170,43 +385,16 @@ def get_user(authorization: Optional[str] = Header(None)):
             if not row:
                 raise HTTPException(status_code=401, detail="Invalid token")
 
-            user_id, username, is_admin, expires_at, is_active, tenant_id = row
-
-            # Check if token is expired
-            if expires_at:
-                cur.execute("SELECT NOW()")
-                current_time = cur.fetchone()[0]
-                if expires_at < current_time:
-                    # Clean up expired token
-                    cur.execute(
-                        "UPDATE public.auth_tokens SET is_active = FALSE WHERE token_hash = %s",
-                        (token_hash,),
-                    )
-                    conn.commit()
-                    raise HTTPException(status_code=401, detail="Token expired")
+            user_id, username, is_admin, expires_at, tenant_id, expired = row
 
-            # Update last used time
-            cur.execute(
-                "UPDATE public.auth_tokens SET last_used_at = NOW() WHERE token_hash = %s",
-                (token_hash,),
-            )
-            conn.commit()
-
-            # Use system tenant as default if tenant_id is None
-            if tenant_id is None:
-                tenant_id = "00000000-0000-0000-0000-000000000000"
-
-            user = {
-                "user_id": str(user_id),
-                "username": username,
-                "is_admin": bool(is_admin),
-                "tenant_id": str(tenant_id),
-            }
-
-            # Cache the result
-            TOKENS_CACHE[token_hash] = user
-
-            return user
+            if expired:
+                # Clean up expired token
+                cur.execute(
+                    "UPDATE public.auth_tokens SET is_active = FALSE WHERE token_hash = %s",
+                    (token_hash,),
+                )
+                conn.commit()
+                raise HTTPException(status_code=401, detail="Token expired")
 
     except HTTPException:
         raise
@@ -216,6 +404,17 @@ def get_user(authorization: Optional[str] = Header(None)):
     finally:
         db._return(conn)
 
+    user = {
+        "user_id": str(user_id),
+        "username": username,
+        "is_admin": bool(is_admin),
+        # Use system tenant as default if tenant_id is None
+        "tenant_id": str(tenant_id) if tenant_id is not None else SYSTEM_TENANT_ID,
+    }
+    TOKENS_CACHE.put(token_hash, user, expires_at)
+    TOKEN_USAGE.record(token_hash)
+    return user
+
 
 def get_admin_user(authorization: Optional[str] = Header(None)):
     """Get user and verify admin permissions."""
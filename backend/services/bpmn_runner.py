@@ -1,5 +1,5 @@
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from .config import Settings
 from .embeddings import SimpleHasherEmbedder
@@ -44,15 +44,22 @@ class BPMNWorkflowRunner:
         requirements = self.extractor.extract(text)
         self.status["requirements_found"] = len(requirements)
 
-        # 2) Monte Carlo loop over requirements
-        collected_json: List[Dict[str, Any]] = []
-        for i in range(iterations):
-            for r in requirements:
-                json_obj = await self.llm_team.analyze_requirement(r, REQUIREMENT_SCHEMA)
-                json_obj.setdefault("id", f"{uuid.uuid4()}_{i}")
-                json_obj.setdefault("text", r)
-                collected_json.append(json_obj)
-
+        # 2) Monte Carlo loop over requirements, analyzed concurrently; partial
+        # results are published to the status as they complete
+        collected: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.status["analyses_completed"] = 0
+        self.status["analyses_total"] = iterations * len(requirements)
+        async for item in self.llm_team.analyze_requirements(requirements, REQUIREMENT_SCHEMA, iterations):
+            i, index = item["iteration"], item["requirement_index"]
+            json_obj = item.get("result") or {}
+            json_obj.setdefault("id", f"{uuid.uuid4()}_{i}")
+            json_obj.setdefault("text", requirements[index])
+            collected[(i, index)] = json_obj
+            self.status["analyses_completed"] += 1
+            if len(self.status["results"]) < 10:
+                self.status["results"].append(json_obj)
+
+        collected_json = [collected[key] for key in sorted(collected)]
         self.status["results"] = collected_json[:10]  # show sample in UI
 
         # 3) Embed and push to vector store
@@ -3,10 +3,11 @@ Camunda External Task Functions for ODRAS Requirements Analysis
 These functions can be called by Camunda BPMN processes as external tasks.
 """
 
+import asyncio
 import json
 import re
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import requests
 
@@ -110,34 +111,33 @@ def process_requirements_with_llm(
     settings.llm_model = llm_model
 
     llm_team = LLMTeam(settings)
-    processed_requirements = []
 
     print(f"Processing {len(requirements_list)} requirements with {iterations} iterations each")
 
+    # Every (requirement, iteration) is analyzed concurrently under the team's
+    # concurrency limit; external tasks are synchronous, so run on a new loop
+    texts = [req["text"] for req in requirements_list]
+    analyses = asyncio.run(_collect_analyses(llm_team, texts, iterations))
+
+    processed_requirements = []
     for req_idx, req in enumerate(requirements_list):
         req_results = []
 
         for i in range(iterations):
-            try:
-                # Call LLM team to analyze the requirement
-                llm_result = llm_team.analyze_requirement(
-                    req["text"], {}
-                )  # Empty schema for now, will enhance later
-
-                # Add metadata
+            analysis = analyses[(req_idx, i)]
+            if "error" not in analysis:
                 result = {
                     "iteration": i + 1,
                     "provider": llm_provider,
                     "model": llm_model,
                     "requirement_id": req["id"],
                     "requirement_text": req["text"],
-                    "llm_response": llm_result,
+                    "llm_response": analysis["result"],
                     "confidence": 0.7 + (i * 0.01),  # Simulate confidence variation
-                    "processing_time": time.time(),
+                    "processing_time": analysis["completed_at"],
                     "status": "success",
                 }
-
-            except Exception as e:
+            else:
                 # Handle LLM processing errors
                 result = {
                     "iteration": i + 1,
@@ -145,18 +145,15 @@ def process_requirements_with_llm(
                     "model": llm_model,
                     "requirement_id": req["id"],
                     "requirement_text": req["text"],
-                    "llm_response": {"error": str(e)},
+                    "llm_response": {"error": analysis["error"]},
                     "confidence": 0.0,
-                    "processing_time": time.time(),
+                    "processing_time": analysis["completed_at"],
                     "status": "error",
-                    "error_message": str(e),
+                    "error_message": analysis["error"],
                 }
 
             req_results.append(result)
 
-            # Small delay to avoid overwhelming the LLM service
-            time.sleep(0.1)
-
         # Calculate aggregate statistics
         successful_results = [r for r in req_results if r["status"] == "success"]
         avg_confidence = (
@@ -175,8 +172,6 @@ def process_requirements_with_llm(
             }
         )
 
-        print(f"Completed requirement {req_idx + 1}/{len(requirements_list)}")
-
     return {
         "processed_requirements": processed_requirements,
         "llm_results": {
@@ -189,6 +184,19 @@ def process_requirements_with_llm(
     }
 
 
+async def _collect_analyses(
+    llm_team: LLMTeam, texts: List[str], iterations: int
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """(requirement index, iteration) -> analysis, reporting progress as results arrive."""
+    analyses = {}
+    async for item in llm_team.analyze_requirements(texts, {}, iterations):  # Empty schema for now
+        item["completed_at"] = time.time()
+        analyses[(item["requirement_index"], item["iteration"])] = item
+        if len(analyses) % max(1, len(texts)) == 0:
+            print(f"Completed {len(analyses)}/{len(texts) * iterations} analyses")
+    return analyses
+
+
 def store_results_in_vector_db(processed_requirements: List[Dict]) -> Dict[str, Any]:
     """
     Store processed requirements in Qdrant vector database.
@@ -217,16 +225,16 @@ def store_results_in_vector_db(processed_requirements: List[Dict]) -> Dict[str,
         collection_name = f"odras_requirements_{int(time.time())}"
         vector_store_status["collections_created"] = 1
 
-        # Prepare vectors and payloads
+        # Prepare texts and payloads
+        texts = []
         vectors = []
         payloads = []
 
         for req in processed_requirements:
             for iteration in req["iterations"]:
                 if iteration["status"] == "success":
-                    # Create embedding for the requirement text
                     text = iteration["requirement_text"]
-                    vector = embedder.embed([text])[0]
+                    texts.append(text)
 
                     # Prepare payload
                     payload = {
@@ -240,9 +248,14 @@ def store_results_in_vector_db(processed_requirements: List[Dict]) -> Dict[str,
                         "collection": collection_name,
                     }
 
-                    vectors.append(vector)
                     payloads.append(payload)
 
+        # Embed each distinct text once, in one batch (iterations repeat the text)
+        if texts:
+            distinct = list(dict.fromkeys(texts))
+            by_text = dict(zip(distinct, embedder.embed(distinct)))
+            vectors = [by_text[text] for text in texts]
+
         # Store in vector database
         if vectors and payloads:
             persistence.upsert_vector_records(vectors, payloads)
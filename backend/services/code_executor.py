@@ -4,6 +4,13 @@ Sandboxed Code Executor
 Implements CodeExecutorInterface to execute Python code safely in an isolated environment.
 Provides security restrictions, resource limits, and output capture.
 
+Code runs in a pool of pre-started worker processes rather than in a thread:
+each execution gets RLIMIT_AS/RLIMIT_CPU limits, and a worker that times out,
+is cancelled or dies is killed and replaced, so runaway code cannot pin threads
+of the shared default executor. Starting, killing and joining worker processes
+happens off the event loop, and shutdown_code_executors() stops every pool at
+application shutdown.
+
 FUTURE CONSIDERATION:
 For enhanced security and isolation, consider moving code execution to a dedicated Docker container.
 See: docs/architecture/CODE_EXECUTOR_CONTAINERIZATION.md for architectural considerations.
@@ -13,13 +20,26 @@ import ast
 import asyncio
 import io
 import logging
+import multiprocessing
+import os
+import pickle
 import re
+import signal
 import sys
 import time
 import traceback
 import uuid
+import weakref
+from collections import OrderedDict
 from contextlib import redirect_stderr, redirect_stdout
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import resource
+    RESOURCE_LIMITS_AVAILABLE = True
+except ImportError:  # not available on Windows
+    resource = None
+    RESOURCE_LIMITS_AVAILABLE = False
 
 from .code_executor_interface import (
     CodeExecutorInterface,
@@ -31,6 +51,9 @@ from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Started executors, stopped by shutdown_code_executors() at shutdown
+_executors: "weakref.WeakSet[SandboxedCodeExecutor]" = weakref.WeakSet()
+
 
 class RestrictedImportHook:
     """Import hook to restrict dangerous imports."""
@@ -81,6 +104,233 @@ class RestrictedImportHook:
         return self.original_import(name, globals, locals, fromlist, level)
 
 
+def _safe_builtins() -> Dict[str, Any]:
+    """Builtins exposed to sandboxed code."""
+    return {
+        # Safe builtin functions
+        "abs": abs, "all": all, "any": any, "bool": bool,
+        "dict": dict, "enumerate": enumerate, "float": float,
+        "int": int, "len": len, "list": list, "max": max,
+        "min": min, "range": range, "reversed": reversed,
+        "round": round, "set": set, "sorted": sorted,
+        "str": str, "sum": sum, "tuple": tuple, "type": type,
+        "zip": zip,
+        # Safe type checking functions
+        "print": print, "isinstance": isinstance,
+        "hasattr": hasattr, "getattr": getattr,
+        "setattr": setattr, "delattr": delattr,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _apply_limits(memory_limit_mb: Optional[int], cpu_seconds: int, baseline_bytes: int) -> None:
+    """
+    Lower the soft RLIMIT_AS/RLIMIT_CPU for one execution.
+
+    The memory limit is headroom on top of the idle worker's own address space;
+    CPU time is cumulative per process, so the limit is relative to what the
+    worker has already used. Hard limits are left alone so the soft limits can
+    be raised again once the execution finishes.
+    """
+    if not RESOURCE_LIMITS_AVAILABLE:
+        return
+    if memory_limit_mb:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = baseline_bytes + memory_limit_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(usage.ru_utime + usage.ru_stime) + cpu_seconds + 1
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _reset_limits() -> None:
+    if not RESOURCE_LIMITS_AVAILABLE:
+        return
+    for limit in (resource.RLIMIT_AS, resource.RLIMIT_CPU):
+        _, hard = resource.getrlimit(limit)
+        resource.setrlimit(limit, (hard, hard))
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute one job in a fresh namespace and capture its output."""
+    namespace = {"__builtins__": _safe_builtins()}
+    if job.get("context"):
+        namespace.update(job["context"])
+
+    stdout_capture = io.StringIO()
+    stderr_capture = io.StringIO()
+    try:
+        with RestrictedImportHook(job["allowed_imports"], job["blocked_imports"], namespace):
+            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                exec(job["code"], namespace)
+    except MemoryError:
+        raise
+    except Exception as e:
+        return {
+            "ok": False,
+            "output": stdout_capture.getvalue(),
+            "error": f"Execution failed: {str(e)}\n{traceback.format_exc()}",
+        }
+
+    error_output = stderr_capture.getvalue()
+    return {
+        "ok": True,
+        "output": stdout_capture.getvalue(),
+        "error": error_output if error_output else None,
+        "return_value": namespace.get("result"),
+    }
+
+
+def _picklable(value: Any) -> Any:
+    """Return values cross a process boundary; fall back to repr() for the rest."""
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        return repr(value)
+
+
+def _sandbox_worker_main(conn, preload: List[str]) -> None:
+    """
+    Worker process loop: receive a job, run it under limits, send the reply.
+
+    Jobs are dicts built by SandboxedCodeExecutor.execute; ``None`` asks the
+    worker to exit.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent owns shutdown
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    baseline = _address_space_bytes()
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        memory_exceeded = False
+        try:
+            _apply_limits(job.get("memory_limit_mb"), job["cpu_seconds"], baseline)
+            reply = _run_job(job)
+        except MemoryError:
+            memory_exceeded = True
+        finally:
+            _reset_limits()
+
+        if memory_exceeded:
+            reply = {
+                "ok": False,
+                "output": "",
+                "error": f"Execution exceeded memory limit of {job.get('memory_limit_mb')} MB",
+            }
+        elif reply["ok"]:
+            reply["return_value"] = _picklable(reply["return_value"])
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send({"ok": False, "output": "", "error": f"Could not return execution result: {e}"})
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+class SandboxWorkerDied(Exception):
+    """The worker process exited while running a job."""
+
+    def __init__(self, exitcode: Optional[int]):
+        super().__init__(f"Sandbox worker exited unexpectedly (exit code {exitcode})")
+        self.exitcode = exitcode
+
+    @property
+    def cpu_limit_exceeded(self) -> bool:
+        return self.exitcode == -signal.SIGXCPU
+
+
+class _SandboxWorker:
+    """Handle on one pre-started worker process and its pipe."""
+
+    def __init__(self, mp_context, preload: List[str]):
+        self.conn, child_conn = mp_context.Pipe()
+        self.process = mp_context.Process(
+            target=_sandbox_worker_main,
+            args=(child_conn, preload),
+            name="odras-sandbox",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.executions = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    async def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a job and wait for the reply without occupying a thread."""
+        loop = asyncio.get_running_loop()
+        reply = loop.create_future()
+        fd = self.conn.fileno()
+
+        def on_readable():
+            loop.remove_reader(fd)
+            if reply.done():
+                return
+            try:
+                reply.set_result(self.conn.recv())
+            except (EOFError, OSError):
+                reply.set_result(None)
+
+        self.conn.send(job)
+        loop.add_reader(fd, on_readable)
+        try:
+            result = await reply
+        finally:
+            loop.remove_reader(fd)
+        if result is None:
+            # The worker exited; wait for its exit code without blocking the loop
+            await asyncio.to_thread(self.process.join, 1)
+            raise SandboxWorkerDied(self.process.exitcode)
+        return result
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
 class SandboxedCodeExecutor(CodeExecutorInterface):
     """
     Sandboxed code executor with security restrictions.
@@ -90,12 +340,34 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
     - Timeout controls
     - Output capture
     - Error handling
+
+    Executions are dispatched to a pool of pre-started worker processes
+    (started on first use). Workers are reused between executions to avoid
+    interpreter start-up cost and are replaced after
+    ``code_executor_max_executions_per_worker`` runs, or immediately when an
+    execution times out, is cancelled or kills its worker.
     """
     
     def __init__(self, settings: Settings):
         """Initialize sandboxed code executor."""
         self.settings = settings
-        self._executions: Dict[str, ExecutionResult] = {}
+        self._executions: "OrderedDict[str, ExecutionResult]" = OrderedDict()
+        self._max_retained_results = max(1, int(getattr(settings, 'code_executor_max_retained_results', 1000)))
+        self._pool_size = max(1, int(getattr(settings, 'code_executor_pool_size', 2)))
+        self._max_executions_per_worker = int(getattr(settings, 'code_executor_max_executions_per_worker', 100))
+        self._default_memory_limit_mb = getattr(settings, 'code_executor_memory_limit_mb', 512)
+
+        start_method = getattr(settings, 'code_executor_start_method', 'forkserver')
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        self._mp_context = multiprocessing.get_context(start_method)
+
+        # Idle workers; after shutdown it holds a None sentinel that wakes every waiter
+        self._idle_workers: Optional[asyncio.Queue] = None
+        self._closed = False
+        self._workers: Set[_SandboxWorker] = set()
+        self._running: Dict[str, _SandboxWorker] = {}
+        self._cancelled: Set[str] = set()
         
         # Default allowed imports (safe standard library)
         self._default_allowed_imports = [
@@ -111,6 +383,78 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
             "multiprocessing", "threading", "ctypes", "pickle",
             "marshal", "importlib", "__builtin__", "builtins",
         ]
+
+    async def start(self) -> None:
+        """Start the worker pool (called automatically by execute)."""
+        if self._idle_workers is not None or self._closed:
+            return
+        self._idle_workers = asyncio.Queue()
+        _executors.add(self)
+        workers = await asyncio.gather(*(self._spawn_worker() for _ in range(self._pool_size)))
+        for worker in workers:
+            await self._return_worker(worker)
+        logger.info(f"Started {self._pool_size} sandbox worker processes ({self._mp_context.get_start_method()})")
+
+    async def shutdown(self) -> None:
+        """
+        Stop all worker processes and close the pool.
+
+        Executions waiting for a worker, and any started afterwards, fail;
+        running executions lose their worker and fail too.
+        """
+        self._closed = True
+        _executors.discard(self)
+        workers = list(self._workers)
+        self._workers.clear()
+        if self._idle_workers is not None:
+            while not self._idle_workers.empty():
+                self._idle_workers.get_nowait()
+            self._idle_workers.put_nowait(None)
+        await asyncio.gather(*(asyncio.to_thread(worker.stop) for worker in workers))
+
+    async def _spawn_worker(self) -> _SandboxWorker:
+        worker = await asyncio.to_thread(_SandboxWorker, self._mp_context, self._default_allowed_imports)
+        self._workers.add(worker)
+        return worker
+
+    async def _acquire_worker(self) -> Optional[_SandboxWorker]:
+        """Wait for an idle worker; None once the pool is shut down."""
+        if self._closed:
+            return None
+        worker = await self._idle_workers.get()
+        if worker is None:
+            self._idle_workers.put_nowait(None)  # pass the wake-up on to the next waiter
+        return worker
+
+    async def _return_worker(self, worker: _SandboxWorker) -> None:
+        """Put a worker back in the pool, or stop it if the pool is shut down."""
+        if self._closed:
+            self._workers.discard(worker)
+            await asyncio.to_thread(worker.stop)
+        else:
+            self._idle_workers.put_nowait(worker)
+
+    async def _replace_worker(self, worker: _SandboxWorker) -> None:
+        """Kill a worker and put a fresh one in the pool."""
+        self._workers.discard(worker)
+        await asyncio.to_thread(worker.kill)
+        if not self._closed:
+            await self._return_worker(await self._spawn_worker())
+
+    async def _release_worker(self, worker: _SandboxWorker) -> None:
+        worker.executions += 1
+        if self._max_executions_per_worker and worker.executions >= self._max_executions_per_worker:
+            await self._replace_worker(worker)
+        else:
+            await self._return_worker(worker)
+
+    def _record(self, execution_id: str, result: ExecutionResult) -> ExecutionResult:
+        """Keep the most recent results for get_execution_status."""
+        self._executions[execution_id] = result
+        self._executions.move_to_end(execution_id)
+        while len(self._executions) > self._max_retained_results:
+            self._executions.popitem(last=False)
+        return result
     
     async def execute(
         self,
@@ -125,10 +469,12 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
         
         Args:
             code: Python code string to execute
-            timeout_seconds: Maximum execution time (default: 30)
-            memory_limit_mb: Memory limit (not enforced in current implementation)
+            timeout_seconds: Maximum wall-clock (and CPU) time (default: 30)
+            memory_limit_mb: Address space allowed on top of the idle worker
+                (default: code_executor_memory_limit_mb; enforced where
+                RLIMIT_AS is available)
             allowed_imports: List of allowed imports (None = use defaults)
-            context: Optional context variables to inject
+            context: Optional context variables to inject (must be picklable)
             
         Returns:
             ExecutionResult with execution status and output
@@ -139,113 +485,106 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
         # Default timeout
         if timeout_seconds is None:
             timeout_seconds = 30
+        if memory_limit_mb is None:
+            memory_limit_mb = self._default_memory_limit_mb
         
         # Use default allowed imports if not specified
         if allowed_imports is None:
             allowed_imports = self._default_allowed_imports
         
-        # Create restricted namespace with safe builtins
-        safe_builtins = {
-            # Safe builtin functions
-            "abs": abs, "all": all, "any": any, "bool": bool,
-            "dict": dict, "enumerate": enumerate, "float": float,
-            "int": int, "len": len, "list": list, "max": max,
-            "min": min, "range": range, "reversed": reversed,
-            "round": round, "set": set, "sorted": sorted,
-            "str": str, "sum": sum, "tuple": tuple, "type": type,
-            "zip": zip,
-            # Safe type checking functions
-            "print": print, "isinstance": isinstance,
-            "hasattr": hasattr, "getattr": getattr,
-            "setattr": setattr, "delattr": delattr,
-        }
-        
-        namespace = {
-            "__builtins__": safe_builtins,
+        # Validate safety first
+        safety_check = await self.validate_safety(code, strict=True)
+        if not safety_check["safe"]:
+            return ExecutionResult(
+                status=ExecutionStatus.FAILED,
+                error=f"Code failed safety check: {', '.join(safety_check['blocked_operations'])}",
+                execution_time_seconds=time.time() - start_time,
+                metadata={"safety_check": safety_check},
+            )
+
+        job = {
+            "code": code,
+            "allowed_imports": list(allowed_imports),
+            "blocked_imports": self._default_blocked_imports,
+            "context": context or {},
+            "memory_limit_mb": memory_limit_mb,
+            "cpu_seconds": int(timeout_seconds),
         }
-        
-        # Inject context variables
-        if context:
-            namespace.update(context)
-        
-        # Capture stdout/stderr
-        stdout_capture = io.StringIO()
-        stderr_capture = io.StringIO()
-        
+        metadata = {"execution_id": execution_id, "code_length": len(code)}
+
+        await self.start()
+        self._record(execution_id, ExecutionResult(status=ExecutionStatus.RUNNING, metadata=metadata))
+        worker = await self._acquire_worker()
+        if worker is None:
+            return self._record(execution_id, ExecutionResult(
+                status=ExecutionStatus.FAILED,
+                error="Code executor has been shut down",
+                execution_time_seconds=time.time() - start_time,
+                metadata={"execution_id": execution_id},
+            ))
+        self._running[execution_id] = worker
         try:
-            # Validate safety first
-            safety_check = await self.validate_safety(code, strict=True)
-            if not safety_check["safe"]:
-                return ExecutionResult(
-                    status=ExecutionStatus.FAILED,
-                    error=f"Code failed safety check: {', '.join(safety_check['blocked_operations'])}",
-                    execution_time_seconds=time.time() - start_time,
-                    metadata={"safety_check": safety_check},
-                )
-            
-            # Execute with timeout
-            try:
-                # Execute code with timeout (import hook applied during execution)
-                with RestrictedImportHook(allowed_imports, self._default_blocked_imports, namespace):
-                    with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                        await asyncio.wait_for(
-                            self._execute_code(code, namespace),
-                            timeout=timeout_seconds
-                        )
-                
-                execution_time = time.time() - start_time
-                output = stdout_capture.getvalue()
-                error_output = stderr_capture.getvalue()
-                
-                # Get return value if code defines 'result'
-                return_value = namespace.get("result")
-                
-                result = ExecutionResult(
-                    status=ExecutionStatus.COMPLETED,
-                    output=output,
-                    error=error_output if error_output else None,
-                    return_value=return_value,
-                    execution_time_seconds=execution_time,
-                    metadata={
-                        "execution_id": execution_id,
-                        "code_length": len(code),
-                    },
-                )
-                
-                self._executions[execution_id] = result
-                return result
-                
-            except asyncio.TimeoutError:
-                execution_time = time.time() - start_time
-                result = ExecutionResult(
-                    status=ExecutionStatus.TIMEOUT,
-                    error=f"Execution timed out after {timeout_seconds} seconds",
-                    execution_time_seconds=execution_time,
-                    metadata={"execution_id": execution_id},
-                )
-                self._executions[execution_id] = result
-                return result
-                
+            reply = await asyncio.wait_for(worker.run(job), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            await self._replace_worker(worker)
+            return self._record(execution_id, ExecutionResult(
+                status=ExecutionStatus.TIMEOUT,
+                error=f"Execution timed out after {timeout_seconds} seconds",
+                execution_time_seconds=time.time() - start_time,
+                metadata={"execution_id": execution_id},
+            ))
+        except SandboxWorkerDied as e:
+            await self._replace_worker(worker)
+            if execution_id in self._cancelled:
+                status, error = ExecutionStatus.CANCELLED, "Execution was cancelled"
+            elif e.cpu_limit_exceeded:
+                status, error = ExecutionStatus.TIMEOUT, f"Execution exceeded CPU time limit of {timeout_seconds} seconds"
+            else:
+                status, error = ExecutionStatus.FAILED, str(e)
+            return self._record(execution_id, ExecutionResult(
+                status=status,
+                error=error,
+                execution_time_seconds=time.time() - start_time,
+                metadata={"execution_id": execution_id},
+            ))
+        except asyncio.CancelledError:
+            await asyncio.shield(self._replace_worker(worker))
+            raise
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Execution failed: {str(e)}\n{traceback.format_exc()}"
-            
-            result = ExecutionResult(
+            # e.g. unpicklable context: nothing reached the worker, so it is still usable
+            if worker.process.is_alive():
+                await self._return_worker(worker)
+            else:
+                await self._replace_worker(worker)
+            return self._record(execution_id, ExecutionResult(
+                status=ExecutionStatus.FAILED,
+                error=f"Execution failed: {str(e)}\n{traceback.format_exc()}",
+                execution_time_seconds=time.time() - start_time,
+                metadata={"execution_id": execution_id},
+            ))
+        finally:
+            self._running.pop(execution_id, None)
+            self._cancelled.discard(execution_id)
+
+        await self._release_worker(worker)
+        execution_time = time.time() - start_time
+        if not reply["ok"]:
+            return self._record(execution_id, ExecutionResult(
                 status=ExecutionStatus.FAILED,
-                error=error_msg,
+                output=reply.get("output") or None,
+                error=reply["error"],
                 execution_time_seconds=execution_time,
                 metadata={"execution_id": execution_id},
-            )
-            self._executions[execution_id] = result
-            return result
-    
-    async def _execute_code(self, code: str, namespace: Dict[str, Any]) -> None:
-        """Execute code in namespace (async wrapper for sync exec)."""
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        def _exec():
-            exec(code, namespace)
-        await loop.run_in_executor(None, _exec)
+            ))
+
+        return self._record(execution_id, ExecutionResult(
+            status=ExecutionStatus.COMPLETED,
+            output=reply["output"],
+            error=reply["error"],
+            return_value=reply["return_value"],
+            execution_time_seconds=execution_time,
+            metadata=metadata,
+        ))
     
     async def validate_safety(
         self,
@@ -350,8 +689,8 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
         """
         Cancel a running execution.
         
-        Note: Current implementation doesn't support cancellation of running executions.
-        This would require more complex async task management.
+        Kills the worker process running the execution; the pending
+        ``execute`` call returns a CANCELLED result and the worker is replaced.
         
         Args:
             execution_id: Execution identifier
@@ -359,12 +698,12 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
         Returns:
             True if execution was cancelled, False otherwise
         """
-        # Check if execution exists and is running
-        result = self._executions.get(execution_id)
-        if result and result.status == ExecutionStatus.RUNNING:
-            result.status = ExecutionStatus.CANCELLED
-            return True
-        return False
+        worker = self._running.get(execution_id)
+        if worker is None:
+            return False
+        self._cancelled.add(execution_id)
+        worker.process.kill()
+        return True
     
     def get_default_allowed_imports(self) -> List[str]:
         """Get default allowed imports."""
@@ -373,3 +712,8 @@ class SandboxedCodeExecutor(CodeExecutorInterface):
     def get_default_blocked_imports(self) -> List[str]:
         """Get default blocked imports."""
         return self._default_blocked_imports.copy()
+
+
+async def shutdown_code_executors() -> None:
+    """Stop the worker processes of every started executor (called at app shutdown)."""
+    await asyncio.gather(*(executor.shutdown() for executor in list(_executors)))
@@ -47,6 +47,12 @@ class Settings(BaseSettings):
     # Hybrid Search Configuration
     rag_hybrid_search: str = "false"  # Enable hybrid search (vector + keyword)
     rag_reranker: str = "rrf"  # Reranker type: rrf, cross_encoder, hybrid, none
+    rag_rerank_max_candidates: int = 50  # Results beyond this are not cross-encoder scored
+    rag_rerank_latency_budget_ms: float = 250.0  # Degrade to RRF ordering past this budget
+    rag_rerank_cache_size: int = 10000  # (query hash, chunk id) -> score LRU entries
+    rag_rerank_batch_window_ms: float = 5.0  # Micro-batching window across concurrent queries
+    rag_rerank_max_batch_pairs: int = 256  # Max (query, chunk) pairs scored in one model call
+    rag_rerank_max_pending_pairs: int = 2048  # Queue depth that triggers RRF-only degradation
     vector_store_backend: str = "qdrant"  # Vector store: qdrant (opensearch for vectors not supported)
 
     # OpenSearch/Elasticsearch Configuration (for keyword search)
@@ -139,6 +145,113 @@ class Settings(BaseSettings):
     namespace_mission_template: str = "{base_uri}/mission/{mission_type}#{entity}"
     namespace_platform_template: str = "{base_uri}/platform/{platform_type}#{entity}"
 
+    # EventCapture2 Redis Streams Configuration
+    eventcapture_stream: str = "eventcapture2:stream"
+    eventcapture_consumer_group: str = "eventcapture2-workers"
+    eventcapture_dead_letter_stream: str = "eventcapture2:dead"
+    eventcapture_workers: int = 2  # Consumer tasks per process (consumer group spreads load)
+    eventcapture_batch_size: int = 100  # Max entries per XREADGROUP call
+    eventcapture_block_ms: int = 1000  # XREADGROUP block timeout
+    eventcapture_claim_idle_ms: int = 60000  # Reclaim pending entries idle this long (dead consumers)
+    eventcapture_max_deliveries: int = 5  # Dead-letter entries delivered more often than this
+    eventcapture_stream_maxlen: int = 100000  # Approximate stream trim length
+
+    # Knowledge chunk access telemetry
+    knowledge_access_flush_interval_s: float = 10.0  # Batched flush period = max access counts lost on crash
+    knowledge_access_max_pending: int = 5000  # Distinct chunks buffered before an early flush
+
+    # Proactive worker event dispatch
+    proactive_worker_inbox_size: int = 1000  # Bounded per-worker event inbox
+    proactive_worker_concurrency: int = 1  # Consumer tasks per worker (1 keeps per-worker event order)
+    proactive_worker_overflow_policy: str = "drop_oldest"  # Full inbox: drop_oldest | drop_newest | block
+    proactive_worker_enqueue_timeout_s: float = 1.0  # Max producer wait under the block policy
+
+    # DAS sandboxed code execution
+    code_executor_pool_size: int = 2  # Pre-started sandbox worker processes
+    code_executor_start_method: str = "forkserver"  # multiprocessing start method (falls back to spawn)
+    code_executor_memory_limit_mb: int = 512  # Default RLIMIT_AS headroom per execution
+    code_executor_max_executions_per_worker: int = 100  # Recycle workers after this many runs (0 = never)
+    code_executor_max_retained_results: int = 1000  # Results kept for get_execution_status
+
+    # Federated access HTTP caching
+    federated_cache_max_age_s: int = 300  # Cache-Control max-age for federated file/knowledge responses
+    federated_content_cache_entries: int = 64  # Assembled knowledge contents cached per process
+
+    # DAS session tracking
+    session_context_ttl_s: int = 86400  # Expiry of the session context hash, refreshed on activity
+    session_event_batch_size: int = 100  # Max queued session events drained per processor round trip
+
+    # Project thread store
+    project_thread_cache_ttl_s: int = 604800  # Redis read-through cache expiry for thread state
+    project_thread_vector_debounce_s: float = 30.0  # Quiet period before a changed thread is re-embedded
+
+    # Fuseki gateway
+    fuseki_max_connections: int = 20  # Pooled keep-alive connections per dataset
+    fuseki_max_concurrency: int = 8  # Concurrent in-flight requests per dataset (sync and async each)
+    fuseki_query_timeout_s: float = 30.0  # SPARQL query / graph read timeout
+    fuseki_update_timeout_s: float = 60.0  # SPARQL update / graph write timeout
+    fuseki_result_cache_entries: int = 512  # Cached read-query results per dataset (0 disables)
+    fuseki_result_cache_ttl_s: float = 30.0  # Bounds staleness from writes made outside this process
+
+    # Neo4j knowledge graph
+    neo4j_write_batch_size: int = 5000  # Rows per UNWIND statement in batched node/relationship writes
+    neo4j_max_traversal_depth: int = 6  # Upper bound on variable-length path depth
+    neo4j_traversal_limit: int = 1000  # Default cap on paths / affected nodes per traversal
+
+    # DAS context packing
+    das_context_token_budget: int = 6000  # Max tokens of retrieved knowledge per prompt
+    das_context_window_tokens: int = 0  # Model context window (0 = infer from LLM_MODEL)
+    das_answer_reserve_tokens: int = 2048  # Context window headroom kept free for the answer
+    das_context_dedup_threshold: float = 0.8  # Chunk similarity treated as a near-duplicate
+    das_context_mmr_lambda: float = 0.7  # MMR relevance vs diversity trade-off (1.0 = relevance only)
+
+    # Requirements extraction jobs
+    requirements_extraction_workers: int = 2  # Processes extracting document sections in parallel
+    requirements_extraction_batch_size: int = 500  # Rows per bulk insert / checkpoint
+    requirements_extraction_flush_interval_s: float = 1.0  # Max time between checkpoints (progress granularity)
+    requirements_extraction_stale_after_s: float = 120.0  # Running jobs without a checkpoint this long are resumed
+
+    # Vector/SQL sync monitor
+    vector_sync_checksum_buckets: int = 256  # Chunk id hash buckets compared by (count, checksum)
+    vector_sync_scroll_page_size: int = 2000  # Point ids fetched per Qdrant scroll page
+    vector_sync_repair_batch_size: int = 128  # Chunks re-embedded and upserted per batch
+    vector_sync_repair_max_chunks_per_s: float = 200.0  # Repair rate limit (0 disables)
+
+    # OpenSearch bulk writer and reindexing
+    opensearch_bulk_batch_size: int = 500  # Documents per bulk request
+    opensearch_bulk_flush_interval_s: float = 1.0  # Max wait for a partial batch before it is sent
+    opensearch_bulk_max_retries: int = 3  # Retries of a failed bulk request before its documents are dropped
+    opensearch_bulk_retry_backoff_s: float = 0.5  # First retry delay, doubled per retry
+    opensearch_bulk_queue_size: int = 10000  # Queued documents before writers block
+    opensearch_reindex_fetch_size: int = 1000  # Rows per server-side cursor fetch during reindex
+
+    # Ontology change detection
+    ontology_snapshot_cache_entries: int = 32  # Graphs whose last saved version is kept as the next baseline
+    ontology_snapshot_ttl_s: float = 300.0  # Bounds staleness from writes made outside this process
+
+    # DAS tool registry
+    das_tool_cache_entries: int = 256  # Cached find_tool lookups per process
+    das_tool_cache_ttl_s: float = 60.0  # Bounds staleness from tools written by other workers
+    das_tool_usage_flush_interval_s: float = 30.0  # Max age of in-memory usage counts before they are written
+    das_tool_usage_flush_batch: int = 100  # Tools with pending usage that trigger an early flush
+
+    # LLM team requirement analysis
+    llm_max_concurrency: int = 8  # LLM calls in flight at once across all LLMTeams in the process
+    llm_analysis_temperature: float = 0.2  # 0 makes analysis calls deterministic and cacheable
+    llm_analysis_cache_entries: int = 10000  # Cached persona outputs of deterministic calls
+
+    # Auth token cache
+    auth_token_cache_entries: int = 10000  # Validated tokens cached per worker
+    auth_token_cache_ttl_s: float = 60.0  # Bounds staleness of a revocation that could not be broadcast
+    auth_revocation_pubsub: bool = True  # Broadcast revocations to other workers over Redis
+    auth_revocation_channel: str = "odras:auth:revoked"
+    auth_last_used_flush_interval_s: float = 60.0  # Max delay before last_used_at is written
+
+    # Individual bulk import
+    individual_import_batch_size: int = 1000  # Individuals per INSERT DATA update and execute_values insert
+    individual_import_max_errors: int = 1000  # Per-row errors kept in the import result and history
+    individual_constraint_cache_ttl_s: float = 300.0  # Reuse of analyzed class constraints between imports
+
     # Pydantic v2 settings configuration
     model_config = SettingsConfigDict(
         env_file=".env",
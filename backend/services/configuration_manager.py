@@ -8,9 +8,9 @@ import uuid
 import logging
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
-from SPARQLWrapper import SPARQLWrapper, JSON as SPARQL_JSON
 
 from backend.services.config import Settings
+from backend.services.fuseki_gateway import get_fuseki_gateway
 import psycopg2
 import psycopg2.extras
 
@@ -477,8 +477,6 @@ class ConfigurationManager:
         try:
             graph_iri = f"{config_data['ontology_graph']}/configurations/{config_id}"
             
-            sparql = SPARQLWrapper(f"{self.settings.fuseki_url}/update")
-            
             # Build SPARQL triples for the configuration
             triples = [
                 f"<{graph_iri}> a <http://odras.io/ontology/Configuration> .",
@@ -505,9 +503,7 @@ class ConfigurationManager:
                 }}
             """
             
-            sparql.setQuery(query)
-            sparql.method = "POST"
-            sparql.query()
+            await get_fuseki_gateway(self.settings.fuseki_url, self.settings).aupdate(query)
             
             logger.info(f"✅ Configuration {config_id} stored in Fuseki")
             
@@ -520,8 +516,6 @@ class ConfigurationManager:
         Delete configuration from Fuseki
         """
         try:
-            sparql = SPARQLWrapper(f"{self.settings.fuseki_url}/update")
-            
             # Delete all triples for this configuration
             query = f"""
                 DELETE WHERE {{
@@ -532,9 +526,7 @@ class ConfigurationManager:
                 }}
             """
             
-            sparql.setQuery(query)
-            sparql.method = "POST"
-            sparql.query()
+            await get_fuseki_gateway(self.settings.fuseki_url, self.settings).aupdate(query)
             
             logger.info(f"✅ Configuration {config_id} deleted from Fuseki")
             
@@ -698,8 +690,6 @@ class ConfigurationManager:
         Detect root classes (classes with no incoming object properties)
         """
         try:
-            sparql = SPARQLWrapper(f"{self.settings.fuseki_url}/query")
-            
             # SPARQL query to find classes that are never the range of object properties
             query = f"""
             PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
@@ -728,9 +718,7 @@ class ConfigurationManager:
             ORDER BY ?label
             """
             
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = await get_fuseki_gateway(self.settings.fuseki_url, self.settings).aquery(query)
             
             root_classes = []
             for binding in results["results"]["bindings"]:
@@ -0,0 +1,240 @@
+"""
+DAS Context Packer
+
+Selects which retrieved RAG chunks go into a DAS prompt under a token budget:
+- Per-model token counting (tiktoken when installed, calibrated estimate otherwise)
+- Near-duplicate removal by MinHash (or embedding cosine when chunks carry one)
+- Maximal marginal relevance selection so the budget buys coverage, not repetition
+- Headroom for the rest of the prompt (history, project context) and the answer
+"""
+
+import logging
+import math
+import re
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import tiktoken
+except ImportError:  # exact OpenAI token counts are optional
+    tiktoken = None
+
+from ..rag.core.context_models import RAGChunk
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Context windows by model-name prefix; the longest matching prefix wins.
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "llama3.1": 131072,
+    "llama3.2": 131072,
+    "llama3": 8192,
+    "mistral": 32768,
+    "qwen2.5": 32768,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Characters per token when no tokenizer is available; SentencePiece-style
+# tokenizers (llama, mistral) split English more finely than OpenAI's BPE.
+CHARS_PER_TOKEN = {"gpt": 4.0, "o1": 4.0, "o3": 4.0}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+_WORD = re.compile(r"\w+")
+_PRIME = (1 << 31) - 1
+
+
+@dataclass
+class PackingStats:
+    """What the packer kept and dropped for one prompt."""
+
+    model: str
+    token_budget: int
+    candidates: int = 0
+    duplicates_removed: int = 0
+    dropped_over_budget: int = 0
+    selected: int = 0
+    candidate_tokens: int = 0
+    packed_tokens: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _lookup(table: Dict[str, float], model: str, default):
+    matches = [prefix for prefix in table if model.startswith(prefix)]
+    return table[max(matches, key=len)] if matches else default
+
+
+class ContextPacker:
+    """
+    Token-budgeted selection of RAG chunks for a prompt.
+
+    pack() orders candidates by relevance, drops any chunk whose similarity to
+    an already kept one reaches dedup_threshold, then greedily picks by MMR
+    (mmr_lambda * relevance - (1 - mmr_lambda) * max similarity to picked)
+    while the rendered chunks still fit the budget.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        token_budget: int = 6000,
+        context_window: int = 0,
+        answer_reserve: int = 2048,
+        dedup_threshold: float = 0.8,
+        mmr_lambda: float = 0.7,
+        num_perm: int = 64,
+        shingle_size: int = 3,
+    ):
+        self.model = (model or "").lower()
+        self.token_budget = token_budget
+        self.context_window = context_window or _lookup(CONTEXT_WINDOWS, self.model, DEFAULT_CONTEXT_WINDOW)
+        self.answer_reserve = answer_reserve
+        self.dedup_threshold = dedup_threshold
+        self.mmr_lambda = mmr_lambda
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except Exception as e:
+                # Not an OpenAI model, or the BPE file cannot be downloaded (offline host)
+                logger.debug(f"No tiktoken encoding for {self.model!r}, estimating tokens: {e}")
+        self._chars_per_token = _lookup(CHARS_PER_TOKEN, self.model, DEFAULT_CHARS_PER_TOKEN)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, model: Optional[str] = None) -> "ContextPacker":
+        return cls(
+            model=model or getattr(settings, "llm_model", "gpt-4o-mini"),
+            token_budget=int(getattr(settings, "das_context_token_budget", 6000)),
+            context_window=int(getattr(settings, "das_context_window_tokens", 0)),
+            answer_reserve=int(getattr(settings, "das_answer_reserve_tokens", 2048)),
+            dedup_threshold=float(getattr(settings, "das_context_dedup_threshold", 0.8)),
+            mmr_lambda=float(getattr(settings, "das_context_mmr_lambda", 0.7)),
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of text for this packer's model."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / self._chars_per_token)
+
+    def budget_for(self, reserved_tokens: int = 0, token_budget: Optional[int] = None) -> int:
+        """
+        Tokens available for chunks once the rest of the prompt (reserved_tokens)
+        and the answer headroom are taken out of the context window.
+        """
+        room = self.context_window - self.answer_reserve - reserved_tokens
+        return max(0, min(self.token_budget if token_budget is None else token_budget, room))
+
+    def pack(
+        self,
+        chunks: List[RAGChunk],
+        reserved_tokens: int = 0,
+        token_budget: Optional[int] = None,
+        render: Optional[Callable[[RAGChunk], str]] = None,
+    ) -> Tuple[List[RAGChunk], PackingStats]:
+        """
+        Select chunks for a prompt.
+
+        Args:
+            chunks: Retrieved candidates
+            reserved_tokens: Tokens already used by the rest of the prompt
+            token_budget: Override of the configured chunk budget
+            render: Text a chunk contributes to the prompt (defaults to its content)
+
+        Returns:
+            (selected chunks in selection order, packing statistics)
+        """
+        started = time.perf_counter()
+        budget = self.budget_for(reserved_tokens, token_budget)
+        stats = PackingStats(model=self.model, token_budget=budget, candidates=len(chunks))
+        if not chunks:
+            return [], stats
+
+        ordered = sorted(chunks, key=lambda c: c.relevance_score, reverse=True)
+        render = render or (lambda chunk: chunk.content)
+        costs = [self.count_tokens(render(chunk)) for chunk in ordered]
+        stats.candidate_tokens = sum(costs)
+
+        similarity = self._similarity_matrix(ordered)
+        kept: List[int] = []
+        for i in range(len(ordered)):
+            if kept and similarity[i, kept].max() >= self.dedup_threshold:
+                stats.duplicates_removed += 1
+            else:
+                kept.append(i)
+
+        top = max(ordered[0].relevance_score, 1e-9)
+        relevance = {i: ordered[i].relevance_score / top for i in kept}
+        redundancy = dict.fromkeys(kept, 0.0)
+        selected: List[int] = []
+        remaining = list(kept)
+        while remaining:
+            best = max(
+                remaining,
+                key=lambda i: self.mmr_lambda * relevance[i] - (1 - self.mmr_lambda) * redundancy[i],
+            )
+            remaining.remove(best)
+            if stats.packed_tokens + costs[best] > budget:
+                stats.dropped_over_budget += 1
+                continue
+            selected.append(best)
+            stats.packed_tokens += costs[best]
+            for i in remaining:
+                redundancy[i] = max(redundancy[i], similarity[i, best])
+
+        stats.selected = len(selected)
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Packed {stats.selected}/{stats.candidates} chunks into {stats.packed_tokens}/{budget} tokens "
+            f"({stats.duplicates_removed} near-duplicates, {stats.dropped_over_budget} over budget)"
+        )
+        return [ordered[i] for i in selected], stats
+
+    def _similarity_matrix(self, chunks: List[RAGChunk]) -> np.ndarray:
+        """Pairwise similarity: embedding cosine where both chunks carry one, MinHash Jaccard otherwise."""
+        signatures = np.stack([self._minhash(chunk.content) for chunk in chunks])
+        similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+
+        embedded = [i for i, chunk in enumerate(chunks) if chunk.metadata.get("embedding")]
+        if len(embedded) > 1:
+            vectors = np.array([chunks[i].metadata["embedding"] for i in embedded], dtype=float)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            similarity[np.ix_(embedded, embedded)] = vectors @ vectors.T
+        return similarity
+
+    def _minhash(self, text: str) -> np.ndarray:
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) & _PRIME for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+
+@lru_cache(maxsize=8)
+def get_context_packer(model: Optional[str] = None) -> ContextPacker:
+    """Shared packer for a model (defaults to the configured LLM_MODEL)."""
+    return ContextPacker.from_settings(Settings(), model)
@@ -26,9 +26,11 @@ from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 
 from .config import Settings
+from .fuseki_gateway import get_fuseki_gateway
 from ..rag.core.rag_service_interface import RAGServiceInterface
 from ..rag.core.context_models import RAGContext
 from .das_prompt_builder import DASPromptBuilder
+from .das_context_packer import ContextPacker
 from .project_thread_manager import ProjectThreadManager, ProjectEventType
 from .code_generator_interface import CodeGeneratorInterface, CodeGenerationRequest, CodeGenerationCapability
 from .code_executor_interface import CodeExecutorInterface, ExecutionStatus
@@ -36,6 +38,9 @@ from .tool_registry_interface import ToolRegistryInterface, ToolType
 
 logger = logging.getLogger(__name__)
 
+# Approximate size of the fixed DAS instructions wrapped around the context
+PROMPT_INSTRUCTION_TOKENS = 400
+
 
 @dataclass
 class DASResponse:
@@ -91,6 +96,7 @@ class DASCoreEngine:
         self.project_manager = project_manager  # Now SqlFirstThreadManager
         self.db_service = db_service
         self.prompt_builder = DASPromptBuilder()  # Prompt builder for formatting RAG context
+        self.context_packer = ContextPacker.from_settings(settings)  # Token-budgeted RAG chunk selection
         
         # Code generation and execution (optional, decoupled)
         self.code_generator = code_generator
@@ -154,26 +160,20 @@ class DASCoreEngine:
             }}
             """
 
-            fuseki_url = f"{self.settings.fuseki_url}/query"
+            fuseki = get_fuseki_gateway(self.settings.fuseki_url, self.settings)
             imported_ontologies = []
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Get imports
-                import_response = await client.post(
-                    fuseki_url,
-                    data={"query": imports_query},
-                    headers={"Accept": "application/json"},
-                    auth=(self.settings.fuseki_user, self.settings.fuseki_password) if hasattr(self.settings, 'fuseki_user') and self.settings.fuseki_user else None
-                )
-
-                if import_response.status_code == 200:
-                    import_results = import_response.json()
-                    import_bindings = import_results.get("results", {}).get("bindings", [])
+            # Get imports
+            try:
+                import_results = await fuseki.aquery(imports_query, timeout=10.0)
+            except httpx.HTTPStatusError:
+                import_results = {}
+            import_bindings = import_results.get("results", {}).get("bindings", [])
 
-                    for binding in import_bindings:
-                        import_iri = binding["import"]["value"]
-                        imported_ontologies.append(import_iri)
-                        logger.info(f"Found import: {graph_iri} imports {import_iri}")
+            for binding in import_bindings:
+                import_iri = binding["import"]["value"]
+                imported_ontologies.append(import_iri)
+                logger.info(f"Found import: {graph_iri} imports {import_iri}")
 
             # SPARQL query to get ALL ontology content including individuals, restrictions, disjoint classes, etc.
             sparql_query = f"""
@@ -351,235 +351,228 @@ class DASCoreEngine:
             }}
             """
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    fuseki_url,
-                    data={"query": sparql_query},
-                    headers={"Accept": "application/json"},
-                    auth=(self.settings.fuseki_user, self.settings.fuseki_password) if hasattr(self.settings, 'fuseki_user') and self.settings.fuseki_user else None
-                )
+            try:
+                results = await fuseki.aquery(sparql_query, timeout=15.0)
+            except httpx.HTTPStatusError as e:
+                logger.warning(f"Failed to fetch ontology details for {graph_iri}: {e.response.status_code}")
+                return {}
 
-                if response.status_code != 200:
-                    logger.warning(f"Failed to fetch ontology details for {graph_iri}: {response.status_code}")
-                    return {}
-
-                results = response.json()
-                bindings = results.get("results", {}).get("bindings", [])
-
-                # Organize results for main ontology with comprehensive attributes
-                ontology_metadata = {}
-                classes = {}
-                obj_properties = {}
-                data_properties = {}
-                individuals = {}
-                restrictions = {}
-                annotation_properties = {}
-                notes = {}
-
-                for binding in bindings:
-                    # Process ontology-level annotations
-                    if "ontology" in binding:
-                        ontology_uri = binding["ontology"]["value"]
-                        if ontology_uri not in ontology_metadata:
-                            ontology_metadata[ontology_uri] = {
-                                "label": binding.get("ontologyLabel", {}).get("value", ""),
-                                "comment": binding.get("ontologyComment", {}).get("value", ""),
-                                "definition": binding.get("ontologyDefinition", {}).get("value", ""),
-                                "example": binding.get("ontologyExample", {}).get("value", ""),
-                                "title": binding.get("ontologyTitle", {}).get("value", ""),
-                                "description": binding.get("ontologyDescription", {}).get("value", ""),
-                                "creator": binding.get("ontologyCreator", {}).get("value", ""),
-                                "contributor": binding.get("ontologyContributor", {}).get("value", ""),
-                                "date": binding.get("ontologyDate", {}).get("value", ""),
-                                "created": binding.get("ontologyCreated", {}).get("value", ""),
-                                "modified": binding.get("ontologyModified", {}).get("value", ""),
-                                "version": binding.get("ontologyVersion", {}).get("value", ""),
-                                "license": binding.get("ontologyLicense", {}).get("value", ""),
-                                "homepage": binding.get("ontologyHomepage", {}).get("value", "")
-                            }
-                    # Process classes with ALL attributes including disjoint classes
-                    if "class" in binding:
-                        class_uri = binding["class"]["value"]
-                        if class_uri not in classes:
-                            classes[class_uri] = {
-                                "name": binding.get("className", {}).get("value", class_uri.split("#")[-1].split("/")[-1]),
-                                "comment": binding.get("classComment", {}).get("value", ""),
-                                "definition": binding.get("classDefinition", {}).get("value", ""),
-                                "example": binding.get("classExample", {}).get("value", ""),
-                                "identifier": binding.get("classIdentifier", {}).get("value", ""),
-                                "creator": binding.get("classCreator", {}).get("value", ""),
-                                "created_date": binding.get("classCreatedDate", {}).get("value", ""),
-                                "modified_by": binding.get("classModifiedBy", {}).get("value", ""),
-                                "modified_date": binding.get("classModifiedDate", {}).get("value", ""),
-                                "priority": binding.get("classPriority", {}).get("value", ""),
-                                "status": binding.get("classStatus", {}).get("value", ""),
-                                "subclass_of": binding.get("classSubClassOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "classSubClassOf" in binding else "",
-                                "equivalent_class": binding.get("classEquivalentClass", {}).get("value", "").split("#")[-1].split("/")[-1] if "classEquivalentClass" in binding else "",
-                                "disjoint_with": binding.get("classDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "classDisjointWith" in binding else ""
-                            }
-
-                    # Process object properties with ALL attributes including disjoint properties
-                    # CRITICAL: Key by prop_uri + domain + range to handle multiple domain/range combos for same property
-                    if "objProp" in binding:
-                        prop_uri = binding["objProp"]["value"]
-                        domain = binding.get("domain", {}).get("value", "").split("#")[-1].split("/")[-1] if "domain" in binding else ""
-                        range_val = binding.get("range", {}).get("value", "").split("#")[-1].split("/")[-1] if "range" in binding else ""
-                        
-                        # Create unique key for each domain/range combination
-                        unique_key = f"{prop_uri}_{domain}_{range_val}"
-                        
-                        if unique_key not in obj_properties:
-                            obj_properties[unique_key] = {
-                                "name": binding.get("objPropName", {}).get("value", prop_uri.split("#")[-1].split("/")[-1]),
-                                "comment": binding.get("objPropComment", {}).get("value", ""),
-                                "definition": binding.get("objPropDefinition", {}).get("value", ""),
-                                "example": binding.get("objPropExample", {}).get("value", ""),
-                                "domain": domain,
-                                "range": range_val,
-                                "creator": binding.get("objPropCreator", {}).get("value", ""),
-                                "created_date": binding.get("objPropCreatedDate", {}).get("value", ""),
-                                "modified_by": binding.get("objPropModifiedBy", {}).get("value", ""),
-                                "inverse_of": binding.get("objPropInverseOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropInverseOf" in binding else "",
-                                "subproperty_of": binding.get("objPropSubPropertyOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropSubPropertyOf" in binding else "",
-                                "equivalent_property": binding.get("objPropEquivalentProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropEquivalentProperty" in binding else "",
-                                "disjoint_with": binding.get("objPropDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropDisjointWith" in binding else ""
-                            }
-
-                    # Process data properties with ALL attributes including disjoint properties
-                    if "dataProp" in binding:
-                        prop_uri = binding["dataProp"]["value"]
-                        if prop_uri not in data_properties:
-                            data_properties[prop_uri] = {
-                                "name": binding.get("dataPropName", {}).get("value", prop_uri.split("#")[-1].split("/")[-1]),
-                                "comment": binding.get("dataPropComment", {}).get("value", ""),
-                                "definition": binding.get("dataPropDefinition", {}).get("value", ""),
-                                "example": binding.get("dataPropExample", {}).get("value", ""),
-                                "domain": binding.get("dataDomain", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataDomain" in binding else "",
-                                "range": binding.get("dataRange", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataRange" in binding else "",
-                                "creator": binding.get("dataPropCreator", {}).get("value", ""),
-                                "created_date": binding.get("dataPropCreatedDate", {}).get("value", ""),
-                                "modified_by": binding.get("dataPropModifiedBy", {}).get("value", ""),
-                                "subproperty_of": binding.get("dataPropSubPropertyOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropSubPropertyOf" in binding else "",
-                                "equivalent_property": binding.get("dataPropEquivalentProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropEquivalentProperty" in binding else "",
-                                "disjoint_with": binding.get("dataPropDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropDisjointWith" in binding else ""
-                            }
-
-                    # Process individuals/instances with all their properties
-                    if "individual" in binding:
-                        individual_uri = binding["individual"]["value"]
-                        if individual_uri not in individuals:
-                            individuals[individual_uri] = {
-                                "name": binding.get("individualName", {}).get("value", individual_uri.split("#")[-1].split("/")[-1]),
-                                "comment": binding.get("individualComment", {}).get("value", ""),
-                                "type": binding.get("individualType", {}).get("value", "").split("#")[-1].split("/")[-1] if "individualType" in binding else "",
-                                "creator": binding.get("individualCreator", {}).get("value", ""),
-                                "created_date": binding.get("individualCreatedDate", {}).get("value", ""),
-                                "properties": []
-                            }
-
-                        # Add property values for this individual
-                        if "individualProperty" in binding and "individualPropertyValue" in binding:
-                            prop_name = binding.get("individualProperty", {}).get("value", "").split("#")[-1].split("/")[-1]
-                            prop_value = binding.get("individualPropertyValue", {}).get("value", "")
-                            prop_type = binding.get("individualPropertyType", {}).get("value", "").split("#")[-1].split("/")[-1] if "individualPropertyType" in binding else ""
-
-                            individuals[individual_uri]["properties"].append({
-                                "property": prop_name,
-                                "value": prop_value,
-                                "type": prop_type
-                            })
-
-                    # Process cardinality and value restrictions
-                    if "restriction" in binding:
-                        restriction_uri = binding["restriction"]["value"]
-                        if restriction_uri not in restrictions:
-                            restrictions[restriction_uri] = {
-                                "type": binding.get("restrictionType", {}).get("value", ""),
-                                "property": binding.get("restrictionProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionProperty" in binding else "",
-                                "cardinality": binding.get("restrictionCardinality", {}).get("value", ""),
-                                "value": binding.get("restrictionValue", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionValue" in binding else "",
-                                "on_class": binding.get("restrictionOnClass", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionOnClass" in binding else "",
-                                "on_property": binding.get("restrictionOnProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionOnProperty" in binding else ""
-                            }
-
-                    # Process annotation properties
-                    if "annotationProp" in binding:
-                        annotation_uri = binding["annotationProp"]["value"]
-                        if annotation_uri not in annotation_properties:
-                            annotation_properties[annotation_uri] = {
-                                "name": binding.get("annotationPropName", {}).get("value", annotation_uri.split("#")[-1].split("/")[-1]),
-                                "comment": binding.get("annotationPropComment", {}).get("value", ""),
-                                "domain": binding.get("annotationPropDomain", {}).get("value", "").split("#")[-1].split("/")[-1] if "annotationPropDomain" in binding else "",
-                                "range": binding.get("annotationPropRange", {}).get("value", "").split("#")[-1].split("/")[-1] if "annotationPropRange" in binding else ""
-                            }
-
-                    # Process notes with comprehensive attributes and note_for relationships
-                    if "note" in binding:
-                        note_uri = binding["note"]["value"]
-                        if note_uri not in notes:
-                            notes[note_uri] = {
-                                "name": binding.get("noteName", {}).get("value", ""),
-                                "comment": binding.get("noteComment", {}).get("value", ""),
-                                "type": binding.get("noteType", {}).get("value", ""),
-                                "creator": binding.get("noteCreator", {}).get("value", ""),
-                                "created_date": binding.get("noteCreatedDate", {}).get("value", ""),
-                                "modified_by": binding.get("noteModifiedBy", {}).get("value", ""),
-                                "modified_date": binding.get("noteModifiedDate", {}).get("value", ""),
-                                "note_for": []
-                            }
-
-                        # Add note_for relationship if present
-                        if "noteFor" in binding:
-                            note_for_uri = binding["noteFor"]["value"]
-                            note_for_info = {
-                                "uri": note_for_uri,
-                                "type": binding.get("noteForType", {}).get("value", "").split("#")[-1].split("/")[-1] if "noteForType" in binding else "",
-                                "name": binding.get("noteForName", {}).get("value", ""),
-                                "comment": binding.get("noteForComment", {}).get("value", "")
-                            }
-                            # Avoid duplicates
-                            if note_for_info not in notes[note_uri]["note_for"]:
-                                notes[note_uri]["note_for"].append(note_for_info)
-
-                # Build result with comprehensive ontology content
-                result = {
-                    "ontology_metadata": list(ontology_metadata.values()),
-                    "classes": list(classes.values()),
-                    "object_properties": list(obj_properties.values()),
-                    "data_properties": list(data_properties.values()),
-                    "individuals": list(individuals.values()),
-                    "restrictions": list(restrictions.values()),
-                    "annotation_properties": list(annotation_properties.values()),
-                    "notes": list(notes.values()),
-                    "imports": []
-                }
+            bindings = results.get("results", {}).get("bindings", [])
+
+            # Organize results for main ontology with comprehensive attributes
+            ontology_metadata = {}
+            classes = {}
+            obj_properties = {}
+            data_properties = {}
+            individuals = {}
+            restrictions = {}
+            annotation_properties = {}
+            notes = {}
+
+            for binding in bindings:
+                # Process ontology-level annotations
+                if "ontology" in binding:
+                    ontology_uri = binding["ontology"]["value"]
+                    if ontology_uri not in ontology_metadata:
+                        ontology_metadata[ontology_uri] = {
+                            "label": binding.get("ontologyLabel", {}).get("value", ""),
+                            "comment": binding.get("ontologyComment", {}).get("value", ""),
+                            "definition": binding.get("ontologyDefinition", {}).get("value", ""),
+                            "example": binding.get("ontologyExample", {}).get("value", ""),
+                            "title": binding.get("ontologyTitle", {}).get("value", ""),
+                            "description": binding.get("ontologyDescription", {}).get("value", ""),
+                            "creator": binding.get("ontologyCreator", {}).get("value", ""),
+                            "contributor": binding.get("ontologyContributor", {}).get("value", ""),
+                            "date": binding.get("ontologyDate", {}).get("value", ""),
+                            "created": binding.get("ontologyCreated", {}).get("value", ""),
+                            "modified": binding.get("ontologyModified", {}).get("value", ""),
+                            "version": binding.get("ontologyVersion", {}).get("value", ""),
+                            "license": binding.get("ontologyLicense", {}).get("value", ""),
+                            "homepage": binding.get("ontologyHomepage", {}).get("value", "")
+                        }
+                # Process classes with ALL attributes including disjoint classes
+                if "class" in binding:
+                    class_uri = binding["class"]["value"]
+                    if class_uri not in classes:
+                        classes[class_uri] = {
+                            "name": binding.get("className", {}).get("value", class_uri.split("#")[-1].split("/")[-1]),
+                            "comment": binding.get("classComment", {}).get("value", ""),
+                            "definition": binding.get("classDefinition", {}).get("value", ""),
+                            "example": binding.get("classExample", {}).get("value", ""),
+                            "identifier": binding.get("classIdentifier", {}).get("value", ""),
+                            "creator": binding.get("classCreator", {}).get("value", ""),
+                            "created_date": binding.get("classCreatedDate", {}).get("value", ""),
+                            "modified_by": binding.get("classModifiedBy", {}).get("value", ""),
+                            "modified_date": binding.get("classModifiedDate", {}).get("value", ""),
+                            "priority": binding.get("classPriority", {}).get("value", ""),
+                            "status": binding.get("classStatus", {}).get("value", ""),
+                            "subclass_of": binding.get("classSubClassOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "classSubClassOf" in binding else "",
+                            "equivalent_class": binding.get("classEquivalentClass", {}).get("value", "").split("#")[-1].split("/")[-1] if "classEquivalentClass" in binding else "",
+                            "disjoint_with": binding.get("classDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "classDisjointWith" in binding else ""
+                        }
 
-                # Recursively fetch imported ontologies
-                for import_iri in imported_ontologies:
-                    try:
-                        imported_details = await self._fetch_ontology_details(import_iri, visited_imports.copy())
-                        if imported_details:
-                            # Extract ontology name from IRI for display
-                            import_name = import_iri.split("/")[-1] or import_iri.split("#")[-1] or "Unknown Import"
-                            result["imports"].append({
-                                "iri": import_iri,
-                                "name": import_name,
-                                "details": imported_details
-                            })
-                            logger.info(f"Successfully fetched imported ontology: {import_iri}")
-                        else:
-                            logger.warning(f"No details found for imported ontology: {import_iri}")
-                    except Exception as import_error:
-                        logger.error(f"Error fetching imported ontology {import_iri}: {import_error}")
-                        # Add placeholder for failed import
+                # Process object properties with ALL attributes including disjoint properties
+                # CRITICAL: Key by prop_uri + domain + range to handle multiple domain/range combos for same property
+                if "objProp" in binding:
+                    prop_uri = binding["objProp"]["value"]
+                    domain = binding.get("domain", {}).get("value", "").split("#")[-1].split("/")[-1] if "domain" in binding else ""
+                    range_val = binding.get("range", {}).get("value", "").split("#")[-1].split("/")[-1] if "range" in binding else ""
+                    
+                    # Create unique key for each domain/range combination
+                    unique_key = f"{prop_uri}_{domain}_{range_val}"
+                    
+                    if unique_key not in obj_properties:
+                        obj_properties[unique_key] = {
+                            "name": binding.get("objPropName", {}).get("value", prop_uri.split("#")[-1].split("/")[-1]),
+                            "comment": binding.get("objPropComment", {}).get("value", ""),
+                            "definition": binding.get("objPropDefinition", {}).get("value", ""),
+                            "example": binding.get("objPropExample", {}).get("value", ""),
+                            "domain": domain,
+                            "range": range_val,
+                            "creator": binding.get("objPropCreator", {}).get("value", ""),
+                            "created_date": binding.get("objPropCreatedDate", {}).get("value", ""),
+                            "modified_by": binding.get("objPropModifiedBy", {}).get("value", ""),
+                            "inverse_of": binding.get("objPropInverseOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropInverseOf" in binding else "",
+                            "subproperty_of": binding.get("objPropSubPropertyOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropSubPropertyOf" in binding else "",
+                            "equivalent_property": binding.get("objPropEquivalentProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropEquivalentProperty" in binding else "",
+                            "disjoint_with": binding.get("objPropDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "objPropDisjointWith" in binding else ""
+                        }
+
+                # Process data properties with ALL attributes including disjoint properties
+                if "dataProp" in binding:
+                    prop_uri = binding["dataProp"]["value"]
+                    if prop_uri not in data_properties:
+                        data_properties[prop_uri] = {
+                            "name": binding.get("dataPropName", {}).get("value", prop_uri.split("#")[-1].split("/")[-1]),
+                            "comment": binding.get("dataPropComment", {}).get("value", ""),
+                            "definition": binding.get("dataPropDefinition", {}).get("value", ""),
+                            "example": binding.get("dataPropExample", {}).get("value", ""),
+                            "domain": binding.get("dataDomain", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataDomain" in binding else "",
+                            "range": binding.get("dataRange", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataRange" in binding else "",
+                            "creator": binding.get("dataPropCreator", {}).get("value", ""),
+                            "created_date": binding.get("dataPropCreatedDate", {}).get("value", ""),
+                            "modified_by": binding.get("dataPropModifiedBy", {}).get("value", ""),
+                            "subproperty_of": binding.get("dataPropSubPropertyOf", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropSubPropertyOf" in binding else "",
+                            "equivalent_property": binding.get("dataPropEquivalentProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropEquivalentProperty" in binding else "",
+                            "disjoint_with": binding.get("dataPropDisjointWith", {}).get("value", "").split("#")[-1].split("/")[-1] if "dataPropDisjointWith" in binding else ""
+                        }
+
+                # Process individuals/instances with all their properties
+                if "individual" in binding:
+                    individual_uri = binding["individual"]["value"]
+                    if individual_uri not in individuals:
+                        individuals[individual_uri] = {
+                            "name": binding.get("individualName", {}).get("value", individual_uri.split("#")[-1].split("/")[-1]),
+                            "comment": binding.get("individualComment", {}).get("value", ""),
+                            "type": binding.get("individualType", {}).get("value", "").split("#")[-1].split("/")[-1] if "individualType" in binding else "",
+                            "creator": binding.get("individualCreator", {}).get("value", ""),
+                            "created_date": binding.get("individualCreatedDate", {}).get("value", ""),
+                            "properties": []
+                        }
+
+                    # Add property values for this individual
+                    if "individualProperty" in binding and "individualPropertyValue" in binding:
+                        prop_name = binding.get("individualProperty", {}).get("value", "").split("#")[-1].split("/")[-1]
+                        prop_value = binding.get("individualPropertyValue", {}).get("value", "")
+                        prop_type = binding.get("individualPropertyType", {}).get("value", "").split("#")[-1].split("/")[-1] if "individualPropertyType" in binding else ""
+
+                        individuals[individual_uri]["properties"].append({
+                            "property": prop_name,
+                            "value": prop_value,
+                            "type": prop_type
+                        })
+
+                # Process cardinality and value restrictions
+                if "restriction" in binding:
+                    restriction_uri = binding["restriction"]["value"]
+                    if restriction_uri not in restrictions:
+                        restrictions[restriction_uri] = {
+                            "type": binding.get("restrictionType", {}).get("value", ""),
+                            "property": binding.get("restrictionProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionProperty" in binding else "",
+                            "cardinality": binding.get("restrictionCardinality", {}).get("value", ""),
+                            "value": binding.get("restrictionValue", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionValue" in binding else "",
+                            "on_class": binding.get("restrictionOnClass", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionOnClass" in binding else "",
+                            "on_property": binding.get("restrictionOnProperty", {}).get("value", "").split("#")[-1].split("/")[-1] if "restrictionOnProperty" in binding else ""
+                        }
+
+                # Process annotation properties
+                if "annotationProp" in binding:
+                    annotation_uri = binding["annotationProp"]["value"]
+                    if annotation_uri not in annotation_properties:
+                        annotation_properties[annotation_uri] = {
+                            "name": binding.get("annotationPropName", {}).get("value", annotation_uri.split("#")[-1].split("/")[-1]),
+                            "comment": binding.get("annotationPropComment", {}).get("value", ""),
+                            "domain": binding.get("annotationPropDomain", {}).get("value", "").split("#")[-1].split("/")[-1] if "annotationPropDomain" in binding else "",
+                            "range": binding.get("annotationPropRange", {}).get("value", "").split("#")[-1].split("/")[-1] if "annotationPropRange" in binding else ""
+                        }
+
+                # Process notes with comprehensive attributes and note_for relationships
+                if "note" in binding:
+                    note_uri = binding["note"]["value"]
+                    if note_uri not in notes:
+                        notes[note_uri] = {
+                            "name": binding.get("noteName", {}).get("value", ""),
+                            "comment": binding.get("noteComment", {}).get("value", ""),
+                            "type": binding.get("noteType", {}).get("value", ""),
+                            "creator": binding.get("noteCreator", {}).get("value", ""),
+                            "created_date": binding.get("noteCreatedDate", {}).get("value", ""),
+                            "modified_by": binding.get("noteModifiedBy", {}).get("value", ""),
+                            "modified_date": binding.get("noteModifiedDate", {}).get("value", ""),
+                            "note_for": []
+                        }
+
+                    # Add note_for relationship if present
+                    if "noteFor" in binding:
+                        note_for_uri = binding["noteFor"]["value"]
+                        note_for_info = {
+                            "uri": note_for_uri,
+                            "type": binding.get("noteForType", {}).get("value", "").split("#")[-1].split("/")[-1] if "noteForType" in binding else "",
+                            "name": binding.get("noteForName", {}).get("value", ""),
+                            "comment": binding.get("noteForComment", {}).get("value", "")
+                        }
+                        # Avoid duplicates
+                        if note_for_info not in notes[note_uri]["note_for"]:
+                            notes[note_uri]["note_for"].append(note_for_info)
+
+            # Build result with comprehensive ontology content
+            result = {
+                "ontology_metadata": list(ontology_metadata.values()),
+                "classes": list(classes.values()),
+                "object_properties": list(obj_properties.values()),
+                "data_properties": list(data_properties.values()),
+                "individuals": list(individuals.values()),
+                "restrictions": list(restrictions.values()),
+                "annotation_properties": list(annotation_properties.values()),
+                "notes": list(notes.values()),
+                "imports": []
+            }
+
+            # Recursively fetch imported ontologies
+            for import_iri in imported_ontologies:
+                try:
+                    imported_details = await self._fetch_ontology_details(import_iri, visited_imports.copy())
+                    if imported_details:
+                        # Extract ontology name from IRI for display
                         import_name = import_iri.split("/")[-1] or import_iri.split("#")[-1] or "Unknown Import"
                         result["imports"].append({
                             "iri": import_iri,
                             "name": import_name,
-                            "error": f"Failed to load: {str(import_error)}"
+                            "details": imported_details
                         })
-
-                return result
+                        logger.info(f"Successfully fetched imported ontology: {import_iri}")
+                    else:
+                        logger.warning(f"No details found for imported ontology: {import_iri}")
+                except Exception as import_error:
+                    logger.error(f"Error fetching imported ontology {import_iri}: {import_error}")
+                    # Add placeholder for failed import
+                    import_name = import_iri.split("/")[-1] or import_iri.split("#")[-1] or "Unknown Import"
+                    result["imports"].append({
+                        "iri": import_iri,
+                        "name": import_name,
+                        "error": f"Failed to load: {str(import_error)}"
+                    })
+
+            return result
 
         except Exception as e:
             logger.error(f"Error fetching ontology details for {graph_iri}: {e}")
@@ -1542,13 +1535,19 @@ class DASCoreEngine:
             print(f"   Query: {rag_context.query}")
             print(f"   Chunks found: {len(rag_context.chunks)}")
             
+            cited_chunks = []  # chunks packed into the prompt, reported as sources
             if rag_context.chunks:
-                # Use prompt builder to format RAG context into prompt section
-                # We'll extract just the context part (without system prompt) to add to our context
-                rag_prompt_section = self.prompt_builder._build_context_section(
-                    rag_context.chunks,
-                    include_sources=True
+                # Use prompt builder to pack RAG context into the remaining token budget
+                # (history, project context, instructions and the answer are reserved first)
+                reserved_tokens = self.context_packer.count_tokens("\n".join(context_sections) + message)
+                rag_prompt_section, packing_stats = self.prompt_builder.pack_context(
+                    rag_context,
+                    reserved_tokens=reserved_tokens + PROMPT_INSTRUCTION_TOKENS,
+                    include_sources=True,
+                    packer=self.context_packer,
                 )
+                logger.debug(f"RAG packing: {packing_stats.to_dict()}")
+                cited_chunks = self.prompt_builder.packed_chunks(rag_context)
                 context_sections.append("KNOWLEDGE FROM DOCUMENTS:")
                 context_sections.append(rag_prompt_section)
 
@@ -1558,7 +1557,7 @@ class DASCoreEngine:
                 print(f"🔍 RAG_DEBUG: RAG content preview: {rag_content_text[:200]}...")
 
                 # Debug sources from RAG context
-                for i, chunk in enumerate(rag_context.chunks[:5]):
+                for i, chunk in enumerate(cited_chunks[:5]):
                     print(f"   Source {i+1}: {chunk.source.title or 'Unknown'} ({chunk.source.domain or 'N/A'}) - score: {chunk.relevance_score:.3f}")
 
                 # Check if AeroMapper is mentioned in the RAG context
@@ -1634,8 +1633,10 @@ Answer naturally and consistently using the context above. Be helpful and conver
                         "timestamp": datetime.now().isoformat(),
                         "prompt_context": full_context,  # Store the full prompt for thread manager
                         "rag_context": {
-                            "chunks_found": len(rag_context.chunks),
+                            "chunks_found": len(cited_chunks),
                             "total_chunks_found": rag_context.total_chunks_found,
+                            "packing": rag_context.query_metadata.get("packing"),
+                            "rerank": rag_context.query_metadata.get("rerank"),
                             "sources": [
                                 {
                                     "chunk_id": chunk.chunk_id,
@@ -1644,7 +1645,7 @@ Answer naturally and consistently using the context above. Be helpful and conver
                                     "domain": chunk.source.domain,
                                     "relevance_score": chunk.relevance_score,
                                 }
-                                for chunk in rag_context.chunks
+                                for chunk in cited_chunks
                             ]
                         },
                         "project_context": {
@@ -1664,10 +1665,13 @@ Answer naturally and consistently using the context above. Be helpful and conver
                 "rag_debug": {
                     "enhanced_query": enhanced_query,
                     "rag_success": len(rag_context.chunks) > 0,
-                    "chunks_found": len(rag_context.chunks),
+                    "chunks_found": len(cited_chunks),
+                    "chunks_retrieved": len(rag_context.chunks),
                     "total_chunks_found": rag_context.total_chunks_found,
-                    "sources_count": len(rag_context.chunks),
+                    "sources_count": len(cited_chunks),
                     "rag_content_length": len(rag_content_text),
+                    "packing": rag_context.query_metadata.get("packing"),
+                    "rerank": rag_context.query_metadata.get("rerank"),
                     "rag_content_preview": rag_content_text[:200] + "..." if len(rag_content_text) > 200 else rag_content_text,
                     "contains_aeromapper": "aeromapper" in rag_content_text.lower(),
                     "contains_weight_info": "20" in rag_content_text and "kg" in rag_content_text.lower()
@@ -1691,9 +1695,9 @@ Answer naturally and consistently using the context above. Be helpful and conver
                             "domain": chunk.source.domain,
                             "relevance_score": chunk.relevance_score,
                         }
-                        for chunk in rag_context.chunks
+                        for chunk in cited_chunks
                     ],
-                    "chunks_found": len(rag_context.chunks),
+                    "chunks_found": len(cited_chunks),
                     "debug": debug_metadata  # Add comprehensive debug info
                 }
             }
@@ -6,8 +6,9 @@ This service is decoupled from RAG and handles prompt formatting
 for different styles and use cases.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from backend.rag.core.context_models import RAGContext, RAGChunk
+from backend.services.das_context_packer import ContextPacker, PackingStats, get_context_packer
 
 
 class DASPromptBuilder:
@@ -26,16 +27,22 @@ class DASPromptBuilder:
         style: str = "comprehensive",
         include_sources: bool = True,
         max_chunks: Optional[int] = None,
+        packer: Optional[ContextPacker] = None,
     ) -> str:
         """
         Build a prompt from RAG context.
         
+        Chunks are packed under the packer's token budget; the packing
+        statistics and packed chunk ids are recorded in
+        rag_context.query_metadata["packing"].
+        
         Args:
             rag_context: RAG context containing retrieved chunks
             user_query: User's original query
             style: Prompt style ("comprehensive", "concise", "technical")
             include_sources: Whether to include source citations
-            max_chunks: Maximum number of chunks to include (None for all)
+            max_chunks: Maximum number of chunks to consider (None for all)
+            packer: Context packer (defaults to the one for the configured model)
         
         Returns:
             Formatted prompt string
@@ -43,19 +50,18 @@ class DASPromptBuilder:
         if not rag_context.chunks:
             return DASPromptBuilder._build_empty_context_prompt(user_query)
         
-        # Select chunks to include
-        chunks_to_include = rag_context.chunks
-        if max_chunks:
-            chunks_to_include = rag_context.get_top_chunks(max_chunks)
-        
-        # Build context section
-        context_section = DASPromptBuilder._build_context_section(
-            chunks_to_include,
-            include_sources=include_sources
-        )
-        
         # Build system prompt based on style
         system_prompt = DASPromptBuilder._get_system_prompt(style)
+        packer = packer or get_context_packer()
+        
+        # Select chunks to include within the token budget
+        context_section, _ = DASPromptBuilder.pack_context(
+            rag_context,
+            reserved_tokens=packer.count_tokens(system_prompt + user_query),
+            include_sources=include_sources,
+            max_chunks=max_chunks,
+            packer=packer,
+        )
         
         # Combine into final prompt
         prompt = f"""{system_prompt}
@@ -69,33 +75,74 @@ Please provide a helpful answer based on the context above. {"Include source cit
 """
         return prompt
     
+    @staticmethod
+    def pack_context(
+        rag_context: RAGContext,
+        reserved_tokens: int = 0,
+        include_sources: bool = True,
+        max_chunks: Optional[int] = None,
+        packer: Optional[ContextPacker] = None,
+    ) -> Tuple[str, PackingStats]:
+        """
+        Build the context section from the chunks that fit the token budget.
+        
+        Args:
+            rag_context: RAG context containing retrieved chunks
+            reserved_tokens: Tokens used by the rest of the prompt
+            include_sources: Whether to include source citations
+            max_chunks: Maximum number of chunks to consider (None for all)
+            packer: Context packer (defaults to the one for the configured model)
+        
+        Returns:
+            (context section, packing statistics)
+        """
+        packer = packer or get_context_packer()
+        candidates = rag_context.get_top_chunks(max_chunks) if max_chunks else rag_context.chunks
+        last = len(candidates)
+        
+        chunks, stats = packer.pack(
+            candidates,
+            reserved_tokens=reserved_tokens,
+            render=lambda chunk: DASPromptBuilder._format_chunk(chunk, last, include_sources),
+        )
+        rag_context.query_metadata["packing"] = dict(stats.to_dict(), chunk_ids=[chunk.chunk_id for chunk in chunks])
+        return DASPromptBuilder._build_context_section(chunks, include_sources=include_sources), stats
+    
+    @staticmethod
+    def packed_chunks(rag_context: RAGContext) -> List[RAGChunk]:
+        """Chunks the last pack_context put in the prompt (none if it was not packed)."""
+        packed_ids = (rag_context.query_metadata.get("packing") or {}).get("chunk_ids", [])
+        by_id = {chunk.chunk_id: chunk for chunk in rag_context.chunks}
+        return [by_id[chunk_id] for chunk_id in packed_ids if chunk_id in by_id]
+    
     @staticmethod
     def _build_context_section(
         chunks: List[RAGChunk],
         include_sources: bool = True,
     ) -> str:
         """Build the context section from chunks."""
-        context_parts = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            source_info = ""
-            if include_sources:
-                source_parts = []
-                if chunk.source.title:
-                    source_parts.append(f"Title: {chunk.source.title}")
-                if chunk.source.domain:
-                    source_parts.append(f"Domain: {chunk.source.domain}")
-                if chunk.source.source_type:
-                    source_parts.append(f"Type: {chunk.source.source_type}")
-                
-                if source_parts:
-                    source_info = f" [Source: {', '.join(source_parts)}]"
+        return "\n\n".join(
+            DASPromptBuilder._format_chunk(chunk, i, include_sources)
+            for i, chunk in enumerate(chunks, 1)
+        )
+    
+    @staticmethod
+    def _format_chunk(chunk: RAGChunk, index: int, include_sources: bool = True) -> str:
+        """Format one chunk as a numbered context entry."""
+        source_info = ""
+        if include_sources:
+            source_parts = []
+            if chunk.source.title:
+                source_parts.append(f"Title: {chunk.source.title}")
+            if chunk.source.domain:
+                source_parts.append(f"Domain: {chunk.source.domain}")
+            if chunk.source.source_type:
+                source_parts.append(f"Type: {chunk.source.source_type}")
             
-            context_parts.append(
-                f"[Context {i}]{source_info}\n{chunk.content}"
-            )
+            if source_parts:
+                source_info = f" [Source: {', '.join(source_parts)}]"
         
-        return "\n\n".join(context_parts)
+        return f"[Context {index}]{source_info}\n{chunk.content}"
     
     @staticmethod
     def _get_system_prompt(style: str) -> str:
@@ -3,14 +3,32 @@ DAS Tool Registry Implementation
 
 Implements ToolRegistryInterface to store and manage runtime-generated tools.
 Stores successful generated tools in PostgreSQL for reuse by DAS.
+
+Tool lookup runs on every DAS turn, so find_tool results are cached in process
+(cleared by store_tool/update_tool/delete_tool, and expiring after a TTL to
+bound staleness from other workers). Capability and tag filters use array
+containment so the GIN indexes on those columns apply, and name/text search
+uses ILIKE, served by trigram indexes. Usage counts are aggregated in memory
+and written in one statement per flush instead of one UPDATE per invocation;
+reads add the pending counts, a background thread flushes them every
+das_tool_usage_flush_interval_s, and close_tool_registries() flushes them at
+shutdown.
 """
 
+import asyncio
+import copy
 import json
 import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from psycopg2.extras import execute_values
+
 from .tool_registry_interface import (
     ToolRegistryInterface,
     ToolMetadata,
@@ -21,6 +39,40 @@ from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Live registries, flushed by close_tool_registries() at shutdown
+_registries: "weakref.WeakSet[DASToolRegistry]" = weakref.WeakSet()
+
+TOOL_COLUMNS = """
+    tool_id, name, description, tool_type, code, capabilities,
+    created_by, created_at, usage_count, last_used_at, tags, metadata
+"""
+
+
+def _contains_pattern(value: str) -> str:
+    """ILIKE pattern matching value anywhere (LIKE wildcards in the value are escaped)"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _row_to_tool(row) -> ToolMetadata:
+    tool_id, name, description, tool_type_str, code, capabilities, \
+    created_by, created_at, usage_count, last_used_at, tags, metadata = row
+
+    return ToolMetadata(
+        tool_id=str(tool_id),
+        name=name,
+        description=description or "",
+        tool_type=ToolType(tool_type_str),
+        code=code,
+        capabilities=capabilities or [],
+        created_at=created_at,
+        created_by=created_by,
+        usage_count=usage_count or 0,
+        last_used_at=last_used_at,
+        tags=tags or [],
+        metadata=metadata or {},
+    )
+
 
 class DASToolRegistry(ToolRegistryInterface):
     """
@@ -34,6 +86,62 @@ class DASToolRegistry(ToolRegistryInterface):
         """Initialize DAS tool registry."""
         self.settings = settings
         self.db_service = db_service or DatabaseService(settings)
+
+        self.cache_ttl_s = getattr(settings, "das_tool_cache_ttl_s", 60.0)
+        self.cache_entries = getattr(settings, "das_tool_cache_entries", 256)
+        self.usage_flush_interval_s = getattr(settings, "das_tool_usage_flush_interval_s", 30.0)
+        self.usage_flush_batch = getattr(settings, "das_tool_usage_flush_batch", 100)
+
+        # find_tool filters -> (expires_at, tools)
+        self._catalog: "OrderedDict[Tuple, Tuple[float, List[ToolMetadata]]]" = OrderedDict()
+        # tool_id -> (pending increment, last used)
+        self._pending_usage: Dict[str, Tuple[int, datetime]] = {}
+        self._last_usage_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        _registries.add(self)
+
+    def invalidate_cache(self) -> None:
+        """Drop cached lookups (called after every catalog write)."""
+        with self._lock:
+            self._catalog.clear()
+
+    def _cached(self, key: Tuple) -> Optional[List[ToolMetadata]]:
+        with self._lock:
+            entry = self._catalog.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._catalog.move_to_end(key)
+                return list(entry[1])
+            return None
+
+    def _with_pending_usage(self, tools: List[ToolMetadata]) -> List[ToolMetadata]:
+        """Tools with usage that is recorded but not yet flushed added in."""
+        with self._lock:
+            pending = {tool.tool_id: self._pending_usage[tool.tool_id]
+                       for tool in tools if tool.tool_id in self._pending_usage}
+        if not pending:
+            return tools
+
+        merged = []
+        for tool in tools:
+            if tool.tool_id in pending:
+                increment, last_used = pending[tool.tool_id]
+                tool = copy.copy(tool)
+                tool.usage_count += increment
+                if tool.last_used_at is None or tool.last_used_at < last_used:
+                    tool.last_used_at = last_used
+            merged.append(tool)
+        return merged
+
+    def _cache(self, key: Tuple, tools: List[ToolMetadata]) -> None:
+        if self.cache_entries <= 0:
+            return
+        with self._lock:
+            self._catalog[key] = (time.monotonic() + self.cache_ttl_s, list(tools))
+            self._catalog.move_to_end(key)
+            while len(self._catalog) > self.cache_entries:
+                self._catalog.popitem(last=False)
     
     async def store_tool(
         self,
@@ -85,6 +193,7 @@ class DASToolRegistry(ToolRegistryInterface):
                 ))
                 conn.commit()
             
+            self.invalidate_cache()
             logger.info(f"Stored tool '{name}' (ID: {tool_id})")
             return tool_id
             
@@ -103,6 +212,7 @@ class DASToolRegistry(ToolRegistryInterface):
         capability: Optional[str] = None,
         tags: Optional[List[str]] = None,
         created_by: Optional[str] = None,
+        query: Optional[str] = None,
     ) -> List[ToolMetadata]:
         """
         Find tools matching criteria.
@@ -114,10 +224,17 @@ class DASToolRegistry(ToolRegistryInterface):
             capability: Filter by capability
             tags: Filter by tags (all must match)
             created_by: Filter by creator
+            query: Text matched (partially) against name or description
             
         Returns:
             List of matching ToolMetadata objects
         """
+        key = (tool_id, name.lower() if name else None, tool_type, capability,
+               tuple(sorted(set(tags))) if tags else None, created_by, query.lower() if query else None)
+        cached = self._cached(key)
+        if cached is not None:
+            return self._with_pending_usage(cached)
+
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
@@ -130,64 +247,41 @@ class DASToolRegistry(ToolRegistryInterface):
                     params.append(tool_id)
                 
                 if name:
-                    conditions.append("LOWER(name) LIKE %s")
-                    params.append(f"%{name.lower()}%")
+                    conditions.append("name ILIKE %s")
+                    params.append(_contains_pattern(name))
+                
+                if query:
+                    conditions.append("(name ILIKE %s OR description ILIKE %s)")
+                    params.extend([_contains_pattern(query)] * 2)
                 
                 if tool_type:
                     conditions.append("tool_type = %s")
                     params.append(tool_type.value)
                 
                 if capability:
-                    conditions.append("%s = ANY(capabilities)")
+                    conditions.append("capabilities @> ARRAY[%s]::text[]")
                     params.append(capability)
                 
                 if tags:
-                    for tag in tags:
-                        conditions.append("%s = ANY(tags)")
-                        params.append(tag)
+                    conditions.append("tags @> %s::text[]")
+                    params.append(list(key[4]))
                 
                 if created_by:
                     conditions.append("created_by = %s")
                     params.append(created_by)
                 
-                query = f"""
-                    SELECT 
-                        tool_id, name, description, tool_type, code, capabilities,
-                        created_by, created_at, usage_count, last_used_at, tags, metadata
+                cur.execute(f"""
+                    SELECT {TOOL_COLUMNS}
                     FROM das_runtime_tools
                     WHERE {' AND '.join(conditions)}
                     ORDER BY usage_count DESC, created_at DESC
-                """
-                
-                cur.execute(query, params)
-                rows = cur.fetchall()
-                
-                tools = []
-                for row in rows:
-                    tool_id, name, description, tool_type_str, code, capabilities, \
-                    created_by, created_at, usage_count, last_used_at, tags, metadata = row
-                    
-                    tool_type = ToolType(tool_type_str)
-                    
-                    tool = ToolMetadata(
-                        tool_id=str(tool_id),
-                        name=name,
-                        description=description or "",
-                        tool_type=tool_type,
-                        code=code,
-                        capabilities=capabilities or [],
-                        created_at=created_at,
-                        created_by=created_by,
-                        usage_count=usage_count or 0,
-                        last_used_at=last_used_at,
-                        tags=tags or [],
-                        metadata=metadata or {},
-                    )
-                    tools.append(tool)
-                
-                return tools
+                """, params)
+                tools = [_row_to_tool(row) for row in cur.fetchall()]
         finally:
             self.db_service._return(conn)
+
+        self._cache(key, tools)
+        return self._with_pending_usage(list(tools))
     
     async def get_tool(self, tool_id: str) -> Optional[ToolMetadata]:
         """
@@ -266,6 +360,7 @@ class DASToolRegistry(ToolRegistryInterface):
                 cur.execute(query, params)
                 conn.commit()
                 
+                self.invalidate_cache()
                 return cur.rowcount > 0
         except Exception as e:
             conn.rollback()
@@ -282,33 +377,97 @@ class DASToolRegistry(ToolRegistryInterface):
         """
         Update tool usage statistics.
         
+        The increment is aggregated in memory (and included in lookups) and
+        written with the next flush, which happens once flush_batch tools have
+        pending usage, or every flush interval from a background thread.
+        
         Args:
             tool_id: Tool identifier
             increment: Usage count increment (default: 1)
             
         Returns:
-            True if updated, False if not found
+            True once the usage is recorded
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            pending, _ = self._pending_usage.get(tool_id, (0, now))
+            self._pending_usage[tool_id] = (pending + increment, now)
+            due = (len(self._pending_usage) >= self.usage_flush_batch
+                   or time.monotonic() - self._last_usage_flush >= self.usage_flush_interval_s)
+            self._start_flusher()
+        if due:
+            self.flush_usage()
+        return True
+
+    def flush_usage(self) -> int:
+        """
+        Write pending usage counts in one statement.
+        
+        Returns:
+            Number of tools updated; on failure the counts stay pending
         """
+        with self._lock:
+            pending, self._pending_usage = self._pending_usage, {}
+            self._last_usage_flush = time.monotonic()
+        if not pending:
+            return 0
+
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE das_runtime_tools
-                    SET 
-                        usage_count = usage_count + %s,
-                        last_used_at = NOW(),
-                        updated_at = NOW()
-                    WHERE tool_id = %s AND is_active = TRUE
-                """, (increment, tool_id))
+                execute_values(cur, """
+                    UPDATE das_runtime_tools AS t
+                    SET
+                        usage_count = t.usage_count + v.increment,
+                        last_used_at = GREATEST(t.last_used_at, v.last_used)
+                    FROM (VALUES %s) AS v(tool_id, increment, last_used)
+                    WHERE t.tool_id = v.tool_id AND t.is_active = TRUE
+                """, [(tool_id, increment, last_used) for tool_id, (increment, last_used) in pending.items()],
+                    template="(%s::uuid, %s::integer, %s::timestamptz)", page_size=len(pending))
                 conn.commit()
-                
-                return cur.rowcount > 0
+                # Cached lookups hold the counts read before this flush
+                self.invalidate_cache()
+                return cur.rowcount
         except Exception as e:
             conn.rollback()
-            logger.error(f"Failed to update usage for tool {tool_id}: {e}")
-            return False
+            logger.error(f"Failed to flush usage for {len(pending)} tools: {e}")
+            with self._lock:
+                for tool_id, (increment, last_used) in pending.items():
+                    current, latest = self._pending_usage.get(tool_id, (0, last_used))
+                    self._pending_usage[tool_id] = (current + increment, max(latest, last_used))
+            return 0
         finally:
             self.db_service._return(conn)
+
+    def _start_flusher(self) -> None:
+        """Start the periodic flush thread (called with the lock held)."""
+        if self._flusher is not None or self.usage_flush_interval_s <= 0 or self._stop_flusher.is_set():
+            return
+        self._flusher = threading.Thread(target=self._flush_periodically, name="das-tool-usage-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flusher.wait(self.usage_flush_interval_s):
+            if time.monotonic() - self._last_usage_flush >= self.usage_flush_interval_s:
+                self.flush_usage()
+
+    def shutdown(self) -> int:
+        """
+        Stop the flush thread and write pending usage counts.
+        
+        Returns:
+            Number of tools updated by the final flush
+        """
+        self._stop_flusher.set()
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join(timeout=5)
+        return self.flush_usage()
+
+    async def close(self) -> None:
+        """Flush pending usage counts (call on shutdown)."""
+        await asyncio.to_thread(self.shutdown)
     
     async def delete_tool(self, tool_id: str) -> bool:
         """
@@ -330,6 +489,7 @@ class DASToolRegistry(ToolRegistryInterface):
                 """, (tool_id,))
                 conn.commit()
                 
+                self.invalidate_cache()
                 return cur.rowcount > 0
         except Exception as e:
             conn.rollback()
@@ -357,57 +517,35 @@ class DASToolRegistry(ToolRegistryInterface):
         Returns:
             List of ToolMetadata objects
         """
+        # Validate sort_by
+        valid_sort_fields = {
+            "created_at": "created_at",
+            "usage_count": "usage_count",
+            "name": "name",
+            "last_used_at": "last_used_at",
+        }
+        sort_field = valid_sort_fields.get(sort_by, "created_at")
+        sort_dir = "DESC" if sort_order.lower() == "desc" else "ASC"
+        
+        if sort_field in ("usage_count", "last_used_at"):
+            self.flush_usage()
+
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
-                # Validate sort_by
-                valid_sort_fields = {
-                    "created_at": "created_at",
-                    "usage_count": "usage_count",
-                    "name": "name",
-                    "last_used_at": "last_used_at",
-                }
-                sort_field = valid_sort_fields.get(sort_by, "created_at")
-                sort_dir = "DESC" if sort_order.lower() == "desc" else "ASC"
-                
                 cur.execute(f"""
-                    SELECT 
-                        tool_id, name, description, tool_type, code, capabilities,
-                        created_by, created_at, usage_count, last_used_at, tags, metadata
+                    SELECT {TOOL_COLUMNS}
                     FROM das_runtime_tools
                     WHERE is_active = TRUE
                     ORDER BY {sort_field} {sort_dir}
                     LIMIT %s OFFSET %s
                 """, (limit, offset))
                 
-                rows = cur.fetchall()
-                
-                tools = []
-                for row in rows:
-                    tool_id, name, description, tool_type_str, code, capabilities, \
-                    created_by, created_at, usage_count, last_used_at, tags, metadata = row
-                    
-                    tool_type = ToolType(tool_type_str)
-                    
-                    tool = ToolMetadata(
-                        tool_id=str(tool_id),
-                        name=name,
-                        description=description or "",
-                        tool_type=tool_type,
-                        code=code,
-                        capabilities=capabilities or [],
-                        created_at=created_at,
-                        created_by=created_by,
-                        usage_count=usage_count or 0,
-                        last_used_at=last_used_at,
-                        tags=tags or [],
-                        metadata=metadata or {},
-                    )
-                    tools.append(tool)
-                
-                return tools
+                tools = [_row_to_tool(row) for row in cur.fetchall()]
         finally:
             self.db_service._return(conn)
+
+        return self._with_pending_usage(tools)
     
     async def get_popular_tools(
         self,
@@ -428,3 +566,13 @@ class DASToolRegistry(ToolRegistryInterface):
             sort_by="usage_count",
             sort_order="desc"
         )
+
+
+def close_tool_registries() -> int:
+    """
+    Flush and stop every live registry (called at application shutdown).
+    
+    Returns:
+        Number of tools whose usage was written
+    """
+    return sum(registry.shutdown() for registry in list(_registries))
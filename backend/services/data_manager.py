@@ -9,10 +9,12 @@ Centralized service for workbench data access, providing:
 - Caching where appropriate
 """
 
+import base64
+import hashlib
 import logging
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from sqlalchemy import text
 import json
 
 from backend.services.db import DatabaseService
@@ -36,6 +38,88 @@ from backend.schemas.workbench_data import (
 logger = logging.getLogger(__name__)
 
 
+# Filterable columns per workbench (anything else is rejected rather than
+# interpolated into SQL)
+REQUIREMENT_FILTER_FIELDS = {
+    "requirement_identifier", "requirement_title", "requirement_text", "requirement_type",
+    "category", "subcategory", "priority", "state", "verification_method",
+    "verification_status", "is_published", "is_immutable", "source_document_id",
+    "created_by", "created_at", "updated_at",
+}
+FILE_FILTER_FIELDS = {
+    "filename", "original_filename", "content_type", "file_size", "status",
+    "storage_backend", "created_by", "created_at", "updated_at", "is_deleted",
+}
+
+# Sortable fields -> NOT NULL sort expressions, so that keyset comparisons
+# reach every row. The expressions match the keyset indexes in odras_schema.sql.
+REQUIREMENT_SORT_KEYS = {
+    "requirement_identifier": "r.requirement_identifier",
+    "requirement_title": "r.requirement_title",
+    "requirement_type": "r.requirement_type",
+    "priority": "COALESCE(r.priority, '')",
+    "state": "COALESCE(r.state, '')",
+    "verification_status": "COALESCE(r.verification_status, '')",
+    "created_at": "COALESCE(r.created_at, '-infinity'::timestamptz)",
+    "updated_at": "COALESCE(r.updated_at, '-infinity'::timestamptz)",
+}
+FILE_SORT_KEYS = {
+    "filename": "f.filename",
+    "file_size": "f.file_size",
+    "status": "COALESCE(f.status, '')",
+    "created_at": "COALESCE(f.created_at, '-infinity'::timestamptz)",
+    "updated_at": "COALESCE(f.updated_at, '-infinity'::timestamptz)",
+}
+
+
+@dataclass
+class WorkbenchQueryPlan:
+    """Pieces of a workbench query; paging and counting are added by WorkbenchDataManager."""
+    select: str
+    from_clause: str
+    conditions: List[str]
+    params: Dict[str, Any]
+    # (sort expression, order); the last entry is the unique tiebreaker
+    order: List[Tuple[str, SortOrder]] = field(default_factory=list)
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(self.conditions)
+
+    @property
+    def signature(self) -> str:
+        """Identifies the sort so cursors cannot be replayed against another ordering"""
+        spec = ",".join(f"{expr} {order.value}" for expr, order in self.order)
+        return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+def _like_pattern(value: Any, operator: FilterOperator) -> str:
+    """ILIKE pattern for a literal value (LIKE wildcards in the value are escaped)"""
+    escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if operator == FilterOperator.STARTS_WITH:
+        return f"{escaped}%"
+    if operator == FilterOperator.ENDS_WITH:
+        return f"%{escaped}"
+    return f"%{escaped}%"
+
+
+def encode_cursor(plan: WorkbenchQueryPlan, values: List[Optional[str]]) -> str:
+    payload = json.dumps({"s": plan.signature, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(plan: WorkbenchQueryPlan, cursor: str) -> List[Optional[str]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if payload.get("s") != plan.signature or len(values) != len(plan.order):
+        raise ValueError("Pagination cursor does not match the requested sort order")
+    return values
+
+
 class WorkbenchDataManager:
     """
     Centralized data manager for all workbench operations.
@@ -93,27 +177,49 @@ class WorkbenchDataManager:
                 raise ValueError(f"Unsupported workbench type: {request.workbench_type}")
             
             # Build and execute query
-            query, count_query, params = query_builder(request, user_id)
+            plan = query_builder(request, user_id)
+            pagination = request.pagination
+            cursor_values = decode_cursor(plan, pagination.cursor) if pagination.cursor else None
+            offset = 0 if cursor_values else (pagination.page - 1) * pagination.page_size
             
-            # Execute count query for total
-            total_count = await self._execute_count_query(count_query, params)
+            # Fetch one extra row to learn whether there is a next page
+            query, params = self._build_page_query(plan, pagination.page_size + 1, offset, cursor_values)
+            rows = await self._execute_data_query(query, params)
+            has_next = len(rows) > pagination.page_size
+            rows = rows[:pagination.page_size]
             
-            # Execute data query
-            items = await self._execute_data_query(query, params)
+            sort_columns = [f"_sort_{i}" for i in range(len(plan.order))]
+            next_cursor = encode_cursor(plan, [rows[-1][c] for c in sort_columns]) if has_next else None
+            items = [{k: v for k, v in row.items() if k not in sort_columns} for row in rows]
+            
+            # Totals: free when everything fits on the first page, otherwise a
+            # planner estimate unless an exact count is requested
+            total_is_estimate = False
+            if not cursor_values and not has_next and (items or offset == 0):
+                total_count = offset + len(items)
+            elif pagination.exact_count:
+                total_count = await self._execute_count_query(
+                    f"SELECT COUNT(*) FROM {plan.from_clause} WHERE {plan.where}", plan.params
+                )
+            else:
+                total_count = await self._estimate_count(plan)
+                total_count = max(total_count, offset + len(items) + int(has_next))
+                total_is_estimate = True
             
             # Calculate pagination metadata
-            total_pages = (total_count + request.pagination.page_size - 1) // request.pagination.page_size
-            has_next = request.pagination.page < total_pages
-            has_previous = request.pagination.page > 1
+            total_pages = (total_count + pagination.page_size - 1) // pagination.page_size
+            has_previous = cursor_values is not None or pagination.page > 1
             
             paginated_data = PaginatedResponse(
                 items=items,
                 total_count=total_count,
-                page=request.pagination.page,
-                page_size=request.pagination.page_size,
+                page=pagination.page,
+                page_size=pagination.page_size,
                 total_pages=total_pages,
                 has_next=has_next,
-                has_previous=has_previous
+                has_previous=has_previous,
+                next_cursor=next_cursor,
+                total_is_estimate=total_is_estimate,
             )
             
             return WorkbenchQueryResponse(
@@ -260,61 +366,37 @@ class WorkbenchDataManager:
         self,
         request: WorkbenchQueryRequest,
         user_id: str
-    ) -> Tuple[str, str, Dict[str, Any]]:
+    ) -> WorkbenchQueryPlan:
         """Build SQL query for requirements workbench"""
-        base_query = """
-            SELECT r.*, u.username as created_by_username
-            FROM requirements r
-            LEFT JOIN users u ON r.created_by = u.user_id
-            WHERE r.project_id = %(project_id)s
-        """
-        
-        count_query = f"SELECT COUNT(*) FROM ({base_query}) AS subquery"
+        plan = WorkbenchQueryPlan(
+            select="r.*, u.username as created_by_username",
+            from_clause="requirements_enhanced r LEFT JOIN users u ON r.created_by = u.user_id",
+            conditions=["r.project_id = %(project_id)s"],
+            params={"project_id": request.project_id},
+        )
         
         # Apply filters
-        where_conditions = ["r.project_id = %(project_id)s"]
-        params = {"project_id": request.project_id}
-        
-        for i, filter_crit in enumerate(request.filters):
-            condition, param_name = self._build_filter_condition(filter_crit, f"filter_{i}")
-            where_conditions.append(condition)
-            params[param_name] = filter_crit.value
+        self._apply_filters(plan, request.filters, "r", REQUIREMENT_FILTER_FIELDS)
         
-        # Apply search query
+        # Apply search query (served by the trigram indexes)
         if request.search_query:
-            where_conditions.append(
+            plan.conditions.append(
                 "(r.requirement_title ILIKE %(search)s OR r.requirement_text ILIKE %(search)s)"
             )
-            params["search"] = f"%{request.search_query}%"
-        
-        # Build WHERE clause
-        where_clause = " AND ".join(where_conditions)
-        base_query = base_query.replace("WHERE r.project_id = %(project_id)s", f"WHERE {where_clause}")
+            plan.params["search"] = _like_pattern(request.search_query, FilterOperator.CONTAINS)
         
         # Apply sorting
-        order_by = []
-        if request.sort:
-            for sort_crit in request.sort:
-                order_by.append(f"r.{sort_crit.field} {sort_crit.order.value.upper()}")
-        else:
-            order_by.append("r.updated_at DESC")  # Default sort
-        
-        order_clause = f"ORDER BY {', '.join(order_by)}"
-        
-        # Apply pagination
-        offset = (request.pagination.page - 1) * request.pagination.page_size
-        limit_clause = f"LIMIT {request.pagination.page_size} OFFSET {offset}"
-        
-        final_query = f"{base_query} {order_clause} {limit_clause}"
-        count_query = f"SELECT COUNT(*) FROM ({base_query}) AS subquery"
-        
-        return final_query, count_query, params
+        plan.order = self._build_sort_keys(
+            request.sort, REQUIREMENT_SORT_KEYS, "r.requirement_id",
+            default=SortCriteria(field="updated_at", order=SortOrder.DESC),
+        )
+        return plan
     
     def _build_individuals_query(
         self,
         request: WorkbenchQueryRequest,
         user_id: str
-    ) -> Tuple[str, str, Dict[str, Any]]:
+    ) -> WorkbenchQueryPlan:
         """Build SQL query for individuals workbench"""
         # Placeholder - implement based on individuals table structure
         raise NotImplementedError("Individuals query builder not yet implemented")
@@ -323,86 +405,157 @@ class WorkbenchDataManager:
         self,
         request: WorkbenchQueryRequest,
         user_id: str
-    ) -> Tuple[str, str, Dict[str, Any]]:
+    ) -> WorkbenchQueryPlan:
         """Build SQL query for files workbench"""
-        base_query = """
-            SELECT f.*, u.username as uploaded_by_username
-            FROM files f
-            LEFT JOIN users u ON f.uploaded_by = u.user_id
-            WHERE f.project_id = %(project_id)s
-        """
-        
-        where_conditions = ["f.project_id = %(project_id)s"]
-        params = {"project_id": request.project_id}
+        plan = WorkbenchQueryPlan(
+            select="f.*, u.username as uploaded_by_username",
+            from_clause="files f LEFT JOIN users u ON f.created_by = u.user_id::text",
+            conditions=["f.project_id = %(project_id)s"],
+            params={"project_id": request.project_id},
+        )
         
         # Apply filters
-        for i, filter_crit in enumerate(request.filters):
-            condition, param_name = self._build_filter_condition(filter_crit, f"filter_{i}")
-            where_conditions.append(condition)
-            params[param_name] = filter_crit.value
+        self._apply_filters(plan, request.filters, "f", FILE_FILTER_FIELDS)
         
         # Apply search
         if request.search_query:
-            where_conditions.append("f.filename ILIKE %(search)s")
-            params["search"] = f"%{request.search_query}%"
-        
-        where_clause = " AND ".join(where_conditions)
-        base_query = base_query.replace("WHERE f.project_id = %(project_id)s", f"WHERE {where_clause}")
+            plan.conditions.append("f.filename ILIKE %(search)s")
+            plan.params["search"] = _like_pattern(request.search_query, FilterOperator.CONTAINS)
         
         # Sorting
-        order_by = []
-        if request.sort:
-            for sort_crit in request.sort:
-                order_by.append(f"f.{sort_crit.field} {sort_crit.order.value.upper()}")
-        else:
-            order_by.append("f.uploaded_at DESC")
-        
-        order_clause = f"ORDER BY {', '.join(order_by)}"
-        
-        # Pagination
-        offset = (request.pagination.page - 1) * request.pagination.page_size
-        limit_clause = f"LIMIT {request.pagination.page_size} OFFSET {offset}"
-        
-        final_query = f"{base_query} {order_clause} {limit_clause}"
-        count_query = f"SELECT COUNT(*) FROM ({base_query}) AS subquery"
-        
-        return final_query, count_query, params
+        plan.order = self._build_sort_keys(
+            request.sort, FILE_SORT_KEYS, "f.id",
+            default=SortCriteria(field="created_at", order=SortOrder.DESC),
+        )
+        return plan
     
     def _build_knowledge_query(
         self,
         request: WorkbenchQueryRequest,
         user_id: str
-    ) -> Tuple[str, str, Dict[str, Any]]:
+    ) -> WorkbenchQueryPlan:
         """Build SQL query for knowledge workbench"""
         # Placeholder - implement based on knowledge_assets table structure
         raise NotImplementedError("Knowledge query builder not yet implemented")
     
-    def _build_filter_condition(self, filter_crit: FilterCriteria, param_prefix: str) -> Tuple[str, str]:
-        """Build SQL WHERE condition from filter criteria"""
-        field = filter_crit.field
+    def _apply_filters(
+        self,
+        plan: WorkbenchQueryPlan,
+        filters: List[FilterCriteria],
+        alias: str,
+        allowed_fields: set
+    ) -> None:
+        """Add filter conditions for whitelisted fields to the plan"""
+        for i, filter_crit in enumerate(filters):
+            if filter_crit.field not in allowed_fields:
+                raise ValueError(f"Unsupported filter field: {filter_crit.field}")
+            condition, param_name, value = self._build_filter_condition(filter_crit, f"filter_{i}", alias)
+            plan.conditions.append(condition)
+            plan.params[param_name] = value
+    
+    def _build_sort_keys(
+        self,
+        sort: List[SortCriteria],
+        sort_keys: Dict[str, str],
+        tiebreaker: str,
+        default: SortCriteria
+    ) -> List[Tuple[str, SortOrder]]:
+        """Resolve sort criteria to sort expressions, ending with a unique tiebreaker"""
+        order = []
+        for sort_crit in sort or [default]:
+            if sort_crit.field not in sort_keys:
+                raise ValueError(f"Unsupported sort field: {sort_crit.field}")
+            order.append((sort_keys[sort_crit.field], sort_crit.order))
+        order.append((tiebreaker, order[-1][1]))
+        return order
+    
+    def _build_keyset_condition(
+        self,
+        plan: WorkbenchQueryPlan,
+        values: List[Optional[str]],
+        params: Dict[str, Any]
+    ) -> str:
+        """
+        WHERE condition selecting rows after the cursor position.
+        
+        A single sort direction becomes one row comparison, which Postgres
+        turns into an index range; mixed directions expand to
+        (a > x) OR (a = x AND (b < y)) ...
+        """
+        for i, value in enumerate(values):
+            params[f"cursor_{i}"] = value
+        directions = {order for _, order in plan.order}
+        if len(directions) == 1:
+            op = "<" if SortOrder.DESC in directions else ">"
+            columns = ", ".join(expr for expr, _ in plan.order)
+            placeholders = ", ".join(f"%(cursor_{i})s" for i in range(len(values)))
+            return f"({columns}) {op} ({placeholders})"
+        
+        condition = None
+        for i in reversed(range(len(plan.order))):
+            expr, order = plan.order[i]
+            op = "<" if order == SortOrder.DESC else ">"
+            after = f"{expr} {op} %(cursor_{i})s"
+            condition = after if condition is None else f"({after} OR ({expr} = %(cursor_{i})s AND {condition}))"
+        return condition
+    
+    def _build_page_query(
+        self,
+        plan: WorkbenchQueryPlan,
+        limit: int,
+        offset: int,
+        cursor_values: Optional[List[Optional[str]]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Data query for one page; sort keys are returned as _sort_N text columns for the next cursor"""
+        params = dict(plan.params)
+        conditions = list(plan.conditions)
+        if cursor_values:
+            conditions.append(self._build_keyset_condition(plan, cursor_values, params))
+        
+        sort_columns = ", ".join(f"({expr})::text AS _sort_{i}" for i, (expr, _) in enumerate(plan.order))
+        order_clause = ", ".join(f"{expr} {order.value.upper()}" for expr, order in plan.order)
+        query = (
+            f"SELECT {plan.select}, {sort_columns} FROM {plan.from_clause} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY {order_clause} LIMIT {int(limit)}"
+        )
+        if offset:
+            query += f" OFFSET {int(offset)}"
+        return query, params
+    
+    def _build_filter_condition(
+        self,
+        filter_crit: FilterCriteria,
+        param_prefix: str,
+        alias: str
+    ) -> Tuple[str, str, Any]:
+        """Build SQL WHERE condition (and its parameter value) from filter criteria"""
+        field = f"{alias}.{filter_crit.field}"
         operator = filter_crit.operator
-        param_name = f"{param_prefix}_{field}"
+        param_name = f"{param_prefix}_{filter_crit.field}"
+        value = filter_crit.value
         
         if operator == FilterOperator.EQUALS:
-            return f"{field} = %({param_name})s", param_name
+            return f"{field} = %({param_name})s", param_name, value
         elif operator == FilterOperator.NOT_EQUALS:
-            return f"{field} != %({param_name})s", param_name
-        elif operator == FilterOperator.CONTAINS:
-            return f"{field} ILIKE %({param_name})s", param_name.replace("_", "_")
-        elif operator == FilterOperator.STARTS_WITH:
-            return f"{field} ILIKE %({param_name})s", param_name.replace("_", "_")
-        elif operator == FilterOperator.ENDS_WITH:
-            return f"{field} ILIKE %({param_name})s", param_name.replace("_", "_")
+            return f"{field} != %({param_name})s", param_name, value
+        elif operator in (FilterOperator.CONTAINS, FilterOperator.STARTS_WITH, FilterOperator.ENDS_WITH):
+            return f"{field} ILIKE %({param_name})s", param_name, _like_pattern(value, operator)
         elif operator == FilterOperator.GREATER_THAN:
-            return f"{field} > %({param_name})s", param_name
+            return f"{field} > %({param_name})s", param_name, value
         elif operator == FilterOperator.LESS_THAN:
-            return f"{field} < %({param_name})s", param_name
+            return f"{field} < %({param_name})s", param_name, value
+        elif operator == FilterOperator.GREATER_THAN_OR_EQUAL:
+            return f"{field} >= %({param_name})s", param_name, value
+        elif operator == FilterOperator.LESS_THAN_OR_EQUAL:
+            return f"{field} <= %({param_name})s", param_name, value
         elif operator == FilterOperator.IN:
-            return f"{field} = ANY(%({param_name})s)", param_name
+            return f"{field} = ANY(%({param_name})s)", param_name, value
+        elif operator == FilterOperator.NOT_IN:
+            return f"NOT ({field} = ANY(%({param_name})s))", param_name, value
         elif operator == FilterOperator.IS_NULL:
-            return f"{field} IS NULL", param_name
+            return f"{field} IS NULL", param_name, value
         elif operator == FilterOperator.IS_NOT_NULL:
-            return f"{field} IS NOT NULL", param_name
+            return f"{field} IS NOT NULL", param_name, value
         else:
             raise ValueError(f"Unsupported filter operator: {operator}")
     
@@ -417,6 +570,21 @@ class WorkbenchDataManager:
         finally:
             self.db._return(conn)
     
+    async def _estimate_count(self, plan: WorkbenchQueryPlan) -> int:
+        """Planner row estimate for the filtered query (no scan of the matching rows)"""
+        conn = self.db._conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {plan.from_clause} WHERE {plan.where}", plan.params
+                )
+                explain = cur.fetchone()[0]
+                if isinstance(explain, str):
+                    explain = json.loads(explain)
+                return int(explain[0]["Plan"]["Plan Rows"])
+        finally:
+            self.db._return(conn)
+    
     async def _execute_data_query(self, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute data query and return results"""
         import psycopg2.extras
@@ -10,18 +10,14 @@ Provides text embedding generation using various models including:
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 import hashlib
+import importlib.util
 import json
 from datetime import datetime
 import os
 
-try:
-    from sentence_transformers import SentenceTransformer
-    import torch
-
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
+# sentence-transformers pulls in torch (seconds of import time and hundreds of
+# MB of RSS); only probe for it here and import it when a model is loaded.
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
 
 try:
     import openai
@@ -175,6 +171,8 @@ class EmbeddingService:
 
             if config["type"] == "sentence_transformer":
                 logger.info(f"Loading SentenceTransformer model: {config['model_name']}")
+                from sentence_transformers import SentenceTransformer
+
                 model = SentenceTransformer(config["model_name"], cache_folder=self.cache_dir)
                 self.models[model_id] = {
                     "model": model,
@@ -224,8 +222,11 @@ class EmbeddingService:
                 logger.info(f"Unloaded model: {model_id}")
 
                 # Clear CUDA cache if using GPU
-                if torch and torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                if SENTENCE_TRANSFORMERS_AVAILABLE:
+                    import torch
+
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
 
                 return True
             else:
@@ -12,11 +12,14 @@ Key Architecture Principles:
 
 import json
 import logging
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from redis.exceptions import ResponseError
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,10 +144,19 @@ class EventCapture2:
     - Dual-write to vectors with IDs-only payloads
     """
 
-    def __init__(self, redis_client=None, sql_first_manager=None):
+    def __init__(self, redis_client=None, sql_first_manager=None, settings=None):
+        from backend.services.config import Settings
+
+        settings = settings or Settings()
         self.redis = redis_client
         self.sql_first_manager = sql_first_manager
-        self.event_queue = "eventcapture2_events"  # Backup queue if SQL-first unavailable
+
+        # Redis stream consumed in batches by EventCapture2Worker consumer group
+        self.event_stream = settings.eventcapture_stream
+        self.consumer_group = settings.eventcapture_consumer_group
+        self.dead_letter_stream = settings.eventcapture_dead_letter_stream
+        self.stream_maxlen = settings.eventcapture_stream_maxlen
+        self.max_deliveries = settings.eventcapture_max_deliveries
         logger.info("EventCapture2 initialized - SQL-first event capture ready")
 
     async def capture_project_created(
@@ -667,108 +679,246 @@ class EventCapture2:
             return False
 
     async def _store_event(self, event: EnhancedEvent) -> bool:
-        """Store event using SQL-first architecture via SqlFirstThreadManager"""
+        """
+        Queue event on the Redis stream for batched SQL-first persistence.
+
+        The EventCapture2Worker consumer group drains the stream in batches.
+        Without Redis, the event is written directly via SqlFirstThreadManager.
+        """
         try:
-            print(f"🔥 EVENTCAPTURE2 SQL-FIRST: Attempting to store event - {event.summary}")
-            print(f"🔥 EVENTCAPTURE2 SQL-FIRST: SQL manager available: {bool(self.sql_first_manager)}")
-            print(f"🔥 EVENTCAPTURE2 SQL-FIRST: Project ID: {event.project_id}")
+            if self.redis:
+                entry_id = await self.redis.xadd(
+                    self.event_stream,
+                    {"event": json.dumps(event.to_dict())},
+                    maxlen=self.stream_maxlen,
+                    approximate=True,
+                )
+                logger.debug(f"EventCapture2: Queued event {entry_id} - {event.summary}")
+                return True
 
-            # Primary: SQL-first storage via SqlFirstThreadManager
             if self.sql_first_manager and event.project_id:
-                try:
-                    # Get or create project thread for this event
-                    thread_data = await self.sql_first_manager.get_or_create_project_thread(
-                        project_id=event.project_id,
-                        user_id=event.user_id
-                    )
+                return await self._store_event_direct(event)
 
-                    project_thread_id = thread_data.get("project_thread_id")
-                    print(f"🔥 EVENTCAPTURE2 SQL-FIRST: Got thread_id: {project_thread_id}")
-
-                    if project_thread_id:
-                        # Store event in SQL-first system
-                        event_id = await self.sql_first_manager.capture_event(
-                            project_thread_id=project_thread_id,
-                            project_id=event.project_id,
-                            user_id=event.user_id,
-                            event_type=event.event_type.value,
-                            event_data={
-                                "summary": event.summary,
-                                "details": event.details,
-                                "context": event.context,
-                                "endpoint": event.endpoint,
-                                "method": event.method,
-                                "response_time": event.response_time,
-                                "timestamp": event.timestamp.isoformat()
-                            },
-                            context_snapshot={
-                                "username": event.username,
-                                "event_id": event.event_id
-                            }
-                        )
-
-                        print(f"🔥 EVENTCAPTURE2 SQL-FIRST: SUCCESS - Stored event {event_id}")
-                        logger.debug(f"EventCapture2: SQL-first storage success - {event.summary}")
-                        return True
-                    else:
-                        print(f"🔥 EVENTCAPTURE2 SQL-FIRST: WARN - Could not get thread_id")
-                        logger.warning(f"EventCapture2: Could not get project_thread_id for project {event.project_id}")
+            logger.warning(f"EventCapture2: No storage available for event - {event.summary}")
+            return False
 
-                except Exception as sql_error:
-                    print(f"🔥 EVENTCAPTURE2 SQL-FIRST: ERROR - {sql_error}")
-                    logger.error(f"EventCapture2: SQL-first storage failed: {sql_error}")
-                    # Fall through to Redis backup
+        except Exception as e:
+            logger.error(f"Failed to store event: {e}")
+            # Stream unavailable - fall back to direct SQL-first storage
+            if self.sql_first_manager and event.project_id:
+                return await self._store_event_direct(event)
+            return False
 
-            # Backup: Redis queue if SQL-first unavailable or no project_id
-            if self.redis:
-                event_json = json.dumps(event.to_dict())
-                result = await self.redis.lpush(self.event_queue, event_json)
-                print(f"🔥 EVENTCAPTURE2 REDIS: Backup storage - Redis result: {result}")
-                logger.debug(f"EventCapture2: Redis backup storage - {event.summary}")
-                return True
-            else:
-                print(f"🔥 EVENTCAPTURE2: No storage available for event")
-                logger.warning(f"EventCapture2: No storage available for event - {event.summary}")
+    async def _store_event_direct(self, event: EnhancedEvent) -> bool:
+        """Store a single event synchronously via SqlFirstThreadManager"""
+        try:
+            thread_data = await self.sql_first_manager.get_or_create_project_thread(
+                project_id=event.project_id,
+                user_id=event.user_id
+            )
+            project_thread_id = thread_data.get("project_thread_id")
+            if not project_thread_id:
+                logger.warning(f"EventCapture2: Could not get project_thread_id for project {event.project_id}")
                 return False
 
+            await self.sql_first_manager.capture_event(
+                project_thread_id=project_thread_id,
+                project_id=event.project_id,
+                user_id=event.user_id,
+                event_type=event.event_type.value,
+                event_data=self._event_data(event),
+                context_snapshot=self._context_snapshot(event)
+            )
+            logger.debug(f"EventCapture2: SQL-first storage success - {event.summary}")
+            return True
+
         except Exception as e:
-            print(f"🔥 EVENTCAPTURE2: CRITICAL ERROR - {e}")
-            logger.error(f"Failed to store event: {e}")
+            logger.error(f"EventCapture2: SQL-first storage failed: {e}")
             return False
 
-    async def process_queued_events(self) -> int:
-        """Process queued events and route them to available DAS systems"""
-        processed = 0
+    @staticmethod
+    def _event_data(event: EnhancedEvent) -> Dict[str, Any]:
+        return {
+            "summary": event.summary,
+            "details": event.details,
+            "context": event.context,
+            "endpoint": event.endpoint,
+            "method": event.method,
+            "response_time": event.response_time,
+            "timestamp": event.timestamp.isoformat()
+        }
+
+    @staticmethod
+    def _context_snapshot(event: EnhancedEvent) -> Dict[str, Any]:
+        return {
+            "username": event.username,
+            "event_id": event.event_id
+        }
+
+    # ====== REDIS STREAM CONSUMPTION ======
+
+    async def ensure_consumer_group(self) -> None:
+        """Create the stream consumer group (and stream) if missing"""
+        try:
+            await self.redis.xgroup_create(self.event_stream, self.consumer_group, id="0", mkstream=True)
+            logger.info(f"EventCapture2: Created consumer group {self.consumer_group} on {self.event_stream}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read_batch(self, consumer: str, count: int = 100, block_ms: Optional[int] = None) -> int:
+        """
+        Read and process up to `count` new entries for `consumer`.
+
+        Entries are acknowledged only after they are stored, so a consumer
+        that dies mid-batch leaves them pending for reclaim_pending().
+        """
+        response = await self.redis.xreadgroup(
+            self.consumer_group, consumer, {self.event_stream: ">"}, count=count, block=block_ms
+        )
+        entries = [entry for _stream, stream_entries in (response or []) for entry in stream_entries]
+        return await self._process_entries(entries)
+
+    async def reclaim_pending(self, consumer: str, min_idle_ms: int, count: int = 100) -> int:
+        """
+        Claim entries left pending by crashed consumers and process them.
+
+        Entries delivered more than max_deliveries times are moved to the
+        dead-letter stream instead of being retried forever.
+        """
+        result = await self.redis.xautoclaim(
+            self.event_stream, self.consumer_group, consumer,
+            min_idle_time=min_idle_ms, start_id="0-0", count=count
+        )
+        entries = [entry for entry in result[1] if entry and entry[1]]
+        if not entries:
+            return 0
 
-        if not self.redis:
-            logger.warning("EventCapture2: No Redis available for event processing")
+        pending = await self.redis.xpending_range(
+            self.event_stream, self.consumer_group,
+            min=entries[0][0], max=entries[-1][0], count=len(entries), consumername=consumer
+        )
+        deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+
+        retry, dead = [], []
+        for entry in entries:
+            if deliveries.get(entry[0], 0) > self.max_deliveries:
+                dead.append(entry)
+            else:
+                retry.append(entry)
+
+        if dead:
+            for entry_id, fields in dead:
+                await self.redis.xadd(self.dead_letter_stream, fields, maxlen=self.stream_maxlen, approximate=True)
+            await self.redis.xack(self.event_stream, self.consumer_group, *[entry_id for entry_id, _ in dead])
+            logger.error(f"EventCapture2: Dead-lettered {len(dead)} events after {self.max_deliveries} deliveries")
+
+        return await self._process_entries(retry)
+
+    async def _process_entries(self, entries: List[Tuple[Any, Dict[Any, Any]]]) -> int:
+        """
+        Persist a batch of stream entries and acknowledge the stored ones.
+
+        Project threads are resolved once per distinct project in the batch
+        and all events are written with a single bulk insert.
+        """
+        if not entries:
             return 0
 
-        try:
-            while True:
-                # Get next event from queue
-                event_data = await self.redis.brpop(self.event_queue, timeout=1)
+        ack_ids: List[Any] = []
+        persist: List[Tuple[Any, EnhancedEvent]] = []
 
-                if not event_data:
-                    break  # No more events
+        for entry_id, fields in entries:
+            raw = fields.get(b"event", fields.get("event"))
+            try:
+                if isinstance(raw, bytes):
+                    raw = raw.decode("utf-8")
+                event = EnhancedEvent.from_dict(json.loads(raw))
+            except Exception as e:
+                logger.error(f"EventCapture2: Dropping malformed stream entry {entry_id}: {e}")
+                ack_ids.append(entry_id)
+                continue
 
-                event_json = event_data[1]
-                if isinstance(event_json, bytes):
-                    event_json = event_json.decode('utf-8')
+            if self.sql_first_manager and event.project_id:
+                persist.append((entry_id, event))
+            else:
+                # Nothing to persist - hand to DAS if a thread exists
+                await self._route_event_to_das(event)
+                ack_ids.append(entry_id)
 
-                event_dict = json.loads(event_json)
-                event = EnhancedEvent.from_dict(event_dict)
+        if persist:
+            ack_ids.extend(await self._persist_batch(persist))
 
-                # Try to route event to available DAS system
-                routed = await self._route_event_to_das(event)
+        if ack_ids:
+            await self.redis.xack(self.event_stream, self.consumer_group, *ack_ids)
 
-                if routed:
-                    logger.debug(f"EventCapture2: Successfully routed event - {event.summary}")
-                else:
-                    logger.debug(f"EventCapture2: Event not routed (no project thread) - {event.summary}")
+        return len(ack_ids)
 
-                processed += 1
+    async def _persist_batch(self, batch: List[Tuple[Any, EnhancedEvent]]) -> List[Any]:
+        """Bulk-store events; return the entry ids that are safe to acknowledge"""
+        thread_ids: Dict[str, Optional[str]] = {}
+        rows: List[Dict[str, Any]] = []
+        stored_ids: List[Any] = []
 
+        for entry_id, event in batch:
+            if event.project_id not in thread_ids:
+                try:
+                    thread_data = await self.sql_first_manager.get_or_create_project_thread(
+                        project_id=event.project_id,
+                        user_id=event.user_id
+                    )
+                    thread_ids[event.project_id] = thread_data.get("project_thread_id")
+                except Exception as e:
+                    logger.error(f"EventCapture2: Thread lookup failed for project {event.project_id}: {e}")
+                    thread_ids[event.project_id] = None
+
+            project_thread_id = thread_ids[event.project_id]
+            if not project_thread_id:
+                continue  # Left pending; retried after claim_idle_ms
+
+            rows.append({
+                "event_id": self._stream_event_id(entry_id),
+                "project_thread_id": project_thread_id,
+                "project_id": event.project_id,
+                "user_id": event.user_id,
+                "event_type": event.event_type.value,
+                "event_data": self._event_data(event),
+                "context_snapshot": self._context_snapshot(event),
+                "created_at": event.timestamp,  # when it happened, not when this batch is flushed
+            })
+            stored_ids.append(entry_id)
+
+        if not rows:
+            return []
+
+        try:
+            await self.sql_first_manager.capture_events_bulk(rows)
+        except Exception as e:
+            logger.error(f"EventCapture2: Bulk storage of {len(rows)} events failed: {e}")
+            return []
+
+        return stored_ids
+
+    def _stream_event_id(self, entry_id: Any) -> str:
+        """Deterministic SQL event id so redelivered entries are not duplicated"""
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode("utf-8")
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.event_stream}/{entry_id}"))
+
+    async def process_queued_events(self, consumer: str = "eventcapture2-manual", batch_size: int = 100) -> int:
+        """Drain currently queued events (non-blocking) - used for manual/debug processing"""
+        if not self.redis:
+            logger.warning("EventCapture2: No Redis available for event processing")
+            return 0
+
+        processed = 0
+        try:
+            await self.ensure_consumer_group()
+            while True:
+                batch_processed = await self.read_batch(consumer, count=batch_size)
+                if batch_processed == 0:
+                    break
+                processed += batch_processed
         except Exception as e:
             logger.error(f"Error processing queued events: {e}")
 
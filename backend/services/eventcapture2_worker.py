@@ -1,34 +1,48 @@
 """
 EventCapture2 Background Worker
 
-Processes queued events from EventCapture2 and routes them to available DAS systems
-for integration with project threads.
+Consumes EventCapture2 events from a Redis stream and persists them in batches
+through the SQL-first thread manager.
 
 Architecture:
-✅ Events are queued by middleware/endpoints for non-blocking performance
-✅ Worker processes events in background
-✅ Events are routed to DAS2 first, then DAS1 as fallback
-✅ Only events with existing project threads are routed
-✅ Rich event summaries are preserved in project threads
+✅ Events are appended to a Redis stream by middleware/endpoints (non-blocking)
+✅ Consumer tasks share a consumer group, so throughput scales with worker count
+✅ Batched XREADGROUP reads with one bulk SQL insert per batch
+✅ Entries are acknowledged only after storage - nothing is lost if a worker dies
+✅ Pending entries from crashed consumers are reclaimed after an idle timeout
+✅ Poison entries are moved to a dead-letter stream after repeated failures
 """
 
 import asyncio
 import logging
-from typing import Optional
+import os
+import socket
+from typing import List, Optional
+
+from backend.services.config import Settings
 
 logger = logging.getLogger(__name__)
 
 
 class EventCapture2Worker:
-    """Background worker that processes EventCapture2 events"""
+    """Background worker that consumes the EventCapture2 event stream"""
 
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, settings: Optional[Settings] = None):
         self.redis = redis_client
+        self.settings = settings or Settings()
         self.running = False
-        self.worker_task: Optional[asyncio.Task] = None
+        self.worker_tasks: List[asyncio.Task] = []
+
+        self.num_consumers = max(1, self.settings.eventcapture_workers)
+        self.batch_size = self.settings.eventcapture_batch_size
+        self.block_ms = self.settings.eventcapture_block_ms
+        self.claim_idle_ms = self.settings.eventcapture_claim_idle_ms
+
+        # Consumer names must be unique across processes sharing the group
+        self.consumer_prefix = f"{socket.gethostname()}-{os.getpid()}"
 
     async def start(self):
-        """Start the background worker"""
+        """Start the background consumer tasks"""
         if self.running:
             logger.warning("EventCapture2 worker already running")
             return
@@ -38,25 +52,43 @@ class EventCapture2Worker:
             return
 
         self.running = True
-        self.worker_task = asyncio.create_task(self._worker_loop())
-        logger.info("EventCapture2 background worker started")
-
-    async def stop(self):
-        """Stop the background worker"""
+        self.worker_tasks = [
+            asyncio.create_task(self._worker_loop(f"{self.consumer_prefix}-{i}"))
+            for i in range(self.num_consumers)
+        ]
+        logger.info(f"EventCapture2 background worker started with {self.num_consumers} consumers")
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background consumer tasks.
+
+        Consumers finish the batch they are reading (XREADGROUP blocks for at
+        most block_ms), so it is stored and acknowledged; any still running
+        after timeout are cancelled, and their unacknowledged entries are
+        reclaimed by the next consumer after claim_idle_ms.
+        """
         self.running = False
 
-        if self.worker_task:
-            self.worker_task.cancel()
-            try:
-                await self.worker_task
-            except asyncio.CancelledError:
-                pass
+        if self.worker_tasks:
+            grace = timeout if timeout is not None else self.block_ms / 1000 + 5
+            _, unfinished = await asyncio.wait(self.worker_tasks, timeout=grace)
+            for task in unfinished:
+                task.cancel()
+            for task in unfinished:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.worker_tasks = []
 
         logger.info("EventCapture2 background worker stopped")
 
-    async def _worker_loop(self):
-        """Main worker loop that processes events"""
-        logger.info("EventCapture2 worker loop started")
+    async def _worker_loop(self, consumer: str):
+        """Consumer loop: reclaim stale pending entries, then read new batches"""
+        logger.info(f"EventCapture2 consumer {consumer} started")
+        loop = asyncio.get_running_loop()
+        next_reclaim = 0.0
+        group_ready = False
 
         while self.running:
             try:
@@ -64,21 +96,35 @@ class EventCapture2Worker:
                 from backend.services.eventcapture2 import get_event_capture
                 event_capture = get_event_capture()
 
-                if event_capture:
-                    # Process queued events (this handles routing to DAS systems)
-                    processed = await event_capture.process_queued_events()
-
-                    if processed > 0:
-                        logger.debug(f"EventCapture2 worker processed {processed} events")
-
-                # Sleep between processing cycles
-                await asyncio.sleep(1)  # Process every second
+                if not event_capture or not event_capture.redis:
+                    await asyncio.sleep(1)
+                    continue
+
+                if not group_ready:
+                    await event_capture.ensure_consumer_group()
+                    group_ready = True
+
+                if loop.time() >= next_reclaim:
+                    reclaimed = await event_capture.reclaim_pending(
+                        consumer, self.claim_idle_ms, count=self.batch_size
+                    )
+                    if reclaimed:
+                        logger.info(f"EventCapture2 consumer {consumer} reclaimed {reclaimed} pending events")
+                    next_reclaim = loop.time() + self.claim_idle_ms / 1000
+
+                # Blocks server-side until entries arrive - no polling sleep needed
+                processed = await event_capture.read_batch(
+                    consumer, count=self.batch_size, block_ms=self.block_ms
+                )
+                if processed > 0:
+                    logger.debug(f"EventCapture2 consumer {consumer} processed {processed} events")
 
             except asyncio.CancelledError:
-                logger.info("EventCapture2 worker cancelled")
+                logger.info(f"EventCapture2 consumer {consumer} cancelled")
                 break
             except Exception as e:
-                logger.error(f"EventCapture2 worker error: {e}")
+                logger.error(f"EventCapture2 consumer {consumer} error: {e}")
+                group_ready = False
                 await asyncio.sleep(5)  # Wait longer on errors
 
     async def process_batch(self, max_events: int = 10) -> int:
@@ -91,15 +137,8 @@ class EventCapture2Worker:
                 logger.warning("EventCapture2 not available for batch processing")
                 return 0
 
-            processed = 0
-            for _ in range(max_events):
-                # Process one event at a time
-                batch_processed = await event_capture.process_queued_events()
-                if batch_processed == 0:
-                    break  # No more events
-                processed += batch_processed
-
-            return processed
+            await event_capture.ensure_consumer_group()
+            return await event_capture.read_batch(f"{self.consumer_prefix}-manual", count=max_events)
 
         except Exception as e:
             logger.error(f"Error in batch processing: {e}")
@@ -110,7 +149,7 @@ class EventCapture2Worker:
 worker: Optional[EventCapture2Worker] = None
 
 
-async def start_eventcapture2_worker(redis_client=None):
+async def start_eventcapture2_worker(redis_client=None, settings: Optional[Settings] = None):
     """Start the global EventCapture2 worker"""
     global worker
 
@@ -118,7 +157,7 @@ async def start_eventcapture2_worker(redis_client=None):
         logger.warning("EventCapture2 worker already started")
         return
 
-    worker = EventCapture2Worker(redis_client)
+    worker = EventCapture2Worker(redis_client, settings)
     await worker.start()
 
 
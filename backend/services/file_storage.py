@@ -3,6 +3,7 @@ File Storage Service for ODRAS
 Provides abstraction over different storage backends (MinIO, PostgreSQL, local filesystem).
 """
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -12,7 +13,7 @@ import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Union
 
 # Storage backend imports
 try:
@@ -143,6 +144,22 @@ class StorageBackend(ABC):
         """List files with visibility support. If include_public=True, includes public files from other projects."""
         pass
 
+    async def iter_file(
+        self, file_id: str, start: int = 0, end: Optional[int] = None, chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield file content from byte ``start`` to ``end`` (inclusive) in chunks.
+
+        The default loads the whole file; backends that can read ranges
+        override this so downloads do not hold the file in memory.
+        """
+        content = await self.retrieve_file(file_id)
+        if content is None:
+            return
+        content = content[start : None if end is None else end + 1]
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
 
 class MinIOBackend(StorageBackend):
     """MinIO/S3-compatible storage backend."""
@@ -226,6 +243,31 @@ class MinIOBackend(StorageBackend):
             logger.error(f"Failed to retrieve file from MinIO: {e}")
             return None
 
+    async def iter_file(
+        self, file_id: str, start: int = 0, end: Optional[int] = None, chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of an object from MinIO (ranged GET, read off the event loop)."""
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_object,
+                bucket_name=self.bucket_name,
+                object_name=f"files/{file_id}",
+                offset=start,
+                length=0 if end is None else end - start + 1,
+            )
+        except S3Error as e:
+            logger.error(f"Failed to retrieve file from MinIO: {e}")
+            return
+        try:
+            while True:
+                chunk = await asyncio.to_thread(response.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
     async def delete_file(self, file_id: str) -> bool:
         """Delete file from MinIO."""
         try:
@@ -782,6 +824,25 @@ class LocalFilesystemBackend(StorageBackend):
             logger.error(f"Failed to retrieve file locally: {e}")
             return None
 
+    async def iter_file(
+        self, file_id: str, start: int = 0, end: Optional[int] = None, chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of a local file."""
+        file_path = self.storage_path / "files" / file_id
+        if not file_path.exists():
+            return
+        remaining = None if end is None else end - start + 1
+        with file_path.open("rb") as f:
+            f.seek(start)
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
     async def delete_file(self, file_id: str) -> bool:
         """Delete file from local filesystem."""
         try:
@@ -1093,6 +1154,24 @@ class FileStorageService:
             logger.error(f"Failed to retrieve file {file_id}: {e}")
             return None
 
+    async def iter_file(
+        self, file_id: str, start: int = 0, end: Optional[int] = None, chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file content without loading it all into memory (where the backend allows).
+
+        Args:
+            file_id: Unique file identifier
+            start: First byte to return
+            end: Last byte to return (inclusive), None for end of file
+            chunk_size: Maximum size of each yielded chunk
+
+        Yields:
+            Chunks of file content; nothing if the file does not exist
+        """
+        async for chunk in self.backend.iter_file(file_id, start, end, chunk_size):
+            yield chunk
+
     async def delete_file(self, file_id: str) -> bool:
         """
         Delete a file by ID.
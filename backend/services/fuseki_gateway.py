@@ -0,0 +1,450 @@
+"""
+Fuseki Gateway - shared access point for every Fuseki dataset call
+
+One gateway per dataset URL (e.g. http://localhost:3030/odras) provides:
+- pooled keep-alive sync and async HTTP clients
+- a cap on concurrent requests to the dataset
+- query/update timeouts
+- a read-query result cache keyed by (query hash, dataset version); any
+  update or graph write through the gateway bumps the version
+- InMemoryFusekiGateway, an rdflib-backed stand-in for tests and benchmarks
+
+Writes made by other processes or tools are not seen by this process's
+version counter, so cached results also expire after a short TTL.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SPARQL_JSON = "application/sparql-results+json"
+TURTLE = "text/turtle"
+
+# rdflib serialization formats for the Accept types the stand-in understands
+RDFLIB_FORMATS = {
+    "text/turtle": "turtle",
+    "application/n-triples": "nt",
+    "application/ld+json": "json-ld",
+    "application/rdf+xml": "xml",
+}
+
+
+async def _close_async_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close an AsyncClient on the loop it was used on, if that loop still runs elsewhere."""
+    try:
+        if loop is not None and loop is not asyncio.get_running_loop() and loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+        else:
+            await client.aclose()
+    except Exception as e:
+        logger.debug(f"Could not close a Fuseki client of another event loop: {e}")
+
+
+def _decode(content: bytes, accept: str) -> Any:
+    if "json" in accept:
+        import json
+        return json.loads(content) if content else {}
+    return content.decode("utf-8")
+
+
+class FusekiGateway:
+    """
+    Shared client for one Fuseki dataset.
+
+    Sync methods (query, update, put_graph, post_graph, get_graph) and their
+    async counterparts (aquery, ...) share the result cache and version;
+    each side has its own pooled client and concurrency cap.
+    """
+
+    def __init__(
+        self,
+        dataset_url: str,
+        auth: Optional[Tuple[str, str]] = None,
+        max_connections: int = 20,
+        max_concurrency: int = 8,
+        query_timeout_s: float = 30.0,
+        update_timeout_s: float = 60.0,
+        cache_entries: int = 512,
+        cache_ttl_s: float = 30.0,
+    ):
+        self.dataset_url = dataset_url.rstrip("/")
+        self.auth = auth
+        self.max_connections = max_connections
+        self.max_concurrency = max(1, max_concurrency)
+        self.query_timeout_s = query_timeout_s
+        self.update_timeout_s = update_timeout_s
+        self.cache_entries = cache_entries
+        self.cache_ttl_s = cache_ttl_s
+
+        self.version = 0
+        self._cache: "OrderedDict[str, Tuple[int, float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._client: Optional[httpx.Client] = None
+        self._sync_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._async_loop = None
+        self._closing: Set[asyncio.Task] = set()
+
+    @property
+    def query_url(self) -> str:
+        return f"{self.dataset_url}/query"
+
+    @property
+    def update_url(self) -> str:
+        return f"{self.dataset_url}/update"
+
+    @property
+    def data_url(self) -> str:
+        return f"{self.dataset_url}/data"
+
+    # ----- reads -----
+
+    def query(self, sparql: str, accept: str = SPARQL_JSON, timeout: Optional[float] = None,
+              use_cache: bool = True) -> Any:
+        """Run a read query; JSON result formats are parsed, others returned as text"""
+        key, version = self._cache_key(sparql, accept), self.version
+        content = self._cache_get(key, version) if use_cache else None
+        if content is None:
+            with self._sync_slots:
+                content = self._send_query(sparql, accept, timeout or self.query_timeout_s)
+            if use_cache:
+                self._cache_put(key, version, content)
+        return _decode(content, accept)
+
+    async def aquery(self, sparql: str, accept: str = SPARQL_JSON, timeout: Optional[float] = None,
+                     use_cache: bool = True) -> Any:
+        key, version = self._cache_key(sparql, accept), self.version
+        content = self._cache_get(key, version) if use_cache else None
+        if content is None:
+            async with self._slots():
+                content = await self._asend_query(sparql, accept, timeout or self.query_timeout_s)
+            if use_cache:
+                self._cache_put(key, version, content)
+        return _decode(content, accept)
+
+    def get_graph(self, graph: Optional[str] = None, accept: str = TURTLE,
+                  timeout: Optional[float] = None) -> str:
+        """Graph Store Protocol GET of a named graph (default graph when None)"""
+        with self._sync_slots:
+            return self._send_graph("GET", graph, None, accept, timeout or self.query_timeout_s).decode("utf-8")
+
+    async def aget_graph(self, graph: Optional[str] = None, accept: str = TURTLE,
+                         timeout: Optional[float] = None) -> str:
+        async with self._slots():
+            content = await self._asend_graph("GET", graph, None, accept, timeout or self.query_timeout_s)
+        return content.decode("utf-8")
+
+    # ----- writes (each invalidates cached results) -----
+
+    def update(self, sparql: str, timeout: Optional[float] = None) -> None:
+        try:
+            with self._sync_slots:
+                self._send_update(sparql, timeout or self.update_timeout_s)
+        finally:
+            self.invalidate()
+
+    async def aupdate(self, sparql: str, timeout: Optional[float] = None) -> None:
+        try:
+            async with self._slots():
+                await self._asend_update(sparql, timeout or self.update_timeout_s)
+        finally:
+            self.invalidate()
+
+    def put_graph(self, data: str, graph: Optional[str] = None, content_type: str = TURTLE,
+                  timeout: Optional[float] = None) -> None:
+        """Replace a named graph (default graph when None) with ``data``"""
+        self._write_graph("PUT", data, graph, content_type, timeout)
+
+    def post_graph(self, data: str, graph: Optional[str] = None, content_type: str = TURTLE,
+                   timeout: Optional[float] = None) -> None:
+        """Add ``data`` to a named graph (default graph when None)"""
+        self._write_graph("POST", data, graph, content_type, timeout)
+
+    async def aput_graph(self, data: str, graph: Optional[str] = None, content_type: str = TURTLE,
+                         timeout: Optional[float] = None) -> None:
+        await self._awrite_graph("PUT", data, graph, content_type, timeout)
+
+    async def apost_graph(self, data: str, graph: Optional[str] = None, content_type: str = TURTLE,
+                          timeout: Optional[float] = None) -> None:
+        await self._awrite_graph("POST", data, graph, content_type, timeout)
+
+    def _write_graph(self, method, data, graph, content_type, timeout):
+        try:
+            with self._sync_slots:
+                self._send_graph(method, graph, data.encode("utf-8"), content_type,
+                                 timeout or self.update_timeout_s)
+        finally:
+            self.invalidate()
+
+    async def _awrite_graph(self, method, data, graph, content_type, timeout):
+        try:
+            async with self._slots():
+                await self._asend_graph(method, graph, data.encode("utf-8"), content_type,
+                                        timeout or self.update_timeout_s)
+        finally:
+            self.invalidate()
+
+    # ----- cache -----
+
+    def invalidate(self) -> None:
+        """Bump the dataset version; results cached under older versions are discarded"""
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "version": self.version,
+            }
+
+    def _cache_key(self, sparql: str, accept: str) -> str:
+        return hashlib.sha256(f"{accept}\n{sparql}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str, version: int) -> Optional[bytes]:
+        if self.cache_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] == version and entry[1] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return entry[2]
+            self.cache_misses += 1
+            return None
+
+    def _cache_put(self, key: str, version: int, content: bytes) -> None:
+        if self.cache_entries <= 0:
+            return
+        with self._lock:
+            # A write finished while this query ran; its result may predate the write
+            if version != self.version:
+                return
+            self._cache[key] = (version, time.monotonic() + self.cache_ttl_s, content)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    # ----- HTTP transport -----
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections)
+
+    def _sync_client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(limits=self._limits(), auth=self.auth)
+        return self._client
+
+    def _async_state(self):
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Clients and semaphores are bound to the loop that first used them
+            if self._async_client is not None:
+                task = loop.create_task(_close_async_client(self._async_client, self._async_loop))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._async_client = httpx.AsyncClient(limits=self._limits(), auth=self.auth)
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_client, self._async_slots
+
+    def _slots(self) -> asyncio.Semaphore:
+        return self._async_state()[1]
+
+    def _graph_params(self, graph: Optional[str]) -> Dict[str, str]:
+        return {"graph": graph} if graph else {"default": ""}
+
+    def _send_query(self, sparql: str, accept: str, timeout: float) -> bytes:
+        response = self._sync_client().post(
+            self.query_url, content=sparql.encode("utf-8"), timeout=timeout,
+            headers={"Content-Type": "application/sparql-query", "Accept": accept},
+        )
+        response.raise_for_status()
+        return response.content
+
+    async def _asend_query(self, sparql: str, accept: str, timeout: float) -> bytes:
+        client, _ = self._async_state()
+        response = await client.post(
+            self.query_url, content=sparql.encode("utf-8"), timeout=timeout,
+            headers={"Content-Type": "application/sparql-query", "Accept": accept},
+        )
+        response.raise_for_status()
+        return response.content
+
+    def _send_update(self, sparql: str, timeout: float) -> None:
+        response = self._sync_client().post(
+            self.update_url, content=sparql.encode("utf-8"), timeout=timeout,
+            headers={"Content-Type": "application/sparql-update"},
+        )
+        response.raise_for_status()
+
+    async def _asend_update(self, sparql: str, timeout: float) -> None:
+        client, _ = self._async_state()
+        response = await client.post(
+            self.update_url, content=sparql.encode("utf-8"), timeout=timeout,
+            headers={"Content-Type": "application/sparql-update"},
+        )
+        response.raise_for_status()
+
+    def _send_graph(self, method: str, graph: Optional[str], body: Optional[bytes],
+                    content_type: str, timeout: float) -> bytes:
+        header = "Accept" if body is None else "Content-Type"
+        response = self._sync_client().request(
+            method, self.data_url, params=self._graph_params(graph), content=body,
+            headers={header: content_type}, timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
+    async def _asend_graph(self, method: str, graph: Optional[str], body: Optional[bytes],
+                           content_type: str, timeout: float) -> bytes:
+        client, _ = self._async_state()
+        header = "Accept" if body is None else "Content-Type"
+        response = await client.request(
+            method, self.data_url, params=self._graph_params(graph), content=body,
+            headers={header: content_type}, timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        self.close()
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is not None:
+            await _close_async_client(client, loop)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+
+class InMemoryFusekiGateway(FusekiGateway):
+    """
+    rdflib-backed stand-in for a Fuseki dataset (no network).
+
+    Supports SPARQL query/update and the Graph Store Protocol over an
+    in-process rdflib Dataset, with the same caching and versioning as the
+    HTTP gateway, so tests and benchmarks can run without Fuseki.
+    """
+
+    def __init__(self, dataset_url: str = "memory://odras", **kwargs):
+        from rdflib import Dataset
+
+        super().__init__(dataset_url, **kwargs)
+        self.dataset = Dataset()
+        self.requests = 0  # Round trips that reached the store (cache misses and writes)
+        self._store_lock = threading.Lock()
+
+    def _graph(self, graph: Optional[str]):
+        from rdflib import URIRef
+
+        return self.dataset.default_graph if not graph else self.dataset.graph(URIRef(graph))
+
+    def _send_query(self, sparql: str, accept: str, timeout: float) -> bytes:
+        with self._store_lock:
+            self.requests += 1
+            result = self.dataset.query(sparql)
+            if result.type in ("SELECT", "ASK"):
+                return result.serialize(format="json")
+            return result.serialize(format=RDFLIB_FORMATS.get(accept, "turtle"))
+
+    async def _asend_query(self, sparql: str, accept: str, timeout: float) -> bytes:
+        return self._send_query(sparql, accept, timeout)
+
+    def _send_update(self, sparql: str, timeout: float) -> None:
+        with self._store_lock:
+            self.requests += 1
+            self.dataset.update(sparql)
+
+    async def _asend_update(self, sparql: str, timeout: float) -> None:
+        self._send_update(sparql, timeout)
+
+    def _send_graph(self, method: str, graph: Optional[str], body: Optional[bytes],
+                    content_type: str, timeout: float) -> bytes:
+        with self._store_lock:
+            self.requests += 1
+            target = self._graph(graph)
+            if method == "GET":
+                return target.serialize(format=RDFLIB_FORMATS.get(content_type, "turtle")).encode("utf-8")
+            if method == "PUT":
+                target.remove((None, None, None))
+            target.parse(data=body.decode("utf-8"), format=RDFLIB_FORMATS.get(content_type, "turtle"))
+            return b""
+
+    async def _asend_graph(self, method: str, graph: Optional[str], body: Optional[bytes],
+                           content_type: str, timeout: float) -> bytes:
+        return self._send_graph(method, graph, body, content_type, timeout)
+
+
+_gateways: Dict[str, FusekiGateway] = {}
+_override: Optional[FusekiGateway] = None
+_registry_lock = threading.Lock()
+
+
+def get_fuseki_gateway(dataset_url: Optional[str] = None, settings=None) -> FusekiGateway:
+    """
+    Process-wide gateway for a dataset URL (Settings.fuseki_url by default).
+
+    Gateways installed with set_fuseki_gateway are returned for every URL.
+    """
+    if _override is not None:
+        return _override
+
+    if settings is None:
+        from .config import Settings
+        settings = Settings()
+    url = (dataset_url or settings.fuseki_url).rstrip("/")
+
+    with _registry_lock:
+        gateway = _gateways.get(url)
+        if gateway is None:
+            user, password = getattr(settings, "fuseki_user", None), getattr(settings, "fuseki_password", None)
+            gateway = FusekiGateway(
+                url,
+                auth=(user, password) if user and password else None,
+                max_connections=getattr(settings, "fuseki_max_connections", 20),
+                max_concurrency=getattr(settings, "fuseki_max_concurrency", 8),
+                query_timeout_s=getattr(settings, "fuseki_query_timeout_s", 30.0),
+                update_timeout_s=getattr(settings, "fuseki_update_timeout_s", 60.0),
+                cache_entries=getattr(settings, "fuseki_result_cache_entries", 512),
+                cache_ttl_s=getattr(settings, "fuseki_result_cache_ttl_s", 30.0),
+            )
+            _gateways[url] = gateway
+        return gateway
+
+
+async def close_fuseki_gateways() -> int:
+    """Close the HTTP clients of every shared gateway (called at shutdown); returns how many."""
+    with _registry_lock:
+        gateways = list(_gateways.values())
+    if _override is not None and _override not in gateways:
+        gateways.append(_override)
+    await asyncio.gather(*(gateway.aclose() for gateway in gateways))
+    return len(gateways)
+
+
+def set_fuseki_gateway(gateway: Optional[FusekiGateway]) -> None:
+    """Route every get_fuseki_gateway call to ``gateway`` (None restores per-URL gateways)"""
+    global _override
+    _override = gateway
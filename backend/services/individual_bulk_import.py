@@ -0,0 +1,508 @@
+"""
+Individual Bulk Import
+
+Streams CSV/JSON rows through a mapping configuration into ontology
+individuals. Rows are validated against the target class's constraints
+(analyzed once per ontology structure version and cached), then written in
+chunks: one execute_values INSERT into individual_instances and one SPARQL
+INSERT DATA into the ontology graph per chunk, instead of one HTTP update and
+one database round trip per individual.
+
+Each chunk's rows are inserted in a transaction that is committed only after
+Fuseki accepts the chunk, so a failed chunk leaves neither store changed.
+Rows whose name already exists for the class are reported and skipped.
+Progress is written to individual_import_history after every chunk.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from psycopg2.extras import execute_values
+
+from .config import Settings
+from .constraint_analyzer import ConstraintAnalyzer
+from .fuseki_gateway import FusekiGateway, get_fuseki_gateway
+
+logger = logging.getLogger(__name__)
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+RDFS_LABEL = "<http://www.w3.org/2000/01/rdf-schema#label>"
+
+# Mapping targets that name the individual rather than set a property
+NAME_TARGETS = ("name", "rdfs:label")
+
+SOURCE_FORMATS = ("csv", "json", "jsonl")
+
+# individual_import_history.import_type for each individual_instances.source_type
+IMPORT_TYPES = {
+    "external_import": "external_data",
+    "requirements_workbench": "requirements_workbench",
+    "das_generated": "das_analysis",
+}
+
+MAX_NAME_LENGTH = 255  # individual_instances.instance_name
+
+_LITERAL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+_UNSAFE_IRI_CHARS = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+# =====================================
+# SOURCES AND MAPPING
+# =====================================
+
+def iter_source_rows(source: Union[str, bytes, BinaryIO, TextIO, Iterable[Dict[str, Any]]],
+                     source_format: str = "json") -> Iterator[Dict[str, Any]]:
+    """
+    Rows of a CSV (with header), JSON (array of objects) or JSON Lines source.
+
+    CSV and JSON Lines are read incrementally from text or binary file
+    objects; a JSON array is parsed whole. Already-parsed rows pass through.
+    """
+    if source_format not in SOURCE_FORMATS:
+        raise ValueError(f"Unsupported source format {source_format!r}; expected one of {', '.join(SOURCE_FORMATS)}")
+
+    if isinstance(source, bytes):
+        source = source.decode("utf-8-sig")
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    elif not hasattr(source, "read"):
+        yield from source
+        return
+    elif not isinstance(source, io.TextIOBase):
+        source = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+
+    if source_format == "csv":
+        yield from csv.DictReader(source)
+    elif source_format == "jsonl":
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        data = json.load(source)
+        yield from (data if isinstance(data, list) else [data])
+
+
+def map_row(row: Dict[str, Any], mapping_config: Dict[str, str]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    (individual name, properties) for a source row. mapping_config maps source
+    fields to target properties; "name" or "rdfs:label" targets the name. With
+    no mapping every field maps to itself. Empty values are dropped.
+    """
+    mapping = mapping_config or {field: field for field in row}
+    name = None
+    properties: Dict[str, Any] = {}
+    for source_field, target in mapping.items():
+        value = row.get(source_field)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        if target in NAME_TARGETS and name is None:
+            name = str(value)
+        elif target not in NAME_TARGETS:
+            properties[target] = value
+    return name, properties
+
+
+# =====================================
+# CONSTRAINTS
+# =====================================
+
+def class_constraints(ontology_structure: Dict[str, Any], class_name: str,
+                      analyzer: Optional[ConstraintAnalyzer] = None) -> Dict[str, Dict[str, Any]]:
+    """Constraints of the properties whose domain is class_name."""
+    constraints = (analyzer or ConstraintAnalyzer()).analyze_property_constraints(ontology_structure)
+    return {name: constraint for name, constraint in constraints.items() if constraint.get("domain") == class_name}
+
+
+class ClassConstraintCache:
+    """
+    Class constraints per (table, ontology structure version, class), so a
+    structure is analyzed once rather than per row or per import.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_s: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            return None
+
+    def put(self, key: Tuple[str, str, str], constraints: Dict[str, Dict[str, Any]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, constraints)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_constraint_cache: Optional[ClassConstraintCache] = None
+_constraint_cache_lock = threading.Lock()
+
+
+def get_constraint_cache(settings: Optional[Settings] = None) -> ClassConstraintCache:
+    """Process-wide class constraint cache (sized from settings on first use)."""
+    global _constraint_cache
+    with _constraint_cache_lock:
+        if _constraint_cache is None:
+            _constraint_cache = ClassConstraintCache(
+                ttl_s=getattr(settings, "individual_constraint_cache_ttl_s", 300.0),
+            )
+        return _constraint_cache
+
+
+def validate_row(properties: Dict[str, Any], constraints: Dict[str, Dict[str, Any]],
+                 analyzer: ConstraintAnalyzer) -> List[str]:
+    """Errors for a row: missing required properties and invalid values."""
+    errors = [f"Field '{name}' is required" for name, constraint in constraints.items()
+              if constraint.get("required") and name not in properties]
+    errors.extend(analyzer.validate_individual_data(properties, constraints)[1])
+    return errors
+
+
+def coerce_properties(properties: Dict[str, Any], constraints: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Validated values converted to their constraint's type (CSV cells arrive as strings)."""
+    coerced = {}
+    for name, value in properties.items():
+        validation_type = constraints.get(name, {}).get("validation_type")
+        if validation_type == "integer":
+            value = int(value)
+        elif validation_type == "decimal":
+            value = float(value)
+        elif validation_type == "boolean" and not isinstance(value, bool):
+            value = str(value).strip().lower() in ("true", "1")
+        coerced[name] = value
+    return coerced
+
+
+# =====================================
+# RDF SERIALIZATION
+# =====================================
+
+def individual_uri(graph_iri: str, name: str) -> str:
+    return f"{graph_iri}#{_UNSAFE_IRI_CHARS.sub('_', name)}_{uuid.uuid4().hex[:8]}"
+
+
+def class_iri(graph_iri: str, class_name: str) -> str:
+    return f"<{graph_iri}#{class_name.replace(' ', '')}>"
+
+
+def property_iri(graph_iri: str, name: str) -> str:
+    """Property IRI, following create_fuseki_individual's naming."""
+    if name.startswith("<") and name.endswith(">"):
+        return name
+    return f"<{graph_iri}#{name.replace(' ', '')}>"
+
+
+def sparql_literal(value: Any, validation_type: Optional[str] = None) -> str:
+    """Escaped SPARQL literal, typed from the property's constraint or the Python value."""
+    if isinstance(value, bool) or validation_type == "boolean":
+        truth = value if isinstance(value, bool) else str(value).strip().lower() in ("true", "1")
+        return f'"{str(truth).lower()}"^^<{XSD}boolean>'
+    if validation_type == "integer" or (validation_type is None and isinstance(value, int)):
+        return f'"{int(value)}"^^<{XSD}integer>'
+    if validation_type == "decimal" or (validation_type is None and isinstance(value, float)):
+        return f'"{format(Decimal(str(value)), "f")}"^^<{XSD}decimal>'
+    if validation_type == "date":
+        return f'"{value}"^^<{XSD}date>'
+    if validation_type == "url":
+        return f'"{str(value).translate(_LITERAL_ESCAPES)}"^^<{XSD}anyURI>'
+    if not isinstance(value, str):
+        value = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    return f'"{value.translate(_LITERAL_ESCAPES)}"'
+
+
+def insert_data_query(graph_iri: str, class_name: str, individuals: List[Dict[str, Any]],
+                      constraints: Dict[str, Dict[str, Any]]) -> str:
+    """One INSERT DATA for a chunk of individuals."""
+    type_iri = class_iri(graph_iri, class_name)
+    triples = []
+    for individual in individuals:
+        subject = f"<{individual['uri']}>"
+        triples.append(f"{subject} {RDF_TYPE} {type_iri} .")
+        triples.append(f"{subject} {RDFS_LABEL} {sparql_literal(individual['name'])} .")
+        for name, value in individual["properties"].items():
+            validation_type = constraints.get(name, {}).get("validation_type")
+            triples.append(f"{subject} {property_iri(graph_iri, name)} {sparql_literal(value, validation_type)} .")
+    body = "\n        ".join(triples)
+    return f"INSERT DATA {{\n    GRAPH <{graph_iri}> {{\n        {body}\n    }}\n}}"
+
+
+# =====================================
+# IMPORTER
+# =====================================
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class IndividualBulkImporter:
+    """Chunked, validated import of individuals into Postgres and Fuseki."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        connect: Callable[[], Any],
+        gateway: Optional[FusekiGateway] = None,
+        analyzer: Optional[ConstraintAnalyzer] = None,
+        constraint_cache: Optional[ClassConstraintCache] = None,
+    ):
+        """
+        Args:
+            settings: Application settings
+            connect: Returns a new psycopg2 connection (closed by the importer)
+            gateway: Fuseki gateway (default: the shared gateway)
+            analyzer: Constraint analyzer
+            constraint_cache: Class constraint cache (default: the process-wide cache)
+        """
+        self.settings = settings
+        self.connect = connect
+        self.gateway = gateway or get_fuseki_gateway(settings=settings)
+        self.analyzer = analyzer or ConstraintAnalyzer()
+        self.constraint_cache = constraint_cache or get_constraint_cache(settings)
+        self.batch_size = max(1, getattr(settings, "individual_import_batch_size", 1000))
+        self.max_errors = getattr(settings, "individual_import_max_errors", 1000)
+
+    async def import_rows(
+        self,
+        project_id: str,
+        graph_iri: str,
+        target_class: str,
+        rows: Iterable[Dict[str, Any]],
+        mapping_config: Optional[Dict[str, str]] = None,
+        source_type: str = "external_import",
+        source_info: Optional[Dict[str, Any]] = None,
+        created_by: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Import rows as individuals of target_class.
+
+        Returns:
+            Dict with import_id, processed/imported/failed counts, per-row
+            errors ({"row", "name", "errors"}, 1-based rows, capped at
+            individual_import_max_errors) and the import status
+        """
+        conn = await asyncio.to_thread(self.connect)
+        result = {"import_id": None, "processed": 0, "imported": 0, "failed": 0, "errors": [], "status": "pending"}
+        try:
+            table_id, constraints = await asyncio.to_thread(
+                self._table_and_constraints, conn, project_id, graph_iri, target_class
+            )
+            result["import_id"] = await asyncio.to_thread(
+                self._start_history, conn, table_id, IMPORT_TYPES.get(source_type, source_type), source_info,
+                created_by
+            )
+            rows = iter(rows)
+            try:
+                while True:
+                    individuals, exhausted = await asyncio.to_thread(
+                        self._prepare_chunk, rows, mapping_config or {}, constraints, graph_iri, result
+                    )
+                    if individuals:
+                        await self._write_chunk(conn, table_id, graph_iri, target_class, individuals, constraints,
+                                                source_type, created_by, result)
+                    if exhausted:
+                        break
+                    await asyncio.to_thread(self._record_progress, conn, result)
+                    if progress:
+                        progress(dict(result, errors=len(result["errors"])))
+            except Exception as e:
+                # The source itself could not be read; chunks already written stay imported
+                result["status"] = "failed"
+                result["errors"].append({"row": result["processed"] + 1, "name": None,
+                                         "errors": [f"Unreadable source: {e}"]})
+                await asyncio.to_thread(self._record_progress, conn, result)
+                raise
+
+            if result["failed"] == 0:
+                result["status"] = "completed"
+            else:
+                result["status"] = "partial" if result["imported"] else "failed"
+            await asyncio.to_thread(self._record_progress, conn, result)
+            if progress:
+                progress(dict(result, errors=len(result["errors"])))
+            logger.info(
+                f"Imported {result['imported']}/{result['processed']} {target_class} individuals "
+                f"into {graph_iri} ({result['failed']} failed)"
+            )
+            return result
+        finally:
+            await asyncio.to_thread(conn.close)
+
+    def _error(self, result: Dict[str, Any], row: int, name: Optional[str], errors: List[str]) -> None:
+        result["failed"] += 1
+        if len(result["errors"]) < self.max_errors:
+            result["errors"].append({"row": row, "name": name, "errors": errors})
+
+    def _prepare_chunk(
+        self,
+        rows: Iterator[Dict[str, Any]],
+        mapping_config: Dict[str, str],
+        constraints: Dict[str, Dict[str, Any]],
+        graph_iri: str,
+        result: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Read, map and validate up to batch_size rows; returns (valid individuals, source exhausted)."""
+        individuals = []
+        read = 0
+        for row in islice(rows, self.batch_size):
+            read += 1
+            result["processed"] += 1
+            row_number = result["processed"]
+            try:
+                name, properties = map_row(row, mapping_config)
+            except Exception as e:
+                self._error(result, row_number, None, [f"Unreadable row: {e}"])
+                continue
+            if not name:
+                self._error(result, row_number, None, ["No value mapped to the individual name"])
+                continue
+            if len(name) > MAX_NAME_LENGTH:
+                self._error(result, row_number, name[:50], [f"Name exceeds {MAX_NAME_LENGTH} characters"])
+                continue
+            errors = validate_row(properties, constraints, self.analyzer)
+            if errors:
+                self._error(result, row_number, name, errors)
+                continue
+            individuals.append({"row": row_number, "name": name,
+                                "properties": coerce_properties(properties, constraints),
+                                "uri": individual_uri(graph_iri, name)})
+        return individuals, read < self.batch_size
+
+    async def _write_chunk(
+        self,
+        conn,
+        table_id: str,
+        graph_iri: str,
+        target_class: str,
+        individuals: List[Dict[str, Any]],
+        constraints: Dict[str, Dict[str, Any]],
+        source_type: str,
+        created_by: Optional[str],
+        result: Dict[str, Any],
+    ) -> None:
+        try:
+            inserted = await asyncio.to_thread(
+                self._insert_instances, conn, table_id, target_class, individuals, source_type, created_by
+            )
+            new = [individual for individual in individuals if individual["uri"] in inserted]
+            if new:
+                await self.gateway.aupdate(insert_data_query(graph_iri, target_class, new, constraints))
+            await asyncio.to_thread(conn.commit)
+        except Exception as e:
+            await asyncio.to_thread(conn.rollback)
+            logger.error(f"Failed to import a chunk of {len(individuals)} individuals: {e}")
+            for individual in individuals:
+                self._error(result, individual["row"], individual["name"], [f"Import failed: {e}"])
+            return
+
+        result["imported"] += len(new)
+        for individual in individuals:
+            if individual["uri"] not in inserted:
+                self._error(result, individual["row"], individual["name"],
+                            [f"An individual named '{individual['name']}' already exists for {target_class}"])
+
+    def _insert_instances(self, conn, table_id: str, class_name: str, individuals: List[Dict[str, Any]],
+                          source_type: str, created_by: Optional[str]) -> set:
+        """Insert a chunk (uncommitted); returns the URIs of the rows inserted."""
+        with conn.cursor() as cur:
+            rows = execute_values(cur, """
+                INSERT INTO individual_instances (
+                    table_id, class_name, instance_name, instance_uri, properties,
+                    validation_status, source_type, created_by
+                ) VALUES %s
+                ON CONFLICT (table_id, class_name, instance_name) DO NOTHING
+                RETURNING instance_uri
+            """, [
+                (table_id, class_name, individual["name"], individual["uri"],
+                 json.dumps(individual["properties"], default=str), "valid", source_type, created_by)
+                for individual in individuals
+            ], page_size=len(individuals), fetch=True)
+        return {row[0] for row in rows}
+
+    def _table_and_constraints(self, conn, project_id: str, graph_iri: str,
+                               class_name: str) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """The project's individual table (created if missing) and the class's cached constraints."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT table_id, updated_at FROM individual_tables_config
+                WHERE project_id = %s AND graph_iri = %s
+            """, (project_id, graph_iri))
+            row = cur.fetchone()
+            if row is None:
+                cur.execute("""
+                    INSERT INTO individual_tables_config (project_id, graph_iri, ontology_label, ontology_structure)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (project_id, graph_iri) DO UPDATE SET graph_iri = EXCLUDED.graph_iri
+                    RETURNING table_id, updated_at
+                """, (project_id, graph_iri, "Auto-created", "{}"))
+                row = cur.fetchone()
+                conn.commit()
+            table_id, updated_at = str(row[0]), row[1]
+
+            key = (table_id, updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at),
+                   class_name)
+            constraints = self.constraint_cache.get(key)
+            if constraints is None:
+                cur.execute("SELECT ontology_structure FROM individual_tables_config WHERE table_id = %s",
+                            (table_id,))
+                structure = cur.fetchone()[0] or {}
+                if isinstance(structure, str):
+                    structure = json.loads(structure or "{}")
+                constraints = class_constraints(structure, class_name, self.analyzer)
+                self.constraint_cache.put(key, constraints)
+            conn.rollback()
+        return table_id, constraints
+
+    def _start_history(self, conn, table_id: str, import_type: str, source_info: Optional[Dict[str, Any]],
+                       created_by: Optional[str]) -> str:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO individual_import_history (table_id, import_type, source_info, created_by)
+                VALUES (%s, %s, %s, %s)
+                RETURNING import_id
+            """, (table_id, import_type, json.dumps(source_info or {}), created_by))
+            import_id = str(cur.fetchone()[0])
+        conn.commit()
+        return import_id
+
+    def _record_progress(self, conn, result: Dict[str, Any]) -> None:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE individual_import_history
+                    SET records_processed = %s, records_successful = %s, records_failed = %s,
+                        import_status = %s, error_log = %s
+                    WHERE import_id = %s
+                """, (result["processed"], result["imported"], result["failed"], result["status"],
+                      json.dumps(result["errors"]), result["import_id"]))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Failed to record progress of import {result['import_id']}: {e}")
@@ -1,9 +1,15 @@
+import asyncio
+import copy
+import hashlib
 import json
 import logging
 import os
 import random
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import weakref
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -11,17 +17,154 @@ from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PERSONAS = [
+    (
+        "Extractor",
+        "You extract ontology-grounded entities from requirements.",
+    ),
+    (
+        "Reviewer",
+        "You validate and correct extracted JSON to fit the schema strictly.",
+    ),
+]
+
+
+def _digest(value: Any) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Persona outputs of deterministic analysis calls, keyed by (requirement text
+    hash, persona, system prompt hash, schema hash, provider/model). Identical
+    calls in flight at the same time share one request.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, ...], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(text: str, persona: str, system_prompt: str, schema: Dict[str, Any], model: str) -> Tuple[str, ...]:
+        return (_digest(text), persona, _digest(system_prompt), _digest(schema), model)
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return copy.deepcopy(result)
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: Tuple[str, ...], result: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_call(self, key: Tuple[str, ...], call) -> Dict[str, Any]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        pending = self._in_flight.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # the call we were waiting on was cancelled; make our own
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+            if result and not _is_fallback(result):
+                self.put(key, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here; waiters re-raise it
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _is_fallback(result: Dict[str, Any]) -> bool:
+    """Placeholder outputs returned on provider errors are never cached."""
+    return result.get("originates_from") in ("parse-error", "api-error", "timeout", "error")
+
+
+_analysis_cache: Optional[AnalysisCache] = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache(settings: Optional[Settings] = None) -> AnalysisCache:
+    """Process-wide analysis cache (sized from settings on first use)."""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache(max_entries=getattr(settings, "llm_analysis_cache_entries", 10000))
+        return _analysis_cache
+
+
+# Process-wide LLM call limit, one semaphore per event loop (semaphores are loop-bound)
+_llm_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_llm_limits_lock = threading.Lock()
+
+
+def get_llm_limit(settings: Optional[Settings] = None) -> asyncio.Semaphore:
+    """Limit on LLM calls in flight in the running event loop, shared by every LLMTeam (sized on first use)."""
+    loop = asyncio.get_running_loop()
+    with _llm_limits_lock:
+        limit = _llm_limits.get(loop)
+        if limit is None:
+            limit = _llm_limits[loop] = asyncio.Semaphore(max(1, getattr(settings, "llm_max_concurrency", 8)))
+        return limit
+
 
 class LLMTeam:
     """Simple LLM team router supporting OpenAI API and local Ollama.
 
     For MVP: two personas call the same model with different system prompts.
+
+    Persona calls run concurrently, bounded by llm_max_concurrency across every
+    analysis in the process (see get_llm_limit). Calls made at temperature 0 are
+    deterministic and are served from the process-wide AnalysisCache.
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, cache: Optional[AnalysisCache] = None):
         self.settings = settings
+        self.temperature = getattr(settings, "llm_analysis_temperature", 0.2)
+        self.cache = cache or get_analysis_cache(settings)
         logger.info(f"LLMTeam initialized with provider={settings.llm_provider}, model={settings.llm_model}")
 
+    @property
+    def deterministic(self) -> bool:
+        return self.temperature == 0
+
+    def _limit(self) -> asyncio.Semaphore:
+        return get_llm_limit(self.settings)
+
     async def generate_response(
         self,
         system_prompt: str,
@@ -230,34 +373,74 @@ class LLMTeam:
         """Call configured personas and ensemble their JSON outputs by simple voting/merging.
         Returns JSON object adhering to `ontology_json_schema` best-effort.
         """
-        # Use custom personas if provided, otherwise use default ones
-        if custom_personas:
-            personas = [
-                (p["name"], p["system_prompt"]) for p in custom_personas if p.get("is_active", True)
-            ]
-        else:
-            # Default personas
-            personas = [
-                (
-                    "Extractor",
-                    "You extract ontology-grounded entities from requirements.",
-                ),
-                (
-                    "Reviewer",
-                    "You validate and correct extracted JSON to fit the schema strictly.",
-                ),
-            ]
-
-        outputs = []
-        for role, system in personas:
-            response = await self._call_model(requirement_text, system, ontology_json_schema)
-            if response:
-                outputs.append(response)
+        personas = self.personas(custom_personas)
+        results = await asyncio.gather(*(
+            self._analyze_with_persona(requirement_text, role, system, ontology_json_schema)
+            for role, system in personas
+        ))
+        outputs = [response for response in results if response]
 
         # Simple merge: prefer fields present in majority; otherwise take first non-null
         merged = self._merge_json(outputs)
         return merged
 
+    async def analyze_requirements(
+        self,
+        requirements: List[str],
+        ontology_json_schema: Dict[str, Any],
+        iterations: int = 1,
+        custom_personas: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze every requirement `iterations` times, yielding results as they complete.
+
+        All (requirement, iteration, persona) calls are started together and
+        share this team's concurrency limit. Each yielded item holds
+        `requirement_index`, `iteration` (0-based) and either `result` (the
+        merged persona output) or `error`.
+        """
+
+        async def analyze(index: int, iteration: int) -> Dict[str, Any]:
+            item = {"requirement_index": index, "iteration": iteration}
+            try:
+                item["result"] = await self.analyze_requirement(
+                    requirements[index], ontology_json_schema, custom_personas=custom_personas
+                )
+            except Exception as e:
+                logger.warning(f"Analysis of requirement {index} (iteration {iteration}) failed: {e}")
+                item["error"] = str(e)
+            return item
+
+        tasks = [
+            asyncio.ensure_future(analyze(index, iteration))
+            for iteration in range(iterations)
+            for index in range(len(requirements))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def personas(self, custom_personas: Optional[List[Dict[str, Any]]] = None) -> List[Tuple[str, str]]:
+        """(name, system prompt) of the active custom personas, or the defaults."""
+        if custom_personas:
+            return [(p["name"], p["system_prompt"]) for p in custom_personas if p.get("is_active", True)]
+        return list(DEFAULT_PERSONAS)
+
+    async def _analyze_with_persona(
+        self, requirement_text: str, persona: str, system_prompt: str, schema: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        async def call():
+            async with self._limit():
+                return await self._call_model(requirement_text, system_prompt, schema)
+
+        if not self.deterministic:
+            return await call()
+        model = f"{self.settings.llm_provider.lower()}:{self.settings.llm_model}"
+        key = AnalysisCache.key(requirement_text, persona, system_prompt, schema, model)
+        return await self.cache.get_or_call(key, call)
+
     async def _call_model(
         self, requirement_text: str, system_prompt: str, schema: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -335,7 +518,7 @@ class LLMTeam:
                     ),
                 },
             ],
-            "temperature": 0.2,
+            "temperature": self.temperature,
         }
         try:
             async with httpx.AsyncClient(timeout=60) as client:
@@ -399,7 +582,7 @@ class LLMTeam:
                     ),
                 },
             ],
-            "temperature": 0.2,
+            "temperature": self.temperature,
             "stream": False,
         }
         try:
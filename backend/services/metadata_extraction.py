@@ -25,6 +25,7 @@ except ImportError:
     NLTK_AVAILABLE = False
 
 from .config import Settings
+from .pattern_bank import PatternBank
 
 logger = logging.getLogger(__name__)
 
@@ -104,15 +105,33 @@ class MetadataExtractionService:
             "by",
         }
 
+        # Entity patterns overlap (an identifier inside a "shall" statement, a
+        # known system name inside a longer one), so each keeps its own scan;
+        # compile them once rather than per call
+        self._requirement_regexes = [
+            re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in self.requirement_patterns
+        ]
+        self._system_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.system_patterns]
+
+        # Document type patterns are disjoint whole-word alternatives, so they
+        # can never overlap and one plain alternation counts them exactly
+        self._document_type_bank = PatternBank(
+            [
+                (doc_type, pattern)
+                for doc_type, patterns in self.document_type_patterns.items()
+                for pattern in patterns
+            ],
+            overlapping=False,
+        )
+
         logger.info("Metadata extraction service initialized")
 
     def extract_requirement_entities(self, text: str) -> List[str]:
         """Extract requirement identifiers and statements."""
         requirements = set()
 
-        for pattern in self.requirement_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+        for regex in self._requirement_regexes:
+            for match in regex.finditer(text):
                 if match.groups():
                     req_id = match.group(1)
                     requirements.add(req_id.strip())
@@ -127,9 +146,8 @@ class MetadataExtractionService:
         """Extract system and component names."""
         systems = set()
 
-        for pattern in self.system_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for regex in self._system_regexes:
+            for match in regex.finditer(text):
                 system_name = match.group(1) if match.groups() else match.group(0)
                 systems.add(system_name.strip())
 
@@ -173,18 +191,13 @@ class MetadataExtractionService:
     def classify_document_type(self, text: str) -> Tuple[str, float]:
         """Classify document type with confidence score."""
         text_lower = text.lower()
+        matches = self._document_type_bank.count(text_lower)
+        text_length = len(text_lower.split())
         scores = {}
 
-        for doc_type, patterns in self.document_type_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text_lower))
-                score += matches
-
+        for doc_type in self.document_type_patterns:
             # Normalize score by text length
-            text_length = len(text_lower.split())
-            normalized_score = score / max(text_length / 1000, 1)
-            scores[doc_type] = normalized_score
+            scores[doc_type] = matches[doc_type] / max(text_length / 1000, 1)
 
         if not scores:
             return "unknown", 0.0
@@ -5,9 +5,10 @@ Ensures Fuseki remains the single source of truth for ontology data
 
 import logging
 from typing import List, Dict, Any, Optional
-import httpx
 from datetime import datetime
 
+from .fuseki_gateway import get_fuseki_gateway
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +18,7 @@ class NamespaceSyncService:
     def __init__(self, fuseki_url: str = "http://localhost:3030"):
         self.fuseki_url = fuseki_url
         self.dataset = "odras"
+        self.fuseki = get_fuseki_gateway(f"{self.fuseki_url.rstrip('/')}/{self.dataset}")
 
     async def sync_class_to_fuseki(
         self, namespace_path: str, version: str, class_data: Dict[str, Any]
@@ -43,22 +45,9 @@ class NamespaceSyncService:
             """
 
             # Send update to Fuseki
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/update",
-                    data=sparql_update,
-                    headers={"Content-Type": "application/sparql-update"},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    logger.info(f"Successfully synced class {class_data['local_name']} to Fuseki")
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to sync class to Fuseki: {response.status_code} - {response.text}"
-                    )
-                    return False
+            await self.fuseki.aupdate(sparql_update)
+            logger.info(f"Successfully synced class {class_data['local_name']} to Fuseki")
+            return True
 
         except Exception as e:
             logger.error(f"Error syncing class to Fuseki: {e}")
@@ -100,24 +89,11 @@ class NamespaceSyncService:
             """
 
             # Send update to Fuseki
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/update",
-                    data=sparql_update,
-                    headers={"Content-Type": "application/sparql-update"},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    logger.info(
-                        f"Successfully synced namespace {namespace_path}/{version} with {len(classes)} classes to Fuseki"
-                    )
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to sync namespace to Fuseki: {response.status_code} - {response.text}"
-                    )
-                    return False
+            await self.fuseki.aupdate(sparql_update)
+            logger.info(
+                f"Successfully synced namespace {namespace_path}/{version} with {len(classes)} classes to Fuseki"
+            )
+            return True
 
         except Exception as e:
             logger.error(f"Error syncing namespace to Fuseki: {e}")
@@ -144,48 +120,34 @@ class NamespaceSyncService:
             ORDER BY ?label
             """
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/sparql",
-                    data=sparql_query,
-                    headers={"Content-Type": "application/sparql-query"},
-                    timeout=30.0,
+            data = await self.fuseki.aquery(sparql_query)
+            classes = []
+
+            for binding in data.get("results", {}).get("bindings", []):
+                class_iri = binding.get("class", {}).get("value", "")
+                label = binding.get("label", {}).get("value", "")
+                comment = binding.get("comment", {}).get("value", "")
+
+                # Extract local name from IRI
+                local_name = (
+                    class_iri.split("#")[-1]
+                    if "#" in class_iri
+                    else class_iri.split("/")[-1]
                 )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    classes = []
-
-                    for binding in data.get("results", {}).get("bindings", []):
-                        class_iri = binding.get("class", {}).get("value", "")
-                        label = binding.get("label", {}).get("value", "")
-                        comment = binding.get("comment", {}).get("value", "")
-
-                        # Extract local name from IRI
-                        local_name = (
-                            class_iri.split("#")[-1]
-                            if "#" in class_iri
-                            else class_iri.split("/")[-1]
-                        )
-
-                        classes.append(
-                            {
-                                "iri": class_iri,
-                                "local_name": local_name,
-                                "label": label,
-                                "comment": comment,
-                            }
-                        )
-
-                    logger.info(
-                        f"Retrieved {len(classes)} classes from Fuseki for {namespace_path}/{version}"
-                    )
-                    return classes
-                else:
-                    logger.error(
-                        f"Failed to get classes from Fuseki: {response.status_code} - {response.text}"
-                    )
-                    return []
+                classes.append(
+                    {
+                        "iri": class_iri,
+                        "local_name": local_name,
+                        "label": label,
+                        "comment": comment,
+                    }
+                )
+
+            logger.info(
+                f"Retrieved {len(classes)} classes from Fuseki for {namespace_path}/{version}"
+            )
+            return classes
 
         except Exception as e:
             logger.error(f"Error getting classes from Fuseki: {e}")
@@ -233,35 +195,10 @@ class NamespaceSyncService:
             }}
             """
 
-            async with httpx.AsyncClient() as client:
-                # Delete old values
-                delete_response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/update",
-                    data=delete_sparql,
-                    headers={"Content-Type": "application/sparql-update"},
-                    timeout=30.0,
-                )
-
-                if delete_response.status_code != 200:
-                    logger.error(f"Failed to delete old class data: {delete_response.status_code}")
-                    return False
-
-                # Insert new values
-                insert_response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/update",
-                    data=insert_sparql,
-                    headers={"Content-Type": "application/sparql-update"},
-                    timeout=30.0,
-                )
-
-                if insert_response.status_code == 200:
-                    logger.info(f"Successfully updated class {class_iri} in Fuseki")
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to update class in Fuseki: {insert_response.status_code} - {insert_response.text}"
-                    )
-                    return False
+            # Delete old values, then insert new values, in one update request
+            await self.fuseki.aupdate(f"{delete_sparql} ;\n{insert_sparql}")
+            logger.info(f"Successfully updated class {class_iri} in Fuseki")
+            return True
 
         except Exception as e:
             logger.error(f"Error updating class in Fuseki: {e}")
@@ -290,22 +227,9 @@ class NamespaceSyncService:
             }}
             """
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.fuseki_url}/{self.dataset}/update",
-                    data=sparql_update,
-                    headers={"Content-Type": "application/sparql-update"},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    logger.info(f"Successfully deleted class {class_iri} from Fuseki")
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to delete class from Fuseki: {response.status_code} - {response.text}"
-                    )
-                    return False
+            await self.fuseki.aupdate(sparql_update)
+            logger.info(f"Successfully deleted class {class_iri} from Fuseki")
+            return True
 
         except Exception as e:
             logger.error(f"Error deleting class from Fuseki: {e}")
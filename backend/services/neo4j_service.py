@@ -9,6 +9,7 @@ Provides high-level interface for graph operations including:
 """
 
 import logging
+import re
 from typing import Dict, List, Optional, Any, Tuple, Union
 from uuid import UUID
 import json
@@ -27,6 +28,63 @@ from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Labels whose nodes carry a unique id (see setup_schema). Anchoring a match on
+# one of them lets the planner seek through the uniqueness constraint index.
+ID_LABELS = (
+    "Document",
+    "KnowledgeAsset",
+    "Chunk",
+    "Requirement",
+    "Component",
+    "Process",
+    "Function",
+    "Interface",
+    "Condition",
+)
+
+IMPACT_RELATIONSHIP_TYPES = ("DEPENDS_ON", "IMPLEMENTS", "DERIVES_FROM")
+
+CREATE_CHUNKS_QUERY = """
+UNWIND $rows AS row
+CREATE (c:Chunk {
+    id: row.id,
+    content: row.content,
+    chunk_type: row.chunk_type,
+    sequence_number: row.sequence_number,
+    token_count: row.token_count,
+    qdrant_point_id: row.qdrant_point_id,
+    created_at: datetime()
+})
+RETURN c.id as id
+"""
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name: str) -> str:
+    """Validate a label or relationship type before it is spliced into Cypher."""
+    if not name or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid Neo4j label or relationship type: {name!r}")
+    return name
+
+
+def _anchor(var: str, id_expr: str, label: Optional[str] = None, imports: str = "") -> str:
+    """
+    Clause binding ``var`` to the node whose id is ``id_expr``.
+
+    With a label this is a plain index seek. Without one, a UNION over the
+    id-constrained labels keeps every branch an index seek instead of a scan
+    of all nodes. ``imports`` names outer variables the subquery needs.
+    """
+    if label:
+        return f"MATCH ({var}:{_identifier(label)} {{id: {id_expr}}})"
+    with_clause = f"WITH {imports} " if imports else ""
+    branches = " UNION ".join(
+        f"{with_clause}MATCH (n:{id_label} {{id: {id_expr}}}) RETURN n AS {var}"
+        for id_label in ID_LABELS
+    )
+    return f"CALL {{ {branches} }}"
+
 
 class Neo4jService:
     """
@@ -43,6 +101,9 @@ class Neo4jService:
 
         self.settings = settings or Settings()
         self.driver: Optional[Driver] = None
+        self.write_batch_size = getattr(self.settings, "neo4j_write_batch_size", 5000)
+        self.max_traversal_depth = getattr(self.settings, "neo4j_max_traversal_depth", 6)
+        self.traversal_limit = getattr(self.settings, "neo4j_traversal_limit", 1000)
 
         # Initialize connection
         self._init_driver()
@@ -51,7 +112,9 @@ class Neo4jService:
         """Initialize Neo4j driver connection."""
         try:
             # Use Neo4j URL from settings (default to localhost)
-            neo4j_uri = getattr(self.settings, "neo4j_uri", "bolt://localhost:7687")
+            neo4j_uri = getattr(self.settings, "neo4j_uri", None) or getattr(
+                self.settings, "neo4j_url", "bolt://localhost:7687"
+            )
             neo4j_user = getattr(self.settings, "neo4j_user", "neo4j")
             neo4j_password = getattr(self.settings, "neo4j_password", "password")
 
@@ -224,39 +287,27 @@ class Neo4jService:
             logger.error(f"Failed to create KnowledgeAsset node: {str(e)}")
             return None
 
-    def create_chunk_nodes(self, chunks_data: List[Dict[str, Any]]) -> List[str]:
+    def create_chunk_nodes(
+        self, chunks_data: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> List[str]:
         """
         Create multiple Chunk nodes in the graph.
 
+        Chunks are written with UNWIND in batches of ``batch_size`` rows, all
+        inside one write transaction, so a failure creates none of them.
+
         Args:
             chunks_data: List of chunk properties
+            batch_size: Rows per UNWIND statement (defaults to neo4j_write_batch_size)
 
         Returns:
             List of created chunk node IDs
         """
         try:
-            created_ids = []
-
             with self.driver.session() as session:
-                for chunk_data in chunks_data:
-                    query = """
-                    CREATE (c:Chunk {
-                        id: $id,
-                        content: $content,
-                        chunk_type: $chunk_type,
-                        sequence_number: $sequence_number,
-                        token_count: $token_count,
-                        qdrant_point_id: $qdrant_point_id,
-                        created_at: datetime()
-                    })
-                    RETURN c.id as id
-                    """
-
-                    result = session.run(query, **chunk_data)
-                    record = result.single()
-
-                    if record:
-                        created_ids.append(record["id"])
+                created_ids = session.execute_write(
+                    self._run_batches, CREATE_CHUNKS_QUERY, chunks_data, batch_size
+                )
 
             logger.info(f"Created {len(created_ids)} Chunk nodes")
             return created_ids
@@ -265,6 +316,17 @@ class Neo4jService:
             logger.error(f"Failed to create Chunk nodes: {str(e)}")
             return []
 
+    def _run_batches(
+        self, tx, query: str, rows: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> List[Any]:
+        """Run an UNWIND $rows query over ``rows`` in slices; returns the first column of every record"""
+        batch_size = max(1, batch_size or self.write_batch_size)
+        values = []
+        for start in range(0, len(rows), batch_size):
+            result = tx.run(query, rows=rows[start : start + batch_size])
+            values.extend(record[0] for record in result)
+        return values
+
     def create_relationship(
         self,
         from_node_id: str,
@@ -289,49 +351,86 @@ class Neo4jService:
             Relationship ID if successful, None otherwise
         """
         try:
+            query = self._relationship_query(relationship_type, from_label, to_label)
+            rows = [{"from_id": from_node_id, "to_id": to_node_id, "properties": properties or {}}]
+
             with self.driver.session() as session:
-                # Build match clauses with optional labels
-                from_match = (
-                    f"(from:{from_label} {{id: $from_id}})"
-                    if from_label
-                    else "(from {id: $from_id})"
+                rel_ids = session.execute_write(self._run_batches, query, rows)
+
+            if rel_ids:
+                logger.info(
+                    f"Created relationship: {from_node_id} -[{relationship_type}]-> {to_node_id}"
                 )
-                to_match = f"(to:{to_label} {{id: $to_id}})" if to_label else "(to {id: $to_id})"
-
-                # Build properties clause
-                props_str = ""
-                if properties:
-                    props_list = [f"{k}: ${k}" for k in properties.keys()]
-                    props_str = f" {{{', '.join(props_list)}}}"
-
-                query = f"""
-                MATCH {from_match}, {to_match}
-                CREATE (from)-[r:{relationship_type}{props_str}]->(to)
-                RETURN id(r) as rel_id
-                """
+                return rel_ids[0]
 
-                # Combine parameters
-                params = {
-                    "from_id": from_node_id,
-                    "to_id": to_node_id,
-                    **(properties or {}),
+            return None
+
+        except Exception as e:
+            logger.error(f"Failed to create relationship: {str(e)}")
+            return None
+
+    def create_relationships(
+        self, relationships: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Create many relationships in one write transaction.
+
+        Args:
+            relationships: Dicts with from_id, to_id, relationship_type and
+                optional from_label, to_label and properties
+            batch_size: Rows per UNWIND statement (defaults to neo4j_write_batch_size)
+
+        Returns:
+            Number of relationships created (edges whose endpoints are missing are skipped)
+        """
+        # Types and labels cannot be parameters, so one statement per combination
+        groups: Dict[Tuple[Optional[str], str, Optional[str]], List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            key = (rel.get("from_label"), rel["relationship_type"], rel.get("to_label"))
+            groups.setdefault(key, []).append(
+                {
+                    "from_id": rel["from_id"],
+                    "to_id": rel["to_id"],
+                    "properties": rel.get("properties") or {},
                 }
+            )
 
-                result = session.run(query, params)
-                record = result.single()
+        try:
+            queries = [
+                (self._relationship_query(rel_type, from_label, to_label), rows)
+                for (from_label, rel_type, to_label), rows in groups.items()
+            ]
+
+            def write(tx):
+                return sum(
+                    len(self._run_batches(tx, query, rows, batch_size)) for query, rows in queries
+                )
 
-                if record:
-                    rel_id = record["rel_id"]
-                    logger.info(
-                        f"Created relationship: {from_node_id} -[{relationship_type}]-> {to_node_id}"
-                    )
-                    return rel_id
+            with self.driver.session() as session:
+                created = session.execute_write(write)
 
-                return None
+            logger.info(f"Created {created} of {len(relationships)} relationships")
+            return created
 
         except Exception as e:
-            logger.error(f"Failed to create relationship: {str(e)}")
-            return None
+            logger.error(f"Failed to create relationships: {str(e)}")
+            return 0
+
+    def _relationship_query(
+        self, relationship_type: str, from_label: Optional[str], to_label: Optional[str]
+    ) -> str:
+        return f"""
+        UNWIND $rows AS row
+        {_anchor("src", "row.from_id", from_label, imports="row")}
+        {_anchor("dst", "row.to_id", to_label, imports="row")}
+        CREATE (src)-[r:{_identifier(relationship_type)}]->(dst)
+        SET r += row.properties
+        RETURN id(r) as rel_id
+        """
+
+    def _depth(self, max_depth: int) -> int:
+        """Clamp a traversal depth; variable-length bounds must be literals in Cypher"""
+        return max(1, min(int(max_depth), self.max_traversal_depth))
 
     def find_paths(
         self,
@@ -340,6 +439,9 @@ class Neo4jService:
         relationship_types: List[str] = None,
         max_depth: int = 3,
         direction: str = "outgoing",  # outgoing, incoming, both
+        start_label: str = None,
+        end_label: str = None,
+        limit: int = None,
     ) -> List[Dict[str, Any]]:
         """
         Find paths between nodes in the graph.
@@ -348,53 +450,49 @@ class Neo4jService:
             start_node_id: Starting node ID
             end_node_id: Optional ending node ID (if None, finds all reachable nodes)
             relationship_types: Optional list of relationship types to traverse
-            max_depth: Maximum traversal depth
+            max_depth: Maximum traversal depth (capped at neo4j_max_traversal_depth)
             direction: Direction of traversal
+            start_label: Optional label of the start node (for performance)
+            end_label: Optional label of the end node (for performance)
+            limit: Maximum paths returned (defaults to neo4j_traversal_limit)
 
         Returns:
-            List of path information
+            List of path information, shortest first
         """
         try:
-            with self.driver.session() as session:
-                # Build relationship pattern
-                if relationship_types:
-                    rel_types = "|".join(relationship_types)
-                    rel_pattern = f"[r:{rel_types}]"
-                else:
-                    rel_pattern = "[r]"
-
-                # Build direction pattern
-                if direction == "incoming":
-                    path_pattern = f"<-{rel_pattern}-"
-                elif direction == "both":
-                    path_pattern = f"-{rel_pattern}-"
-                else:  # outgoing
-                    path_pattern = f"-{rel_pattern}->"
-
-                # Build query
-                if end_node_id:
-                    # Specific end node
-                    query = f"""
-                    MATCH path = (start {{id: $start_id}}){path_pattern}*(end {{id: $end_id}})
-                    WHERE length(path) <= $max_depth AND length(path) > 0
-                    RETURN path, length(path) as depth
-                    ORDER BY depth
-                    """
-                    params = {
-                        "start_id": start_node_id,
-                        "end_id": end_node_id,
-                        "max_depth": max_depth,
-                    }
-                else:
-                    # All reachable nodes
-                    query = f"""
-                    MATCH path = (start {{id: $start_id}}){path_pattern}(end)
-                    WHERE length(path) <= $max_depth AND length(path) > 0
-                    RETURN path, length(path) as depth, end
-                    ORDER BY depth
-                    """
-                    params = {"start_id": start_node_id, "max_depth": max_depth}
+            depth = self._depth(max_depth)
+
+            # Build relationship pattern
+            if relationship_types:
+                rel_types = "|".join(_identifier(t) for t in relationship_types)
+                rel_pattern = f"[:{rel_types}*1..{depth}]"
+            else:
+                rel_pattern = f"[*1..{depth}]"
+
+            # Build direction pattern
+            if direction == "incoming":
+                path_pattern = f"<-{rel_pattern}-"
+            elif direction == "both":
+                path_pattern = f"-{rel_pattern}-"
+            else:  # outgoing
+                path_pattern = f"-{rel_pattern}->"
+
+            clauses = [_anchor("start", "$start_id", start_label)]
+            params = {"start_id": start_node_id, "limit": limit or self.traversal_limit}
+            if end_node_id:
+                # Specific end node
+                clauses.append(_anchor("target", "$end_id", end_label))
+                params["end_id"] = end_node_id
+
+            query = f"""
+            {" ".join(clauses)}
+            MATCH path = (start){path_pattern}(target)
+            RETURN path, length(path) as depth
+            ORDER BY depth
+            LIMIT $limit
+            """
 
+            with self.driver.session() as session:
                 result = session.run(query, params)
 
                 paths = []
@@ -423,7 +521,7 @@ class Neo4jService:
                     paths.append(path_data)
 
                 logger.info(
-                    f"Found {len(paths)} paths from {start_node_id} (max depth: {max_depth})"
+                    f"Found {len(paths)} paths from {start_node_id} (max depth: {depth})"
                 )
                 return paths
 
@@ -432,70 +530,75 @@ class Neo4jService:
             return []
 
     def impact_analysis(
-        self, node_id: str, analysis_type: str = "downstream", max_depth: int = 3
+        self,
+        node_id: str,
+        analysis_type: str = "downstream",
+        max_depth: int = 3,
+        node_label: str = None,
+        limit: int = None,
     ) -> Dict[str, Any]:
         """
         Perform impact analysis for a given node.
 
+        Each reachable node is reported once, at its shortest distance.
+
         Args:
             node_id: Target node ID (e.g., requirement ID)
             analysis_type: Type of analysis (downstream, upstream, bidirectional)
-            max_depth: Maximum traversal depth
+            max_depth: Maximum traversal depth (capped at neo4j_max_traversal_depth)
+            node_label: Optional label of the target node (for performance)
+            limit: Maximum affected nodes returned (defaults to neo4j_traversal_limit)
 
         Returns:
             Impact analysis results
         """
         try:
+            depth = self._depth(max_depth)
+            limit = limit or self.traversal_limit
+            rel_pattern = f"[:{'|'.join(IMPACT_RELATIONSHIP_TYPES)}*1..{depth}]"
+
+            if analysis_type == "downstream":
+                # Find what depends on this node
+                match = f"MATCH path = (start)-{rel_pattern}->(node)"
+            elif analysis_type == "upstream":
+                # Find what this node depends on
+                match = f"MATCH path = (node)-{rel_pattern}->(start)"
+            else:  # bidirectional
+                match = f"MATCH path = (start)-{rel_pattern}-(node)"
+
+            query = f"""
+            {_anchor("start", "$node_id", node_label)}
+            {match}
+            WHERE node <> start
+            WITH node, min(length(path)) as depth
+            RETURN node, depth
+            ORDER BY depth
+            LIMIT $limit
+            """
+
             with self.driver.session() as session:
-                if analysis_type == "downstream":
-                    # Find what depends on this node
-                    query = """
-                    MATCH path = (start {id: $node_id})-[r:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..3]->(affected)
-                    RETURN affected, r, length(path) as depth
-                    ORDER BY depth
-                    """
-                elif analysis_type == "upstream":
-                    # Find what this node depends on
-                    query = """
-                    MATCH path = (dependency)-[r:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..3]->(start {id: $node_id})
-                    RETURN dependency, r, length(path) as depth
-                    ORDER BY depth
-                    """
-                else:  # bidirectional
-                    query = """
-                    MATCH path = (start {id: $node_id})-[r:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..3]-(connected)
-                    RETURN connected, r, length(path) as depth
-                    ORDER BY depth
-                    """
-
-                result = session.run(query, {"node_id": node_id, "max_depth": max_depth})
+                result = session.run(query, {"node_id": node_id, "limit": limit})
 
                 affected_nodes = []
                 for record in result:
-                    node_key = (
-                        "affected"
-                        if analysis_type == "downstream"
-                        else ("dependency" if analysis_type == "upstream" else "connected")
+                    node = record["node"]
+                    affected_nodes.append(
+                        {
+                            "id": node.get("id"),
+                            "labels": list(node.labels),
+                            "properties": dict(node.items()),
+                            "depth": record["depth"],
+                        }
                     )
-                    node = record.get(node_key)
-
-                    if node:
-                        affected_nodes.append(
-                            {
-                                "id": node.get("id"),
-                                "labels": list(node.labels),
-                                "properties": dict(node.items()),
-                                "depth": record["depth"],
-                            }
-                        )
 
-                return {
-                    "target_node_id": node_id,
-                    "analysis_type": analysis_type,
-                    "max_depth": max_depth,
-                    "affected_count": len(affected_nodes),
-                    "affected_nodes": affected_nodes,
-                }
+            return {
+                "target_node_id": node_id,
+                "analysis_type": analysis_type,
+                "max_depth": depth,
+                "affected_count": len(affected_nodes),
+                "affected_nodes": affected_nodes,
+                "truncated": len(affected_nodes) >= limit,
+            }
 
         except Exception as e:
             logger.error(f"Impact analysis failed for {node_id}: {str(e)}")
@@ -531,28 +634,29 @@ class Neo4jService:
         """
         Get graph database statistics.
 
+        Every count is a single-label or single-type count, which Neo4j
+        answers from its count store without touching nodes or relationships.
+
         Returns:
             Statistics about nodes, relationships, etc.
         """
         try:
             with self.driver.session() as session:
+                labels = [r["label"] for r in session.run("CALL db.labels() YIELD label")]
+                rel_types = [
+                    r["relationshipType"]
+                    for r in session.run("CALL db.relationshipTypes() YIELD relationshipType")
+                ]
+
                 # Get node counts by label
-                node_stats = session.run(
-                    """
-                    MATCH (n)
-                    RETURN labels(n) as labels, count(n) as count
-                    ORDER BY count DESC
-                """
-                ).data()
+                node_stats = self._count_store_counts(
+                    session, labels, "MATCH (n:`{0}`) RETURN ${1} as label, count(n) as count"
+                )
 
                 # Get relationship counts by type
-                rel_stats = session.run(
-                    """
-                    MATCH ()-[r]->()
-                    RETURN type(r) as type, count(r) as count
-                    ORDER BY count DESC
-                """
-                ).data()
+                rel_stats = self._count_store_counts(
+                    session, rel_types, "MATCH ()-[r:`{0}`]->() RETURN ${1} as type, count(r) as count"
+                )
 
                 # Get total counts
                 total_nodes = session.run("MATCH (n) RETURN count(n) as total").single()["total"]
@@ -571,6 +675,17 @@ class Neo4jService:
             logger.error(f"Failed to get graph stats: {str(e)}")
             return {"error": str(e)}
 
+    def _count_store_counts(self, session, names: List[str], branch: str) -> List[Dict[str, Any]]:
+        """Run one count-store branch per label/type as a single UNION ALL query"""
+        if not names:
+            return []
+        params = {f"name{i}": name for i, name in enumerate(names)}
+        query = " UNION ALL ".join(
+            branch.format(name.replace("`", "``"), f"name{i}") for i, name in enumerate(names)
+        )
+        rows = session.run(query, params).data()
+        return sorted(rows, key=lambda row: row["count"], reverse=True)
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check Neo4j service health.
@@ -5,21 +5,171 @@ Detects changes to ontology elements when ontologies are saved.
 Compares old and new versions to identify:
 - Added elements
 - Deleted elements
-- Renamed elements (detected via heuristics)
+- Renamed elements (matched by structural fingerprint)
 - Modified elements (properties, types, etc.)
+
+Both versions are parsed rdflib graphs. Elements are read per subject from the
+graph's subject index, and each gets a fingerprint of its statements other
+than its label. A deleted and an added element of the same type whose
+fingerprints hash to the same bucket are a rename, so renames are matched in
+one pass instead of by comparing every old/new pair.
+
+The previous version of a graph is kept as a snapshot after each save and
+reused while no write has gone through the Fuseki gateway since (and for at
+most ontology_snapshot_ttl_s, for writes by other processes); otherwise it is
+fetched from Fuseki with a Graph Store GET.
 """
 
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Set, Tuple, Any
-from dataclasses import dataclass
-from SPARQLWrapper import SPARQLWrapper, JSON
+from dataclasses import dataclass, field
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
 from backend.services.db import DatabaseService
 from backend.services.sparql_runner import SPARQLRunner
 from backend.services.cqmt_dependency_tracker import CQMTDependencyTracker
 from backend.services.config import Settings
+from backend.services.fuseki_gateway import get_fuseki_gateway
 
 logger = logging.getLogger(__name__)
 
+# rdf:type objects that make a subject an ontology element, by precedence
+# (a subject declared as both keeps the later type)
+DECLARED_TYPES = {
+    OWL.Class: (1, "Class"),
+    OWL.ObjectProperty: (2, "ObjectProperty"),
+    OWL.DatatypeProperty: (3, "DatatypeProperty"),
+}
+
+# Namespaces whose classes do not make their instances Individuals
+VOCABULARY_NAMESPACES = (str(OWL), str(RDF), str(RDFS))
+
+PROPERTY_TYPES = ("DatatypeProperty", "ObjectProperty")
+
+
+@dataclass
+class OntologySnapshot:
+    """Elements of one ontology version and their structural fingerprints."""
+
+    elements: Dict[str, Dict] = field(default_factory=dict)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+
+
+def _preferred_literal(values: List[Any]) -> str:
+    """Deterministic pick among several labels/comments: untagged or English first."""
+    if not values:
+        return ""
+    return str(min(values, key=lambda v: (getattr(v, "language", None) not in (None, "en"), str(v))))
+
+
+def _term_key(term) -> str:
+    # Blank node ids differ between parses; only their presence counts
+    return "_:" if isinstance(term, BNode) else term.n3()
+
+
+def extract_snapshot(graph: Graph) -> OntologySnapshot:
+    """
+    Ontology elements of a graph: declared classes and properties, and
+    subjects typed with a non-vocabulary class (Individuals).
+    """
+    types: Dict[URIRef, List] = {}
+    for subject, rdf_type in graph.subject_objects(RDF.type):
+        if isinstance(subject, URIRef):
+            types.setdefault(subject, []).append(rdf_type)
+
+    snapshot = OntologySnapshot()
+    for subject, subject_types in types.items():
+        declared = [DECLARED_TYPES[t] for t in subject_types if t in DECLARED_TYPES]
+        if declared:
+            element_type = max(declared)[1]
+        elif any(isinstance(t, URIRef) and not str(t).startswith(VOCABULARY_NAMESPACES) for t in subject_types):
+            element_type = "Individual"
+        else:
+            continue
+
+        labels, comments, statements = [], [], []
+        for predicate, obj in graph.predicate_objects(subject):
+            if predicate == RDFS.label:
+                labels.append(obj)
+                continue
+            if predicate == RDFS.comment:
+                comments.append(obj)
+            statements.append(f"{predicate.n3()} {_term_key(obj)}")
+
+        iri = str(subject)
+        snapshot.elements[iri] = {
+            "type": element_type,
+            "label": _preferred_literal(labels),
+            "comment": _preferred_literal(comments),
+        }
+        statements.sort()
+        snapshot.fingerprints[iri] = hashlib.sha1("\n".join(statements).encode("utf-8")).hexdigest()
+
+    return snapshot
+
+
+def parse_snapshot(turtle_content: str) -> OntologySnapshot:
+    """Parse Turtle into a snapshot (raises on invalid Turtle)."""
+    graph = Graph()
+    graph.parse(data=turtle_content, format="turtle")
+    return extract_snapshot(graph)
+
+
+class SnapshotCache:
+    """
+    Last known snapshot per graph, valid while the Fuseki gateway's dataset
+    version is unchanged and for at most ttl_s.
+    """
+
+    def __init__(self, max_entries: int = 32, ttl_s: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, float, OntologySnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_url: str, graph_iri: str, version: int) -> Optional[OntologySnapshot]:
+        with self._lock:
+            entry = self._entries.get((dataset_url, graph_iri))
+            if entry and entry[0] == version and entry[1] > time.monotonic():
+                self._entries.move_to_end((dataset_url, graph_iri))
+                return entry[2]
+            return None
+
+    def put(self, dataset_url: str, graph_iri: str, version: int, snapshot: OntologySnapshot) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(dataset_url, graph_iri)] = (version, time.monotonic() + self.ttl_s, snapshot)
+            self._entries.move_to_end((dataset_url, graph_iri))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_snapshot_cache: Optional[SnapshotCache] = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache(settings: Optional[Settings] = None) -> SnapshotCache:
+    """Process-wide snapshot cache (sized from settings on first use)."""
+    global _snapshot_cache
+    with _snapshot_cache_lock:
+        if _snapshot_cache is None:
+            _snapshot_cache = SnapshotCache(
+                max_entries=getattr(settings, "ontology_snapshot_cache_entries", 32),
+                ttl_s=getattr(settings, "ontology_snapshot_ttl_s", 300.0),
+            )
+        return _snapshot_cache
+
 
 @dataclass
 class ElementChange:
@@ -44,14 +194,15 @@ class ChangeDetectionResult:
     total_deleted: int = 0
     total_renamed: int = 0
     total_modified: int = 0
+    snapshot: Optional[OntologySnapshot] = None  # Parsed new version, for remember_snapshot()
 
 
 class OntologyChangeDetector:
     """
     Detects changes to ontology elements when ontologies are saved.
     
-    Compares the current state in Fuseki with incoming Turtle content
-    to identify what changed.
+    Compares the current state in Fuseki (or its cached snapshot) with
+    incoming Turtle content to identify what changed.
     """
     
     def __init__(self, db_service: DatabaseService, fuseki_url: str = "http://localhost:3030"):
@@ -59,6 +210,8 @@ class OntologyChangeDetector:
         self.runner = SPARQLRunner(fuseki_url)
         self.dependency_tracker = CQMTDependencyTracker(db_service, fuseki_url)
         self.settings = Settings()
+        self.gateway = get_fuseki_gateway(fuseki_url, self.settings)
+        self.snapshots = get_snapshot_cache(self.settings)
     
     def detect_changes(self, graph_iri: str, new_turtle_content: str) -> ChangeDetectionResult:
         """
@@ -72,14 +225,17 @@ class OntologyChangeDetector:
             ChangeDetectionResult with detected changes and affected MTs
         """
         try:
-            # Get current state from Fuseki
-            old_elements = self._get_current_elements(graph_iri)
+            # Parse new content first: invalid Turtle reports no changes rather than all deletions
+            new_snapshot = parse_snapshot(new_turtle_content)
             
-            # Parse new content to get elements
-            new_elements = self._parse_turtle_elements(new_turtle_content)
+            # Previous version from the snapshot cache, or Fuseki
+            old_snapshot = self._current_snapshot(graph_iri)
             
             # Compare and detect changes
-            changes = self._compare_elements(old_elements, new_elements)
+            changes = self._compare_elements(
+                old_snapshot.elements, new_snapshot.elements,
+                old_snapshot.fingerprints, new_snapshot.fingerprints
+            )
             
             # Find affected MTs
             affected_mts = self._find_affected_mts(graph_iri, changes)
@@ -92,7 +248,8 @@ class OntologyChangeDetector:
                 total_added=len([c for c in changes if c.change_type == 'added']),
                 total_deleted=len([c for c in changes if c.change_type == 'deleted']),
                 total_renamed=len([c for c in changes if c.change_type == 'renamed']),
-                total_modified=len([c for c in changes if c.change_type == 'modified'])
+                total_modified=len([c for c in changes if c.change_type == 'modified']),
+                snapshot=new_snapshot
             )
             
             logger.info(f"Detected {len(changes)} changes to {graph_iri}: "
@@ -110,6 +267,34 @@ class OntologyChangeDetector:
                 affected_mts=[]
             )
     
+    def remember_snapshot(self, graph_iri: str, snapshot: Optional[OntologySnapshot]) -> None:
+        """
+        Record the version just written to graph_iri as the baseline for its
+        next save. Call after the write, so the gateway version includes it.
+        """
+        if snapshot is not None:
+            self.snapshots.put(self.gateway.dataset_url, graph_iri, self.gateway.version, snapshot)
+    
+    def _current_snapshot(self, graph_iri: str) -> OntologySnapshot:
+        """Snapshot of the graph as stored in Fuseki (cached between saves)."""
+        version = self.gateway.version
+        snapshot = self.snapshots.get(self.gateway.dataset_url, graph_iri, version)
+        if snapshot is not None:
+            return snapshot
+        
+        try:
+            turtle = self.gateway.get_graph(graph_iri)
+        except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) != 404:
+                logger.error(f"Error getting current elements for {graph_iri}: {e}")
+                return OntologySnapshot()
+            turtle = ""  # Graph does not exist yet
+        
+        snapshot = parse_snapshot(turtle)
+        self.snapshots.put(self.gateway.dataset_url, graph_iri, version, snapshot)
+        logger.info(f"Total elements found: {len(snapshot.elements)}")
+        return snapshot
+    
     def _get_current_elements(self, graph_iri: str) -> Dict[str, Dict]:
         """
         Get current ontology elements from Fuseki.
@@ -117,202 +302,28 @@ class OntologyChangeDetector:
         Returns:
             Dict mapping element IRI to element metadata
         """
-        try:
-            # Query for classes, properties, and individuals
-            query = f"""
-            PREFIX owl: <http://www.w3.org/2002/07/owl#>
-            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            
-            SELECT ?iri ?type ?label ?comment WHERE {{
-                GRAPH <{graph_iri}> {{
-                    {{
-                        ?iri a owl:Class .
-                        BIND("Class" as ?type)
-                    }} UNION {{
-                        ?iri a owl:ObjectProperty .
-                        BIND("ObjectProperty" as ?type)
-                    }} UNION {{
-                        ?iri a owl:DatatypeProperty .
-                        BIND("DatatypeProperty" as ?type)
-                    }} UNION {{
-                        ?iri rdf:type ?class .
-                        ?class a owl:Class .
-                        BIND("Individual" as ?type)
-                    }}
-                    OPTIONAL {{ ?iri rdfs:label ?label }}
-                    OPTIONAL {{ ?iri rdfs:comment ?comment }}
-                }}
-            }}
-            """
-            
-            result = self.runner._execute_sparql_select(query)
-            if not result["success"]:
-                logger.warning(f"Failed to query current elements for {graph_iri}")
-                return {}
-            
-            elements = {}
-            bindings = result["data"].get("results", {}).get("bindings", [])
-            
-            for binding in bindings:
-                iri = binding.get("iri", {}).get("value", "")
-                if iri:
-                    elements[iri] = {
-                        "type": binding.get("type", {}).get("value", "Other"),
-                        "label": binding.get("label", {}).get("value", ""),
-                        "comment": binding.get("comment", {}).get("value", "")
-                    }
-                    # Debug logging
-                    logger.debug(f"Found element: {iri}, type: {elements[iri]['type']}, label: '{elements[iri]['label']}'")
-            
-            logger.info(f"Total elements found: {len(elements)}")
-            return elements
-            
-        except Exception as e:
-            logger.error(f"Error getting current elements: {e}")
-            return {}
+        return self._current_snapshot(graph_iri).elements
     
     def _parse_turtle_elements(self, turtle_content: str) -> Dict[str, Dict]:
         """
         Parse Turtle content to extract element IRIs.
         
-        This parser handles:
-        - Prefix declarations (@prefix)
-        - Class declarations
-        - Property declarations  
-        - Individual declarations
-        - Labels and comments
-        
         Returns:
             Dict mapping element IRI to element metadata
         """
-        elements = {}
-        
         try:
-            import re
-            
-            # Step 1: Extract prefix declarations
-            prefixes = {}
-            prefix_pattern = r'@prefix\s+(\w+):\s+<([^>]+)>'
-            for match in re.finditer(prefix_pattern, turtle_content):
-                prefix_name = match.group(1)
-                prefix_value = match.group(2)
-                prefixes[prefix_name] = prefix_value
-            
-            # Also handle default (empty) prefix
-            default_prefix_pattern = r'@prefix\s+:\s+<([^>]+)>'
-            for match in re.finditer(default_prefix_pattern, turtle_content):
-                prefix_value = match.group(1)
-                prefixes[''] = prefix_value
-            
-            # Step 2: Helper function to resolve IRIs
-            def resolve_iri(iri_str: str) -> str:
-                """Resolve shorthand IRI to full IRI."""
-                # If already full IRI, return as-is
-                if iri_str.startswith('<') and iri_str.endswith('>'):
-                    return iri_str[1:-1]
-                
-                # If shorthand with prefix (e.g., owl:Class)
-                if ':' in iri_str:
-                    parts = iri_str.split(':', 1)
-                    prefix_name = parts[0]
-                    local_name = parts[1]
-                    
-                    if prefix_name in prefixes:
-                        return f"{prefixes[prefix_name]}{local_name}"
-                    # Well-known prefixes
-                    if prefix_name == 'owl':
-                        return f"http://www.w3.org/2002/07/owl#{local_name}"
-                    if prefix_name == 'rdfs':
-                        return f"http://www.w3.org/2000/01/rdf-schema#{local_name}"
-                    if prefix_name == 'rdf':
-                        return f"http://www.w3.org/1999/02/22-rdf-syntax-ns#{local_name}"
-                
-                # If shorthand without prefix (e.g., :Person) - use default prefix
-                if iri_str.startswith(':'):
-                    local_name = iri_str[1:]
-                    if '' in prefixes:
-                        return f"{prefixes['']}{local_name}"
-                
-                return iri_str
-            
-            # Step 3: Find class declarations
-            class_patterns = [
-                r'<([^>]+)>\s+a\s+owl:Class',  # Full IRI
-                r':(\w+)\s+a\s+owl:Class',     # Shorthand
-            ]
-            for pattern in class_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    elements[iri] = {"type": "Class", "label": "", "comment": ""}
-            
-            # Step 4: Find object property declarations
-            obj_prop_patterns = [
-                r'<([^>]+)>\s+a\s+owl:ObjectProperty',
-                r':(\w+)\s+a\s+owl:ObjectProperty',
-            ]
-            for pattern in obj_prop_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    elements[iri] = {"type": "ObjectProperty", "label": "", "comment": ""}
-            
-            # Step 5: Find datatype property declarations
-            data_prop_patterns = [
-                r'<([^>]+)>\s+a\s+owl:DatatypeProperty',
-                r':(\w+)\s+a\s+owl:DatatypeProperty',
-            ]
-            for pattern in data_prop_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    elements[iri] = {"type": "DatatypeProperty", "label": "", "comment": ""}
-            
-            # Step 6: Find individual type declarations (but don't override classes/properties)
-            individual_patterns = [
-                r'<([^>]+)>\s+a\s+<([^>]+)>',
-                r':(\w+)\s+a\s+:(\w+)',
-            ]
-            for pattern in individual_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    if iri not in elements:
-                        elements[iri] = {"type": "Individual", "label": "", "comment": ""}
-            
-            # Step 7: Extract labels
-            label_patterns = [
-                r'<([^>]+)>\s+rdfs:label\s+"([^"]+)"',
-                r':(\w+)\s+rdfs:label\s+"([^"]+)"',
-            ]
-            for pattern in label_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    label = match.group(2)
-                    if iri in elements:
-                        elements[iri]["label"] = label
-            
-            # Step 8: Extract comments
-            comment_patterns = [
-                r'<([^>]+)>\s+rdfs:comment\s+"([^"]+)"',
-                r':(\w+)\s+rdfs:comment\s+"([^"]+)"',
-            ]
-            for pattern in comment_patterns:
-                for match in re.finditer(pattern, turtle_content):
-                    iri_raw = match.group(1)
-                    iri = resolve_iri(iri_raw)
-                    comment = match.group(2)
-                    if iri in elements:
-                        elements[iri]["comment"] = comment
-                    
+            return parse_snapshot(turtle_content).elements
         except Exception as e:
             logger.error(f"Error parsing Turtle content: {e}")
-        
-        return elements
+            return {}
     
-    def _compare_elements(self, old_elements: Dict[str, Dict], new_elements: Dict[str, Dict]) -> List[ElementChange]:
+    def _compare_elements(
+        self,
+        old_elements: Dict[str, Dict],
+        new_elements: Dict[str, Dict],
+        old_fingerprints: Optional[Dict[str, str]] = None,
+        new_fingerprints: Optional[Dict[str, str]] = None,
+    ) -> List[ElementChange]:
         """
         Compare old and new elements to detect changes.
         
@@ -324,8 +335,31 @@ class OntologyChangeDetector:
         old_iris = set(old_elements.keys())
         new_iris = set(new_elements.keys())
         
+        # Detect renames among the deleted/added elements
+        renames = self._match_renames(
+            old_iris - new_iris, new_iris - old_iris, old_elements, new_elements,
+            old_fingerprints or {}, new_fingerprints or {}
+        )
+        for old_iri, new_iri, confidence in renames:
+            old_elem = old_elements[old_iri]
+            new_elem = new_elements[new_iri]
+            changes.append(ElementChange(
+                element_iri=old_iri,
+                change_type='renamed',
+                old_iri=old_iri,
+                new_iri=new_iri,
+                element_type=old_elem.get("type"),
+                change_details={
+                    "old_label": old_elem.get("label", ""),
+                    "new_label": new_elem.get("label", ""),
+                    "confidence": confidence
+                }
+            ))
+        renamed_old = {old_iri for old_iri, _, _ in renames}
+        renamed_new = {new_iri for _, new_iri, _ in renames}
+        
         # Detect additions
-        for iri in new_iris - old_iris:
+        for iri in new_iris - old_iris - renamed_new:
             new_elem = new_elements[iri]
             changes.append(ElementChange(
                 element_iri=iri,
@@ -335,7 +369,7 @@ class OntologyChangeDetector:
             ))
         
         # Detect deletions
-        for iri in old_iris - new_iris:
+        for iri in old_iris - new_iris - renamed_old:
             old_elem = old_elements[iri]
             changes.append(ElementChange(
                 element_iri=iri,
@@ -391,83 +425,104 @@ class OntologyChangeDetector:
         
         return changes
     
-    def detect_property_renames(self, changes: List[ElementChange]) -> List[Dict[str, Any]]:
+    def _match_renames(
+        self,
+        deleted: Set[str],
+        added: Set[str],
+        old_elements: Dict[str, Dict],
+        new_elements: Dict[str, Dict],
+        old_fingerprints: Dict[str, str],
+        new_fingerprints: Dict[str, str],
+    ) -> List[Tuple[str, str, str]]:
         """
-        Detect potential property renames by comparing deleted and added properties.
+        Pair deleted with added elements that are the same element under a new IRI.
+        
+        Elements are bucketed by (type, fingerprint); a bucket holding exactly
+        one deleted and one added element is a rename with high confidence.
+        Of what remains, a type with exactly one deleted and one added element
+        is a rename with medium confidence. Ambiguous buckets stay as
+        additions and deletions.
         
         Returns:
-            List of potential rename mappings
+            (old_iri, new_iri, confidence) tuples
         """
         renames = []
         
-        # Get deleted and added properties
-        deleted_props = [c for c in changes if c.change_type == 'deleted' and c.element_type in ['DatatypeProperty', 'ObjectProperty']]
-        added_props = [c for c in changes if c.change_type == 'added' and c.element_type in ['DatatypeProperty', 'ObjectProperty']]
+        def unique_pairs(key_old, key_new, old_iris, new_iris):
+            buckets: Dict[Any, Tuple[List[str], List[str]]] = {}
+            for iri in old_iris:
+                buckets.setdefault(key_old(iri), ([], []))[0].append(iri)
+            for iri in new_iris:
+                buckets.setdefault(key_new(iri), ([], []))[1].append(iri)
+            return [(olds[0], news[0]) for olds, news in buckets.values() if len(olds) == len(news) == 1]
         
-        # Simple heuristic: if a property is deleted and another similar one is added, it might be a rename
-        # This is simplistic but catches common cases
-        for deleted in deleted_props:
-            deleted_label = deleted.change_details.get("label", "")
-            deleted_local_name = deleted.element_iri.split("#")[-1].split("/")[-1]
-            
-            for added in added_props:
-                added_label = added.change_details.get("label", "")
-                added_local_name = added.element_iri.split("#")[-1].split("/")[-1]
-                
-                # Check if labels are similar (potential rename)
-                if deleted_label and added_label and deleted_label != added_label:
-                    # Use labels (with spaces) instead of IRI names (without spaces)
-                    # This matches how frontend stores property names in database
-                    old_name = deleted_label
-                    new_name = added_label
-                    
-                    renames.append({
-                        "old_name": old_name,
-                        "new_name": new_name,
-                        "old_iri": deleted.element_iri,
-                        "new_iri": added.element_iri,
-                        "old_local_name": deleted_local_name,
-                        "new_local_name": added_local_name,
-                        "property_type": deleted.element_type,  # Include property type
-                        "confidence": "medium"
-                    })
+        # Structural buckets (only elements with a fingerprint on both sides)
+        fingerprinted_old = {iri for iri in deleted if iri in old_fingerprints}
+        fingerprinted_new = {iri for iri in added if iri in new_fingerprints}
+        for old_iri, new_iri in unique_pairs(
+            lambda iri: (old_elements[iri].get("type"), old_fingerprints[iri]),
+            lambda iri: (new_elements[iri].get("type"), new_fingerprints[iri]),
+            fingerprinted_old, fingerprinted_new
+        ):
+            renames.append((old_iri, new_iri, "high"))
+        
+        # One remaining deletion and addition of a type
+        remaining_old = deleted - {old_iri for old_iri, _, _ in renames}
+        remaining_new = added - {new_iri for _, new_iri, _ in renames}
+        for old_iri, new_iri in unique_pairs(
+            lambda iri: old_elements[iri].get("type"),
+            lambda iri: new_elements[iri].get("type"),
+            remaining_old, remaining_new
+        ):
+            renames.append((old_iri, new_iri, "medium"))
+        
+        return sorted(renames)
+    
+    def _label_renames(self, changes: List[ElementChange], element_types) -> List[Dict[str, Any]]:
+        """Renames of the given element types that also changed the (non-empty) label."""
+        renames = []
+        for change in changes:
+            if change.change_type != 'renamed' or change.element_type not in element_types:
+                continue
+            old_label = change.change_details.get("old_label", "")
+            new_label = change.change_details.get("new_label", "")
+            # Use labels (with spaces) instead of IRI names (without spaces)
+            # This matches how frontend stores property names in database
+            if old_label and new_label and old_label != new_label:
+                renames.append({
+                    "old_name": old_label,
+                    "new_name": new_label,
+                    "old_iri": change.old_iri,
+                    "new_iri": change.new_iri,
+                    "old_local_name": change.old_iri.split("#")[-1].split("/")[-1],
+                    "new_local_name": change.new_iri.split("#")[-1].split("/")[-1],
+                    "element_type": change.element_type,
+                    "confidence": change.change_details.get("confidence", "medium")
+                })
+        return renames
+    
+    def detect_property_renames(self, changes: List[ElementChange]) -> List[Dict[str, Any]]:
+        """
+        Property renames (from detected 'renamed' changes) that changed the label.
         
+        Returns:
+            List of potential rename mappings
+        """
+        renames = self._label_renames(changes, PROPERTY_TYPES)
+        for rename in renames:
+            rename["property_type"] = rename.pop("element_type")  # Include property type
         return renames
     
     def detect_class_renames(self, changes: List[ElementChange]) -> List[Dict[str, Any]]:
         """
-        Detect potential class renames by comparing deleted and added classes.
+        Class renames (from detected 'renamed' changes) that changed the label.
         
         Returns:
             List of potential class rename mappings
         """
-        renames = []
-        
-        # Get deleted and added classes
-        deleted_classes = [c for c in changes if c.change_type == 'deleted' and c.element_type == 'Class']
-        added_classes = [c for c in changes if c.change_type == 'added' and c.element_type == 'Class']
-        
-        # Simple heuristic: if a class is deleted and another similar one is added, it might be a rename
-        for deleted in deleted_classes:
-            deleted_label = deleted.change_details.get("label", "")
-            deleted_local_name = deleted.element_iri.split("#")[-1].split("/")[-1]
-            
-            for added in added_classes:
-                added_label = added.change_details.get("label", "")
-                added_local_name = added.element_iri.split("#")[-1].split("/")[-1]
-                
-                # Check if labels are similar (potential rename)
-                if deleted_label and added_label and deleted_label != added_label:
-                    renames.append({
-                        "old_name": deleted_label,
-                        "new_name": added_label,
-                        "old_iri": deleted.element_iri,
-                        "new_iri": added.element_iri,
-                        "old_local_name": deleted_local_name,
-                        "new_local_name": added_local_name,
-                        "confidence": "medium"
-                    })
-        
+        renames = self._label_renames(changes, ("Class",))
+        for rename in renames:
+            del rename["element_type"]
         return renames
     
     def _find_affected_mts(self, graph_iri: str, changes: List[ElementChange]) -> List[str]:
@@ -482,25 +537,25 @@ class OntologyChangeDetector:
             List of affected MT IDs
         """
         affected_mts = set()
+        element_iris = sorted({change.element_iri for change in changes})
+        if not element_iris:
+            return []
         
         try:
-            for change in changes:
-                # Query dependency table for MTs referencing this element
-                query = """
-                SELECT DISTINCT mt_id FROM mt_ontology_dependencies
-                WHERE ontology_graph_iri = %s AND referenced_element_iri = %s
-                """
-                
-                conn = self.db._conn()
-                try:
-                    with conn.cursor() as cursor:
-                        cursor.execute(query, (graph_iri, change.element_iri))
-                        rows = cursor.fetchall()
-                        
-                        for row in rows:
-                            affected_mts.add(str(row[0]))
-                finally:
-                    self.db.pool.putconn(conn)
+            # Query dependency table for MTs referencing any changed element
+            query = """
+            SELECT DISTINCT mt_id FROM mt_ontology_dependencies
+            WHERE ontology_graph_iri = %s AND referenced_element_iri = ANY(%s)
+            """
+            
+            conn = self.db._conn()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, (graph_iri, element_iris))
+                    for row in cursor.fetchall():
+                        affected_mts.add(str(row[0]))
+            finally:
+                self.db._return(conn)
                 
         except Exception as e:
             logger.error(f"Error finding affected MTs: {e}")
@@ -12,11 +12,9 @@ from typing import Any, Dict, List, Optional, Union
 import requests
 from rdflib import OWL, RDF, RDFS, XSD, Graph, Literal, Namespace, URIRef
 from rdflib.namespace import NamespaceManager
-from SPARQLWrapper import GET
-from SPARQLWrapper import JSON as SPARQL_JSON
-from SPARQLWrapper import POST, SPARQLWrapper
 
 from .config import Settings
+from .fuseki_gateway import get_fuseki_gateway
 from .namespace_uri_generator import NamespaceURIGenerator
 from .resource_uri_service import ResourceURIService
 
@@ -37,6 +35,7 @@ class OntologyManager:
         self.fuseki_url = settings.fuseki_url
         self.fuseki_query_url = f"{self.fuseki_url}/query"
         self.fuseki_update_url = f"{self.fuseki_url}/update"
+        self.fuseki = get_fuseki_gateway(self.fuseki_url)
 
         # Initialize namespace URI generator
         self.namespace_generator = NamespaceURIGenerator(settings)
@@ -93,10 +92,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             # Convert SPARQL results to structured JSON
             ontology_json = self._sparql_results_to_json(results)
@@ -131,10 +127,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             # Convert SPARQL results to structured JSON
             ontology_json = self._sparql_results_to_json(results)
@@ -478,10 +471,7 @@ class OntologyManager:
             }
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             bindings = results["results"]["bindings"][0]
 
@@ -1089,10 +1079,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_update_url)
-            sparql.setMethod(POST)
-            sparql.setQuery(query)
-            sparql.query()
+            self.fuseki.update(query)
 
             return {"success": True}
 
@@ -1158,11 +1145,7 @@ class OntologyManager:
         """Execute a SPARQL UPDATE query."""
         try:
             logger.debug(f"Executing SPARQL UPDATE: {query}")
-            sparql = SPARQLWrapper(self.fuseki_update_url)
-            sparql.setMethod(POST)
-            sparql.setQuery(query)
-            result = sparql.query()
-            logger.debug(f"SPARQL UPDATE result: {result}")
+            self.fuseki.update(query)
 
             return {"success": True}
 
@@ -1233,10 +1216,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             if results["results"]["bindings"]:
                 binding = results["results"]["bindings"][0]
@@ -1352,10 +1332,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             if results["results"]["bindings"]:
                 binding = results["results"]["bindings"][0]
@@ -1530,10 +1507,7 @@ class OntologyManager:
                 }}
                 """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            result = sparql.query().convert()
+            result = self.fuseki.query(query)
 
             return result.get("boolean", False)
 
@@ -1563,10 +1537,7 @@ class OntologyManager:
             }}
             """
 
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
 
             warnings = []
             errors = []
@@ -1734,10 +1705,7 @@ SELECT ?class ?label WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
             
             for binding in results["results"]["bindings"]:
                 class_uri = binding["class"]["value"]
@@ -1784,10 +1752,7 @@ SELECT ?property ?label ?comment ?range WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
             
             properties = []
             for binding in results["results"]["bindings"]:
@@ -1841,10 +1806,7 @@ SELECT DISTINCT ?g WHERE {{
     }}
 }}"""
                 
-                sparql = SPARQLWrapper(self.fuseki_query_url)
-                sparql.setQuery(query)
-                sparql.setReturnFormat(SPARQL_JSON)
-                results = sparql.query().convert()
+                results = self.fuseki.query(query)
                 
                 if results["results"]["bindings"]:
                     parent_graph = results["results"]["bindings"][0]["g"]["value"]
@@ -1874,10 +1836,7 @@ SELECT DISTINCT ?parent WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
             
             parents = []
             for binding in results["results"]["bindings"]:
@@ -1923,10 +1882,7 @@ SELECT ?label WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
             
             for binding in results["results"]["bindings"]:
                 label = binding.get("label", {}).get("value", "")
@@ -1989,10 +1945,7 @@ SELECT ?property ?domain ?range WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(debug_query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            debug_results = sparql.query().convert()
+            debug_results = self.fuseki.query(debug_query)
             
             logger.info(f"🔍 Found {len(debug_results['results']['bindings'])} data properties in graph")
             for binding in debug_results['results']['bindings']:
@@ -2037,9 +1990,7 @@ SELECT ?property ?label ?comment ?range ?defaultValue ?required ?units ?sortOrde
     }}
 }}"""
                 
-                sparql.setQuery(query)
-                sparql.setReturnFormat(SPARQL_JSON)
-                results = sparql.query().convert()
+                results = self.fuseki.query(query)
                 
                 logger.info(f"🔍 Query for class URI {class_uri}: found {len(results['results']['bindings'])} properties")
                 
@@ -2113,10 +2064,7 @@ SELECT DISTINCT ?parent ?parentGraph WHERE {{
     }}
 }}"""
                 
-                sparql = SPARQLWrapper(self.fuseki_query_url)
-                sparql.setQuery(query)
-                sparql.setReturnFormat(SPARQL_JSON)
-                results = sparql.query().convert()
+                results = self.fuseki.query(query)
                 
                 logger.info(f"🔍 Parent query for class URI {class_uri}: found {len(results['results']['bindings'])} parents")
                 
@@ -2272,10 +2220,7 @@ SELECT ?class WHERE {{
     }}
 }}"""
             
-            sparql = SPARQLWrapper(self.fuseki_query_url)
-            sparql.setQuery(simple_query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            simple_results = sparql.query().convert()
+            simple_results = self.fuseki.query(simple_query)
             
             logger.info(f"Simple query found {len(simple_results['results']['bindings'])} classes")
             
@@ -2297,9 +2242,7 @@ SELECT ?class ?label ?comment ?isAbstract WHERE {{
     }}
 }}"""
             
-            sparql.setQuery(query)
-            sparql.setReturnFormat(SPARQL_JSON)
-            results = sparql.query().convert()
+            results = self.fuseki.query(query)
             
             logger.info(f"Full query found {len(results['results']['bindings'])} classes")
             
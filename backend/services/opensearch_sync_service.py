@@ -14,15 +14,117 @@ Features:
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from uuid import uuid4
 import asyncio
 
 from backend.services.config import Settings
 from backend.services.db import DatabaseService
+from backend.rag.storage.opensearch_bulk_writer import OpenSearchBulkWriter
 from backend.rag.storage.text_search_factory import create_text_search_store
 from backend.db.queries import now_utc
 
 logger = logging.getLogger(__name__)
 
+# Searches and live writes use this name; full reindexes point it at a new versioned index
+CHUNKS_ALIAS = "knowledge_chunks"
+
+# Note: knowledge_chunks table doesn't have page/start_char/end_char
+CHUNK_QUERY = """
+    SELECT
+        kc.id as chunk_id,
+        kc.content as text,
+        kc.sequence_number as chunk_index,
+        kc.asset_id as doc_id,
+        ka.project_id,
+        ka.title as asset_title,
+        ka.document_type,
+        kc.created_at
+    FROM knowledge_chunks kc
+    JOIN knowledge_assets ka ON kc.asset_id = ka.id
+"""
+
+
+def chunk_document(row) -> Dict[str, Any]:
+    """OpenSearch document for a CHUNK_QUERY row"""
+    chunk_id, text, chunk_index, doc_id, project_id, asset_title, document_type, created_at = row
+    return {
+        "chunk_id": chunk_id,
+        "original_chunk_id": chunk_id,
+        "content": text or "",
+        "text": text or "",
+        "title": asset_title or "",  # Use asset title
+        "project_id": project_id,
+        "asset_id": doc_id,
+        "doc_id": doc_id,
+        "chunk_index": chunk_index or 0,
+        "document_type": document_type or "document",
+        "created_at": created_at.isoformat() if created_at else now_utc().isoformat(),
+    }
+
+
+# Uploaded-document chunks, which RAGStoreService writes to the same index
+DOC_CHUNK_QUERY = """
+    SELECT
+        dc.chunk_id,
+        dc.text,
+        dc.chunk_index,
+        dc.doc_id,
+        d.project_id,
+        d.version,
+        dc.page,
+        dc.start_char,
+        dc.end_char,
+        dc.created_at
+    FROM doc_chunk dc
+    JOIN doc d ON dc.doc_id = d.doc_id
+"""
+
+
+def doc_chunk_document(row) -> Dict[str, Any]:
+    """OpenSearch document for a DOC_CHUNK_QUERY row (same shape as RAGStoreService writes)"""
+    chunk_id, text, chunk_index, doc_id, project_id, version, page, start, end, created_at = row
+    return {
+        "chunk_id": chunk_id,
+        "original_chunk_id": chunk_id,
+        "content": text or "",
+        "text": text or "",
+        "title": "",
+        "project_id": project_id,
+        "asset_id": doc_id,
+        "doc_id": doc_id,
+        "chunk_index": chunk_index or 0,
+        "version": version,
+        "page": page,
+        "start_char": start,
+        "end_char": end,
+        "document_type": "document",
+        "created_at": created_at.isoformat() if created_at else now_utc().isoformat(),
+    }
+
+
+# (query, created_at column, project_id column, row -> document) for every table in the index
+CHUNK_SOURCES = (
+    (CHUNK_QUERY, "kc.created_at", "ka.project_id", chunk_document),
+    (DOC_CHUNK_QUERY, "dc.created_at", "d.project_id", doc_chunk_document),
+)
+
+
+def chunk_sources(project_id: Optional[str] = None, since: Optional[datetime] = None):
+    """(query, params, row -> document) per chunk table, filtered by project and creation time"""
+    sources = []
+    for query, created_column, project_column, to_document in CHUNK_SOURCES:
+        conditions, params = [], []
+        if since is not None:
+            conditions.append(f"{created_column} >= %s")
+            params.append(since)
+        if project_id:
+            conditions.append(f"{project_column} = %s")
+            params.append(project_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        sources.append((query, params, to_document))
+    return sources
+
 
 class OpenSearchSyncService:
     """
@@ -35,10 +137,11 @@ class OpenSearchSyncService:
     - Drift detection
     """
 
-    def __init__(self, settings: Settings = None):
+    def __init__(self, settings: Settings = None, db_service: Optional[DatabaseService] = None,
+                 text_search_store=None):
         self.settings = settings or Settings()
-        self.db_service = DatabaseService(self.settings)
-        self.text_search_store = create_text_search_store(self.settings)
+        self.db_service = db_service or DatabaseService(self.settings)
+        self.text_search_store = text_search_store or create_text_search_store(self.settings)
         
         if not self.text_search_store:
             logger.warning("OpenSearch not available - sync service will not function")
@@ -46,15 +149,22 @@ class OpenSearchSyncService:
     async def reindex_all_chunks(
         self,
         project_id: Optional[str] = None,
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
-        Reindex all chunks from PostgreSQL to OpenSearch.
-        
+        Reindex all chunks (knowledge chunks and uploaded-document chunks)
+        from PostgreSQL to OpenSearch.
+
+        A full reindex builds a fresh versioned index (refresh disabled while
+        loading), then atomically points the knowledge_chunks alias at it and
+        drops the previous index, so search keeps serving the old index until
+        the swap. Chunks created while it ran are indexed again after the swap.
+        A project reindex rewrites that project's documents in place.
+
         Args:
             project_id: Optional project filter (reindex only this project)
-            batch_size: Number of chunks to process per batch
-            
+            batch_size: Rows fetched per server-side cursor round trip
+
         Returns:
             Dict with sync statistics
         """
@@ -64,99 +174,45 @@ class OpenSearchSyncService:
                 "error": "OpenSearch not available",
                 "chunks_indexed": 0,
             }
-        
+
         try:
-            # Ensure index exists
-            await self.text_search_store.ensure_index("knowledge_chunks")
-            
-            conn = self.db_service._conn()
-            try:
-                with conn.cursor() as cur:
-                    # Build query to get all chunks
-                    # Note: knowledge_chunks table doesn't have page/start_char/end_char
-                    query = """
-                        SELECT 
-                            kc.id as chunk_id,
-                            kc.content as text,
-                            kc.sequence_number as chunk_index,
-                            kc.asset_id as doc_id,
-                            ka.project_id,
-                            ka.title as asset_title,
-                            ka.document_type,
-                            kc.created_at
-                        FROM knowledge_chunks kc
-                        JOIN knowledge_assets ka ON kc.asset_id = ka.id
-                    """
-                    
-                    if project_id:
-                        query += " WHERE ka.project_id = %s"
-                        cur.execute(query, (project_id,))
-                    else:
-                        cur.execute(query)
-                    
-                    all_chunks = cur.fetchall()
-                    
-                    logger.info(f"Found {len(all_chunks)} chunks to reindex")
-                    
-                    # Process in batches
-                    chunks_indexed = 0
-                    chunks_failed = 0
-                    
-                    for i in range(0, len(all_chunks), batch_size):
-                        batch = all_chunks[i:i + batch_size]
-                        documents = []
-                        
-                        for chunk in batch:
-                            chunk_id = chunk[0]
-                            text = chunk[1] or ""
-                            chunk_index = chunk[2] or 0
-                            doc_id = chunk[3]
-                            project_id_val = chunk[4]
-                            asset_title = chunk[5] or ""
-                            document_type = chunk[6] or "document"
-                            created_at = chunk[7]
-                            
-                            document = {
-                                "chunk_id": chunk_id,
-                                "original_chunk_id": chunk_id,
-                                "content": text,
-                                "text": text,
-                                "title": asset_title,  # Use asset title
-                                "project_id": project_id_val,
-                                "asset_id": doc_id,
-                                "doc_id": doc_id,
-                                "chunk_index": chunk_index,
-                                "document_type": document_type,
-                                "created_at": created_at.isoformat() if created_at else now_utc().isoformat(),
-                            }
-                            documents.append(document)
-                        
-                        # Bulk index batch
-                        try:
-                            success = await self.text_search_store.bulk_index(
-                                index="knowledge_chunks",
-                                documents=documents,
-                            )
-                            if success:
-                                chunks_indexed += len(documents)
-                                logger.info(f"Indexed batch {i//batch_size + 1}: {len(documents)} chunks")
-                            else:
-                                chunks_failed += len(documents)
-                                logger.warning(f"Failed to index batch {i//batch_size + 1}")
-                        except Exception as e:
-                            chunks_failed += len(documents)
-                            logger.error(f"Error indexing batch {i//batch_size + 1}: {e}")
-                    
-                    return {
-                        "success": True,
-                        "chunks_indexed": chunks_indexed,
-                        "chunks_failed": chunks_failed,
-                        "total_chunks": len(all_chunks),
-                    }
-                    
-            finally:
-                self.db_service._return(conn)
-                
+            if project_id:
+                await self.text_search_store.ensure_index(CHUNKS_ALIAS)
+                stats = await self._index_chunk_rows(chunk_sources(project_id=project_id), CHUNKS_ALIAS, batch_size)
+                return {"success": True, **stats}
+
+            started = datetime.utcnow()
+            new_index = f"{CHUNKS_ALIAS}_v{started:%Y%m%d%H%M%S}"
+            if not await self.text_search_store.ensure_index(new_index, settings={"refresh_interval": "-1"}):
+                return {"success": False, "error": f"Could not create index {new_index}", "chunks_indexed": 0}
+
+            stats = await self._index_chunk_rows(chunk_sources(), new_index, batch_size)
+            if stats["chunks_failed"]:
+                await self.text_search_store.delete_index(new_index)
+                return {
+                    "success": False,
+                    "error": f"{stats['chunks_failed']} chunks failed to index; kept the current index",
+                    **stats,
+                }
+
+            await self.text_search_store.update_index_settings(new_index, {"refresh_interval": "1s"})
+            await self.text_search_store.refresh(new_index)
+            previous = await self.text_search_store.swap_alias(CHUNKS_ALIAS, new_index)
+            for index in previous:
+                await self.text_search_store.delete_index(index)
+
+            # Writes made during the load went to the previous index
+            catch_up = await self.reindex_updated_chunks(since=started, batch_size=batch_size)
+            logger.info(f"Reindexed {stats['chunks_indexed']} chunks into {new_index}")
+
+            return {
+                "success": True,
+                **stats,
+                "index": new_index,
+                "previous_indices": previous,
+                "caught_up_chunks": catch_up.get("chunks_indexed", 0),
+            }
+
         except Exception as e:
             logger.error(f"Reindexing failed: {e}", exc_info=True)
             return {
@@ -169,16 +225,16 @@ class OpenSearchSyncService:
         self,
         since: Optional[datetime] = None,
         project_id: Optional[str] = None,
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Reindex only chunks that have been updated since a given time.
-        
+
         Args:
             since: Only reindex chunks updated after this time (default: last 24 hours)
             project_id: Optional project filter
-            batch_size: Number of chunks per batch
-            
+            batch_size: Rows fetched per server-side cursor round trip
+
         Returns:
             Dict with sync statistics
         """
@@ -188,104 +244,20 @@ class OpenSearchSyncService:
                 "error": "OpenSearch not available",
                 "chunks_indexed": 0,
             }
-        
+
         if since is None:
             since = datetime.utcnow() - timedelta(hours=24)
-        
+
         try:
-            await self.text_search_store.ensure_index("knowledge_chunks")
-            
-            conn = self.db_service._conn()
-            try:
-                with conn.cursor() as cur:
-                    # Query for updated chunks (using created_at as proxy)
-                    query = """
-                        SELECT 
-                            kc.id as chunk_id,
-                            kc.content as text,
-                            kc.sequence_number as chunk_index,
-                            kc.asset_id as doc_id,
-                            ka.project_id,
-                            ka.title as asset_title,
-                            ka.document_type,
-                            kc.created_at
-                        FROM knowledge_chunks kc
-                        JOIN knowledge_assets ka ON kc.asset_id = ka.id
-                        WHERE kc.created_at >= %s
-                    """
-                    
-                    params = [since]
-                    if project_id:
-                        query += " AND ka.project_id = %s"
-                        params.append(project_id)
-                    
-                    cur.execute(query, params)
-                    updated_chunks = cur.fetchall()
-                    
-                    if not updated_chunks:
-                        return {
-                            "success": True,
-                            "chunks_indexed": 0,
-                            "total_chunks": 0,
-                            "message": "No chunks updated since specified time",
-                        }
-                    
-                    # Process in batches (same as reindex_all_chunks)
-                    chunks_indexed = 0
-                    chunks_failed = 0
-                    
-                    for i in range(0, len(updated_chunks), batch_size):
-                        batch = updated_chunks[i:i + batch_size]
-                        documents = []
-                        
-                        for chunk in batch:
-                            chunk_id = chunk[0]
-                            text = chunk[1] or ""
-                            chunk_index = chunk[2] or 0
-                            doc_id = chunk[3]
-                            project_id_val = chunk[4]
-                            asset_title = chunk[5] or ""
-                            document_type = chunk[6] or "document"
-                            created_at = chunk[7]
-                            
-                            document = {
-                                "chunk_id": chunk_id,
-                                "original_chunk_id": chunk_id,
-                                "content": text,
-                                "text": text,
-                                "title": asset_title,
-                                "project_id": project_id_val,
-                                "asset_id": doc_id,
-                                "doc_id": doc_id,
-                                "chunk_index": chunk_index,
-                                "document_type": document_type,
-                                "created_at": created_at.isoformat() if created_at else now_utc().isoformat(),
-                            }
-                            documents.append(document)
-                        
-                        try:
-                            success = await self.text_search_store.bulk_index(
-                                index="knowledge_chunks",
-                                documents=documents,
-                            )
-                            if success:
-                                chunks_indexed += len(documents)
-                            else:
-                                chunks_failed += len(documents)
-                        except Exception as e:
-                            chunks_failed += len(documents)
-                            logger.error(f"Error indexing batch: {e}")
-                    
-                    return {
-                        "success": True,
-                        "chunks_indexed": chunks_indexed,
-                        "chunks_failed": chunks_failed,
-                        "total_chunks": len(updated_chunks),
-                    }
-                    
-            finally:
-                self.db_service._return(conn)
-                
+            await self.text_search_store.ensure_index(CHUNKS_ALIAS)
+
+            # Query for updated chunks (using created_at as proxy)
+            sources = chunk_sources(project_id=project_id, since=since)
+            stats = await self._index_chunk_rows(sources, CHUNKS_ALIAS, batch_size)
+            if not stats["total_chunks"]:
+                return {**stats, "success": True, "message": "No chunks updated since specified time"}
+            return {"success": True, **stats}
+
         except Exception as e:
             logger.error(f"Incremental reindexing failed: {e}", exc_info=True)
             return {
@@ -294,6 +266,48 @@ class OpenSearchSyncService:
                 "chunks_indexed": 0,
             }
 
+    async def _index_chunk_rows(
+        self,
+        sources,
+        index: str,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Stream the rows of each (query, params, row -> document) source from a
+        server-side cursor into one bulk writer.
+
+        Memory stays bounded by one fetch plus the writer's queue, and the
+        next fetch overlaps the writer's bulk requests.
+        """
+        fetch_size = batch_size or getattr(self.settings, "opensearch_reindex_fetch_size", 1000)
+        writer = OpenSearchBulkWriter.from_settings(self.text_search_store, self.settings, ensure_indexes=False)
+        total = 0
+
+        conn = self.db_service._conn()
+        try:
+            for query, params, to_document in sources:
+                with conn.cursor(name=f"opensearch_sync_{uuid4().hex[:12]}") as cur:
+                    cur.itersize = fetch_size
+                    await asyncio.to_thread(cur.execute, query, params)
+                    while True:
+                        rows = await asyncio.to_thread(cur.fetchmany, fetch_size)
+                        if not rows:
+                            break
+                        total += len(rows)
+                        await writer.submit(index, [to_document(row) for row in rows])
+        finally:
+            try:
+                await writer.close()
+            finally:
+                conn.rollback()  # end the cursor's read transaction before pooling
+                self.db_service._return(conn)
+
+        return {
+            "chunks_indexed": writer.stats["indexed"],
+            "chunks_failed": writer.stats["failed"],
+            "total_chunks": total,
+        }
+
     async def get_sync_status(
         self,
         project_id: Optional[str] = None,
@@ -314,19 +328,24 @@ class OpenSearchSyncService:
             conn = self.db_service._conn()
             try:
                 with conn.cursor() as cur:
-                    # Count chunks in Postgres
+                    # Count chunks in Postgres (both tables feed the index)
                     if project_id:
                         cur.execute(
                             """
-                            SELECT COUNT(*) 
-                            FROM knowledge_chunks kc
-                            JOIN knowledge_assets ka ON kc.asset_id = ka.id
-                            WHERE ka.project_id = %s
+                            SELECT
+                                (SELECT COUNT(*)
+                                 FROM knowledge_chunks kc
+                                 JOIN knowledge_assets ka ON kc.asset_id = ka.id
+                                 WHERE ka.project_id = %s)
+                              + (SELECT COUNT(*)
+                                 FROM doc_chunk dc
+                                 JOIN doc d ON dc.doc_id = d.doc_id
+                                 WHERE d.project_id = %s)
                             """,
-                            (project_id,)
+                            (project_id, project_id)
                         )
                     else:
-                        cur.execute("SELECT COUNT(*) FROM knowledge_chunks")
+                        cur.execute("SELECT (SELECT COUNT(*) FROM knowledge_chunks) + (SELECT COUNT(*) FROM doc_chunk)")
                     pg_count = cur.fetchone()[0]
                     
                 # Count chunks in OpenSearch (approximate via search)
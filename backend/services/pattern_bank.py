@@ -0,0 +1,155 @@
+"""
+Pattern Bank.
+
+Matches a bank of labelled regular expressions against text in one scan, for
+extractors that would otherwise call re.search / re.finditer once per pattern.
+
+The patterns are compiled once into a single alternation. A scan searches it
+for the next position where any pattern matches, then tries the patterns after
+the one that matched, anchored at that position, so every (position, pattern)
+hit is seen even when patterns overlap. finditer() reports exactly the matches running re.finditer with each
+pattern separately would (leftmost and non-overlapping per pattern), merged in
+text order.
+
+Patterns are compiled with the bank's flags and must not use named groups or
+backreferences of their own; numbered groups are available on the reported
+matches.
+"""
+
+import re
+from collections import Counter
+from typing import Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class PatternMatch:
+    """A single pattern's match, with the re.Match accessors extractors use."""
+
+    __slots__ = ("label", "index", "string", "_spans")
+
+    def __init__(self, label: Hashable, index: int, string: str, spans: Tuple[Tuple[int, int], ...]):
+        self.label = label
+        self.index = index  # position of the pattern in the bank
+        self.string = string
+        self._spans = spans
+
+    def group(self, n: int = 0) -> Optional[str]:
+        start, end = self._spans[n]
+        return None if start < 0 else self.string[start:end]
+
+    def groups(self) -> Tuple[Optional[str], ...]:
+        return tuple(self.group(n) for n in range(1, len(self._spans)))
+
+    def start(self, n: int = 0) -> int:
+        return self._spans[n][0]
+
+    def end(self, n: int = 0) -> int:
+        return self._spans[n][1]
+
+    def span(self, n: int = 0) -> Tuple[int, int]:
+        return self._spans[n]
+
+    def __repr__(self) -> str:
+        return f"<PatternMatch label={self.label!r} span={self.span()} match={self.group()!r}>"
+
+
+class PatternBank:
+    """Labelled regex patterns matched together in one pass over the text."""
+
+    def __init__(self, patterns: Iterable[Tuple[Hashable, str]], flags: int = 0, overlapping: bool = True):
+        """
+        Args:
+            patterns: (label, regex) pairs; several patterns may share a label
+            flags: re flags applied to every pattern
+            overlapping: False when no two patterns can match overlapping text
+                (e.g. disjoint whole-word alternatives); the bank then reports the
+                plain alternation's matches, which is exact in that case and cheaper
+        """
+        self.patterns: List[Tuple[Hashable, str]] = list(patterns)
+        self.flags = flags
+        self.overlapping = overlapping
+        self._labels = [label for label, _ in self.patterns]
+        self._label_count = len(set(self._labels))
+        self._own_groups = [re.compile(pattern, flags).groups for _, pattern in self.patterns]
+
+        # _tails[i] is the alternation of patterns i.. : _tails[0] finds the next
+        # position any pattern matches, _tails[i + 1] the next pattern matching
+        # there. Each alternative ends in an empty group p<index> naming it (a
+        # trailing empty group keeps the regex engine from saving capture state at
+        # every branch, as a group around the whole pattern would).
+        self._tails: List[Optional[re.Pattern]] = [None] * len(self.patterns)
+
+    def _tail(self, start: int) -> Optional[re.Pattern]:
+        if start >= len(self.patterns):
+            return None
+        if self._tails[start] is None:
+            self._tails[start] = re.compile(
+                "|".join(f"(?:{pattern})(?P<p{i}>)" for i, (_, pattern) in enumerate(self.patterns) if i >= start),
+                self.flags
+            )
+        return self._tails[start]
+
+    def _hits(self, text: str) -> Iterator[Tuple[int, re.Match]]:
+        """(pattern index, match) for every position at which each pattern matches."""
+        regex = self._tail(0)
+        if regex is None:
+            return
+        if not self.overlapping:
+            for match in regex.finditer(text):
+                yield int(match.lastgroup[1:]), match
+            return
+        search = regex.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                return
+            position = match.start()
+            while match is not None:
+                index = int(match.lastgroup[1:])
+                yield index, match
+                tail = self._tail(index + 1)
+                match = tail.match(text, position) if tail else None
+            position += 1
+
+    def _match(self, index: int, match: re.Match, text: str) -> PatternMatch:
+        marker = match.re.groupindex[f"p{index}"]
+        regs = match.regs
+        return PatternMatch(self._labels[index], index, text, regs[:1] + regs[marker - self._own_groups[index]:marker])
+
+    def finditer(self, text: str) -> Iterator[PatternMatch]:
+        """Every match of every pattern, in text order (bank order at equal positions)."""
+        resume = [0] * len(self.patterns)
+        for index, match in self._hits(text):
+            start, end = match.span()
+            if start < resume[index]:
+                continue  # inside this pattern's previous match
+            resume[index] = end if end > start else start + 1
+            yield self._match(index, match, text)
+
+    def first(self, text: str) -> Optional[PatternMatch]:
+        """
+        Leftmost match of the first pattern (in bank order) that matches at all,
+        i.e. what trying re.search with each pattern in turn would return.
+        """
+        best = None
+        for index, match in self._hits(text):
+            if best is None or index < best[0]:
+                best = (index, match)
+                if index == 0:
+                    break
+        return self._match(best[0], best[1], text) if best else None
+
+    def labels(self, text: str) -> Set[Hashable]:
+        """Labels with at least one matching pattern."""
+        found: Set[Hashable] = set()
+        for index, _ in self._hits(text):
+            found.add(self._labels[index])
+            if len(found) == self._label_count:
+                break
+        return found
+
+    def count(self, text: str) -> Counter:
+        """Number of (non-overlapping, per pattern) matches for each label."""
+        if not self.overlapping:
+            return Counter(self._labels[index] for index, _ in self._hits(text))
+        return Counter(match.label for match in self.finditer(text))
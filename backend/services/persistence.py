@@ -7,9 +7,9 @@ from neo4j import GraphDatabase
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 from rdflib import RDF, Graph, Literal, Namespace, URIRef
-from SPARQLWrapper import JSON, POST, SPARQLWrapper
 
 from .config import Settings
+from .fuseki_gateway import get_fuseki_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -107,34 +107,12 @@ class PersistenceLayer:
 
         Raises an exception if both strategies fail.
         """
-        # Normalize base dataset URL
-        base = self.settings.fuseki_url.rstrip("/")
-        graph_store_url = f"{base}/data?default"
-
-        # Build auth if configured
-        auth = None
-        if getattr(self.settings, "fuseki_user", None) and getattr(
-            self.settings, "fuseki_password", None
-        ):
-            import requests
-
-            auth = (self.settings.fuseki_user, self.settings.fuseki_password)
+        fuseki = get_fuseki_gateway(self.settings.fuseki_url, self.settings)
 
         # Attempt Graph Store Protocol
         try:
-            import requests
-
-            headers = {"Content-Type": "text/turtle"}
-            resp = requests.put(
-                graph_store_url,
-                data=ttl.encode("utf-8"),
-                headers=headers,
-                auth=auth,
-                timeout=10,
-            )
-            if 200 <= resp.status_code < 300:
-                return
-            # If not successful, fall through to SPARQL Update fallback
+            fuseki.put_graph(ttl)
+            return
         except Exception:
             # Fall through to SPARQL Update fallback
             pass
@@ -177,19 +155,7 @@ class PersistenceLayer:
             }}
             """
 
-            sparql = SPARQLWrapper(base + "/update")
-            sparql.setMethod(POST)
-            # If credentials provided, use them
-            if getattr(self.settings, "fuseki_user", None) and getattr(
-                self.settings, "fuseki_password", None
-            ):
-                try:
-                    sparql.setCredentials(self.settings.fuseki_user, self.settings.fuseki_password)
-                except Exception:
-                    pass
-
-            sparql.setQuery(query)
-            sparql.query()
+            fuseki.update(query)
         except Exception as e:
             raise RuntimeError(f"Failed to write RDF to Fuseki: {e}")
 
@@ -7,9 +7,11 @@ review knowledge, and assist users proactively.
 
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
 from .worker_interface import WorkerInterface
@@ -30,12 +32,49 @@ class WorkerStatus:
     scheduled_runs: int = 0
 
 
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+@dataclass
+class InboxMetrics:
+    """Per-worker inbox counters plus recent lag (queue wait) and handler latency samples."""
+    enqueued: int = 0
+    dropped: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    lag_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    @staticmethod
+    def _percentile(samples: Deque[float], pct: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 3)
+
+    def to_dict(self, depth: int, capacity: int) -> Dict[str, Any]:
+        return {
+            "depth": depth,
+            "capacity": capacity,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "lag_ms_p50": self._percentile(self.lag_ms, 0.5),
+            "lag_ms_p95": self._percentile(self.lag_ms, 0.95),
+            "latency_ms_p50": self._percentile(self.latency_ms, 0.5),
+            "latency_ms_p95": self._percentile(self.latency_ms, 0.95),
+        }
+
+
 class BaseProactiveWorker(WorkerInterface):
     """
     Base class for proactive workers implementing WorkerInterface.
     
     Provides:
-    - Event subscription and processing
+    - Event subscription and processing through a bounded inbox drained by
+      ``concurrency`` consumer tasks; a full inbox applies ``overflow_policy``
+      (drop_oldest, drop_newest or block up to ``enqueue_timeout``)
     - Scheduled task execution
     - Status tracking and health monitoring
     - Lifecycle management
@@ -53,9 +92,19 @@ class BaseProactiveWorker(WorkerInterface):
         self.db_service = db_service
         self._status = WorkerStatus(status="idle")
         self._running = False
-        self._worker_task: Optional[asyncio.Task] = None
+        self._worker_tasks: List[asyncio.Task] = []
         self._scheduler_task: Optional[asyncio.Task] = None
-        self._event_queue: asyncio.Queue = asyncio.Queue()
+        
+        # Bounded inbox so a slow worker sheds load instead of growing without limit
+        self.inbox_size = max(1, int(getattr(settings, 'proactive_worker_inbox_size', 1000)))
+        self.concurrency = max(1, int(getattr(settings, 'proactive_worker_concurrency', 1)))
+        self.overflow_policy = getattr(settings, 'proactive_worker_overflow_policy', 'drop_oldest')
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            logger.warning(f"Unknown overflow policy '{self.overflow_policy}', using drop_oldest")
+            self.overflow_policy = "drop_oldest"
+        self.enqueue_timeout = float(getattr(settings, 'proactive_worker_enqueue_timeout_s', 1.0))
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=self.inbox_size)
+        self._inbox = InboxMetrics()
         
     @property
     @abstractmethod
@@ -107,17 +156,52 @@ class BaseProactiveWorker(WorkerInterface):
         if event_type not in self.subscribed_events:
             return None
         
-        try:
-            # Queue event for processing
-            await self._event_queue.put(event)
-            self._status.events_processed += 1
+        if await self._enqueue((time.monotonic(), event)):
+            self._inbox.enqueued += 1
+            self._inbox.max_depth = max(self._inbox.max_depth, self._event_queue.qsize())
             logger.debug(f"{self.worker_name} queued event: {event_type}")
-            return None
-        except Exception as e:
-            logger.error(f"{self.worker_name} failed to queue event: {e}")
-            self._status.last_error = str(e)
-            self._status.health = "degraded"
-            return None
+        else:
+            self._record_drop()
+        return None
+    
+    def _record_drop(self) -> None:
+        self._inbox.dropped += 1
+        if self._inbox.dropped % 1000 == 1:
+            logger.warning(f"{self.worker_name} inbox full ({self.overflow_policy}), dropped {self._inbox.dropped} events so far")
+    
+    async def _enqueue(self, item: Tuple[float, Dict[str, Any]]) -> bool:
+        """Put an item in the inbox according to the overflow policy; False if dropped."""
+        try:
+            self._event_queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+        
+        if self.overflow_policy == "drop_newest":
+            return False
+        if self.overflow_policy == "drop_oldest":
+            try:
+                self._event_queue.get_nowait()
+                self._event_queue.task_done()
+                self._record_drop()
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                self._event_queue.put_nowait(item)
+                return True
+            except asyncio.QueueFull:
+                return False
+        
+        # block: apply backpressure to the producer, bounded by enqueue_timeout
+        try:
+            await asyncio.wait_for(self._event_queue.put(item), timeout=self.enqueue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking work (psycopg2 queries) in a thread so handlers never stall the event loop."""
+        return await asyncio.to_thread(func, *args)
     
     async def run_scheduled(self) -> Optional[Dict[str, Any]]:
         """
@@ -164,6 +248,7 @@ class BaseProactiveWorker(WorkerInterface):
             "last_error": self._status.last_error,
             "events_processed": self._status.events_processed,
             "scheduled_runs": self._status.scheduled_runs,
+            "inbox": self._inbox.to_dict(self._event_queue.qsize(), self.inbox_size),
             "metrics": self._status.metrics,
             "running": self._running,
         }
@@ -177,9 +262,12 @@ class BaseProactiveWorker(WorkerInterface):
         self._running = True
         self._status.status = "running"
         
-        # Start event processing loop
-        self._worker_task = asyncio.create_task(self._event_loop())
-        logger.info(f"{self.worker_name} started")
+        # Start inbox consumers
+        self._worker_tasks = [
+            asyncio.create_task(self._event_loop(), name=f"{self.worker_name}-consumer-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"{self.worker_name} started ({self.concurrency} consumer(s), inbox {self.inbox_size})")
         
         # Start scheduler if interval is set
         if self.schedule_interval:
@@ -191,12 +279,11 @@ class BaseProactiveWorker(WorkerInterface):
         self._running = False
         self._status.status = "stopped"
         
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
+        for task in self._worker_tasks:
+            task.cancel()
+        if self._worker_tasks:
+            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
         
         if self._scheduler_task:
             self._scheduler_task.cancel()
@@ -208,34 +295,32 @@ class BaseProactiveWorker(WorkerInterface):
         logger.info(f"{self.worker_name} stopped")
     
     async def _event_loop(self):
-        """Main event processing loop."""
+        """Inbox consumer: handle events one at a time, recording lag and latency."""
         logger.info(f"{self.worker_name} event loop started")
         
         while self._running:
             try:
-                # Wait for event with timeout
-                try:
-                    event = await asyncio.wait_for(
-                        self._event_queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
-                
-                # Process event
-                try:
-                    await self._handle_event(event)
-                except Exception as e:
-                    logger.error(f"{self.worker_name} error processing event: {e}")
-                    self._status.last_error = str(e)
-                    self._status.health = "degraded"
-                
+                enqueued_at, event = await self._event_queue.get()
+            except asyncio.CancelledError:
+                logger.info(f"{self.worker_name} event loop cancelled")
+                break
+            
+            started = time.monotonic()
+            self._inbox.lag_ms.append((started - enqueued_at) * 1000)
+            try:
+                await self._handle_event(event)
+                self._status.events_processed += 1
             except asyncio.CancelledError:
                 logger.info(f"{self.worker_name} event loop cancelled")
                 break
             except Exception as e:
-                logger.error(f"{self.worker_name} event loop error: {e}")
-                await asyncio.sleep(1)  # Brief pause before retry
+                logger.error(f"{self.worker_name} error processing event: {e}")
+                self._inbox.failed += 1
+                self._status.last_error = str(e)
+                self._status.health = "degraded"
+            finally:
+                self._inbox.latency_ms.append((time.monotonic() - started) * 1000)
+                self._event_queue.task_done()
     
     async def _scheduler_loop(self):
         """Scheduled task execution loop."""
@@ -337,18 +422,22 @@ class WorkerRegistry:
         if event_type not in self._event_subscriptions:
             return []
         
+        workers = [
+            self._workers[name] for name in self._event_subscriptions[event_type] if name in self._workers
+        ]
+        
+        # Enqueue into every inbox concurrently; a worker applying backpressure
+        # (block policy) or raising does not hold up the others
+        outcomes = await asyncio.gather(
+            *(worker.process_event(event) for worker in workers), return_exceptions=True
+        )
+        
         results = []
-        worker_names = self._event_subscriptions[event_type]
-        
-        for worker_name in worker_names:
-            if worker_name in self._workers:
-                worker = self._workers[worker_name]
-                try:
-                    result = await worker.process_event(event)
-                    if result:
-                        results.append({"worker": worker_name, "result": result})
-                except Exception as e:
-                    logger.error(f"Worker {worker_name} failed to process event: {e}")
+        for worker, outcome in zip(workers, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Worker {worker.worker_name} failed to process event: {outcome}")
+            elif outcome:
+                results.append({"worker": worker.worker_name, "result": outcome})
         
         return results
     
@@ -372,12 +461,10 @@ class WorkerRegistry:
         """Get worker by name."""
         return self._workers.get(worker_name)
     
-    def get_all_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get status of all workers."""
-        return {
-            name: worker.get_status()
-            for name, worker in self._workers.items()
-        }
+    async def get_all_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get status (including inbox lag/latency metrics) of all workers."""
+        statuses = await asyncio.gather(*(worker.get_status() for worker in self._workers.values()))
+        return dict(zip(self._workers.keys(), statuses))
     
     def list_workers(self) -> List[str]:
         """List all registered worker names."""
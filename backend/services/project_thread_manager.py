@@ -14,8 +14,44 @@ from typing import Any, Dict, List, Optional, Set
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from psycopg2.extras import RealDictCursor
+
 logger = logging.getLogger(__name__)
 
+THREAD_VECTOR_MODEL = "all-MiniLM-L6-v2"
+MAX_PROJECT_EVENTS = 100
+MAX_RECENT_DOCUMENTS = 20
+
+_thread_embedding_service = None
+
+
+def get_thread_embedding_service(settings):
+    """Process-wide embedding service, so the thread vector model is loaded once"""
+    global _thread_embedding_service
+    if _thread_embedding_service is None:
+        from .embedding_service import EmbeddingService
+        _thread_embedding_service = EmbeddingService(settings)
+    return _thread_embedding_service
+
+
+def _bounded_array_sql(key: str, keep: int, prepend: bool = False) -> str:
+    """
+    SQL expression adding the %s JSON array to thread_data->key, keeping
+    the ``keep`` entries nearest the insertion end
+    """
+    existing = f"COALESCE(thread_data->'{key}', '[]'::jsonb)"
+    combined = f"%s::jsonb || {existing}" if prepend else f"{existing} || %s::jsonb"
+    order = "n" if prepend else "n DESC"
+    return (
+        "(SELECT COALESCE(jsonb_agg(e ORDER BY n), '[]'::jsonb) FROM ("
+        f"SELECT e, n FROM jsonb_array_elements({combined}) WITH ORDINALITY AS t(e, n) "
+        f"ORDER BY {order} LIMIT {int(keep)}) kept)"
+    )
+
+
+def _json(value) -> str:
+    return json.dumps(value, default=str)
+
 
 class ProjectEventType(Enum):
     """Types of project events that can be captured"""
@@ -137,21 +173,31 @@ class ProjectThreadContext:
 class ProjectThreadManager:
     """
     Manages project threads with comprehensive intelligence and context awareness
+
+    Thread state lives in the project_thread_state table, keyed by thread ID
+    (and unique per project), with Redis as a read-through cache. Events
+    update the stored state in place with a single UPDATE; the thread's
+    vector in Qdrant is only used for similarity search and is refreshed in
+    the background, debounced per thread, when its searchable text changes.
     """
 
-    def __init__(self, settings, redis_client, qdrant_service):
+    def __init__(self, settings, redis_client, qdrant_service, db_service=None):
         self.settings = settings
         self.redis = redis_client  # Optional cache
-        self.qdrant = qdrant_service  # Primary storage
+        self.qdrant = qdrant_service  # Thread vectors for similarity search
+        self.db = db_service  # Primary storage (created on first use if not given)
         self.project_threads: Dict[str, ProjectThreadContext] = {}
         self.event_queue = "project_events"
         self.thread_prefix = "project_thread"
         self.collection_name = "project_threads"
+        self.cache_ttl = getattr(settings, 'project_thread_cache_ttl_s', 86400 * 7)
+        self.vector_debounce_s = getattr(settings, 'project_thread_vector_debounce_s', 30.0)
 
-        if not qdrant_service:
-            raise RuntimeError("Qdrant service required for project thread storage")
+        self._vector_dirty: Set[str] = set()
+        self._vector_tasks: Dict[str, asyncio.Task] = {}
+        self._embedded_text: Dict[str, str] = {}
 
-        logger.info(f"Project Thread Manager initialized - Vector store: Primary, Redis: {'Cache enabled' if redis_client else 'Cache disabled'}")
+        logger.info(f"Project Thread Manager initialized - SQL store: Primary, Redis: {'Cache enabled' if redis_client else 'Cache disabled'}")
 
     async def get_project_thread_by_project_id(self, project_id: str) -> Optional[ProjectThreadContext]:
         """
@@ -164,7 +210,7 @@ class ProjectThreadManager:
             if existing_thread:
                 # Update last activity and return
                 existing_thread.last_activity = datetime.now()
-                await self._persist_project_thread(existing_thread)
+                await self._save_thread_fields(existing_thread, {})
                 logger.info(f"Retrieved existing project thread {existing_thread.project_thread_id} for project {project_id}")
                 return existing_thread
 
@@ -186,7 +232,7 @@ class ProjectThreadManager:
             if existing_thread:
                 logger.warning(f"Project thread already exists for project {project_id}, returning existing thread")
                 existing_thread.last_activity = datetime.now()
-                await self._persist_project_thread(existing_thread)
+                await self._save_thread_fields(existing_thread, {})
                 return existing_thread
 
             # Create new project thread
@@ -211,9 +257,18 @@ class ProjectThreadManager:
                 applied_patterns=[]
             )
 
-            # Store in memory and persist to vector store
+            # The unique project_id decides between concurrent creators
+            created = await self._sql(lambda cur: self._insert_thread(cur, thread_context, on_conflict="(project_id) DO NOTHING"))
+            if not created:
+                existing_thread = await self._find_project_thread(project_id)
+                if existing_thread:
+                    logger.warning(f"Project thread for project {project_id} was created concurrently, returning it")
+                    return existing_thread
+                raise RuntimeError(f"Project thread for project {project_id} could not be created")
+
             self.project_threads[project_thread_id] = thread_context
-            await self._persist_project_thread(thread_context)
+            await self._cache_thread(thread_context)
+            self._schedule_vector_refresh(thread_context)
 
             # Capture thread creation event
             await self.capture_project_event(
@@ -242,7 +297,7 @@ class ProjectThreadManager:
             if project_thread_id in self.project_threads:
                 return self.project_threads[project_thread_id]
 
-            # Load from persistent storage (vector store + Redis cache)
+            # Load from persistent storage (SQL + Redis cache)
             thread_context = await self._load_project_thread(project_thread_id)
             if thread_context:
                 # Cache in memory
@@ -279,11 +334,14 @@ class ProjectThreadManager:
                 context_snapshot=context_snapshot or {}
             )
 
-            # Add to Redis queue for background processing (if available)
+            # Add to Redis queue for background processing and publish for
+            # real-time monitoring (if available)
             if self.redis:
-                await self.redis.lpush(self.event_queue, json.dumps(event.to_dict()))
-                # Publish for real-time monitoring
-                await self.redis.publish(f"project_watch:{project_id}", json.dumps(event.to_dict()))
+                event_json = json.dumps(event.to_dict())
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.lpush(self.event_queue, event_json)
+                    pipe.publish(f"project_watch:{project_id}", event_json)
+                    await pipe.execute()
 
             # Update project thread context immediately
             await self._update_thread_context_from_event(event)
@@ -328,13 +386,14 @@ class ProjectThreadManager:
                 for old_key, _ in sorted_refs[:-50]:
                     del thread_context.contextual_references[old_key]
 
-            await self._persist_project_thread(thread_context)
+            await self._save_thread_fields(
+                thread_context, {"contextual_references": thread_context.contextual_references}
+            )
             return True
 
         except Exception as e:
             logger.error(f"Failed to add contextual reference: {e}")
             return False
-
     async def resolve_contextual_reference(
         self,
         project_thread_id: str,
@@ -406,94 +465,74 @@ class ProjectThreadManager:
             return {}
 
     async def _find_project_thread(self, project_id: str) -> Optional[ProjectThreadContext]:
-        """Find existing project thread by project ID using vector store"""
+        """Find existing project thread by project ID (Redis index, then SQL)"""
         try:
-            # Use direct Qdrant filtering for exact project_id match instead of vector search
-            from qdrant_client.models import Filter, FieldCondition, MatchValue
-
-            # Create filter for exact project_id match
-            project_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="project_id",
-                        match=MatchValue(value=project_id)
-                    )
-                ]
-            )
-
-            # Scroll through points with the filter
-            scroll_result = self.qdrant.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=project_filter,
-                limit=1
-            )[0]  # Get the points from the tuple
-
-            if scroll_result:
-                # Found existing project thread
-                point = scroll_result[0]  # First point
-                payload = point.payload
-                thread_data = payload.get("thread_data", {})
-
-                if thread_data and thread_data.get("project_id") == project_id:
-                    logger.info(f"Found existing project thread for project {project_id}")
-                    return ProjectThreadContext.from_dict(thread_data)
+            if self.redis:
+                project_thread_id = await self.redis.get(f"project_index:{project_id}")
+                if project_thread_id:
+                    if isinstance(project_thread_id, bytes):
+                        project_thread_id = project_thread_id.decode('utf-8')
+                    thread_context = await self.get_project_thread(project_thread_id)
+                    if thread_context and thread_context.project_id == project_id:
+                        return thread_context
+
+            row = await self._sql(lambda cur: self._select_thread(cur, "project_id", project_id))
+            if row:
+                thread_context = ProjectThreadContext.from_dict(row["thread_data"])
+                self.project_threads[thread_context.project_thread_id] = thread_context
+                await self._cache_thread(thread_context)
+                logger.info(f"Found existing project thread for project {project_id}")
+                return thread_context
 
-            return None
+            return await self._import_vector_store_thread(project_id=project_id)
 
         except Exception as e:
             logger.error(f"Failed to find project thread for project {project_id}: {e}")
             return None
 
     async def _persist_project_thread(self, thread_context: ProjectThreadContext):
-        """Persist project thread to vector store (primary) and Redis (cache)"""
-        try:
-            thread_data = thread_context.to_dict()
-
-            # Create searchable text for the thread
-            searchable_text = self._create_thread_searchable_text(thread_context)
-
-            # Generate embedding for the thread
-            from sentence_transformers import SentenceTransformer
-            import os
-
-            # Use local cache to avoid downloading model metadata from HuggingFace
-            cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "models", "embeddings")
-            model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=cache_dir)
-            embedding = model.encode([searchable_text])[0].tolist()
-
-            # Store in vector store (primary storage)
-            vector_data = [{
-                "id": thread_context.project_thread_id,
-                "vector": embedding,
-                "payload": {
-                    "project_thread_id": thread_context.project_thread_id,
-                    "project_id": thread_context.project_id,
-                    "created_by": thread_context.created_by,
-                    "created_at": thread_context.created_at.isoformat(),
-                    "last_activity": thread_context.last_activity.isoformat(),
-                    "thread_data": thread_data,
-                    "searchable_text": searchable_text
-                }
-            }]
-
-            stored_ids = self.qdrant.store_vectors(self.collection_name, vector_data)
-            logger.info(f"Stored project thread {thread_context.project_thread_id} in vector store")
+        """
+        Write the full project thread (SQL, then Redis cache)
 
-            # Also cache in Redis if available (for performance)
-            if self.redis:
-                thread_json = json.dumps(thread_data)
-                await self.redis.set(
-                    f"{self.thread_prefix}:{thread_context.project_thread_id}",
-                    thread_json,
-                    ex=86400 * 7  # 7 days cache
-                )
-                # Create project index for fast lookup
-                await self.redis.set(f"project_index:{thread_context.project_id}", thread_context.project_thread_id, ex=86400 * 7)
+        Used for edits that replace parts of the thread wholesale, such as
+        rewriting the conversation history; per-event updates go through
+        ``_update_thread_context_from_event`` instead.
+        """
+        try:
+            await self._sql(lambda cur: self._insert_thread(
+                cur, thread_context,
+                on_conflict="(project_thread_id) DO UPDATE SET last_activity = EXCLUDED.last_activity, "
+                            "thread_data = EXCLUDED.thread_data",
+            ))
+            self.project_threads[thread_context.project_thread_id] = thread_context
+            await self._cache_thread(thread_context)
+            self._schedule_vector_refresh(thread_context)
+            logger.info(f"Stored project thread {thread_context.project_thread_id}")
 
         except Exception as e:
             logger.error(f"Failed to persist project thread {thread_context.project_thread_id}: {e}")
             raise
 
+    async def _save_thread_fields(self, thread_context: ProjectThreadContext, fields: Dict[str, Any]):
+        """Write some top-level thread fields (and last_activity) without rewriting the rest"""
+        changes = dict(fields, last_activity=thread_context.last_activity.isoformat())
+
+        def update(cur):
+            cur.execute(
+                """
+                UPDATE project_thread_state
+                SET last_activity = %s, thread_data = thread_data || %s::jsonb
+                WHERE project_thread_id = %s
+                RETURNING thread_data
+                """,
+                (thread_context.last_activity, _json(changes), thread_context.project_thread_id),
+            )
+            return cur.fetchone()
+
+        row = await self._sql(update)
+        if row:
+            await self._store_updated_thread(row["thread_data"])
+
     def _create_thread_searchable_text(self, thread_context: ProjectThreadContext) -> str:
         """Create searchable text representation of project thread"""
         try:
@@ -527,7 +566,7 @@ class ProjectThreadManager:
             return f"project_id:{thread_context.project_id}"
 
     async def _load_project_thread(self, project_thread_id: str) -> Optional[ProjectThreadContext]:
-        """Load project thread from vector store (primary) or Redis (cache)"""
+        """Load project thread from Redis (cache) or SQL (primary)"""
         try:
             # Try Redis cache first (if available)
             if self.redis:
@@ -539,117 +578,308 @@ class ProjectThreadManager:
                     logger.debug(f"Loaded project thread {project_thread_id} from Redis cache")
                     return ProjectThreadContext.from_dict(thread_data)
 
-            # Load from vector store (primary storage)
-            try:
-                # Get the specific point by ID
-                points = self.qdrant.client.retrieve(
-                    collection_name=self.collection_name,
-                    ids=[project_thread_id],
-                    with_payload=True
-                )
+            row = await self._sql(lambda cur: self._select_thread(cur, "project_thread_id", project_thread_id))
+            if row:
+                thread_context = ProjectThreadContext.from_dict(row["thread_data"])
+                await self._cache_thread(thread_context)
+                logger.debug(f"Loaded project thread {project_thread_id} from SQL")
+                return thread_context
 
-                if points:
-                    payload = points[0].payload
-                    thread_data = payload.get("thread_data", {})
+            return await self._import_vector_store_thread(project_thread_id=project_thread_id)
 
-                    if thread_data:
-                        logger.info(f"Loaded project thread {project_thread_id} from vector store")
+        except Exception as e:
+            logger.error(f"Failed to load project thread {project_thread_id}: {e}")
+            return None
 
-                        # Cache in Redis if available
-                        if self.redis:
-                            await self.redis.set(
-                                f"{self.thread_prefix}:{project_thread_id}",
-                                json.dumps(thread_data),
-                                ex=86400 * 7
-                            )
+    async def _import_vector_store_thread(
+        self, project_id: Optional[str] = None, project_thread_id: Optional[str] = None
+    ) -> Optional[ProjectThreadContext]:
+        """
+        Move a thread persisted before the SQL store (thread_data in the Qdrant payload) into SQL
+        """
+        if not self.qdrant:
+            return None
+        try:
+            if project_thread_id:
+                points = await asyncio.to_thread(
+                    self.qdrant.client.retrieve,
+                    collection_name=self.collection_name,
+                    ids=[project_thread_id],
+                    with_payload=True,
+                )
+            else:
+                from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-                        return ProjectThreadContext.from_dict(thread_data)
+                project_filter = Filter(must=[FieldCondition(key="project_id", match=MatchValue(value=project_id))])
+                points, _ = await asyncio.to_thread(
+                    self.qdrant.client.scroll,
+                    collection_name=self.collection_name,
+                    scroll_filter=project_filter,
+                    limit=1,
+                )
 
-            except Exception as e:
-                logger.warning(f"Failed to load from vector store: {e}")
+            thread_data = (points[0].payload or {}).get("thread_data") if points else None
+            if not thread_data:
+                return None
 
-            return None
+            thread_context = ProjectThreadContext.from_dict(thread_data)
+            await self._persist_project_thread(thread_context)
+            logger.info(f"Imported project thread {thread_context.project_thread_id} from vector store")
+            return thread_context
 
         except Exception as e:
-            logger.error(f"Failed to load project thread {project_thread_id}: {e}")
+            logger.warning(f"Failed to load from vector store: {e}")
             return None
 
     async def _update_thread_context_from_event(self, event: ProjectEvent):
-        """Update project thread context based on event"""
+        """
+        Update project thread context based on event
+
+        Appends the event and applies its context changes in one UPDATE, so
+        concurrent events for the same thread (from any process) compose.
+        """
         try:
-            thread_context = await self.get_project_thread(event.project_thread_id)
-            if not thread_context:
+            sql, params = self._event_update_sql(event)
+            row = await self._sql(lambda cur: (cur.execute(sql, params), cur.fetchone())[1])
+            if not row:
                 return
 
-            # Update last activity
-            thread_context.last_activity = event.timestamp
+            thread_context = await self._store_updated_thread(row["thread_data"])
+            self._schedule_vector_refresh(thread_context)
 
-            # Add event to project events (keep last 100)
-            event_summary = {
-                "event_id": event.event_id,
-                "timestamp": event.timestamp.isoformat(),
-                "event_type": event.event_type.value,
-                "summary": event.semantic_summary or f"{event.event_type.value} event",
-                "key_data": event.event_data
-            }
+        except Exception as e:
+            logger.error(f"Failed to update thread context from event: {e}")
 
-            thread_context.project_events.append(event_summary)
-            if len(thread_context.project_events) > 100:
-                thread_context.project_events = thread_context.project_events[-100:]
+    def _event_update_sql(self, event: ProjectEvent):
+        """UPDATE statement and parameters applying one event to the stored thread"""
+        event_summary = {
+            "event_id": event.event_id,
+            "timestamp": event.timestamp.isoformat(),
+            "event_type": event.event_type.value,
+            "summary": event.semantic_summary or f"{event.event_type.value} event",
+            "key_data": event.event_data
+        }
 
-            # Update specific context based on event type
-            if event.event_type == ProjectEventType.ONTOLOGY_CREATED:
-                ontology_id = event.event_data.get("ontology_id")
-                if ontology_id and ontology_id not in thread_context.active_ontologies:
-                    thread_context.active_ontologies.append(ontology_id)
+        # (thread_data key, SQL expression, expression parameters)
+        changes = [
+            ("last_activity", "to_jsonb(%s::text)", [event.timestamp.isoformat()]),
+            ("project_events", _bounded_array_sql("project_events", MAX_PROJECT_EVENTS), [_json([event_summary])]),
+        ]
+
+        # Update specific context based on event type
+        if event.event_type == ProjectEventType.ONTOLOGY_CREATED:
+            ontology_id = event.event_data.get("ontology_id")
+            if ontology_id:
+                existing = "COALESCE(thread_data->'active_ontologies', '[]'::jsonb)"
+                changes.append((
+                    "active_ontologies",
+                    f"CASE WHEN {existing} ? %s THEN {existing} ELSE {existing} || jsonb_build_array(%s::text) END",
+                    [ontology_id, ontology_id],
+                ))
+
+        elif event.event_type == ProjectEventType.DOCUMENT_UPLOADED:
+            doc_id = event.event_data.get("document_id")
+            if doc_id:
+                changes.append((
+                    "recent_documents",
+                    _bounded_array_sql("recent_documents", MAX_RECENT_DOCUMENTS, prepend=True),
+                    [_json([doc_id])],
+                ))
+
+        elif event.event_type == ProjectEventType.WORKBENCH_CHANGED:
+            changes.append(("current_workbench", "to_jsonb(%s::text)", [event.event_data.get("workbench", "ontology")]))
+
+        elif event.event_type == ProjectEventType.PROJECT_GOAL_SET:
+            changes.append(("project_goals", "to_jsonb(%s::text)", [event.event_data.get("goals")]))
+
+        params: List[Any] = [event.timestamp]
+        for _, _, expression_params in changes:
+            params.extend(expression_params)
+        params.append(event.project_thread_id)
+
+        sql = (
+            "UPDATE project_thread_state SET last_activity = %s, thread_data = thread_data || jsonb_build_object("
+            + ", ".join(f"'{key}', {expression}" for key, expression, _ in changes)
+            + ") WHERE project_thread_id = %s RETURNING thread_data"
+        )
+        return sql, params
 
-            elif event.event_type == ProjectEventType.DOCUMENT_UPLOADED:
-                doc_id = event.event_data.get("document_id")
-                if doc_id:
-                    thread_context.recent_documents.insert(0, doc_id)
-                    thread_context.recent_documents = thread_context.recent_documents[:20]  # Keep last 20
+    async def delete_project_thread(self, project_id: str) -> bool:
+        """Delete project thread from SQL, Redis and the vector store"""
+        try:
+            def delete(cur):
+                cur.execute(
+                    "DELETE FROM project_thread_state WHERE project_id = %s RETURNING project_thread_id",
+                    (project_id,),
+                )
+                return cur.fetchone()
 
-            elif event.event_type == ProjectEventType.WORKBENCH_CHANGED:
-                thread_context.current_workbench = event.event_data.get("workbench", "ontology")
+            row = await self._sql(delete)
+            if not row:
+                logger.warning(f"No project thread found for project {project_id}")
+                return False
 
-            elif event.event_type == ProjectEventType.PROJECT_GOAL_SET:
-                thread_context.project_goals = event.event_data.get("goals")
+            project_thread_id = row["project_thread_id"]
+            self.project_threads.pop(project_thread_id, None)
+            self._vector_dirty.discard(project_thread_id)
+            self._embedded_text.pop(project_thread_id, None)
+            task = self._vector_tasks.pop(project_thread_id, None)
+            if task:
+                task.cancel()
 
-            # Persist updated context
-            await self._persist_project_thread(thread_context)
+            if self.redis:
+                await self.redis.delete(f"{self.thread_prefix}:{project_thread_id}", f"project_index:{project_id}")
+            logger.info(f"Deleted project thread {project_thread_id}")
 
-        except Exception as e:
-            logger.error(f"Failed to update thread context from event: {e}")
+            # Delete from vector store
+            if self.qdrant:
+                try:
+                    await asyncio.to_thread(self.qdrant.delete_vectors, self.collection_name, [project_thread_id])
+                    logger.info(f"Deleted project thread {project_thread_id} from vector store")
+                except Exception as vector_error:
+                    logger.warning(f"Could not delete from vector store: {vector_error}")
 
-    async def delete_project_thread(self, project_id: str) -> bool:
-        """Delete project thread from both Redis and vector store"""
-        try:
-            # Get project thread ID from Redis index
-            if self.redis:
-                project_thread_id = await self.redis.get(f"project_index:{project_id}")
-                if project_thread_id:
-                    project_thread_id = project_thread_id.decode()
-
-                    # Delete from Redis
-                    await self.redis.delete(f"{self.thread_prefix}:{project_thread_id}")
-                    await self.redis.delete(f"project_index:{project_id}")
-                    logger.info(f"Deleted project thread {project_thread_id} from Redis")
-
-                    # Delete from vector store
-                    try:
-                        self.qdrant.delete_vectors(self.collection_name, [project_thread_id])
-                        logger.info(f"Deleted project thread {project_thread_id} from vector store")
-                    except Exception as vector_error:
-                        logger.warning(f"Could not delete from vector store: {vector_error}")
-
-                    return True
-                else:
-                    logger.warning(f"No project thread found for project {project_id}")
-                    return False
-            else:
-                logger.warning("Redis not available for project thread deletion")
-                return False
+            return True
 
         except Exception as e:
             logger.error(f"Error deleting project thread for project {project_id}: {e}")
             return False
+
+    async def close(self):
+        """Cancel pending background vector refreshes"""
+        tasks = list(self._vector_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._vector_tasks.clear()
+        self._vector_dirty.clear()
+
+    # Storage helpers
+
+    def _db_service(self):
+        if self.db is None:
+            from .db import DatabaseService
+            self.db = DatabaseService(self.settings)
+        return self.db
+
+    def _run_sql(self, operation):
+        db = self._db_service()
+        conn = db._conn()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                result = operation(cur)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            db._return(conn)
+
+    async def _sql(self, operation):
+        """Run ``operation(cursor)`` in one transaction, off the event loop"""
+        return await asyncio.to_thread(self._run_sql, operation)
+
+    @staticmethod
+    def _insert_thread(cur, thread_context: ProjectThreadContext, on_conflict: str) -> bool:
+        cur.execute(
+            f"""
+            INSERT INTO project_thread_state
+                (project_thread_id, project_id, created_by, created_at, last_activity, thread_data)
+            VALUES (%s, %s, %s, %s, %s, %s::jsonb)
+            ON CONFLICT {on_conflict}
+            """,
+            (
+                thread_context.project_thread_id,
+                thread_context.project_id,
+                thread_context.created_by,
+                thread_context.created_at,
+                thread_context.last_activity,
+                _json(thread_context.to_dict()),
+            ),
+        )
+        return cur.rowcount > 0
+
+    @staticmethod
+    def _select_thread(cur, column: str, value: str) -> Optional[Dict[str, Any]]:
+        cur.execute(f"SELECT thread_data FROM project_thread_state WHERE {column} = %s", (value,))
+        return cur.fetchone()
+
+    async def _store_updated_thread(self, thread_data: Dict[str, Any]) -> ProjectThreadContext:
+        """Refresh the memory and Redis caches from the row an UPDATE returned"""
+        thread_context = ProjectThreadContext.from_dict(thread_data)
+        self.project_threads[thread_context.project_thread_id] = thread_context
+        await self._cache_thread(thread_context)
+        return thread_context
+
+    async def _cache_thread(self, thread_context: ProjectThreadContext):
+        if not self.redis:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.thread_prefix}:{thread_context.project_thread_id}",
+                     _json(thread_context.to_dict()), ex=self.cache_ttl)
+            # Project index for fast lookup
+            pipe.set(f"project_index:{thread_context.project_id}",
+                     thread_context.project_thread_id, ex=self.cache_ttl)
+            await pipe.execute()
+
+    # Thread vectors
+
+    def _schedule_vector_refresh(self, thread_context: ProjectThreadContext):
+        """
+        Queue a re-embed of the thread if its searchable text changed; bursts
+        of changes within the debounce window produce a single embedding
+        """
+        if not self.qdrant:
+            return
+        project_thread_id = thread_context.project_thread_id
+        if self._embedded_text.get(project_thread_id) == self._create_thread_searchable_text(thread_context):
+            return
+
+        self._vector_dirty.add(project_thread_id)
+        task = self._vector_tasks.get(project_thread_id)
+        if task is None or task.done():
+            self._vector_tasks[project_thread_id] = asyncio.create_task(self._refresh_vector(project_thread_id))
+
+    async def _refresh_vector(self, project_thread_id: str):
+        try:
+            while project_thread_id in self._vector_dirty:
+                await asyncio.sleep(self.vector_debounce_s)
+                self._vector_dirty.discard(project_thread_id)
+
+                thread_context = await self.get_project_thread(project_thread_id)
+                if not thread_context:
+                    return
+                searchable_text = self._create_thread_searchable_text(thread_context)
+                if self._embedded_text.get(project_thread_id) == searchable_text:
+                    continue
+
+                embedding_service = get_thread_embedding_service(self.settings)
+                embedding = (await asyncio.to_thread(
+                    embedding_service.generate_embeddings, [searchable_text], THREAD_VECTOR_MODEL
+                ))[0]
+
+                # Vectors carry search metadata only; thread state lives in SQL
+                vector_data = [{
+                    "id": project_thread_id,
+                    "vector": embedding,
+                    "payload": {
+                        "project_thread_id": project_thread_id,
+                        "project_id": thread_context.project_id,
+                        "created_by": thread_context.created_by,
+                        "created_at": thread_context.created_at.isoformat(),
+                        "last_activity": thread_context.last_activity.isoformat(),
+                        "searchable_text": searchable_text
+                    }
+                }]
+                await asyncio.to_thread(self.qdrant.store_vectors, self.collection_name, vector_data)
+                self._embedded_text[project_thread_id] = searchable_text
+                logger.debug(f"Refreshed vector for project thread {project_thread_id}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to refresh vector for project thread {project_thread_id}: {e}")
+        finally:
+            if self._vector_tasks.get(project_thread_id) is asyncio.current_task():
+                del self._vector_tasks[project_thread_id]
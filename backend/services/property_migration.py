@@ -9,7 +9,7 @@ import psycopg2
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from backend.services.config import Settings
-from SPARQLWrapper import SPARQLWrapper, JSON
+from backend.services.fuseki_gateway import get_fuseki_gateway
 
 def get_db_connection():
     """Get raw database connection for complex queries."""
@@ -472,10 +472,8 @@ WHERE {{
 """
             
             # Execute SPARQL update
-            sparql = SPARQLWrapper(self.settings.fuseki_url + "/update")
-            sparql.setQuery(sparql_query)
-            sparql.method = "POST"
-            sparql.query()
+            fuseki = get_fuseki_gateway(self.settings.fuseki_url, self.settings)
+            fuseki.update(sparql_query)
             
             # Count affected triples
             count_query = f"""
@@ -489,10 +487,7 @@ WHERE {{
 }}
 """
             
-            sparql = SPARQLWrapper(self.settings.fuseki_url + "/query")
-            sparql.setQuery(count_query)
-            sparql.setReturnFormat(JSON)
-            results = sparql.query().convert()
+            results = fuseki.query(count_query)
             
             migrated_count = int(results["results"]["bindings"][0]["count"]["value"])
             
@@ -21,6 +21,7 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from collections import Counter, defaultdict
 from enum import Enum
+from operator import attrgetter
 
 try:
     import nltk
@@ -32,9 +33,29 @@ except ImportError:
 
 from .config import Settings
 from .metadata_extraction import MetadataExtractionService, DocumentMetadata
+from .pattern_bank import PatternBank, PatternMatch
 
 logger = logging.getLogger(__name__)
 
+SECTION_HEADER_PATTERN = re.compile(r'^(\d+(?:\.\d+)*\.?\s+.*)|^([A-Z][A-Z\s]{10,})|^(#{1,6}\s+.*)')
+NUMERIC_CONSTRAINT_PATTERN = re.compile(
+    r'(?:minimum|maximum|min|max|at least|no more than|between|±|tolerance|accuracy|precision)'
+    r'[\s:]*([0-9]+(?:\.[0-9]+)?)\s*([a-zA-Z/%]+)?',
+    re.IGNORECASE
+)
+
+# ExtractionConfig keyword lists matched against each candidate sentence
+KEYWORD_FIELDS = (
+    "functional_keywords", "performance_keywords", "safety_keywords",
+    "security_keywords", "constraint_keywords"
+)
+_config_keywords = attrgetter(*KEYWORD_FIELDS)
+
+
+def normalize_requirement_text(text: str) -> str:
+    """Normalized requirement text used to detect duplicate extractions."""
+    return re.sub(r'\s+', ' ', text.lower().strip())
+
 
 class RequirementType(Enum):
     """Standard requirement types based on systems engineering best practices."""
@@ -236,6 +257,63 @@ class RequirementsExtractionEngine:
             "percentage": r"\b%|percent(?:age)?\b"
         }
         
+        # Modal verbs and the requirement confidence they signal
+        self.modal_patterns = [
+            (r'\b(shall|must)\b', 0.9),
+            (r'\b(will|should)\b', 0.7),
+            (r'\b(may|might|could)\b', 0.4)
+        ]
+        
+        # Subject-modal-action structure
+        self.structure_patterns = [
+            r'\b(?:the\s+)?(?:system|component|user|interface)\s+(?:shall|must|will)\s+\w+',
+            r'\b(?:shall|must|will)\s+(?:be\s+)?(?:able\s+to\s+)?(?:provide|perform|support|maintain)',
+            r'\b\w+\s+(?:shall|must|will)\s+(?:not\s+)?(?:exceed|be\s+less\s+than|be\s+greater\s+than)'
+        ]
+        
+        # Requirement identifiers, in order of preference
+        self.identifier_patterns = [
+            r'\b([A-Z]+-[0-9]+)\b',
+            r'\b(REQ-[0-9]+)\b',
+            r'\b([A-Z]{2,4}-[0-9]{3,4})\b',
+            r'\b([0-9]+\.[0-9]+\.[0-9]+)\b'
+        ]
+        
+        # Category mapping based on domain keywords
+        self.category_keywords = {
+            "Navigation": ["navigation", "gps", "position", "location", "coordinates", "waypoint"],
+            "Communication": ["communication", "radio", "transmit", "receive", "signal", "frequency"],
+            "Power": ["power", "battery", "electrical", "voltage", "current", "energy"],
+            "Safety": ["safety", "hazard", "emergency", "fault", "fail-safe", "protection"],
+            "Performance": ["performance", "speed", "accuracy", "efficiency", "throughput"],
+            "Interface": ["interface", "connection", "protocol", "api", "format"],
+            "Display": ["display", "screen", "indicator", "visual", "gui", "hmi"],
+            "Control": ["control", "command", "operate", "manual", "automatic"],
+            "Maintenance": ["maintenance", "service", "repair", "diagnostic", "test"]
+        }
+        
+        # ExtractionConfig keyword list that scores each requirement type
+        self.type_keyword_fields = {
+            RequirementType.FUNCTIONAL: "functional_keywords",
+            RequirementType.PERFORMANCE: "performance_keywords",
+            RequirementType.SAFETY: "safety_keywords",
+            RequirementType.SECURITY: "security_keywords",
+        }
+        
+        # Compile the pattern sets once so each sentence or section is scanned in a
+        # single pass per category instead of once per pattern
+        self._sentence_bank = PatternBank(
+            [(("modal", score), pattern) for pattern, score in self.modal_patterns]
+            + [(("type", req_type), pattern)
+               for req_type, patterns in self.requirement_markers.items() for pattern in patterns]
+            + [(("structure", None), pattern) for pattern in self.structure_patterns]
+        )
+        self._structure_bank = PatternBank((None, pattern) for pattern in self.structure_patterns)
+        self._identifier_bank = PatternBank((None, pattern) for pattern in self.identifier_patterns)
+        self._unit_bank = PatternBank(self.units_patterns.items(), re.IGNORECASE)
+        self._constraint_banks: Dict[int, PatternBank] = {}
+        self._keyword_cache: Dict[Tuple[Tuple[str, ...], ...], List[Tuple[str, str, str]]] = {}
+        
         logger.info("Requirements extraction engine initialized")
     
     def extract_requirements_from_document(
@@ -256,7 +334,7 @@ class RequirementsExtractionEngine:
             doc_metadata = self.metadata_service.extract_comprehensive_metadata(document_text)
             
             # Split document into sections for better context extraction
-            sections = self._split_into_sections(document_text)
+            sections = self.split_into_sections(document_text)
             
             # Extract requirements from each section
             all_requirements = []
@@ -264,22 +342,14 @@ class RequirementsExtractionEngine:
             
             for section_num, (section_title, section_text) in enumerate(sections):
                 # Skip sections if filters are specified
-                if config.section_filters and not any(
-                    filter_text.lower() in section_title.lower() 
-                    for filter_text in config.section_filters
-                ):
+                if not self.section_selected(section_title, config):
                     continue
                 
-                section_requirements = self._extract_requirements_from_section(
+                section_requirements, section_constraints = self.extract_from_section(
                     section_text, section_title, config, section_num + 1
                 )
                 all_requirements.extend(section_requirements)
-                
-                if config.extract_constraints:
-                    section_constraints = self._extract_constraints_from_section(
-                        section_text, section_title, config, section_num + 1
-                    )
-                    all_constraints.extend(section_constraints)
+                all_constraints.extend(section_constraints)
             
             # Post-process and deduplicate
             all_requirements = self._post_process_requirements(all_requirements, config)
@@ -326,7 +396,33 @@ class RequirementsExtractionEngine:
                 errors=[str(e)]
             )
     
-    def _split_into_sections(self, text: str) -> List[Tuple[str, str]]:
+    def extract_from_section(
+        self,
+        section_text: str,
+        section_title: str,
+        config: ExtractionConfig,
+        section_number: int
+    ) -> Tuple[List[ExtractedRequirement], List[ExtractedConstraint]]:
+        """Extract requirements and (if configured) constraints from one section."""
+        requirements = self._extract_requirements_from_section(
+            section_text, section_title, config, section_number
+        )
+        constraints = []
+        if config.extract_constraints:
+            constraints = self._extract_constraints_from_section(
+                section_text, section_title, config, section_number
+            )
+        return requirements, constraints
+    
+    @staticmethod
+    def section_selected(section_title: str, config: ExtractionConfig) -> bool:
+        """Whether a section passes the configured section filters."""
+        return not config.section_filters or any(
+            filter_text.lower() in section_title.lower()
+            for filter_text in config.section_filters
+        )
+    
+    def split_into_sections(self, text: str) -> List[Tuple[str, str]]:
         """Split document into logical sections based on headers."""
         sections = []
         current_section = ""
@@ -336,7 +432,7 @@ class RequirementsExtractionEngine:
         
         for line in lines:
             # Detect section headers (various formats)
-            header_match = re.match(r'^(\d+(?:\.\d+)*\.?\s+.*)|^([A-Z][A-Z\s]{10,})|^(#{1,6}\s+.*)', line.strip())
+            header_match = SECTION_HEADER_PATTERN.match(line.strip())
             
             if header_match and len(line.strip()) > 0 and len(current_section.strip()) > 50:
                 # Save previous section
@@ -425,18 +521,15 @@ class RequirementsExtractionEngine:
         """Extract constraints from a document section."""
         constraints = []
         
-        # Look for constraint patterns in the text
-        for constraint_type, patterns in self.constraint_patterns.items():
-            for pattern in patterns:
-                flags = re.IGNORECASE if config.ignore_case else 0
-                matches = re.finditer(pattern, section_text, flags)
-                
-                for match in matches:
-                    constraint = self._parse_constraint_match(
-                        match, constraint_type, section_text, section_title, section_number
-                    )
-                    if constraint:
-                        constraints.append(constraint)
+        # Look for constraint patterns in the text, reported per pattern in document order
+        flags = re.IGNORECASE if config.ignore_case else 0
+        matches = sorted(self._constraint_bank(flags).finditer(section_text), key=lambda match: match.index)
+        for match in matches:
+            constraint = self._parse_constraint_match(
+                match, match.label, section_text, section_title, section_number
+            )
+            if constraint:
+                constraints.append(constraint)
         
         # Extract numeric constraints with units
         numeric_constraints = self._extract_numeric_constraints(
@@ -446,42 +539,48 @@ class RequirementsExtractionEngine:
         
         return constraints
     
+    def _constraint_bank(self, flags: int) -> PatternBank:
+        """Constraint patterns compiled with the given flags (ignore_case is configurable)."""
+        if flags not in self._constraint_banks:
+            self._constraint_banks[flags] = PatternBank(
+                ((constraint_type, pattern)
+                 for constraint_type, patterns in self.constraint_patterns.items() for pattern in patterns),
+                flags
+            )
+        return self._constraint_banks[flags]
+    
+    def _keywords(self, config: ExtractionConfig) -> List[Tuple[str, str, str]]:
+        """(field, keyword, lowercased keyword) for the config's keyword lists."""
+        key = tuple(map(tuple, _config_keywords(config)))
+        keywords = self._keyword_cache.get(key)
+        if keywords is None:
+            keywords = self._keyword_cache[key] = [
+                (field_name, keyword, keyword.lower())
+                for field_name, field_keywords in zip(KEYWORD_FIELDS, key) for keyword in field_keywords
+            ]
+        return keywords
+    
     def _classify_requirement_sentence(self, sentence: str, config: ExtractionConfig) -> Tuple[float, RequirementType]:
         """Classify a sentence as a requirement and determine its type."""
         max_confidence = 0.0
         best_type = RequirementType.FUNCTIONAL
         
         sentence_lower = sentence.lower()
+        found = self._sentence_bank.labels(sentence_lower)
+        keyword_fields = {
+            field_name for field_name, _, lowered in self._keywords(config) if lowered in sentence_lower
+        }
+        
+        # Modal verbs (shall, must, will, should): the strongest one present
+        modal_score = max((score for kind, score in found if kind == "modal"), default=0.0)
         
-        # Check for modal verbs (shall, must, will, should)
-        modal_score = 0.0
-        if re.search(r'\b(shall|must)\b', sentence_lower):
-            modal_score = 0.9
-        elif re.search(r'\b(will|should)\b', sentence_lower):
-            modal_score = 0.7
-        elif re.search(r'\b(may|might|could)\b', sentence_lower):
-            modal_score = 0.4
-        
-        # Check requirement type patterns
-        for req_type, patterns in self.requirement_markers.items():
+        # Check requirement type patterns, then type-specific keywords
+        for req_type in self.requirement_markers:
             type_score = 0.0
-            
-            for pattern in patterns:
-                if re.search(pattern, sentence_lower):
-                    type_score = max(type_score, 0.8)
-            
-            # Check for type-specific keywords
-            type_keywords = {
-                RequirementType.FUNCTIONAL: config.functional_keywords,
-                RequirementType.PERFORMANCE: config.performance_keywords,
-                RequirementType.SAFETY: config.safety_keywords,
-                RequirementType.SECURITY: config.security_keywords,
-            }
-            
-            if req_type in type_keywords:
-                for keyword in type_keywords[req_type]:
-                    if keyword.lower() in sentence_lower:
-                        type_score = max(type_score, 0.6)
+            if ("type", req_type) in found:
+                type_score = 0.8
+            elif self.type_keyword_fields.get(req_type) in keyword_fields:
+                type_score = 0.6
             
             # Combine modal and type scores
             combined_score = modal_score * 0.4 + type_score * 0.6
@@ -491,40 +590,19 @@ class RequirementsExtractionEngine:
                 best_type = req_type
         
         # Boost confidence if sentence has good requirement structure
-        if self._has_requirement_structure(sentence):
+        if ("structure", None) in found:
             max_confidence = min(max_confidence + 0.1, 1.0)
         
         return max_confidence, best_type
     
     def _has_requirement_structure(self, sentence: str) -> bool:
         """Check if sentence has typical requirement structure."""
-        sentence_lower = sentence.lower()
-        
-        # Check for subject-modal-action structure
-        structure_patterns = [
-            r'\b(?:the\s+)?(?:system|component|user|interface)\s+(?:shall|must|will)\s+\w+',
-            r'\b(?:shall|must|will)\s+(?:be\s+)?(?:able\s+to\s+)?(?:provide|perform|support|maintain)',
-            r'\b\w+\s+(?:shall|must|will)\s+(?:not\s+)?(?:exceed|be\s+less\s+than|be\s+greater\s+than)'
-        ]
-        
-        return any(re.search(pattern, sentence_lower) for pattern in structure_patterns)
+        return self._structure_bank.first(sentence.lower()) is not None
     
     def _extract_requirement_identifier(self, sentence: str) -> Optional[str]:
         """Extract requirement identifier from sentence."""
-        # Check for common ID patterns
-        id_patterns = [
-            r'\b([A-Z]+-[0-9]+)\b',
-            r'\b(REQ-[0-9]+)\b',
-            r'\b([A-Z]{2,4}-[0-9]{3,4})\b',
-            r'\b([0-9]+\.[0-9]+\.[0-9]+)\b'
-        ]
-        
-        for pattern in id_patterns:
-            match = re.search(pattern, sentence)
-            if match:
-                return match.group(1)
-        
-        return None
+        match = self._identifier_bank.first(sentence)
+        return match.group(1) if match else None
     
     def _extract_context(self, sentences: List[str], target_idx: int, window_size: int) -> str:
         """Extract context around a target sentence."""
@@ -538,20 +616,7 @@ class RequirementsExtractionEngine:
         """Classify requirement into category and subcategory."""
         sentence_lower = sentence.lower()
         
-        # Category mapping based on domain keywords
-        category_keywords = {
-            "Navigation": ["navigation", "gps", "position", "location", "coordinates", "waypoint"],
-            "Communication": ["communication", "radio", "transmit", "receive", "signal", "frequency"],
-            "Power": ["power", "battery", "electrical", "voltage", "current", "energy"],
-            "Safety": ["safety", "hazard", "emergency", "fault", "fail-safe", "protection"],
-            "Performance": ["performance", "speed", "accuracy", "efficiency", "throughput"],
-            "Interface": ["interface", "connection", "protocol", "api", "format"],
-            "Display": ["display", "screen", "indicator", "visual", "gui", "hmi"],
-            "Control": ["control", "command", "operate", "manual", "automatic"],
-            "Maintenance": ["maintenance", "service", "repair", "diagnostic", "test"]
-        }
-        
-        for category, keywords in category_keywords.items():
+        for category, keywords in self.category_keywords.items():
             if any(keyword in sentence_lower for keyword in keywords):
                 return category, None  # Could implement subcategory logic
         
@@ -560,24 +625,11 @@ class RequirementsExtractionEngine:
     def _extract_matching_keywords(self, sentence: str, config: ExtractionConfig) -> List[str]:
         """Extract keywords that triggered the requirement match."""
         sentence_lower = sentence.lower()
-        keywords = []
-        
-        # Check all keyword lists
-        all_keywords = (
-            config.functional_keywords + config.performance_keywords +
-            config.safety_keywords + config.security_keywords +
-            config.constraint_keywords
-        )
-        
-        for keyword in all_keywords:
-            if keyword.lower() in sentence_lower:
-                keywords.append(keyword)
-        
-        return list(set(keywords))  # Remove duplicates
+        return list({keyword for _, keyword, lowered in self._keywords(config) if lowered in sentence_lower})
     
     def _parse_constraint_match(
         self,
-        match: re.Match,
+        match: Union[re.Match, PatternMatch],
         constraint_type: ConstraintType,
         section_text: str,
         section_title: str,
@@ -636,12 +688,8 @@ class RequirementsExtractionEngine:
         """Extract numeric constraints with units from text."""
         constraints = []
         
-        # Pattern for numeric values with units and context
-        numeric_pattern = r'(?:minimum|maximum|min|max|at least|no more than|between|±|tolerance|accuracy|precision)[\s:]*([0-9]+(?:\.[0-9]+)?)\s*([a-zA-Z/%]+)?'
-        
-        matches = re.finditer(numeric_pattern, section_text, re.IGNORECASE)
-        
-        for match in matches:
+        # Numeric values with units and context
+        for match in NUMERIC_CONSTRAINT_PATTERN.finditer(section_text):
             value_str = match.group(1)
             unit_str = match.group(2) if match.group(2) else None
             
@@ -697,11 +745,8 @@ class RequirementsExtractionEngine:
     
     def _extract_unit_from_context(self, context: str) -> Optional[str]:
         """Extract measurement unit from context."""
-        for unit_type, pattern in self.units_patterns.items():
-            match = re.search(pattern, context, re.IGNORECASE)
-            if match:
-                return match.group(0).lower()
-        return None
+        match = self._unit_bank.first(context)
+        return match.group(0).lower() if match else None
     
     def _post_process_requirements(
         self,
@@ -715,7 +760,7 @@ class RequirementsExtractionEngine:
         
         for req in requirements:
             # Simple deduplication based on normalized text
-            normalized_text = re.sub(r'\s+', ' ', req.text.lower().strip())
+            normalized_text = normalize_requirement_text(req.text)
             if normalized_text not in seen_texts:
                 seen_texts.add(normalized_text)
                 unique_requirements.append(req)
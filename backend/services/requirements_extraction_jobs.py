@@ -0,0 +1,622 @@
+"""
+Requirements Extraction Jobs
+
+Runs document requirements extraction as durable background jobs:
+- Section splitting and extraction run in a process pool, off the event loop
+- Sections are extracted in parallel and persisted in document order with
+  bulk inserts, one checkpoint transaction per flush
+- Progress lives on the requirements_extraction_jobs row and can be polled
+  or streamed
+- Jobs store their options and a section checkpoint, so a job interrupted by
+  a restart (or failed / cancelled) resumes after its last committed section
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from .config import Settings
+from .db import DatabaseService
+from .requirements_extraction import (
+    ExtractedConstraint,
+    ExtractedRequirement,
+    ExtractionConfig,
+    RequirementsExtractionEngine,
+    normalize_requirement_text,
+)
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Columns added to requirements_extraction_jobs for resumable background jobs
+# (keep in sync with backend/odras_schema.sql)
+EXTRACTION_JOB_DDL = """
+ALTER TABLE requirements_extraction_jobs
+    ADD COLUMN IF NOT EXISTS job_config JSONB,
+    ADD COLUMN IF NOT EXISTS sections_total INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS sections_completed INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+"""
+
+REQUIREMENT_COLUMNS = (
+    "requirement_id, project_id, requirement_title, requirement_text, requirement_type, category, "
+    "subcategory, priority, source_document_id, source_section, extraction_confidence, "
+    "extraction_method, extraction_job_id, created_by, updated_by, metadata"
+)
+CONSTRAINT_COLUMNS = (
+    "constraint_id, requirement_id, constraint_type, constraint_name, constraint_description, "
+    "value_type, numeric_value, numeric_unit, text_value, created_by"
+)
+
+
+def extraction_config(options: Optional[Dict[str, Any]]) -> ExtractionConfig:
+    """ExtractionConfig from stored job options (unknown keys and None values ignored)."""
+    names = {f.name for f in fields(ExtractionConfig)}
+    return ExtractionConfig(**{k: v for k, v in (options or {}).items() if k in names and v is not None})
+
+
+# Process pool entry points: one engine per worker process, built on first use
+
+_engine: Optional[RequirementsExtractionEngine] = None
+
+
+def _worker_engine() -> RequirementsExtractionEngine:
+    global _engine
+    if _engine is None:
+        _engine = RequirementsExtractionEngine()
+    return _engine
+
+
+def split_sections(document_text: str) -> List[Tuple[str, str]]:
+    return _worker_engine().split_into_sections(document_text)
+
+
+def extract_section(
+    section_title: str, section_text: str, config: ExtractionConfig, section_number: int
+) -> Tuple[List[ExtractedRequirement], List[ExtractedConstraint]]:
+    return _worker_engine().extract_from_section(section_text, section_title, config, section_number)
+
+
+@dataclass
+class SectionBatch:
+    """Rows and counters accumulated between two checkpoints."""
+
+    requirement_rows: List[tuple] = field(default_factory=list)
+    constraint_rows: List[tuple] = field(default_factory=list)
+    requirements_found: int = 0
+    constraints_found: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.requirement_rows) + len(self.constraint_rows)
+
+
+class ExtractionJobStore:
+    """Postgres persistence for extraction jobs, their checkpoints and results."""
+
+    def __init__(self, db: DatabaseService, batch_size: int = 500):
+        self.db = db
+        self.batch_size = batch_size
+
+    def _execute(self, query: str, params: tuple = (), fetch: str = None):
+        conn = self.db._conn()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                if fetch == "one":
+                    result = cur.fetchone()
+                elif fetch == "all":
+                    result = cur.fetchall()
+                else:
+                    result = cur.rowcount
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db._return(conn)
+
+    def ensure_schema(self) -> None:
+        self._execute(EXTRACTION_JOB_DDL)
+
+    def create(
+        self,
+        job_id: str,
+        project_id: str,
+        job_name: str,
+        source_document_id: str,
+        extraction_type: str,
+        options: Dict[str, Any],
+        user_id: str,
+    ) -> None:
+        self._execute(
+            """
+            INSERT INTO requirements_extraction_jobs (
+                job_id, project_id, job_name, source_document_id, extraction_type,
+                status, job_config, created_by
+            ) VALUES (%s, %s, %s, %s, %s, 'pending', %s, %s)
+            """,
+            (job_id, project_id, job_name, source_document_id, extraction_type, json.dumps(options), user_id),
+        )
+
+    def claim(self, job_id: str, stale_after_s: float) -> Optional[Dict[str, Any]]:
+        """Mark a pending (or abandoned running) job as running here; None if someone else has it."""
+        return self._execute(
+            """
+            UPDATE requirements_extraction_jobs
+            SET status = 'running', started_at = COALESCE(started_at, NOW()), updated_at = NOW()
+            WHERE job_id = %s
+              AND (status = 'pending'
+                   OR (status = 'running' AND updated_at < NOW() - make_interval(secs => %s)))
+            RETURNING job_id, project_id, source_document_id, created_by, job_config, sections_completed
+            """,
+            (job_id, stale_after_s),
+            fetch="one",
+        )
+
+    def claimable(self, stale_after_s: float, limit: int = 50) -> List[str]:
+        rows = self._execute(
+            """
+            SELECT job_id FROM requirements_extraction_jobs
+            WHERE status = 'pending'
+               OR (status = 'running' AND updated_at < NOW() - make_interval(secs => %s))
+            ORDER BY created_at
+            LIMIT %s
+            """,
+            (stale_after_s, limit),
+            fetch="all",
+        )
+        return [str(row["job_id"]) for row in rows]
+
+    def seen_texts(self, job_id: str) -> Set[str]:
+        """Normalized texts already stored by a job (duplicate detection after a resume)."""
+        rows = self._execute(
+            "SELECT requirement_text FROM requirements_enhanced WHERE extraction_job_id = %s",
+            (job_id,),
+            fetch="all",
+        )
+        return {normalize_requirement_text(row["requirement_text"]) for row in rows}
+
+    def checkpoint(
+        self, job_id: str, expected_sections: int, sections_completed: int, sections_total: int, batch: SectionBatch
+    ) -> bool:
+        """
+        Insert a batch and advance the job's checkpoint in one transaction.
+
+        Returns False (and writes nothing) when the job was cancelled or its
+        checkpoint moved, i.e. this process no longer owns it.
+        """
+        progress = int(sections_completed * 100 / sections_total) if sections_total else 100
+        conn = self.db._conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE requirements_extraction_jobs
+                    SET sections_completed = %s, sections_total = %s, progress_percent = %s,
+                        requirements_found = requirements_found + %s,
+                        constraints_found = constraints_found + %s,
+                        requirements_created = requirements_created + %s,
+                        constraints_created = constraints_created + %s,
+                        updated_at = NOW()
+                    WHERE job_id = %s AND status = 'running' AND sections_completed = %s
+                    """,
+                    (
+                        sections_completed, sections_total, progress,
+                        batch.requirements_found, batch.constraints_found,
+                        len(batch.requirement_rows), len(batch.constraint_rows),
+                        job_id, expected_sections,
+                    ),
+                )
+                if cur.rowcount == 0:
+                    conn.rollback()
+                    return False
+                if batch.requirement_rows:
+                    execute_values(
+                        cur,
+                        f"INSERT INTO requirements_enhanced ({REQUIREMENT_COLUMNS}) VALUES %s",
+                        batch.requirement_rows,
+                        page_size=self.batch_size,
+                    )
+                if batch.constraint_rows:
+                    execute_values(
+                        cur,
+                        f"INSERT INTO requirements_constraints ({CONSTRAINT_COLUMNS}) VALUES %s",
+                        batch.constraint_rows,
+                        page_size=self.batch_size,
+                    )
+            conn.commit()
+            return True
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db._return(conn)
+
+    def finish(self, job_id: str, processing_log: Optional[str]) -> None:
+        self._execute(
+            """
+            UPDATE requirements_extraction_jobs
+            SET status = 'completed', completed_at = NOW(), updated_at = NOW(), progress_percent = 100,
+                processing_log = %s,
+                processing_duration_seconds = EXTRACT(EPOCH FROM (NOW() - started_at))
+            WHERE job_id = %s AND status = 'running'
+            """,
+            (processing_log, job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute(
+            """
+            UPDATE requirements_extraction_jobs
+            SET status = 'failed', error_message = %s, completed_at = NOW(), updated_at = NOW()
+            WHERE job_id = %s AND status = 'running'
+            """,
+            (error, job_id),
+        )
+
+    def release(self, job_id: str) -> None:
+        """Hand a running job back for immediate pickup (graceful shutdown)."""
+        self._execute(
+            "UPDATE requirements_extraction_jobs SET status = 'pending', updated_at = NOW() "
+            "WHERE job_id = %s AND status = 'running'",
+            (job_id,),
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        return bool(self._execute(
+            """
+            UPDATE requirements_extraction_jobs
+            SET status = 'cancelled', completed_at = NOW(), updated_at = NOW()
+            WHERE job_id = %s AND status IN ('pending', 'running')
+            """,
+            (job_id,),
+        ))
+
+    def reopen(self, job_id: str) -> bool:
+        """Make a failed or cancelled job pending again; it resumes from its checkpoint."""
+        return bool(self._execute(
+            """
+            UPDATE requirements_extraction_jobs
+            SET status = 'pending', error_message = NULL, completed_at = NULL, updated_at = NOW()
+            WHERE job_id = %s AND status IN ('failed', 'cancelled')
+            """,
+            (job_id,),
+        ))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(
+            """
+            SELECT ej.*, f.filename AS document_name
+            FROM requirements_extraction_jobs ej
+            LEFT JOIN files f ON ej.source_document_id = f.id
+            WHERE ej.job_id = %s
+            """,
+            (job_id,),
+            fetch="one",
+        )
+        return dict(row) if row else None
+
+
+class ExtractionJobManager:
+    """
+    Schedules, runs and tracks extraction jobs in this process.
+
+    A job is claimed through its database row before it runs, so with several
+    app processes each job runs in exactly one of them; a running job whose
+    checkpoint stops advancing for ``requirements_extraction_stale_after_s``
+    is considered abandoned and is picked up by the periodic sweep.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        store: ExtractionJobStore,
+        file_storage=None,
+        executor: Optional[Executor] = None,
+    ):
+        self.settings = settings
+        self.store = store
+        self.workers = max(1, int(getattr(settings, "requirements_extraction_workers", 2)))
+        self.stale_after_s = float(getattr(settings, "requirements_extraction_stale_after_s", 120.0))
+        self.flush_interval_s = float(getattr(settings, "requirements_extraction_flush_interval_s", 1.0))
+        self._file_storage = file_storage
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    # ----- lifecycle -----
+
+    async def start(self) -> None:
+        """Ensure the schema, resume interrupted jobs and start the stale-job sweep."""
+        await asyncio.to_thread(self.store.ensure_schema)
+        await self.sweep()
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop(), name="extraction-jobs:sweep")
+
+    async def shutdown(self) -> None:
+        """Stop running jobs and hand them back so the next process resumes them at once."""
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+        running = list(self._tasks.items())
+        for _, task in running:
+            task.cancel()
+        for job_id, task in running:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+            await asyncio.to_thread(self.store.release, job_id)
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(5.0, self.stale_after_s / 2))
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Extraction job sweep failed: {e}")
+
+    async def sweep(self) -> List[str]:
+        """Schedule pending and abandoned jobs not already running here."""
+        job_ids = await asyncio.to_thread(self.store.claimable, self.stale_after_s)
+        scheduled = [job_id for job_id in job_ids if job_id not in self._tasks]
+        for job_id in scheduled:
+            self.schedule(job_id)
+        if scheduled:
+            logger.info(f"Resuming {len(scheduled)} requirements extraction jobs")
+        return scheduled
+
+    # ----- job control -----
+
+    async def submit(
+        self,
+        project_id: str,
+        source_document_id: str,
+        user_id: str,
+        job_name: str,
+        extraction_type: str = "document",
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Record a pending job and start it in the background; returns the job id."""
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(
+            self.store.create, job_id, project_id, job_name, source_document_id,
+            extraction_type, options or {}, user_id,
+        )
+        self.schedule(job_id)
+        return job_id
+
+    def schedule(self, job_id: str) -> asyncio.Task:
+        task = self._tasks.get(job_id)
+        if task is None:
+            task = asyncio.create_task(self._run(job_id), name=f"extraction-job:{job_id}")
+            self._tasks[job_id] = task
+        return task
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a pending or running job; committed sections are kept."""
+        cancelled = await asyncio.to_thread(self.store.cancel, job_id)
+        task = self._tasks.get(job_id)
+        if cancelled and task:
+            task.cancel()
+        self._notify(job_id)
+        return cancelled
+
+    async def resume(self, job_id: str) -> bool:
+        """Restart a failed or cancelled job from its last checkpoint."""
+        reopened = await asyncio.to_thread(self.store.reopen, job_id)
+        if reopened:
+            self.schedule(job_id)
+        return reopened
+
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def watch(self, job_id: str, poll_interval_s: float = 2.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's status whenever it changes until it reaches a terminal
+        state. Local progress wakes the watcher at once; jobs running in
+        another process are picked up by polling.
+        """
+        last = None
+        while True:
+            status = await self.get_status(job_id)
+            if status is None:
+                return
+            snapshot = (status["status"], status.get("sections_completed"), status.get("progress_percent"))
+            if snapshot != last:
+                last = snapshot
+                yield status
+            if status["status"] in TERMINAL_STATUSES:
+                return
+            changed = self._changed.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, job_id: str) -> None:
+        changed = self._changed.pop(job_id, None)
+        if changed:
+            changed.set()
+
+    # ----- execution -----
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            start_method = getattr(self.settings, "code_executor_start_method", "forkserver")
+            if start_method not in multiprocessing.get_all_start_methods():
+                start_method = "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(start_method)
+            )
+        return self._executor
+
+    def _storage(self):
+        if self._file_storage is None:
+            from .file_storage import FileStorageService
+            self._file_storage = FileStorageService(self.settings)
+        return self._file_storage
+
+    async def _run(self, job_id: str) -> None:
+        try:
+            job = await asyncio.to_thread(self.store.claim, job_id, self.stale_after_s)
+            if job:
+                await self._extract(job_id, job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool) and self._owns_executor:
+                self._executor = None  # a worker died; start a fresh pool for the next job
+            logger.error(f"Requirements extraction job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.fail, job_id, str(e))
+        finally:
+            self._tasks.pop(job_id, None)
+            self._notify(job_id)
+
+    async def _extract(self, job_id: str, job: Dict[str, Any]) -> None:
+        started = time.monotonic()
+        config = extraction_config(job.get("job_config"))
+        content = await self._storage().get_file_content(str(job["source_document_id"]))
+        if not content:
+            raise ValueError("Document has no extractable content")
+
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        sections = await loop.run_in_executor(pool, split_sections, content.decode("utf-8"))
+        total = len(sections)
+        done = job.get("sections_completed") or 0
+        seen = await asyncio.to_thread(self.store.seen_texts, job_id) if done else set()
+        seen_constraints: Set[str] = set()
+        errors: List[str] = []
+
+        remaining = iter(enumerate(sections[done:], done + 1))
+        in_flight: deque = deque()
+
+        def fill() -> None:
+            # Keep a bounded window of sections queued so jobs share the pool fairly
+            while len(in_flight) < self.workers * 2:
+                item = next(remaining, None)
+                if item is None:
+                    return
+                number, (title, text) = item
+                future = None
+                if RequirementsExtractionEngine.section_selected(title, config):
+                    future = loop.run_in_executor(pool, extract_section, title, text, config, number)
+                in_flight.append((number, future))
+
+        batch = SectionBatch()
+        last_flush = time.monotonic()
+        fill()
+        try:
+            while in_flight:
+                number, future = in_flight.popleft()
+                requirements, constraints = [], []
+                if future is not None:
+                    try:
+                        requirements, constraints = await future
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        errors.append(f"Section {number}: {e}")
+                fill()
+                self._add_section(batch, job_id, job, config, requirements, constraints, seen, seen_constraints)
+
+                if batch.size >= self.store.batch_size or not in_flight \
+                        or time.monotonic() - last_flush >= self.flush_interval_s:
+                    if not await asyncio.to_thread(self.store.checkpoint, job_id, done, number, total, batch):
+                        logger.info(f"Extraction job {job_id} was cancelled or taken over; stopping")
+                        return
+                    done, batch, last_flush = number, SectionBatch(), time.monotonic()
+                    self._notify(job_id)
+        finally:
+            for _, future in in_flight:
+                if future is not None:
+                    future.cancel()
+
+        await asyncio.to_thread(self.store.finish, job_id, "\n".join(errors) or None)
+        logger.info(f"Extraction job {job_id} completed: {total} sections in {time.monotonic() - started:.1f}s")
+
+    @staticmethod
+    def _add_section(
+        batch: SectionBatch,
+        job_id: str,
+        job: Dict[str, Any],
+        config: ExtractionConfig,
+        requirements: List[ExtractedRequirement],
+        constraints: List[ExtractedConstraint],
+        seen: Set[str],
+        seen_constraints: Set[str],
+    ) -> None:
+        """Deduplicate one section's results against the job so far and queue its rows."""
+        user_id = str(job["created_by"]) if job.get("created_by") else None
+        project_id, document_id = str(job["project_id"]), str(job["source_document_id"])
+        for constraint in constraints:
+            if constraint.description not in seen_constraints:
+                seen_constraints.add(constraint.description)
+                batch.constraints_found += 1
+
+        for req in requirements:
+            normalized = normalize_requirement_text(req.text)
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            batch.requirements_found += 1
+            if req.confidence < config.min_confidence:
+                continue
+
+            req_id = str(uuid.uuid4())
+            batch.requirement_rows.append((
+                req_id, project_id, req.title or req.text[:100], req.text,
+                req.requirement_type.value, req.category, req.subcategory, req.priority,
+                document_id, req.source_section, req.confidence, "ai_extraction",
+                job_id, user_id, user_id, json.dumps(req.metadata),
+            ))
+            for constraint in req.constraints:
+                batch.constraint_rows.append((
+                    str(uuid.uuid4()), req_id, constraint.constraint_type.value, constraint.name,
+                    constraint.description, constraint.value_type, constraint.numeric_value,
+                    constraint.numeric_unit, constraint.text_value, user_id,
+                ))
+
+
+_manager: Optional[ExtractionJobManager] = None
+
+
+def get_extraction_job_manager(
+    settings: Settings = None, db_service: DatabaseService = None
+) -> ExtractionJobManager:
+    """Process-wide extraction job manager (created on first use)."""
+    global _manager
+    if _manager is None:
+        settings = settings or Settings()
+        store = ExtractionJobStore(
+            db_service or DatabaseService(settings),
+            batch_size=int(getattr(settings, "requirements_extraction_batch_size", 500)),
+        )
+        _manager = ExtractionJobManager(settings, store)
+    return _manager
+
+
+async def shutdown_extraction_jobs() -> None:
+    """Stop the job manager if this process started one."""
+    if _manager is not None:
+        await _manager.shutdown()
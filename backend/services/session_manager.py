@@ -10,13 +10,69 @@ import json
 import logging
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
+
+from redis.exceptions import ResponseError
 
 from .config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Field-level context update, applied only to an existing hash so that late
+# updates cannot resurrect an expired session. ARGV: ttl, document id to
+# prepend to recent_documents ("" for none), recent_documents cap, then
+# field/value pairs.
+UPDATE_CONTEXT_SCRIPT = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then return 0 end
+if #ARGV > 3 then redis.call('HSET', KEYS[1], unpack(ARGV, 4)) end
+if ARGV[2] ~= '' then
+    local docs = {}
+    local raw = redis.call('HGET', KEYS[1], 'recent_documents')
+    if raw and raw ~= '' then docs = cjson.decode(raw) end
+    table.insert(docs, 1, ARGV[2])
+    while #docs > tonumber(ARGV[3]) do table.remove(docs) end
+    redis.call('HSET', KEYS[1], 'recent_documents', cjson.encode(docs))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Snapshot the context hash and bump last_activity in one round trip.
+# ARGV: last_activity, ttl.
+TOUCH_CONTEXT_SCRIPT = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then return {} end
+local snapshot = redis.call('HGETALL', KEYS[1])
+redis.call('HSET', KEYS[1], 'last_activity', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return snapshot
+"""
+
+LIST_FIELDS = ('recent_documents', 'recent_analyses')
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _encode_field(value) -> str:
+    """Encode one context field as a Redis hash value"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _decode_hash(data) -> Dict[str, str]:
+    """HGETALL result (mapping, or flat list from a script) with text keys/values"""
+    if isinstance(data, dict):
+        return {_text(k): _text(v) for k, v in data.items()}
+    items = [_text(v) for v in data or []]
+    return dict(zip(items[0::2], items[1::2]))
+
 
 @dataclass
 class SessionContext:
@@ -57,6 +113,10 @@ class SessionContext:
 
         return data
 
+    def to_hash(self) -> Dict[str, str]:
+        """Convert to a flat mapping for the Redis context hash"""
+        return {f.name: _encode_field(getattr(self, f.name)) for f in fields(self)}
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SessionContext':
         """Create from dictionary stored in Redis"""
@@ -65,7 +125,7 @@ class SessionContext:
         for key, value in data.items():
             if value == "":
                 converted_data[key] = None
-            elif key in ['recent_documents', 'recent_analyses'] and isinstance(value, str):
+            elif key in LIST_FIELDS and isinstance(value, str):
                 try:
                     converted_data[key] = json.loads(value) if value != "[]" else []
                 except json.JSONDecodeError:
@@ -118,6 +178,12 @@ class SessionManager:
         self.redis = redis_client
         self.event_queue = "session_events"
         self.session_prefix = "session"
+        self.context_ttl = getattr(settings, 'session_context_ttl_s', 86400)
+        self._update_context_script = redis_client.register_script(UPDATE_CONTEXT_SCRIPT)
+        self._touch_context_script = redis_client.register_script(TOUCH_CONTEXT_SCRIPT)
+
+    def context_key(self, session_id: str) -> str:
+        return f"{self.session_prefix}:{session_id}:context"
 
     async def create_session(self, user_id: str, project_id: Optional[str] = None) -> SessionContext:
         """
@@ -161,34 +227,44 @@ class SessionManager:
         Get current session context
         """
         try:
-            session_json = await self.redis.get(f"{self.session_prefix}:{session_id}:context")
-            if session_json:
-                session_data = json.loads(session_json)
+            try:
+                session_data = _decode_hash(await self.redis.hgetall(self.context_key(session_id)))
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                return await self._migrate_legacy_context(session_id)
+            if session_data:
                 return SessionContext.from_dict(session_data)
             return None
         except Exception as e:
             logger.error(f"Failed to get session context for {session_id}: {e}")
             return None
 
+    async def _migrate_legacy_context(self, session_id: str) -> Optional[SessionContext]:
+        """
+        Convert a context stored as a JSON string (before contexts were hashes)
+        """
+        session_json = await self.redis.get(self.context_key(session_id))
+        if not session_json:
+            return None
+        session_context = SessionContext.from_dict(json.loads(session_json))
+        await self._store_session_context(session_context)
+        return session_context
+
     async def update_session_context(self, session_id: str, updates: Dict[str, Any]) -> bool:
         """
         Update session context (e.g., when user selects ontology, changes project)
+
+        Only the changed fields (and last_activity) are written, so concurrent
+        updates of different fields do not overwrite each other.
         """
         try:
-            session_context = await self.get_session_context(session_id)
-            if not session_context:
-                logger.warning(f"Session {session_id} not found for context update")
-                return False
-
-            # Update fields
-            for key, value in updates.items():
-                if hasattr(session_context, key):
-                    setattr(session_context, key, value)
-
-            session_context.last_activity = datetime.now()
-
-            # Store updated context
-            await self._store_session_context(session_context)
+            if not await self._apply_context_updates(self.redis, session_id, updates):
+                # A context stored before the hash layout is converted on read
+                if not await self.get_session_context(session_id) or \
+                        not await self._apply_context_updates(self.redis, session_id, updates):
+                    logger.warning(f"Session {session_id} not found for context update")
+                    return False
 
             # Log context update event
             await self.capture_event(
@@ -204,14 +280,43 @@ class SessionManager:
             logger.error(f"Failed to update session context for {session_id}: {e}")
             return False
 
+    def context_update_args(self, updates: Dict[str, Any], prepend_document: Optional[str] = None) -> List[str]:
+        """
+        UPDATE_CONTEXT_SCRIPT arguments for the known context fields in ``updates``
+        """
+        known = {f.name for f in fields(SessionContext)}
+        args = [str(self.context_ttl), prepend_document or "", str(SessionEventProcessor.max_recent_documents)]
+        for key, value in updates.items():
+            if key in known:
+                args.extend((key, _encode_field(value)))
+        args.extend(("last_activity", datetime.now().isoformat()))
+        return args
+
+    async def _apply_context_updates(self, client, session_id: str, updates: Dict[str, Any],
+                                     prepend_document: Optional[str] = None):
+        """
+        Run the field-level update script; ``client`` may be a pipeline
+        """
+        return await self._update_context_script(
+            keys=[self.context_key(session_id)],
+            args=self.context_update_args(updates, prepend_document),
+            client=client,
+        )
+
     async def capture_event(self, session_id: str, event_type: str, event_data: Dict[str, Any]) -> bool:
         """
         Capture a session event and add to processing queue
+
+        Two round trips: one script call snapshots the context and bumps its
+        last_activity, one pipeline queues and publishes the event.
         """
         try:
             # Get current session context for snapshot
-            session_context = await self.get_session_context(session_id)
-            context_snapshot = session_context.to_dict() if session_context else {}
+            snapshot = _decode_hash(await self._touch_context_script(
+                keys=[self.context_key(session_id)],
+                args=[datetime.now().isoformat(), self.context_ttl],
+            ))
+            context_snapshot = SessionContext.from_dict(snapshot).to_dict() if snapshot else {}
 
             # Create event
             event = SessionEvent(
@@ -223,17 +328,13 @@ class SessionManager:
                 event_data=event_data,
                 context_snapshot=context_snapshot
             )
+            event_json = json.dumps(event.to_dict())
 
-            # Add to Redis queue for processing
-            await self.redis.lpush(self.event_queue, json.dumps(event.to_dict()))
-
-            # Also publish for real-time DAS monitoring
-            await self.redis.publish(f"das_watch:{session_id}", json.dumps(event.to_dict()))
-
-            # Update session last activity
-            if session_context:
-                session_context.last_activity = datetime.now()
-                await self._store_session_context(session_context)
+            # Queue for processing and publish for real-time DAS monitoring
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.lpush(self.event_queue, event_json)
+                pipe.publish(f"das_watch:{session_id}", event_json)
+                await pipe.execute()
 
             logger.debug(f"Captured event {event_type} for session {session_id}")
             return True
@@ -244,14 +345,14 @@ class SessionManager:
 
     async def _store_session_context(self, context: SessionContext):
         """
-        Store session context in Redis as JSON string
+        Store session context in Redis as a hash
         """
-        context_json = json.dumps(context.to_dict())
-        await self.redis.set(
-            f"{self.session_prefix}:{context.session_id}:context",
-            context_json,
-            ex=86400  # 24 hour expiration
-        )
+        key = self.context_key(context.session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=context.to_hash())
+            pipe.expire(key, self.context_ttl)
+            await pipe.execute()
 
     async def get_session_events(self, session_id: str, limit: int = 50) -> List[SessionEvent]:
         """
@@ -577,12 +678,21 @@ class SessionManager:
 class SessionEventProcessor:
     """
     Processes session events from Redis queue
+
+    Events are drained in batches: a blocking pop waits for the first event,
+    the rest of the batch is popped in the same loop iteration, and all
+    resulting writes go out in a single pipeline.
     """
 
+    max_events_per_session = 100
+    max_recent_documents = 10
+    opportunity_ttl = 300  # 5 min expiry
+
     def __init__(self, redis_client, session_manager):
         self.redis = redis_client
         self.session_manager = session_manager
         self.event_queue = "session_events"
+        self.batch_size = max(1, getattr(session_manager.settings, 'session_event_batch_size', 100))
 
     async def start_processing(self):
         """
@@ -592,51 +702,88 @@ class SessionEventProcessor:
 
         while True:
             try:
-                # Blocking pop from queue (waits for events)
-                event_data = await self.redis.brpop(self.event_queue, timeout=1)
-
-                if event_data:
-                    event_json = event_data[1]
-                    event_dict = json.loads(event_json)
-                    event = SessionEvent.from_dict(event_dict)
-
-                    # Process the event
-                    await self._process_event(event)
+                batch = await self._next_batch()
+                if batch:
+                    await self._process_batch(batch)
 
             except Exception as e:
                 logger.error(f"Error processing session event: {e}")
                 await asyncio.sleep(1)
 
-    async def _process_event(self, event: SessionEvent):
+    async def _next_batch(self) -> List[SessionEvent]:
         """
-        Process individual session event
+        Wait for the next event, then take whatever else is queued (up to the batch size)
         """
-        try:
-            # Store event in session history
-            await self.redis.lpush(
-                f"session:{event.session_id}:events",
-                json.dumps(event.to_dict())
-            )
+        # Blocking pop from queue (waits for events)
+        event_data = await self.redis.brpop(self.event_queue, timeout=1)
+        if not event_data:
+            return []
 
-            # Keep only last 100 events per session
-            await self.redis.ltrim(f"session:{event.session_id}:events", 0, 99)
+        raw_events = [event_data[1]]
+        if self.batch_size > 1:
+            raw_events.extend(await self.redis.rpop(self.event_queue, self.batch_size - 1) or [])
 
-            # Update session context based on event
-            await self._update_context_from_event(event)
+        events = []
+        for event_json in raw_events:
+            try:
+                events.append(SessionEvent.from_dict(json.loads(event_json)))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Dropping malformed session event: {e}")
+        return events
 
-            # Check for DAS intervention opportunities
-            await self._check_das_opportunities(event)
+    async def _process_event(self, event: SessionEvent):
+        """
+        Process individual session event
+        """
+        await self._process_batch([event])
 
-            logger.debug(f"Processed event {event.event_type} for session {event.session_id}")
+    async def _process_batch(self, events: List[SessionEvent]):
+        """
+        Apply a batch of events in one pipeline: history, context and DAS opportunities
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for event in events:
+                    history_key = f"session:{event.session_id}:events"
+                    # Store event in session history, keeping only the last 100 events per session
+                    pipe.lpush(history_key, json.dumps(event.to_dict()))
+                    pipe.ltrim(history_key, 0, self.max_events_per_session - 1)
+
+                    # Update session context based on event
+                    updates, document_id = self._context_updates_for_event(event)
+                    if updates or document_id:
+                        await self.session_manager._apply_context_updates(
+                            pipe, event.session_id, updates, prepend_document=document_id
+                        )
+
+                    # Store opportunities for DAS to present
+                    opportunities = self._das_opportunities_for_event(event)
+                    if opportunities:
+                        opportunities_key = f"das:{event.session_id}:opportunities"
+                        pipe.lpush(opportunities_key, *[json.dumps(o) for o in opportunities])
+                        pipe.expire(opportunities_key, self.opportunity_ttl)
+
+                results = await pipe.execute(raise_on_error=False)
+
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Session event write failed: {result}")
+
+            logger.debug(f"Processed {len(events)} session events")
 
         except Exception as e:
-            logger.error(f"Failed to process event {event.event_id}: {e}")
+            logger.error(f"Failed to process {len(events)} session events: {e}")
 
-    async def _update_context_from_event(self, event: SessionEvent):
+    def _context_updates_for_event(self, event: SessionEvent) -> Tuple[Dict[str, Any], Optional[str]]:
         """
-        Update session context based on event type
+        Context field updates implied by an event, plus a document id to add to recent_documents
+
+        Updates are written directly rather than through
+        ``SessionManager.update_session_context`` so that processing an event
+        does not queue another (context_update) event.
         """
         updates = {}
+        document_id = None
 
         if event.event_type == "ontology_selected":
             updates["active_ontology"] = event.event_data.get("ontology_id")
@@ -645,20 +792,14 @@ class SessionEventProcessor:
             updates["project_id"] = event.event_data.get("project_id")
 
         elif event.event_type == "workbench_changed":
-            updates["current_workbench"] = event.event_data.get("workbench")
+            updates["current_workbench"] = event.event_data.get("new_workbench") or event.event_data.get("workbench")
 
         elif event.event_type == "document_uploaded":
-            # Add to recent documents list
-            session_context = await self.session_manager.get_session_context(event.session_id)
-            if session_context:
-                recent_docs = session_context.recent_documents or []
-                recent_docs.insert(0, event.event_data.get("document_id"))
-                updates["recent_documents"] = recent_docs[:10]  # Keep last 10
+            document_id = event.event_data.get("document_id")
 
-        if updates:
-            await self.session_manager.update_session_context(event.session_id, updates)
+        return {k: v for k, v in updates.items() if v is not None}, document_id
 
-    async def _check_das_opportunities(self, event: SessionEvent):
+    def _das_opportunities_for_event(self, event: SessionEvent) -> List[Dict[str, Any]]:
         """
         Check if DAS should provide proactive assistance based on this event
         """
@@ -687,13 +828,7 @@ class SessionEventProcessor:
                     "confidence": 0.7
                 })
 
-        # Store opportunities for DAS to present
-        for opportunity in opportunities:
-            await self.redis.lpush(
-                f"das:{event.session_id}:opportunities",
-                json.dumps(opportunity)
-            )
-            await self.redis.expire(f"das:{event.session_id}:opportunities", 300)  # 5 min expiry
+        return opportunities
 
 
 # Common event types that should be captured
@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Tuple, Optional
 import httpx
 from urllib.parse import quote
 
+from .fuseki_gateway import get_fuseki_gateway
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,7 @@ class SPARQLRunner:
         # Note: fuseki_url from Settings already includes dataset (e.g., "http://localhost:3030/odras")
         self.query_url = f"{self.fuseki_url}/query"
         self.update_url = f"{self.fuseki_url}/update"
+        self.fuseki = get_fuseki_gateway(self.fuseki_url)
         
     def run_select_in_graph(self, graph_iri: str, sparql_template: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -220,22 +223,8 @@ class SPARQLRunner:
             {"success": bool, "data": dict or None, "error": str or None}
         """
         try:
-            headers = {
-                "Accept": "application/sparql-results+json",
-                "Content-Type": "application/sparql-query"
-            }
-            
-            # Use synchronous httpx for simplicity (can be made async later)
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.query_url,
-                    content=sparql.encode('utf-8'),
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                result_data = response.json()
-                return {"success": True, "data": result_data, "error": None}
+            result_data = self.fuseki.query(sparql)
+            return {"success": True, "data": result_data, "error": None}
                 
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP {e.response.status_code}: {e.response.text}"
@@ -375,20 +364,10 @@ class SPARQLRunner:
             # SPARQL UPDATE to create empty named graph
             update_query = f"INSERT DATA {{ GRAPH <{graph_iri}> {{ }} }}"
             
-            headers = {
-                "Content-Type": "application/sparql-update"
-            }
+            self.fuseki.update(update_query)
+            
+            return {"success": True, "error": None}
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.update_url,
-                    content=update_query.encode('utf-8'),
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                return {"success": True, "error": None}
-                
         except Exception as e:
             error_msg = f"Failed to create named graph: {str(e)}"
             logger.error(error_msg)
@@ -408,20 +387,10 @@ class SPARQLRunner:
             # SPARQL UPDATE to drop named graph
             update_query = f"DROP GRAPH <{graph_iri}>"
             
-            headers = {
-                "Content-Type": "application/sparql-update"
-            }
+            self.fuseki.update(update_query)
+            
+            return {"success": True, "error": None}
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.update_url,
-                    content=update_query.encode('utf-8'),
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                return {"success": True, "error": None}
-                
         except Exception as e:
             error_msg = f"Failed to drop named graph: {str(e)}"
             logger.error(error_msg)
@@ -454,24 +423,14 @@ class SPARQLRunner:
             }}
             """
             
-            headers = {
-                "Content-Type": "application/sparql-update"
-            }
+            self.fuseki.update(update_query)
+            
+            # Count triples in target graph to verify
+            count_result = self.count_triples_in_graph(target_iri)
+            triples_copied = count_result.get("count", 0) if count_result["success"] else None
+            
+            return {"success": True, "error": None, "triples_copied": triples_copied}
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.update_url,
-                    content=update_query.encode('utf-8'),
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                # Count triples in target graph to verify
-                count_result = self.count_triples_in_graph(target_iri)
-                triples_copied = count_result.get("count", 0) if count_result["success"] else None
-                
-                return {"success": True, "error": None, "triples_copied": triples_copied}
-                
         except Exception as e:
             error_msg = f"Failed to clone named graph: {str(e)}"
             logger.error(error_msg)
@@ -578,20 +537,10 @@ class SPARQLRunner:
             }}
             """
             
-            headers = {
-                "Content-Type": "application/sparql-update"
-            }
+            self.fuseki.update(update_query)
+            
+            return {"success": True, "error": None}
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.update_url,
-                    content=update_query.encode('utf-8'),
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                return {"success": True, "error": None}
-                
         except Exception as e:
             error_msg = f"Failed to insert sample triples: {str(e)}"
             logger.error(error_msg)
@@ -12,13 +12,14 @@ This fixes the violation where thread_data and searchable_text were stored
 in vector payloads, breaking SQL-first principles.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
 from backend.db.event_queries import (
-    create_event_tables, insert_project_thread, insert_project_event,
+    create_event_tables, insert_project_thread, insert_project_event, insert_project_events_bulk,
     insert_thread_conversation, get_project_thread_by_id, get_project_thread_by_project_id,
     get_events_by_ids, get_recent_events, get_conversation_history
 )
@@ -176,6 +177,70 @@ class SqlFirstThreadManager:
             logger.error(f"Failed to capture event: {e}")
             raise
 
+    async def capture_events_bulk(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Capture a batch of project events in one SQL transaction.
+
+        Each event dict has the capture_event arguments (plus an optional
+        deterministic 'event_id' for idempotent redelivery). The insert runs
+        off the event loop, and dual-write embeds all summaries in one call.
+        """
+        if not events:
+            return []
+
+        rows = []
+        for event in events:
+            row = dict(event)
+            row["semantic_summary"] = self._create_event_summary(row["event_type"], row.get("event_data") or {})
+            rows.append(row)
+
+        def _insert():
+            conn = self.db_service._conn()
+            try:
+                return insert_project_events_bulk(conn, rows)
+            finally:
+                self.db_service._return(conn)
+
+        inserted_ids = await asyncio.to_thread(_insert)
+
+        dual_write = getattr(self.settings, 'rag_dual_write', 'true').lower() == 'true'
+        if dual_write and inserted_ids:
+            inserted = set(inserted_ids)
+            await self._create_event_vectors([row for row in rows if row.get("event_id") in inserted])
+
+        logger.debug(f"Bulk captured {len(inserted_ids)} events")
+        return inserted_ids
+
+    async def _create_event_vectors(self, rows: List[Dict[str, Any]]):
+        """Create IDs-only event vectors for a batch with a single embedding call"""
+        if not rows:
+            return
+        try:
+            embeddings = await asyncio.to_thread(
+                self.embedding_service.generate_embeddings,
+                [row["semantic_summary"] for row in rows]
+            )
+            created_at = datetime.now().isoformat()
+            vector_data = [
+                {
+                    "id": row["event_id"],
+                    "vector": embedding,
+                    "payload": {
+                        "event_id": row["event_id"],
+                        "project_thread_id": row["project_thread_id"],
+                        "project_id": row["project_id"],
+                        "event_type": row["event_type"],
+                        "created_at": created_at,
+                        "sql_first": True,
+                    }
+                }
+                for row, embedding in zip(rows, embeddings)
+            ]
+            await asyncio.to_thread(self.qdrant.store_vectors, self.events_collection, vector_data)
+        except Exception as e:
+            logger.error(f"Failed to create event vectors for batch: {e}")
+            # Don't fail the batch if vector storage fails - SQL is source of truth
+
     async def _create_thread_vector(
         self,
         project_thread_id: str,
@@ -816,9 +881,7 @@ class SqlFirstThreadManager:
                         onto_label = onto_row[1]
 
                         # Simple SPARQL query to get classes
-                        import requests
-                        from backend.services.config import Settings
-                        settings = Settings()
+                        from backend.services.fuseki_gateway import get_fuseki_gateway
 
                         sparql_query = f"""
                         PREFIX owl: <http://www.w3.org/2002/07/owl#>
@@ -831,32 +894,22 @@ class SqlFirstThreadManager:
                         }}
                         """
 
-                        fuseki_url = f"{settings.fuseki_url}/query"
-                        response = requests.post(
-                            fuseki_url,
-                            data={"query": sparql_query},
-                            headers={"Accept": "application/json"},
-                            auth=(settings.fuseki_user, settings.fuseki_password) if settings.fuseki_user else None,
-                            timeout=5
-                        )
-
-                        if response.status_code == 200:
-                            sparql_result = response.json()
-                            bindings = sparql_result.get("results", {}).get("bindings", [])
+                        sparql_result = get_fuseki_gateway().query(sparql_query, timeout=5)
+                        bindings = sparql_result.get("results", {}).get("bindings", [])
 
-                            for binding in bindings:
-                                class_uri = binding.get("class", {}).get("value", "")
-                                class_label = binding.get("label", {}).get("value", "")
+                        for binding in bindings:
+                            class_uri = binding.get("class", {}).get("value", "")
+                            class_label = binding.get("label", {}).get("value", "")
 
-                                # Extract class name from URI
-                                class_name = class_uri.split("#")[-1] if "#" in class_uri else class_uri.split("/")[-1]
+                            # Extract class name from URI
+                            class_name = class_uri.split("#")[-1] if "#" in class_uri else class_uri.split("/")[-1]
 
-                                metadata["classes"].append({
-                                    "class_name": class_name,
-                                    "class_label": class_label or class_name,
-                                    "class_uri": class_uri,
-                                    "ontology": onto_label
-                                })
+                            metadata["classes"].append({
+                                "class_name": class_name,
+                                "class_label": class_label or class_name,
+                                "class_uri": class_uri,
+                                "ontology": onto_label
+                            })
 
                     except Exception as e:
                         logger.warning(f"Failed to get classes for ontology {onto_row[0]}: {e}")
@@ -15,14 +15,12 @@ OpenSearch is synced from Postgres for reliable keyword search.
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import asyncio
-import threading
 
 from backend.db.queries import insert_chunk, insert_chat, now_utc
 from backend.services.embedding_service import EmbeddingService
 from backend.services.qdrant_service import QdrantService
 from backend.services.config import Settings
-from backend.rag.storage.text_search_factory import create_text_search_store
+from backend.rag.storage.opensearch_bulk_writer import get_background_bulk_writer
 
 logger = logging.getLogger(__name__)
 
@@ -42,18 +40,19 @@ class RAGStoreService:
         self.embedding_service = EmbeddingService(settings)
         self.qdrant_service = QdrantService(settings)
 
-        # Initialize OpenSearch text search store if enabled
-        self.text_search_store = None
+        # Shared background bulk writer for OpenSearch keyword indexing, if enabled
+        self.opensearch_writer = None
         opensearch_enabled = getattr(self.settings, "opensearch_enabled", "false").lower() == "true"
         if opensearch_enabled:
             try:
-                self.text_search_store = create_text_search_store(self.settings)
-                if self.text_search_store:
-                    logger.info("OpenSearch text search store initialized for keyword search")
+                writer = get_background_bulk_writer(self.settings)
+                if writer.available:
+                    self.opensearch_writer = writer
+                    logger.info("OpenSearch bulk writer attached for keyword search")
                 else:
                     logger.warning("OpenSearch enabled but store creation failed")
             except Exception as e:
-                logger.warning(f"Failed to initialize OpenSearch store: {e}")
+                logger.warning(f"Failed to initialize OpenSearch writer: {e}")
 
         # Default embedding model (matches ODRAS standard)
         self.default_embedding_model = "all-MiniLM-L6-v2"
@@ -363,74 +362,32 @@ class RAGStoreService:
         end: Optional[int] = None,
     ):
         """
-        Asynchronously index a chunk in OpenSearch (fire-and-forget).
-        
+        Queue a chunk for OpenSearch indexing (fire-and-forget).
+
         This is called after successful Postgres write to keep OpenSearch in sync.
-        Non-blocking: failures are logged but don't affect the transaction.
+        Non-blocking: the background bulk writer batches and retries the write,
+        and failures are logged but don't affect the transaction.
         """
-        if not self.text_search_store:
+        if not self.opensearch_writer:
             return
-        
-        # Create async task (fire-and-forget)
-        try:
-            # Create a coroutine for the async indexing
-            async def _index_async():
-                try:
-                    # Ensure index exists
-                    await self.text_search_store.ensure_index("knowledge_chunks")
-                    
-                    # Prepare document for OpenSearch
-                    document = {
-                        "chunk_id": chunk_id,
-                        "original_chunk_id": chunk_id,  # For matching with Qdrant results
-                        "content": text,  # Full text for keyword search
-                        "text": text,  # Alias for content
-                        "title": "",  # Can be extracted from document metadata if available
-                        "project_id": project_id,
-                        "asset_id": doc_id,
-                        "doc_id": doc_id,
-                        "chunk_index": idx,
-                        "version": version,
-                        "page": page,
-                        "start_char": start,
-                        "end_char": end,
-                        "document_type": "document",
-                        "created_at": now_utc().isoformat(),
-                    }
-                    
-                    # Index document
-                    success = await self.text_search_store.index_document(
-                        index="knowledge_chunks",
-                        document_id=chunk_id,
-                        document=document,
-                    )
-                    
-                    if success:
-                        logger.debug(f"Indexed chunk {chunk_id} in OpenSearch")
-                    else:
-                        logger.warning(f"Failed to index chunk {chunk_id} in OpenSearch")
-                        
-                except Exception as e:
-                    logger.error(f"Error indexing chunk {chunk_id} in OpenSearch: {e}", exc_info=True)
-            
-            # Schedule the async task in a background thread (fire-and-forget)
-            def run_in_thread():
-                try:
-                    # Create new event loop for this thread
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        new_loop.run_until_complete(_index_async())
-                    finally:
-                        new_loop.close()
-                except Exception as e:
-                    logger.error(f"Error in OpenSearch indexing thread: {e}")
-            
-            thread = threading.Thread(target=run_in_thread, daemon=True)
-            thread.start()
-                
-        except Exception as e:
-            logger.warning(f"Failed to schedule OpenSearch indexing for chunk {chunk_id}: {e}")
+
+        self.opensearch_writer.submit("knowledge_chunks", [{
+            "chunk_id": chunk_id,
+            "original_chunk_id": chunk_id,  # For matching with Qdrant results
+            "content": text,  # Full text for keyword search
+            "text": text,  # Alias for content
+            "title": "",  # Can be extracted from document metadata if available
+            "project_id": project_id,
+            "asset_id": doc_id,
+            "doc_id": doc_id,
+            "chunk_index": idx,
+            "version": version,
+            "page": page,
+            "start_char": start,
+            "end_char": end,
+            "document_type": "document",
+            "created_at": now_utc().isoformat(),
+        }])
 
     def _bulk_index_chunks_in_opensearch_async(
         self,
@@ -441,84 +398,45 @@ class RAGStoreService:
         version: int,
     ):
         """
-        Asynchronously bulk index chunks in OpenSearch (fire-and-forget).
-        
+        Queue chunks for OpenSearch bulk indexing (fire-and-forget).
+
         This is called after successful bulk Postgres write to keep OpenSearch in sync.
         Non-blocking: failures are logged but don't affect the transaction.
         """
-        if not self.text_search_store:
+        if not self.opensearch_writer:
             return
-        
+
         if not chunk_ids or not chunks_data:
             return
-        
-        # Create async task (fire-and-forget)
-        try:
-            async def _bulk_index_async():
-                try:
-                    # Ensure index exists
-                    await self.text_search_store.ensure_index("knowledge_chunks")
-                    
-                    # Prepare documents for bulk indexing
-                    documents = []
-                    for chunk_id, chunk_data in zip(chunk_ids, chunks_data):
-                        document = {
-                            "chunk_id": chunk_id,
-                            "original_chunk_id": chunk_id,  # For matching with Qdrant results
-                            "content": chunk_data.get("text", ""),  # Full text for keyword search
-                            "text": chunk_data.get("text", ""),  # Alias for content
-                            "title": "",  # Can be extracted from document metadata if available
-                            "project_id": project_id,
-                            "asset_id": doc_id,
-                            "doc_id": doc_id,
-                            "chunk_index": chunk_data.get("index", 0),
-                            "version": version,
-                            "page": chunk_data.get("page"),
-                            "start_char": chunk_data.get("start"),
-                            "end_char": chunk_data.get("end"),
-                            "document_type": "document",
-                            "created_at": now_utc().isoformat(),
-                        }
-                        documents.append(document)
-                    
-                    # Bulk index documents
-                    success = await self.text_search_store.bulk_index(
-                        index="knowledge_chunks",
-                        documents=documents,
-                    )
-                    
-                    if success:
-                        logger.info(f"Bulk indexed {len(documents)} chunks in OpenSearch")
-                    else:
-                        logger.warning(f"Failed to bulk index {len(documents)} chunks in OpenSearch")
-                        
-                except Exception as e:
-                    logger.error(f"Error bulk indexing chunks in OpenSearch: {e}", exc_info=True)
-            
-            # Schedule the async task in a background thread (fire-and-forget)
-            def run_in_thread():
-                try:
-                    # Create new event loop for this thread
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        new_loop.run_until_complete(_bulk_index_async())
-                    finally:
-                        new_loop.close()
-                except Exception as e:
-                    logger.error(f"Error in OpenSearch bulk indexing thread: {e}")
-            
-            thread = threading.Thread(target=run_in_thread, daemon=True)
-            thread.start()
-                
-        except Exception as e:
-            logger.warning(f"Failed to schedule OpenSearch bulk indexing: {e}")
+
+        created_at = now_utc().isoformat()
+        documents = [
+            {
+                "chunk_id": chunk_id,
+                "original_chunk_id": chunk_id,  # For matching with Qdrant results
+                "content": chunk_data.get("text", ""),  # Full text for keyword search
+                "text": chunk_data.get("text", ""),  # Alias for content
+                "title": "",  # Can be extracted from document metadata if available
+                "project_id": project_id,
+                "asset_id": doc_id,
+                "doc_id": doc_id,
+                "chunk_index": chunk_data.get("index", 0),
+                "version": version,
+                "page": chunk_data.get("page"),
+                "start_char": chunk_data.get("start"),
+                "end_char": chunk_data.get("end"),
+                "document_type": "document",
+                "created_at": created_at,
+            }
+            for chunk_id, chunk_data in zip(chunk_ids, chunks_data)
+        ]
+        self.opensearch_writer.submit("knowledge_chunks", documents)
 
     def get_service_info(self) -> Dict[str, Any]:
         """Get information about the RAG store service configuration."""
         dual_write = getattr(self.settings, 'rag_dual_write', 'true').lower() == 'true'
         sql_read_through = getattr(self.settings, 'rag_sql_read_through', 'true').lower() == 'true'
-        opensearch_enabled = self.text_search_store is not None
+        opensearch_enabled = self.opensearch_writer is not None
 
         return {
             "service": "RAGStoreService",
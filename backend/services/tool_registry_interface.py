@@ -137,6 +137,7 @@ class ToolRegistryInterface(ABC):
         capability: Optional[str] = None,
         tags: Optional[List[str]] = None,
         created_by: Optional[str] = None,
+        query: Optional[str] = None,
     ) -> List[ToolMetadata]:
         """
         Find tools matching criteria.
@@ -148,6 +149,7 @@ class ToolRegistryInterface(ABC):
             capability: Filter by capability
             tags: Filter by tags (all must match)
             created_by: Filter by creator
+            query: Text matched (partially) against name or description
             
         Returns:
             List of matching ToolMetadata objects
@@ -3,12 +3,22 @@ Vector/SQL Sync Monitoring Service
 
 Prevents and detects vector store desynchronization issues that can break DAS functionality.
 Implements monitoring, health checks, and recovery tools for dual-storage RAG systems.
+
+Vector counts come from Qdrant's exact filtered count. Chunk consistency is
+checked by hashing chunk ids into buckets and comparing a (count, checksum) per
+bucket between doc_chunk (aggregated in Postgres) and the collection's point
+ids (scrolled without payloads); only the ids of buckets that differ are
+fetched from SQL, which yields exactly the missing and orphaned ids. Repair
+re-embeds missing chunks in batches and upserts each batch in one call, paced
+to a chunks/second limit.
 """
 
 import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 
 from .config import Settings
 from .db import DatabaseService
@@ -17,6 +27,23 @@ from .embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# Bucket and checksum term of a chunk id, computed in Postgres the same way
+# chunk_bucket() computes them in Python (two disjoint 32-bit slices of md5)
+_BUCKET_SQL = "mod(('x' || lpad(substr(md5(dc.chunk_id), 1, 8), 16, '0'))::bit(64)::bigint, %(buckets)s)"
+_TERM_SQL = "('x' || lpad(substr(md5(dc.chunk_id), 9, 8), 16, '0'))::bit(64)::bigint"
+
+# Embedding model each chunk collection was written with (see RAGStoreService)
+CHUNK_COLLECTION_MODELS = {
+    "knowledge_chunks": "all-MiniLM-L6-v2",
+    "knowledge_chunks_768": "all-mpnet-base-v2",
+}
+
+
+def chunk_bucket(chunk_id: str, buckets: int) -> Tuple[int, int]:
+    """(bucket, checksum term) of a chunk id"""
+    digest = hashlib.md5(chunk_id.encode("utf-8")).hexdigest()
+    return int(digest[:8], 16) % buckets, int(digest[8:16], 16)
+
 
 class VectorSQLSyncMonitor:
     """
@@ -26,11 +53,18 @@ class VectorSQLSyncMonitor:
     that causes DAS to return "no information available" despite having data.
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, db_service: Optional[DatabaseService] = None,
+                 qdrant_service: Optional[QdrantService] = None,
+                 embedding_service: Optional[EmbeddingService] = None):
         self.settings = settings
-        self.db_service = DatabaseService(settings)
-        self.qdrant_service = QdrantService(settings)
-        self.embedding_service = EmbeddingService(settings)
+        self.db_service = db_service or DatabaseService(settings)
+        self.qdrant_service = qdrant_service or QdrantService(settings)
+        self.embedding_service = embedding_service or EmbeddingService(settings)
+
+        self.checksum_buckets = getattr(settings, "vector_sync_checksum_buckets", 256)
+        self.scroll_page_size = getattr(settings, "vector_sync_scroll_page_size", 2000)
+        self.repair_batch_size = getattr(settings, "vector_sync_repair_batch_size", 128)
+        self.repair_max_chunks_per_s = getattr(settings, "vector_sync_repair_max_chunks_per_s", 200.0)
 
         # Collections to monitor
         self.collections = [
@@ -166,48 +200,203 @@ class VectorSQLSyncMonitor:
         finally:
             self.db_service._return(conn)
 
+    def _vector_filter(self, collection: str, project_id: Optional[str]):
+        """Filter selecting the points that correspond to the SQL rows counted for a collection"""
+        from qdrant_client.models import Filter, FieldCondition, IsEmptyCondition, MatchValue, PayloadField
+
+        must = []
+        if project_id:
+            must.append(FieldCondition(key="project_id", match=MatchValue(value=project_id)))
+        if collection == "project_threads":
+            # The collection also holds project event vectors; only threads map to project_thread rows
+            must.append(IsEmptyCondition(is_empty=PayloadField(key="event_id")))
+        return Filter(must=must) if must else None
+
     async def _get_vector_counts(self, collection: str, project_id: Optional[str]) -> Dict[str, int]:
         """Get vector store counts for sync comparison"""
         try:
-            # Get collection info from Qdrant
-            collection_info = self.qdrant_service.client.get_collection(collection)
-
-            if project_id:
-                # Count vectors for specific project
-                from qdrant_client.models import Filter, FieldCondition, MatchValue
-
-                filter_condition = Filter(
-                    must=[
-                        FieldCondition(
-                            key="project_id",
-                            match=MatchValue(value=project_id)
-                        )
-                    ]
-                )
-
-                # Use scroll to count with filter
-                scroll_result = self.qdrant_service.client.scroll(
-                    collection_name=collection,
-                    scroll_filter=filter_condition,
-                    limit=1,
-                    with_payload=False,
-                    with_vectors=False
-                )
-
-                # For accurate count, we'd need to scroll through all
-                # For now, estimate based on collection size
-                total_vectors = collection_info.vectors_count
-                # This is an approximation - for exact count, we'd need full scroll
-                project_vectors = total_vectors  # Simplified for now
-            else:
-                project_vectors = collection_info.vectors_count
-
-            return {"total": project_vectors}
+            result = await asyncio.to_thread(
+                self.qdrant_service.client.count,
+                collection_name=collection,
+                count_filter=self._vector_filter(collection, project_id),
+                exact=True
+            )
+            return {"total": result.count}
 
         except Exception as e:
             logger.error(f"Failed to get vector counts for {collection}: {e}")
             return {"total": 0, "error": str(e)}
 
+    def _sql_chunk_checksums(self, project_id: Optional[str]) -> Dict[int, Tuple[int, int]]:
+        """bucket -> (chunk count, checksum) over doc_chunk, aggregated in Postgres"""
+        join, where = ("JOIN doc d ON dc.doc_id = d.doc_id", "WHERE d.project_id = %(project_id)s") if project_id else ("", "")
+        conn = self.db_service._conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT {_BUCKET_SQL} AS bucket, COUNT(*), SUM({_TERM_SQL})
+                    FROM doc_chunk dc {join} {where}
+                    GROUP BY 1
+                """, {"buckets": self.checksum_buckets, "project_id": project_id})
+                return {bucket: (count, int(total)) for bucket, count, total in cur.fetchall()}
+        finally:
+            self.db_service._return(conn)
+
+    def _sql_chunk_ids(self, project_id: Optional[str], buckets: List[int]) -> Set[str]:
+        """Chunk ids in doc_chunk that fall in the given buckets"""
+        join = "JOIN doc d ON dc.doc_id = d.doc_id" if project_id else ""
+        project_clause = "AND d.project_id = %(project_id)s" if project_id else ""
+        conn = self.db_service._conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT dc.chunk_id FROM doc_chunk dc {join}
+                    WHERE {_BUCKET_SQL} = ANY(%(wanted)s) {project_clause}
+                """, {"buckets": self.checksum_buckets, "project_id": project_id, "wanted": buckets})
+                return {row[0] for row in cur.fetchall()}
+        finally:
+            self.db_service._return(conn)
+
+    def _vector_point_ids(self, collection: str, project_id: Optional[str]) -> Dict[int, Set[str]]:
+        """bucket -> point ids in the collection, scrolled without payloads or vectors"""
+        buckets: Dict[int, Set[str]] = {}
+        scroll_filter = self._vector_filter(collection, project_id)
+        offset = None
+        while True:
+            points, offset = self.qdrant_service.client.scroll(
+                collection_name=collection,
+                scroll_filter=scroll_filter,
+                limit=self.scroll_page_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False
+            )
+            for point in points:
+                point_id = str(point.id)
+                buckets.setdefault(chunk_bucket(point_id, self.checksum_buckets)[0], set()).add(point_id)
+            if offset is None:
+                return buckets
+
+    async def diff_chunk_ids(self, collection: str = "knowledge_chunks",
+                             project_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Exact comparison of doc_chunk ids with a chunk collection's point ids
+
+        Returns the ids missing from the collection and the orphaned points
+        whose chunk no longer exists in SQL. Only buckets whose (count,
+        checksum) differ are listed from SQL.
+        """
+        sql_checksums = await asyncio.to_thread(self._sql_chunk_checksums, project_id)
+        vector_buckets = await asyncio.to_thread(self._vector_point_ids, collection, project_id)
+
+        vector_checksums = {
+            bucket: (len(ids), sum(chunk_bucket(point_id, self.checksum_buckets)[1] for point_id in ids))
+            for bucket, ids in vector_buckets.items()
+        }
+        mismatched = sorted(
+            bucket for bucket in set(sql_checksums) | set(vector_checksums)
+            if sql_checksums.get(bucket) != vector_checksums.get(bucket)
+        )
+
+        missing: Set[str] = set()
+        orphaned: Set[str] = set()
+        if mismatched:
+            sql_ids = await asyncio.to_thread(self._sql_chunk_ids, project_id, mismatched)
+            vector_ids = set().union(*(vector_buckets.get(bucket, ()) for bucket in mismatched))
+            missing = sql_ids - vector_ids
+            orphaned = vector_ids - sql_ids
+
+        return {
+            "collection": collection,
+            "project_id": project_id,
+            "sql_chunks": sum(count for count, _ in sql_checksums.values()),
+            "vector_points": sum(len(ids) for ids in vector_buckets.values()),
+            "buckets": self.checksum_buckets,
+            "mismatched_buckets": len(mismatched),
+            "missing": sorted(missing),
+            "orphaned": sorted(orphaned),
+        }
+
+    def _fetch_chunks(self, chunk_ids: List[str]) -> List[Dict[str, Any]]:
+        """doc_chunk rows (with their document's project and version) for a batch of ids"""
+        conn = self.db_service._conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT dc.chunk_id, dc.text, dc.doc_id, dc.chunk_index, dc.page,
+                           dc.start_char, dc.end_char, d.project_id, d.version
+                    FROM doc_chunk dc
+                    JOIN doc d ON dc.doc_id = d.doc_id
+                    WHERE dc.chunk_id = ANY(%s)
+                """, (chunk_ids,))
+                columns = [column[0] for column in cur.description]
+                return [dict(zip(columns, row)) for row in cur.fetchall()]
+        finally:
+            self.db_service._return(conn)
+
+    async def repair_chunk_vectors(self, chunk_ids: List[str], collection: str = "knowledge_chunks",
+                                   recovery_log: Optional[List[str]] = None) -> Tuple[int, int]:
+        """
+        Re-embed and upsert the given chunks
+
+        Works through the ids in batches of vector_sync_repair_batch_size: one
+        SQL read, one batched embedding call and one bulk upsert per batch,
+        sleeping between batches to stay under vector_sync_repair_max_chunks_per_s.
+        A failed batch is logged and counted, and the repair moves on.
+
+        Returns (recovered, failed) chunk counts.
+        """
+        model = CHUNK_COLLECTION_MODELS.get(collection, "all-MiniLM-L6-v2")
+        recovered_count = 0
+        failed_count = 0
+        started = time.monotonic()
+
+        for i in range(0, len(chunk_ids), self.repair_batch_size):
+            batch = chunk_ids[i:i + self.repair_batch_size]
+            try:
+                rows = await asyncio.to_thread(self._fetch_chunks, batch)
+                if rows:
+                    embeddings = await asyncio.to_thread(
+                        self.embedding_service.generate_embeddings,
+                        [row["text"] for row in rows], model, self.repair_batch_size
+                    )
+                    recovered_at = datetime.now().isoformat()
+                    vector_data = [{
+                        "id": row["chunk_id"],
+                        "vector": embedding,
+                        "payload": {
+                            "project_id": row["project_id"],
+                            "doc_id": row["doc_id"],
+                            "chunk_id": row["chunk_id"],
+                            "chunk_index": row["chunk_index"],
+                            "version": row["version"],
+                            "page": row["page"],
+                            "start_char": row["start_char"],
+                            "end_char": row["end_char"],
+                            "created_at": recovered_at,
+                            "embedding_model": model,
+                            "sql_first": True,
+                            "asset_id": row["doc_id"],
+                            "document_type": "document",
+                            "recovered": True,
+                            "recovery_timestamp": recovered_at
+                        }
+                    } for row, embedding in zip(rows, embeddings)]
+                    await asyncio.to_thread(self.qdrant_service.store_vectors, collection, vector_data)
+                    recovered_count += len(vector_data)
+            except Exception as e:
+                failed_count += len(batch)
+                if recovery_log is not None:
+                    recovery_log.append(f"Failed to recover {len(batch)} chunks starting at {batch[0]}: {e}")
+                logger.error(f"Chunk vector repair batch failed for {collection}: {e}")
+
+            if self.repair_max_chunks_per_s:
+                ahead = (i + len(batch)) / self.repair_max_chunks_per_s - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+        return recovered_count, failed_count
+
     async def _check_das_query_health(self, project_id: Optional[str]) -> Dict[str, Any]:
         """Check if DAS queries are working (critical failure detection)"""
         if not project_id:
@@ -325,52 +514,17 @@ class VectorSQLSyncMonitor:
 
             recovery_log.append(f"Found {sql_counts['total']} SQL chunks to recover")
 
-            # Step 2: Get all chunks for project from SQL
-            conn = self.db_service._conn()
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT dc.chunk_id, dc.text, d.project_id
-                        FROM doc_chunk dc
-                        JOIN doc d ON dc.doc_id = d.doc_id
-                        WHERE d.project_id = %s
-                        ORDER BY dc.chunk_index
-                    """, (project_id,))
-
-                    chunks = cur.fetchall()
-                    recovery_log.append(f"Retrieved {len(chunks)} chunks from SQL")
-
-            finally:
-                self.db_service._return(conn)
-
-            # Step 3: Regenerate embeddings and store in vector database
-            recovered_count = 0
-            failed_count = 0
-
-            for chunk_id, text, proj_id in chunks:
-                try:
-                    # Generate embedding
-                    embedding = self.embedding_service.generate_single_embedding(text)
-
-                    # Store in vector database
-                    vector_data = [{
-                        "id": chunk_id,
-                        "vector": embedding,
-                        "payload": {
-                            "project_id": proj_id,
-                            "chunk_id": chunk_id,
-                            "created_at": datetime.now().isoformat(),
-                            "recovered": True,
-                            "recovery_timestamp": datetime.now().isoformat()
-                        }
-                    }]
-
-                    self.qdrant_service.store_vectors("knowledge_chunks", vector_data)
-                    recovered_count += 1
+            # Step 2: Find exactly which chunks have no vector
+            diff = await self.diff_chunk_ids("knowledge_chunks", project_id)
+            recovery_log.append(
+                f"{len(diff['missing'])} chunks missing from knowledge_chunks, "
+                f"{len(diff['orphaned'])} orphaned vectors ({diff['mismatched_buckets']}/{diff['buckets']} buckets differ)"
+            )
 
-                except Exception as e:
-                    recovery_log.append(f"Failed to recover chunk {chunk_id}: {e}")
-                    failed_count += 1
+            # Step 3: Re-embed the missing chunks in batches and upsert them in bulk
+            recovered_count, failed_count = await self.repair_chunk_vectors(
+                diff["missing"], "knowledge_chunks", recovery_log
+            )
 
             recovery_log.append(f"Recovery complete: {recovered_count} recovered, {failed_count} failed")
 
@@ -378,9 +532,10 @@ class VectorSQLSyncMonitor:
             final_health = await self.check_sync_health(project_id)
 
             return {
-                "success": recovered_count > 0,
+                "success": failed_count == 0 or recovered_count > 0,
                 "recovered_chunks": recovered_count,
                 "failed_chunks": failed_count,
+                "orphaned_vectors": len(diff["orphaned"]),
                 "final_sync_ratio": final_health["collections"]["knowledge_chunks"]["sync_ratio"],
                 "recovery_log": recovery_log
             }
@@ -8,6 +8,7 @@ This module handles all application startup logic including:
 - Event system setup
 - Middleware configuration
 - Router registration
+- Concurrent startup phases and readiness state
 """
 
 from .initialize import initialize_application
@@ -18,6 +19,7 @@ from .das import initialize_das
 from .events import initialize_events
 from .middleware import configure_middleware
 from .routers import register_routers
+from .phases import StartupPhase, cancel_startup, run_startup_phases, start_in_background, startup_state
 
 __all__ = [
     "initialize_application",
@@ -28,4 +30,9 @@ __all__ = [
     "initialize_events",
     "configure_middleware",
     "register_routers",
+    "StartupPhase",
+    "run_startup_phases",
+    "start_in_background",
+    "cancel_startup",
+    "startup_state",
 ]
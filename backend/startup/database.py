@@ -4,6 +4,7 @@ Database initialization module.
 Handles database schema verification and setup.
 """
 
+import asyncio
 import logging
 
 from ..services.config import Settings
@@ -26,14 +27,15 @@ async def initialize_database(settings: Settings):
     
     try:
         from ..services.db import DatabaseService
-        db = DatabaseService(settings)
+        # Pool creation and DDL block; keep them off the loop so other phases proceed
+        db = await asyncio.to_thread(DatabaseService, settings)
         print(f"✅ Database connected to {settings.postgres_host}:{settings.postgres_port}/{settings.postgres_database}")
         logger.info(f"Database connected successfully to {settings.postgres_host}:{settings.postgres_port}/{settings.postgres_database}")
         
         print("🔥 Step 2.1: Verifying RAG SQL-first tables...")
         logger.info("🔧 Verifying RAG SQL-first tables...")
         from ..db.init import ensure_rag_schema_from_settings
-        if ensure_rag_schema_from_settings(settings):
+        if await asyncio.to_thread(ensure_rag_schema_from_settings, settings):
             print("✅ RAG SQL-first tables verified/created")
         else:
             print("ℹ️  RAG SQL-first tables already exist (from schema)")
@@ -50,3 +50,14 @@ async def initialize_events(settings: Settings, redis_client) -> None:
     except Exception as e:
         logger.error(f"Failed to initialize SQL-first event capture: {e}")
         print(f"⚠️  SQL-first event capture failed: {e}")
+
+    try:
+        # Stream consumers persist queued events in batches
+        from ..services.eventcapture2_worker import start_eventcapture2_worker
+
+        await start_eventcapture2_worker(redis_client, settings)
+        print("✅ EventCapture2 stream worker started")
+        logger.info("✅ EventCapture2 stream worker started")
+    except Exception as e:
+        logger.error(f"Failed to start EventCapture2 stream worker: {e}")
+        print(f"⚠️  EventCapture2 stream worker failed to start: {e}")
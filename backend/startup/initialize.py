@@ -1,84 +1,128 @@
 """
 Main application initialization orchestrator.
 
-Coordinates all startup activities in the correct order.
+Declares the startup phases and their dependencies; ``phases.py`` runs
+independent phases concurrently.
 """
 
 import logging
+from typing import List
 
 from fastapi import FastAPI
 
 from ..services.config import Settings
 from .database import initialize_database
-from .services import initialize_services
+from .services import initialize_redis, initialize_services
 from .training_data import initialize_training_data
 from .das import initialize_das
 from .events import initialize_events
 from .middleware import configure_middleware
+from .phases import StartupPhase, run_startup_phases
 
 logger = logging.getLogger(__name__)
 
 
+async def start_indexing_worker(settings: Settings, rag_service, db) -> None:
+    """Start the background indexing worker (if enabled)."""
+    indexing_worker_enabled = getattr(settings, 'indexing_worker_enabled', 'true').lower() == 'true'
+    if indexing_worker_enabled and hasattr(rag_service, 'indexing_service') and rag_service.indexing_service:
+        from ..services.indexing_worker import IndexingWorker
+        indexing_worker = IndexingWorker(settings, rag_service.indexing_service, db)
+        await indexing_worker.start()
+        logger.info("Indexing worker started")
+        print("✅ Indexing worker started")
+
+
+async def start_extraction_jobs(settings: Settings, db) -> None:
+    """Start the requirements extraction job manager and resume interrupted jobs."""
+    from ..services.requirements_extraction_jobs import get_extraction_job_manager
+    await get_extraction_job_manager(settings, db).start()
+    logger.info("Requirements extraction jobs started")
+
+
+def build_startup_phases(settings: Settings) -> List[StartupPhase]:
+    """
+    Startup dependency graph.
+
+    Critical phases gate readiness:
+        database, redis (no dependencies)
+        middleware (redis); services, events (database, redis); das (services)
+    Warm-up phases run after the app is serving:
+        training_data (database), indexing_worker (services), extraction_jobs (database)
+    """
+    from ..api.core import set_db_instance
+
+    async def database(results):
+        db = await initialize_database(settings)
+        set_db_instance(db)  # Set the global db instance for core API
+        return db
+
+    async def redis_client(results):
+        return await initialize_redis(settings)
+
+    async def middleware(results):
+        configure_middleware(results["redis"])
+
+    async def services(results):
+        rag_service, _ = await initialize_services(settings, results["database"], results["redis"])
+        return rag_service
+
+    async def events(results):
+        await initialize_events(settings, results["redis"])
+
+    async def das(results):
+        # DAS builds its own service instances; it only needs the schema in place
+        await initialize_das(settings, (results["services"], results["redis"]), results["database"])
+
+    async def training_data(results):
+        await initialize_training_data(settings, results["database"])
+
+    async def indexing_worker(results):
+        await start_indexing_worker(settings, results["services"], results["database"])
+
+    async def extraction_jobs(results):
+        await start_extraction_jobs(settings, results["database"])
+
+    return [
+        StartupPhase("database", database),
+        StartupPhase("redis", redis_client),
+        StartupPhase("middleware", middleware, depends_on=("redis",)),
+        StartupPhase("services", services, depends_on=("database", "redis")),
+        StartupPhase("events", events, depends_on=("database", "redis")),
+        StartupPhase("das", das, depends_on=("services",)),
+        StartupPhase("training_data", training_data, depends_on=("database",), critical=False, in_thread=True),
+        StartupPhase("indexing_worker", indexing_worker, depends_on=("services",), critical=False),
+        StartupPhase("extraction_jobs", extraction_jobs, depends_on=("database",), critical=False),
+    ]
+
+
 async def initialize_application(app: FastAPI) -> None:
     """
     Initialize the entire ODRAS application.
-    
-    This function orchestrates all startup activities:
-    1. Load settings
-    2. Initialize database
-    3. Initialize services (RAG, Redis)
-    4. Initialize DAS
-    5. Configure middleware
-    6. Initialize event systems
-    
+
+    Runs the startup phases from ``build_startup_phases`` concurrently in
+    dependency order and returns once every critical phase is done; warm-up
+    phases keep running in the background. The app's startup hook runs this
+    through ``start_in_background``; progress is exposed through
+    ``/api/health/ready``.
+
     Args:
         app: FastAPI application instance
     """
     print("🔥 STARTUP EVENT TRIGGERED")
     logger.info("🔥 STARTUP EVENT TRIGGERED")
-    
+
     try:
         print("🔥 Step 1: Loading settings...")
         logger.info("🔥 Step 1: Loading settings...")
         settings = Settings()  # loads env
         print("✅ Settings loaded")
-        
-        # Step 2: Initialize database
-        from ..api.core import set_db_instance
-        db = await initialize_database(settings)
-        set_db_instance(db)  # Set the global db instance for core API
-        
-        # Step 6-7: Initialize services
-        rag_service, redis_client = await initialize_services(settings, db)
-        
-        # Step 7: Initialize base training data (before DAS so it can use the knowledge)
-        await initialize_training_data(settings, db)
-        
-        # Step 7.5: Initialize indexing worker (if enabled)
-        indexing_worker_enabled = getattr(settings, 'indexing_worker_enabled', 'true').lower() == 'true'
-        if indexing_worker_enabled and hasattr(rag_service, 'indexing_service') and rag_service.indexing_service:
-            try:
-                from ..services.indexing_worker import IndexingWorker
-                indexing_worker = IndexingWorker(settings, rag_service.indexing_service, db)
-                await indexing_worker.start()
-                logger.info("Indexing worker started")
-                print("✅ Indexing worker started")
-            except Exception as e:
-                logger.warning(f"Failed to start indexing worker: {e}")
-                print(f"⚠️  Indexing worker failed to start: {e}")
-        
-        # Step 8: Initialize DAS
-        await initialize_das(settings, (rag_service, redis_client), db)
-        
-        # Step 9: Configure middleware
-        configure_middleware(redis_client)
-        
-        # Step 10-11: Initialize events
-        await initialize_events(settings, redis_client)
-        
+
+        await run_startup_phases(build_startup_phases(settings))
+
         print("🎉 Application initialization complete!")
         logger.info("🎉 Application initialization complete!")
-        
+
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
@@ -0,0 +1,237 @@
+"""
+Startup phase scheduler.
+
+Runs startup phases as a dependency graph: every phase starts as soon as the
+phases it depends on have finished, so independent phases (database, Redis,
+DAS, ...) initialize concurrently instead of one after another.
+
+Critical phases gate readiness; when one fails the application stays up but
+never becomes ready. Startup runs as a tracked task (``start_in_background``)
+so the server answers liveness probes while it is in progress. Warm-up
+phases (training data, background workers) keep running after the
+application becomes ready; their failures are logged and reported.
+Per-phase timings and RSS are recorded in ``startup_state`` for the
+readiness endpoint and the startup benchmark.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PhaseFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class StartupPhase:
+    """A unit of startup work; ``run`` receives the results of completed phases."""
+
+    name: str
+    run: PhaseFunc
+    depends_on: Tuple[str, ...] = ()
+    critical: bool = True  # Gates readiness; failure aborts startup
+    in_thread: bool = False  # Run on a private event loop in a worker thread (blocking, loop-independent work)
+
+
+@dataclass
+class PhaseRecord:
+    """Outcome of one startup phase."""
+
+    name: str
+    critical: bool
+    status: str = "pending"  # pending | running | done | failed | skipped
+    started_at: Optional[float] = None
+    duration_ms: Optional[float] = None
+    rss_start_mb: Optional[float] = None
+    rss_end_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "critical": self.critical,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "rss_mb": round(self.rss_end_mb, 1) if self.rss_end_mb is not None else None,
+            "rss_delta_mb": (
+                round(self.rss_end_mb - self.rss_start_mb, 1)
+                if self.rss_end_mb is not None and self.rss_start_mb is not None else None
+            ),
+            "error": self.error,
+        }
+
+
+@dataclass
+class StartupState:
+    """Process-wide startup progress, read by the liveness/readiness endpoints."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    phases: Dict[str, PhaseRecord] = field(default_factory=dict)
+    ready: bool = False
+    failed: bool = False
+    ready_after_ms: Optional[float] = None
+    task: Optional[asyncio.Task] = None  # The startup run itself, see start_in_background
+    background: List[asyncio.Task] = field(default_factory=list)
+
+    @property
+    def warming_up(self) -> bool:
+        return any(record.status in ("pending", "running") for record in self.phases.values())
+
+    @property
+    def status(self) -> str:
+        if self.ready:
+            return "ready"
+        return "failed" if self.failed else "starting"
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "failed": self.failed,
+            "warming_up": self.warming_up,
+            "ready_after_ms": round(self.ready_after_ms, 1) if self.ready_after_ms is not None else None,
+            "rss_mb": round(current_rss_mb(), 1),
+            "phases": {name: record.to_dict() for name, record in self.phases.items()},
+        }
+
+
+startup_state = StartupState()
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _validate(phases: Sequence[StartupPhase]) -> None:
+    by_name = {phase.name: phase for phase in phases}
+    if len(by_name) != len(phases):
+        raise ValueError("Duplicate startup phase names")
+    for phase in phases:
+        for dep in phase.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Startup phase '{phase.name}' depends on unknown phase '{dep}'")
+            if phase.critical and not by_name[dep].critical:
+                raise ValueError(f"Critical phase '{phase.name}' cannot depend on warm-up phase '{dep}'")
+
+    # Kahn's algorithm to reject cycles up front instead of deadlocking
+    remaining = {phase.name: set(phase.depends_on) for phase in phases}
+    while remaining:
+        free = [name for name, deps in remaining.items() if not deps]
+        if not free:
+            raise ValueError(f"Startup phase dependency cycle among: {sorted(remaining)}")
+        for name in free:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(free)
+
+
+async def run_startup_phases(
+    phases: Sequence[StartupPhase], state: Optional[StartupState] = None
+) -> Dict[str, Any]:
+    """
+    Run ``phases`` concurrently in dependency order.
+
+    Returns once every critical phase has finished, with the results of the
+    phases completed so far. Warm-up phases continue as background tasks
+    tracked in ``state.background``.
+
+    Raises:
+        RuntimeError: If a critical phase fails.
+    """
+    state = state or startup_state
+    _validate(phases)
+
+    results: Dict[str, Any] = {}
+    done: Dict[str, asyncio.Future] = {}
+    loop = asyncio.get_running_loop()
+    for phase in phases:
+        state.phases[phase.name] = PhaseRecord(name=phase.name, critical=phase.critical)
+        done[phase.name] = loop.create_future()
+
+    async def execute(phase: StartupPhase) -> None:
+        record = state.phases[phase.name]
+        for dep in phase.depends_on:
+            if not await done[dep]:
+                record.status = "skipped"
+                record.error = f"dependency '{dep}' did not complete"
+                done[phase.name].set_result(False)
+                return
+
+        record.status = "running"
+        record.started_at = time.monotonic() - state.started_at
+        record.rss_start_mb = current_rss_mb()
+        start = time.perf_counter()
+        try:
+            if phase.in_thread:
+                result = await asyncio.to_thread(asyncio.run, phase.run(dict(results)))
+            else:
+                result = await phase.run(dict(results))
+            results[phase.name] = result
+            record.status = "done"
+        except Exception as e:
+            record.status = "failed"
+            record.error = str(e)
+            log = logger.error if phase.critical else logger.warning
+            log(f"Startup phase '{phase.name}' failed: {e}")
+        finally:
+            record.duration_ms = (time.perf_counter() - start) * 1000
+            record.rss_end_mb = current_rss_mb()
+            logger.info(f"Startup phase '{phase.name}' {record.status} in {record.duration_ms:.0f} ms")
+            done[phase.name].set_result(record.status == "done")
+
+    critical = [asyncio.create_task(execute(p), name=f"startup:{p.name}") for p in phases if p.critical]
+    state.background.extend(
+        asyncio.create_task(execute(p), name=f"warmup:{p.name}") for p in phases if not p.critical
+    )
+
+    await asyncio.gather(*critical)
+    failed = [p.name for p in phases if p.critical and state.phases[p.name].status != "done"]
+    if failed:
+        state.failed = True
+        raise RuntimeError(f"Critical startup phases did not complete: {', '.join(failed)}")
+
+    state.ready = True
+    state.ready_after_ms = (time.monotonic() - state.started_at) * 1000
+    return results
+
+
+def start_in_background(startup: Awaitable[Any], state: Optional[StartupState] = None) -> asyncio.Task:
+    """
+    Run ``startup`` (e.g. the critical phases) as a tracked task and return at once.
+
+    The application serves requests meanwhile; readiness stays false until the
+    phases complete, and an exception marks startup as failed.
+    """
+    state = state or startup_state
+
+    def finished(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            state.failed = True
+            logger.error(f"Application startup failed: {error}")
+
+    state.task = asyncio.create_task(startup, name="startup")
+    state.task.add_done_callback(finished)
+    return state.task
+
+
+async def cancel_startup(state: Optional[StartupState] = None) -> None:
+    """Cancel startup and warm-up work still running (called at shutdown)."""
+    state = state or startup_state
+    tasks = [task for task in (state.task, *state.background) if task is not None and not task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
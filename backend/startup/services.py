@@ -16,13 +16,34 @@ from ..services.indexing_service_interface import IndexingServiceInterface
 logger = logging.getLogger(__name__)
 
 
-async def initialize_services(settings: Settings, db) -> Tuple[ModularRAGService, redis.Redis]:
+async def initialize_redis(settings: Settings) -> redis.Redis:
+    """
+    Create the shared async Redis client.
+    
+    Args:
+        settings: Application settings.
+        
+    Returns:
+        Redis client (connections are opened lazily on first use).
+    """
+    print("🔥 Step 7: Connecting to Redis...")
+    logger.info("🔗 Connecting to Redis...")
+    redis_url = settings.redis_url if hasattr(settings, 'redis_url') else "redis://localhost:6379"
+    redis_client = redis.from_url(redis_url)
+    print("✅ Redis client created")
+    return redis_client
+
+
+async def initialize_services(
+    settings: Settings, db, redis_client: Optional[redis.Redis] = None
+) -> Tuple[ModularRAGService, redis.Redis]:
     """
     Initialize core application services.
     
     Args:
         settings: Application settings.
         db: Initialized DatabaseService instance.
+        redis_client: Existing Redis client to reuse; created if omitted.
         
     Returns:
         A tuple containing the ModularRAGService instance and the Redis client.
@@ -49,11 +70,8 @@ async def initialize_services(settings: Settings, db) -> Tuple[ModularRAGService
     rag_service = ModularRAGService(settings, db_service=db, indexing_service=indexing_service)
     print("✅ Modular RAG service created")
     
-    print("🔥 Step 7: Connecting to Redis...")
-    logger.info("🔗 Connecting to Redis...")
-    redis_url = settings.redis_url if hasattr(settings, 'redis_url') else "redis://localhost:6379"
-    redis_client = redis.from_url(redis_url)
-    print("✅ Redis client created")
+    if redis_client is None:
+        redis_client = await initialize_redis(settings)
     
     # Start connection pool monitoring task
     try:
@@ -5,12 +5,15 @@ Proactive worker that periodically reviews knowledge by domain, identifies
 unused/low-quality chunks, and suggests knowledge improvements to admins.
 """
 
-import json
+import asyncio
 import logging
+import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from psycopg2.extras import execute_values
+
 from ..services.proactive_workers import BaseProactiveWorker
 from ..services.config import Settings
 from ..services.db import DatabaseService
@@ -18,6 +21,92 @@ from ..services.db import DatabaseService
 logger = logging.getLogger(__name__)
 
 
+class ChunkAccessAggregator:
+    """
+    In-memory aggregator for chunk access telemetry.
+
+    ``record`` only bumps counters; ``flush`` writes the accumulated counts to
+    ``chunk_access_stats`` as one batch of atomic upsert-increments. Counts
+    recorded since the last successful flush are lost if the process dies, so
+    the flush interval is the loss window.
+    """
+
+    def __init__(self, db_service: DatabaseService, max_pending: int = 5000):
+        self.db_service = db_service
+        self.max_pending = max_pending
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._last_accessed: Dict[str, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        self.flush_requested = asyncio.Event()
+        self.metrics = {"recorded": 0, "flushed": 0, "flushes": 0, "flush_errors": 0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._counts)
+
+    def record(self, chunk_id: str, accessed_at: Optional[datetime] = None) -> bool:
+        """Count one access; returns False for ids that are not UUIDs."""
+        try:
+            chunk_id = str(uuid.UUID(str(chunk_id)))
+        except ValueError:
+            return False
+        accessed_at = accessed_at or datetime.now(timezone.utc)
+        self._counts[chunk_id] += 1
+        if chunk_id not in self._last_accessed or accessed_at > self._last_accessed[chunk_id]:
+            self._last_accessed[chunk_id] = accessed_at
+        self.metrics["recorded"] += 1
+        if len(self._counts) >= self.max_pending:
+            self.flush_requested.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write pending counts; on failure they are merged back for the next flush."""
+        async with self._flush_lock:
+            self.flush_requested.clear()
+            if not self._counts:
+                return 0
+            counts, last_accessed = self._counts, self._last_accessed
+            self._counts, self._last_accessed = defaultdict(int), {}
+
+            # Sorted so concurrent replicas lock rows in the same order
+            rows = [(chunk_id, counts[chunk_id], last_accessed[chunk_id]) for chunk_id in sorted(counts)]
+            try:
+                await asyncio.to_thread(self._write_batch, rows)
+            except Exception as e:
+                logger.warning(f"Chunk access flush failed, retrying next interval: {e}")
+                self.metrics["flush_errors"] += 1
+                for chunk_id, count, accessed_at in rows:
+                    self._counts[chunk_id] += count
+                    if chunk_id not in self._last_accessed or accessed_at > self._last_accessed[chunk_id]:
+                        self._last_accessed[chunk_id] = accessed_at
+                return 0
+
+            self.metrics["flushed"] += sum(count for _, count, _ in rows)
+            self.metrics["flushes"] += 1
+            return len(rows)
+
+    def _write_batch(self, rows: List[Tuple[str, int, datetime]]) -> None:
+        conn = self.db_service._conn()
+        try:
+            with conn.cursor() as cur:
+                # Join drops counts for chunks deleted since they were accessed
+                execute_values(cur, """
+                    INSERT INTO chunk_access_stats (chunk_id, access_count, last_accessed_at)
+                    SELECT v.chunk_id, v.access_count, v.last_accessed_at
+                    FROM (VALUES %s) AS v(chunk_id, access_count, last_accessed_at)
+                    JOIN das_knowledge_chunks c ON c.chunk_id = v.chunk_id
+                    ON CONFLICT (chunk_id) DO UPDATE SET
+                        access_count = chunk_access_stats.access_count + EXCLUDED.access_count,
+                        last_accessed_at = GREATEST(chunk_access_stats.last_accessed_at, EXCLUDED.last_accessed_at)
+                """, rows, template="(%s::uuid, %s::bigint, %s::timestamptz)", page_size=1000)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_service._return(conn)
+
+
 class KnowledgeReviewWorker(BaseProactiveWorker):
     """
     Worker that reviews knowledge quality and usage patterns.
@@ -38,6 +127,13 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
         self.unused_threshold_days = 90  # Chunks not accessed in 90 days
         self.low_quality_threshold_score = 0.3  # Low similarity scores
         self.min_access_count = 3  # Minimum access count to be considered "used"
+        
+        # Access telemetry is aggregated in memory and flushed in batches
+        self.access_flush_interval = getattr(settings, 'knowledge_access_flush_interval_s', 10.0)
+        self.access_aggregator = ChunkAccessAggregator(
+            self.db_service, max_pending=getattr(settings, 'knowledge_access_max_pending', 5000)
+        )
+        self._flush_task: Optional[asyncio.Task] = None
     
     @property
     def worker_name(self) -> str:
@@ -60,6 +156,45 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
             "knowledge.asset.uploaded",
         ]
     
+    async def start(self):
+        """Start the worker and the access telemetry flush loop."""
+        await super().start()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._access_flush_loop())
+    
+    async def stop(self):
+        """Stop the worker, flushing buffered access counts."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await super().stop()
+        await self.access_aggregator.flush()
+    
+    async def _access_flush_loop(self):
+        """Flush access counts every interval, or early when the buffer fills."""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(
+                        self.access_aggregator.flush_requested.wait(),
+                        timeout=self.access_flush_interval,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                await self.access_aggregator.flush()
+                self._status.metrics["chunk_access"] = dict(
+                    self.access_aggregator.metrics, pending=self.access_aggregator.pending
+                )
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"{self.worker_name} access flush loop error: {e}")
+                await asyncio.sleep(1)
+    
     async def _handle_event(self, event: Dict[str, Any]) -> None:
         """
         Handle knowledge-related events.
@@ -138,6 +273,9 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
         Returns:
             Dictionary mapping domain to review results
         """
+        return await self._run_blocking(self._review_by_domain_sync)
+    
+    def _review_by_domain_sync(self) -> Dict[str, Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
@@ -183,28 +321,33 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
         Returns:
             List of unused chunk dictionaries
         """
+        return await self._run_blocking(self._identify_unused_chunks_sync)
+    
+    def _identify_unused_chunks_sync(self) -> List[Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
-                # Find chunks created more than threshold days ago
-                # that haven't been accessed (we'll track access in future)
+                # Chunks older than the threshold that were never accessed, accessed
+                # too rarely, or not accessed within the threshold window
                 cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.unused_threshold_days)
                 
                 cur.execute("""
                     SELECT 
-                        chunk_id,
-                        domain,
-                        knowledge_type,
-                        created_at,
-                        token_count,
-                        metadata->>'title' as title
-                    FROM das_knowledge_chunks
-                    WHERE created_at < %s
-                    AND (metadata->>'access_count' IS NULL 
-                         OR (metadata->>'access_count')::int < %s)
-                    ORDER BY created_at ASC
+                        c.chunk_id,
+                        c.domain,
+                        c.knowledge_type,
+                        c.created_at,
+                        c.token_count,
+                        c.metadata->>'title' as title
+                    FROM das_knowledge_chunks c
+                    LEFT JOIN chunk_access_stats s ON s.chunk_id = c.chunk_id
+                    WHERE c.created_at < %s
+                    AND (s.chunk_id IS NULL
+                         OR s.access_count < %s
+                         OR s.last_accessed_at < %s)
+                    ORDER BY c.created_at ASC
                     LIMIT 100
-                """, (cutoff_date, self.min_access_count))
+                """, (cutoff_date, self.min_access_count, cutoff_date))
                 
                 rows = cur.fetchall()
                 unused_chunks = []
@@ -237,6 +380,9 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
         Returns:
             List of low-quality chunk dictionaries
         """
+        return await self._run_blocking(self._identify_low_quality_chunks_sync)
+    
+    def _identify_low_quality_chunks_sync(self) -> List[Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
@@ -283,6 +429,9 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
         Returns:
             List of knowledge gap dictionaries
         """
+        return await self._run_blocking(self._detect_knowledge_gaps_sync)
+    
+    def _detect_knowledge_gaps_sync(self) -> List[Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
@@ -386,36 +535,13 @@ class KnowledgeReviewWorker(BaseProactiveWorker):
             logger.info(f"Recommendation: {rec.get('title')} (Priority: {rec.get('priority')})")
     
     async def _track_chunk_access(self, payload: Dict[str, Any]) -> None:
-        """Track when a chunk is accessed."""
+        """Track when a chunk is accessed (buffered; flushed by the access flush loop)."""
         chunk_id = payload.get("chunk_id")
         if not chunk_id:
             return
         
-        # Update access count in metadata
-        conn = self.db_service._conn()
-        try:
-            with conn.cursor() as cur:
-                # Get current metadata
-                cur.execute("""
-                    SELECT metadata FROM das_knowledge_chunks WHERE chunk_id = %s
-                """, (chunk_id,))
-                row = cur.fetchone()
-                
-                if row and row[0]:
-                    metadata = row[0] if isinstance(row[0], dict) else {}
-                    access_count = metadata.get("access_count", 0) + 1
-                    metadata["access_count"] = access_count
-                    metadata["last_accessed"] = datetime.now(timezone.utc).isoformat()
-                    
-                    # Update metadata (convert dict to JSON string for psycopg2)
-                    cur.execute("""
-                        UPDATE das_knowledge_chunks
-                        SET metadata = %s::jsonb
-                        WHERE chunk_id = %s
-                    """, (json.dumps(metadata), chunk_id))
-                    conn.commit()
-        finally:
-            self.db_service._return(conn)
+        if not self.access_aggregator.record(chunk_id):
+            logger.debug(f"{self.worker_name} ignoring access for invalid chunk id: {chunk_id}")
     
     async def _track_chunk_creation(self, payload: Dict[str, Any]) -> None:
         """Track when a chunk is created."""
@@ -317,6 +317,9 @@ class UserActivityWorker(BaseProactiveWorker):
     
     async def _detect_struggling_users_from_db(self) -> List[Dict[str, Any]]:
         """Detect struggling users from database history."""
+        return await self._run_blocking(self._detect_struggling_users_from_db_sync)
+    
+    def _detect_struggling_users_from_db_sync(self) -> List[Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
@@ -364,6 +367,9 @@ class UserActivityWorker(BaseProactiveWorker):
         Returns:
             List of query pattern dictionaries
         """
+        return await self._run_blocking(self._analyze_query_patterns_sync)
+    
+    def _analyze_query_patterns_sync(self) -> List[Dict[str, Any]]:
         conn = self.db_service._conn()
         try:
             with conn.cursor() as cur:
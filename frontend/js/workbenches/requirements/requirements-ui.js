@@ -1021,13 +1021,26 @@ export async function startExtractionJob() {
       startBtn.textContent = 'Extracting...';
     }
 
-    const result = await ApiClient.post(`/api/requirements/projects/${projectId}/extract`, {
+    const job = await ApiClient.post(`/api/requirements/projects/${projectId}/extract`, {
       job_name: jobName,
       source_document_id: documentId,
       min_confidence: minConfidence,
       extract_constraints: extractConstraints
     });
 
+    // Extraction runs in the background; poll the job until it finishes
+    let result = job;
+    while (!['completed', 'failed', 'cancelled'].includes(result.status)) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      result = await ApiClient.get(`/api/requirements/projects/${projectId}/extraction-jobs/${job.job_id}`);
+      if (startBtn) {
+        startBtn.textContent = `Extracting... ${result.progress_percent || 0}%`;
+      }
+    }
+    if (result.status !== 'completed') {
+      throw new Error(result.error_message || `Extraction job ${result.status}`);
+    }
+
     // Close modal
     const modal = document.querySelector('.extract-modal');
     if (modal) modal.remove();
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+LLM Team Analysis Benchmark
+
+Times Monte Carlo requirement analysis (requirements x iterations x personas)
+against a fake LLM with a fixed per-call latency, so no provider is needed:
+
+  * sequential: one persona call at a time, as the runners used to loop
+  * concurrent: LLMTeam.analyze_requirements under llm_max_concurrency
+  * deterministic: the same at temperature 0, where repeated iterations are
+    served by the analysis cache
+
+Usage:
+    python scripts/benchmark_llm_team.py [--requirements 200] [--iterations 5] [--latency 0.05] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.llm_team import AnalysisCache, LLMTeam  # noqa: E402
+
+
+class FakeLLMTeam(LLMTeam):
+    def __init__(self, latency: float, concurrency: int, temperature: float):
+        settings = SimpleNamespace(llm_provider="fake", llm_model="fake", llm_max_concurrency=concurrency,
+                                   llm_analysis_temperature=temperature)
+        super().__init__(settings, cache=AnalysisCache())
+        self.latency = latency
+        self.calls = 0
+
+    async def _call_model(self, requirement_text, system_prompt, schema):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"text": requirement_text, "reviewed_by": system_prompt}
+
+
+async def run_sequential(team: FakeLLMTeam, texts, iterations: int) -> int:
+    results = 0
+    for _ in range(iterations):
+        for text in texts:
+            outputs = [await team._call_model(text, system, {}) for _, system in team.personas()]
+            team._merge_json(outputs)
+            results += 1
+    return results
+
+
+async def run_concurrent(team: FakeLLMTeam, texts, iterations: int) -> int:
+    return len([item async for item in team.analyze_requirements(texts, {}, iterations)])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    texts = [f"The system shall satisfy requirement {n}." for n in range(args.requirements)]
+    print(f"{args.requirements} requirements x {args.iterations} iterations x 2 personas, "
+          f"{args.latency * 1000:.0f} ms per call")
+
+    timings = {}
+    for name, runner, concurrency, temperature in [
+        ("sequential", run_sequential, 1, 0.2),
+        ("concurrent", run_concurrent, args.concurrency, 0.2),
+        ("deterministic", run_concurrent, args.concurrency, 0.0),
+    ]:
+        team = FakeLLMTeam(args.latency, concurrency, temperature)
+        started = time.perf_counter()
+        results = await runner(team, texts, args.iterations)
+        timings[name] = time.perf_counter() - started
+        print(f"  {name:<14} {timings[name]:8.2f}s  {results} results  {team.calls} model calls  "
+              f"speedup {timings['sequential'] / timings[name]:6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
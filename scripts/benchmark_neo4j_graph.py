@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Neo4j Knowledge Graph Write / Traversal Benchmark
+
+Loads N Chunk nodes plus a requirements traceability tree into the Neo4j
+configured in Settings (.env; docker-compose provides neo4j:5), then times:
+
+  * per-statement chunk creation (one CREATE per chunk, as create_chunk_nodes
+    used to do) on a small sample, extrapolated to N
+  * UNWIND-batched create_chunk_nodes on all N chunks
+  * batched create_relationships linking every chunk to a requirement
+  * impact_analysis from the tree roots: label-anchored, unlabelled (UNION
+    anchor) and the previous label-less anchor that scans all nodes
+  * get_graph_stats from the count store
+
+Every node created carries an id prefixed with a per-run tag and is deleted
+afterwards.
+
+Usage:
+    python scripts/benchmark_neo4j_graph.py [--chunks 100000] [--requirements 5000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.config import Settings  # noqa: E402
+from backend.services.neo4j_service import ID_LABELS, Neo4jService  # noqa: E402
+
+LEGACY_CHUNK_QUERY = """
+CREATE (c:Chunk {
+    id: $id, content: $content, chunk_type: $chunk_type, sequence_number: $sequence_number,
+    token_count: $token_count, qdrant_point_id: $qdrant_point_id, created_at: datetime()
+})
+RETURN c.id as id
+"""
+
+LEGACY_IMPACT_QUERY = """
+MATCH path = (start {id: $node_id})-[r:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..3]->(affected)
+RETURN affected, r, length(path) as depth
+ORDER BY depth
+"""
+
+
+def chunk_row(tag: str, n: int) -> dict:
+    return {
+        "id": f"{tag}-chunk-{n}",
+        "content": f"Benchmark chunk {n}: the system shall respond within {n % 500} ms.",
+        "chunk_type": "text",
+        "sequence_number": n,
+        "token_count": 16,
+        "qdrant_point_id": None,
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def cleanup(service: Neo4jService, tag: str) -> None:
+    for label in ID_LABELS:
+        while True:
+            deleted = service.execute_cypher(
+                f"MATCH (n:{label}) WHERE n.id STARTS WITH $tag "
+                "WITH n LIMIT 10000 DETACH DELETE n RETURN count(*) as deleted",
+                {"tag": tag},
+            )[0]["deleted"]
+            if not deleted:
+                break
+
+
+def main(chunks: int, requirements: int, sample: int, roots: int) -> None:
+    service = Neo4jService(Settings())
+    service.setup_schema()
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    print(f"Neo4j graph benchmark ({chunks} chunks, {requirements} requirements, tag {tag})")
+
+    try:
+        # Per-statement baseline on a sample
+        with service.driver.session() as session:
+            start = time.perf_counter()
+            for n in range(sample):
+                session.run(LEGACY_CHUNK_QUERY, **chunk_row(f"{tag}-legacy", n)).single()
+            legacy_s = time.perf_counter() - start
+        print(f"{'per-statement CREATE':<34} {sample / legacy_s:10.0f} chunks/s "
+              f"(~{legacy_s / sample * chunks:7.1f} s for {chunks})")
+
+        created, batched_s = timed(service.create_chunk_nodes, [chunk_row(tag, n) for n in range(chunks)])
+        print(f"{'UNWIND create_chunk_nodes':<34} {len(created) / batched_s:10.0f} chunks/s "
+              f"({batched_s:7.1f} s for {len(created)})")
+
+        # Requirements tree (4-way fan-out) with a component implementing each leaf
+        service.execute_cypher(
+            "UNWIND $ids AS id CREATE (:Requirement {id: id})",
+            {"ids": [f"{tag}-req-{n}" for n in range(requirements)]},
+        )
+        service.execute_cypher(
+            "UNWIND $ids AS id CREATE (:Component {id: id})",
+            {"ids": [f"{tag}-comp-{n}" for n in range(requirements)]},
+        )
+        rels = [
+            {"from_id": f"{tag}-req-{(n - 1) // 4}", "to_id": f"{tag}-req-{n}",
+             "relationship_type": "DERIVES_FROM", "from_label": "Requirement", "to_label": "Requirement"}
+            for n in range(1, requirements)
+        ]
+        rels += [
+            {"from_id": f"{tag}-req-{n}", "to_id": f"{tag}-comp-{n}",
+             "relationship_type": "IMPLEMENTS", "from_label": "Requirement", "to_label": "Component"}
+            for n in range(requirements)
+        ]
+        rels += [
+            {"from_id": f"{tag}-chunk-{n}", "to_id": f"{tag}-req-{n % requirements}",
+             "relationship_type": "REFERENCES", "from_label": "Chunk", "to_label": "Requirement"}
+            for n in range(chunks)
+        ]
+        linked, rel_s = timed(service.create_relationships, rels)
+        print(f"{'batched create_relationships':<34} {linked / rel_s:10.0f} rels/s "
+              f"({rel_s:7.1f} s for {linked})")
+
+        # Impact analysis from the top of the tree
+        root_ids = [f"{tag}-req-{n}" for n in range(roots)]
+        cases = [
+            ("impact (label-anchored)", lambda node_id: service.impact_analysis(
+                node_id, max_depth=3, node_label="Requirement")),
+            ("impact (UNION anchor)", lambda node_id: service.impact_analysis(node_id, max_depth=3)),
+            ("impact (previous, unlabelled)", lambda node_id: service.execute_cypher(
+                LEGACY_IMPACT_QUERY, {"node_id": node_id})),
+        ]
+        for label, run in cases:
+            run(root_ids[0])  # warm-up / plan cache
+            times = [timed(run, node_id)[1] * 1000 for node_id in root_ids]
+            print(f"{label:<34} mean {statistics.mean(times):8.2f} ms  "
+                  f"p95 {sorted(times)[int(len(times) * 0.95) - 1]:8.2f} ms")
+
+        stats, stats_s = timed(service.get_graph_stats)
+        print(f"{'get_graph_stats':<34} {stats_s * 1000:10.2f} ms "
+              f"({stats.get('total_nodes')} nodes, {stats.get('total_relationships')} relationships)")
+
+    finally:
+        cleanup(service, tag)
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--requirements", type=int, default=5000)
+    parser.add_argument("--sample", type=int, default=2000, help="chunks created one statement at a time")
+    parser.add_argument("--roots", type=int, default=50, help="requirements used as impact-analysis roots")
+    args = parser.parse_args()
+    main(args.chunks, args.requirements, args.sample, args.roots)
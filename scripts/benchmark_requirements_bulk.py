@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Requirements Bulk Publish / Import Benchmark
+
+Seeds a throwaway source and target project with N approved requirements
+(one constraint each), then times:
+
+  * a row-by-row publish baseline (SELECT + UPDATE per requirement, as the
+    batch-publish endpoint used to do) on an extra N/2 seeded requirements
+  * the set-based batch-publish endpoint on all N requirements
+  * the set-based import endpoint copying all N into the target project
+
+Runs against the database configured in Settings (.env). Both projects and
+everything hanging off them are deleted afterwards (ON DELETE CASCADE).
+
+Usage:
+    python scripts/benchmark_requirements_bulk.py [--count 5000] [--user-id UUID]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from psycopg2.extras import execute_values  # noqa: E402
+
+from backend.api import requirements  # noqa: E402
+from backend.api.requirements import BatchPublishRequest, ImportRequirementsRequest  # noqa: E402
+
+
+def create_project(cur, name: str, user_id: str) -> str:
+    project_id = str(uuid.uuid4())
+    cur.execute(
+        "INSERT INTO projects (project_id, name, created_by) VALUES (%s, %s, %s)",
+        (project_id, name, user_id),
+    )
+    cur.execute(
+        "INSERT INTO project_members (user_id, project_id, role) VALUES (%s, %s, 'owner')",
+        (user_id, project_id),
+    )
+    return project_id
+
+
+def seed_requirements(cur, project_id: str, user_id: str, count: int, prefix: str) -> list:
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    execute_values(cur, """
+        INSERT INTO requirements_enhanced (
+            requirement_id, project_id, requirement_identifier, requirement_title,
+            requirement_text, requirement_type, state, created_by, updated_by
+        ) VALUES %s
+    """, [
+        (req_id, project_id, f"{prefix}-{n:05d}", f"Benchmark requirement {n}",
+         "The system shall do something measurable.", "functional", "approved", user_id, user_id)
+        for n, req_id in enumerate(ids)
+    ], page_size=1000)
+    execute_values(cur, """
+        INSERT INTO requirements_constraints (
+            requirement_id, constraint_type, constraint_name, constraint_description,
+            value_type, numeric_value, numeric_unit, created_by
+        ) VALUES %s
+    """, [
+        (req_id, "threshold", "Range", "Minimum range", "numeric", 100, "km", user_id)
+        for req_id in ids
+    ], page_size=1000)
+    return ids
+
+
+def row_by_row_publish(conn, project_id: str, ids: list, user_id: str) -> None:
+    """The pre-bulk batch-publish loop, kept here as a baseline."""
+    with conn.cursor() as cur:
+        for req_id in ids:
+            cur.execute("""
+                SELECT requirement_id, state FROM requirements_enhanced
+                WHERE requirement_id = %s AND project_id = %s
+            """, (req_id, project_id))
+            cur.fetchone()
+            cur.execute("""
+                UPDATE requirements_enhanced
+                SET state = 'published', is_published = true, published_at = NOW(),
+                    published_by = %s, updated_at = NOW(), updated_by = %s, version = version + 1
+                WHERE requirement_id = %s AND project_id = %s
+            """, (user_id, user_id, req_id, project_id))
+    conn.commit()
+
+
+async def main(count: int, user_id: str) -> None:
+    conn = requirements.get_db_connection()
+    run = uuid.uuid4().hex[:8]
+    try:
+        with conn.cursor() as cur:
+            if not user_id:
+                cur.execute("SELECT user_id FROM users ORDER BY created_at LIMIT 1")
+                row = cur.fetchone()
+                if not row:
+                    print("No users found; pass --user-id")
+                    return
+                user_id = str(row[0])
+            source_project = create_project(cur, f"bench-src-{run}", user_id)
+            target_project = create_project(cur, f"bench-dst-{run}", user_id)
+            ids = seed_requirements(cur, source_project, user_id, count, "REQ")
+            baseline_ids = seed_requirements(cur, source_project, user_id, count // 2, "BASE")
+        conn.commit()
+
+        user = {"user_id": user_id, "username": "benchmark"}
+        print(f"Requirements bulk benchmark ({count} requirements, 1 constraint each)")
+
+        start = time.perf_counter()
+        row_by_row_publish(conn, source_project, baseline_ids, user_id)
+        elapsed = time.perf_counter() - start
+        per_row = elapsed / len(baseline_ids)
+        print(f"  row-by-row publish ({len(baseline_ids)}): {elapsed:7.2f} s "
+              f"(~{per_row * count:.2f} s extrapolated to {count})")
+
+        start = time.perf_counter()
+        result = await requirements.batch_publish_requirements(
+            source_project, BatchPublishRequest(requirement_ids=ids), user
+        )
+        print(f"  set-based publish ({count}):  {time.perf_counter() - start:7.2f} s "
+              f"-> published {result['summary']['published_count']}, skipped {result['summary']['skipped_count']}")
+
+        start = time.perf_counter()
+        result = await requirements.import_requirements(
+            target_project, ImportRequirementsRequest(source_project_id=source_project, requirement_ids=ids), user
+        )
+        print(f"  set-based import ({count}):   {time.perf_counter() - start:7.2f} s "
+              f"-> imported {result['imported_count']}, failed {len(result.get('failed_imports', []))}")
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM projects WHERE name LIKE %s", (f"bench-%-{run}",))
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--user-id", default=None, help="Existing user to own the benchmark projects")
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.user_id))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Requirements / Metadata Extraction Pattern Benchmark
+
+Generates a synthetic N-page specification (numbered sections, identified
+"shall" statements, constraints with units, narrative text) and times:
+
+  * RequirementsExtractionEngine.extract_requirements_from_document with the
+    single-pass pattern banks
+  * the same engine with the previous one-re.search-per-pattern methods
+  * MetadataExtractionService entity extraction and document classification,
+    both ways
+
+and checks that both produce identical requirements, constraints and
+metadata. Needs no services.
+
+Usage:
+    python scripts/benchmark_requirements_extraction.py [--pages 500] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.metadata_extraction import MetadataExtractionService  # noqa: E402
+from backend.services.requirements_extraction import (  # noqa: E402
+    ExtractionConfig,
+    RequirementType,
+    RequirementsExtractionEngine,
+)
+
+SUBJECTS = ["The navigation system", "The flight control computer", "The ground station interface",
+            "The operator", "Each sensor module", "The communication subsystem", "The power controller",
+            "The mission planning component", "The user", "The data link"]
+ACTIONS = ["shall provide position updates to the autopilot", "must maintain encrypted storage of mission data",
+           "will support manual override during every flight phase", "shall achieve a throughput of {n} Mbps",
+           "shall not exceed a latency of {n} ms under peak load", "must authenticate every operator session",
+           "should communicate with the ground station over the primary protocol",
+           "shall perform an emergency shutdown when a fault occurs", "may log diagnostic data for maintenance",
+           "shall operate at a minimum of {n} hz", "must not cause a hazard to ground personnel"]
+CONSTRAINTS = ["Threshold: {n} seconds.", "Objective: {n} kg.", "KPP: navigation accuracy within {n} meters.",
+               "The maximum {n} ft ceiling applies.", "Tolerance ± {n} % is acceptable.",
+               "Range 10 to {n} km is required."]
+NARRATIVE = ["This section describes the operational context and the assumptions made by the design team.",
+             "Figures in this chapter are illustrative and do not constitute additional obligations.",
+             "The Navigation Controller and the Data Management Module exchange messages over the bus.",
+             "Operators are trained according to the procedure manual and the applicable guideline standard."]
+
+
+def make_corpus(pages: int, seed: int = 7) -> str:
+    """Roughly 3,000 characters per page."""
+    rng = random.Random(seed)
+    lines = []
+    for page in range(pages):
+        lines.append(f"{page // 10 + 1}.{page % 10 + 1} Requirements Group {page}")
+        lines.append("")
+        for n in range(12):
+            statement = f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)}".format(n=rng.randint(1, 500))
+            prefix = f"SYS-{page * 12 + n:04d}: " if n % 3 else ""
+            lines.append(f"{prefix}{statement}. {rng.choice(CONSTRAINTS).format(n=rng.randint(1, 900))}")
+            if n % 4 == 0:
+                lines.append(rng.choice(NARRATIVE))
+        lines.append("")
+    return "\n".join(lines)
+
+
+class LegacyMetadataExtractionService(MetadataExtractionService):
+    """One re.finditer / re.findall per pattern, as before the pattern banks."""
+
+    def extract_requirement_entities(self, text):
+        requirements = set()
+        for pattern in self.requirement_patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
+                if match.groups():
+                    requirements.add(match.group(1).strip())
+                elif len(match.group(0).strip()) < 200:
+                    requirements.add(match.group(0).strip())
+        return list(requirements)
+
+    def extract_system_entities(self, text):
+        systems = set()
+        for pattern in self.system_patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                systems.add((match.group(1) if match.groups() else match.group(0)).strip())
+        return list(systems)
+
+    def classify_document_type(self, text):
+        text_lower = text.lower()
+        scores = {}
+        for doc_type, patterns in self.document_type_patterns.items():
+            score = sum(len(re.findall(pattern, text_lower)) for pattern in patterns)
+            scores[doc_type] = score / max(len(text_lower.split()) / 1000, 1)
+        best_type = max(scores.keys(), key=lambda x: scores[x])
+        return best_type, min(scores[best_type] / 10.0, 1.0)
+
+
+class LegacyRequirementsExtractionEngine(RequirementsExtractionEngine):
+    """One re.search / re.finditer / substring test per pattern, as before the pattern banks."""
+
+    def _extract_constraints_from_section(self, section_text, section_title, config, section_number):
+        constraints = []
+        for constraint_type, patterns in self.constraint_patterns.items():
+            for pattern in patterns:
+                flags = re.IGNORECASE if config.ignore_case else 0
+                for match in re.finditer(pattern, section_text, flags):
+                    constraint = self._parse_constraint_match(
+                        match, constraint_type, section_text, section_title, section_number
+                    )
+                    if constraint:
+                        constraints.append(constraint)
+        constraints.extend(self._extract_numeric_constraints(section_text, section_title, section_number))
+        return constraints
+
+    def _classify_requirement_sentence(self, sentence, config):
+        max_confidence, best_type = 0.0, RequirementType.FUNCTIONAL
+        sentence_lower = sentence.lower()
+        modal_score = 0.0
+        if re.search(r'\b(shall|must)\b', sentence_lower):
+            modal_score = 0.9
+        elif re.search(r'\b(will|should)\b', sentence_lower):
+            modal_score = 0.7
+        elif re.search(r'\b(may|might|could)\b', sentence_lower):
+            modal_score = 0.4
+        for req_type, patterns in self.requirement_markers.items():
+            type_score = 0.0
+            for pattern in patterns:
+                if re.search(pattern, sentence_lower):
+                    type_score = max(type_score, 0.8)
+            field_name = self.type_keyword_fields.get(req_type)
+            if field_name:
+                for keyword in getattr(config, field_name):
+                    if keyword.lower() in sentence_lower:
+                        type_score = max(type_score, 0.6)
+            combined_score = modal_score * 0.4 + type_score * 0.6
+            if combined_score > max_confidence:
+                max_confidence, best_type = combined_score, req_type
+        if self._has_requirement_structure(sentence):
+            max_confidence = min(max_confidence + 0.1, 1.0)
+        return max_confidence, best_type
+
+    def _has_requirement_structure(self, sentence):
+        sentence_lower = sentence.lower()
+        return any(re.search(pattern, sentence_lower) for pattern in self.structure_patterns)
+
+    def _extract_requirement_identifier(self, sentence):
+        for pattern in self.identifier_patterns:
+            match = re.search(pattern, sentence)
+            if match:
+                return match.group(1)
+        return None
+
+    def _classify_requirement_category(self, sentence):
+        sentence_lower = sentence.lower()
+        for category, keywords in self.category_keywords.items():
+            if any(keyword in sentence_lower for keyword in keywords):
+                return category, None
+        return None, None
+
+    def _extract_matching_keywords(self, sentence, config):
+        sentence_lower = sentence.lower()
+        all_keywords = (config.functional_keywords + config.performance_keywords + config.safety_keywords
+                        + config.security_keywords + config.constraint_keywords)
+        return list({keyword for keyword in all_keywords if keyword.lower() in sentence_lower})
+
+    def _extract_unit_from_context(self, context):
+        for pattern in self.units_patterns.values():
+            match = re.search(pattern, context, re.IGNORECASE)
+            if match:
+                return match.group(0).lower()
+        return None
+
+
+def best_of(repeat: int, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def summarize(result):
+    requirements = [(r.text, r.requirement_type, round(r.confidence, 6), r.identifier, r.category,
+                     sorted(r.keywords)) for r in result.requirements]
+    constraints = [(c.description, c.constraint_type, c.numeric_value, c.numeric_unit) for c in result.constraints]
+    return requirements, constraints
+
+
+def main(pages: int, repeat: int) -> None:
+    corpus = make_corpus(pages)
+    config = ExtractionConfig(min_confidence=0.5)
+    print(f"Extraction pattern benchmark ({pages} pages, {len(corpus) / 1e6:.2f} MB, best of {repeat})")
+
+    engines = [
+        ("single-pass pattern banks", RequirementsExtractionEngine(metadata_service=MetadataExtractionService())),
+        ("per-pattern re.search (previous)",
+         LegacyRequirementsExtractionEngine(metadata_service=LegacyMetadataExtractionService())),
+    ]
+
+    summaries = []
+    for label, engine in engines:
+        metadata_calls = [
+            ("  requirement entities", engine.metadata_service.extract_requirement_entities),
+            ("  system entities", engine.metadata_service.extract_system_entities),
+            ("  document type", engine.metadata_service.classify_document_type),
+        ]
+        metadata = []
+        for call_label, call in metadata_calls:
+            value, elapsed = best_of(repeat, call, corpus)
+            metadata.append(sorted(value) if isinstance(value, list) else value)
+            print(f"{label + call_label:<50} {elapsed * 1000:9.1f} ms")
+
+        result, elapsed = best_of(repeat, engine.extract_requirements_from_document, corpus, config)
+        print(f"{label + '  full extraction':<50} {elapsed * 1000:9.1f} ms  "
+              f"{pages / elapsed:8.1f} pages/s  ({len(result.requirements)} requirements, "
+              f"{len(result.constraints)} constraints)")
+        summaries.append((summarize(result), metadata))
+
+    print("outputs identical:", summaries[0] == summaries[1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.pages, args.repeat)
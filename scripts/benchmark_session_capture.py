@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Session Capture Middleware Micro-Benchmark
+
+Measures the per-request latency SessionCaptureMiddleware adds on top of a
+bare ASGI app, for an uncaptured route (GET /api/projects) and a captured
+route (POST /api/knowledge/search). Requests are driven straight through the
+ASGI interface so that no network or server overhead is included.
+
+Capture work itself runs on the middleware's background queue; the benchmark
+replaces it with a counter so only request-path overhead is measured.
+
+Usage:
+    python scripts/benchmark_session_capture.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.middleware import session_capture  # noqa: E402
+from backend.middleware.session_capture import SessionCaptureMiddleware  # noqa: E402
+
+
+BODY = json.dumps({"query": "radar detection range", "project_id": "bench-project"}).encode()
+
+
+async def bare_app(scope, receive, send):
+    """Endpoint stand-in: read the body like FastAPI would, then respond"""
+    if scope["method"] == "POST":
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+class CountingMiddleware(SessionCaptureMiddleware):
+    """Middleware with background capture work replaced by a counter"""
+
+    captured = 0
+
+    async def _run_capture(self, rule, ctx, response_time):
+        CountingMiddleware.captured += 1
+        return True
+
+
+def make_scope(method: str, path: str):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"authorization", b"Bearer benchmark"), (b"content-type", b"application/json")],
+    }
+
+
+async def run(app, method: str, path: str, n: int) -> list:
+    async def send(message):
+        pass
+
+    timings = []
+    for _ in range(n):
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": BODY if method == "POST" else b"", "more_body": False}
+
+        scope = make_scope(method, path)
+        start = time.perf_counter_ns()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter_ns() - start)
+        await asyncio.sleep(0)  # let the background capture consumer run, as a server loop would
+    return timings
+
+
+def summarize(label: str, baseline: list, wrapped: list) -> None:
+    base_us = statistics.median(baseline) / 1000
+    wrapped_us = statistics.median(wrapped) / 1000
+    p99 = sorted(wrapped)[int(len(wrapped) * 0.99) - 1] / 1000
+    print(f"{label:<38} bare {base_us:7.2f} us | middleware {wrapped_us:7.2f} us "
+          f"(p99 {p99:7.2f} us) | added {wrapped_us - base_us:6.2f} us")
+
+
+async def main(n: int) -> None:
+    session_capture.set_global_redis_client(object())  # enable capture path
+    middleware = CountingMiddleware(bare_app)
+
+    cases = [("GET", "/api/projects", "uncaptured GET /api/projects"),
+             ("POST", "/api/knowledge/search", "captured POST /api/knowledge/search")]
+
+    print(f"Session capture middleware benchmark ({n} requests per case)")
+    for method, path, label in cases:
+        await run(bare_app, method, path, 1000)  # warm-up
+        await run(middleware, method, path, 1000)
+        baseline = await run(bare_app, method, path, n)
+        wrapped = await run(middleware, method, path, n)
+        summarize(label, baseline, wrapped)
+
+    await middleware._queue.join()
+    print(f"Background capture jobs processed: {CountingMiddleware.captured}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Application Startup Benchmark
+
+Reports wall time and RSS for each step of bringing up one ODRAS replica:
+module imports, app/router construction, then every startup phase from
+backend/startup/initialize.py (run concurrently per their dependencies).
+
+The summary compares time-to-ready with the sum of the critical phase
+durations, i.e. what a serial startup would have taken. Startup phases talk
+to the services configured in Settings (.env); phases whose services are
+unreachable are reported as failed/skipped rather than aborting the report.
+
+Usage:
+    python scripts/benchmark_startup.py [--warmup-timeout 300]
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def current_rss_mb() -> float:
+    """RSS in MB; local so that nothing from backend is imported before it is timed"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def timed(label: str, func, rows: list):
+    rss_start = current_rss_mb()
+    start = time.perf_counter()
+    result = func()
+    rows.append((label, "done", None, (time.perf_counter() - start) * 1000, current_rss_mb(), current_rss_mb() - rss_start))
+    return result
+
+
+def print_rows(title: str, rows: list) -> None:
+    print(f"\n{title}")
+    print(f"  {'step':<28} {'status':<8} {'start ms':>9} {'time ms':>9} {'rss MB':>8} {'Δrss MB':>8}")
+    for label, status, started, duration, rss, delta in rows:
+        started_s = f"{started:9.0f}" if started is not None else f"{'':>9}"
+        duration_s = f"{duration:9.0f}" if duration is not None else f"{'-':>9}"
+        rss_s = f"{rss:8.1f}" if rss is not None else f"{'-':>8}"
+        delta_s = f"{delta:+8.1f}" if delta is not None else f"{'-':>8}"
+        print(f"  {label:<28} {status:<8} {started_s} {duration_s} {rss_s} {delta_s}")
+
+
+async def run_phases(warmup_timeout: float) -> None:
+    from backend.services.config import Settings
+    from backend.startup.initialize import build_startup_phases
+    from backend.startup.phases import run_startup_phases, startup_state
+
+    startup_state.started_at = time.monotonic()
+    start = time.perf_counter()
+    try:
+        await run_startup_phases(build_startup_phases(Settings()))
+    except RuntimeError as e:
+        print(f"\n⚠️  {e}")
+    ready_ms = (time.perf_counter() - start) * 1000
+
+    if startup_state.background:
+        _, pending = await asyncio.wait(startup_state.background, timeout=warmup_timeout)
+        if pending:
+            print(f"\n⚠️  {len(pending)} warm-up phase(s) still running after {warmup_timeout:.0f}s")
+    warm_ms = (time.perf_counter() - start) * 1000
+
+    rows = []
+    for name, record in startup_state.phases.items():
+        delta = (record.rss_end_mb - record.rss_start_mb) if record.rss_end_mb is not None and record.rss_start_mb is not None else None
+        label = name if record.critical else f"{name} (warm-up)"
+        rows.append((label, record.status, record.started_at and record.started_at * 1000, record.duration_ms, record.rss_end_mb, delta))
+    print_rows("Startup phases", rows)
+
+    serial_ms = sum(r.duration_ms or 0 for r in startup_state.phases.values() if r.critical)
+    readiness = f"ready after {ready_ms:.0f} ms" if startup_state.ready else f"NOT ready ({ready_ms:.0f} ms)"
+    print(f"\n  {readiness} (serial sum of critical phases {serial_ms:.0f} ms), "
+          f"warm-up finished after {warm_ms:.0f} ms, RSS {current_rss_mb():.1f} MB")
+    for name, record in startup_state.phases.items():
+        if record.error:
+            print(f"  {name}: {record.error}")
+
+
+def main(warmup_timeout: float) -> None:
+    print(f"ODRAS startup benchmark (baseline RSS {current_rss_mb():.1f} MB)")
+
+    rows = []
+    timed("import fastapi", lambda: importlib.import_module("fastapi"), rows)
+    app_factory = timed("import app_factory", lambda: importlib.import_module("backend.app_factory"), rows)
+    # backend.startup imports every API router (and their clients) eagerly
+    routers = timed("import startup + routers", lambda: importlib.import_module("backend.startup.routers"), rows)
+    app = timed("create_app", app_factory.create_app, rows)
+    timed("register_routers", lambda: routers.register_routers(app), rows)
+    print_rows("Imports and app construction", rows)
+
+    asyncio.run(run_phases(warmup_timeout))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--warmup-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+    main(args.warmup_timeout)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Workbench Pagination Benchmark
+
+Seeds a throwaway project with N requirements and times
+WorkbenchDataManager.query_workbench_data for:
+
+  * shallow and deep pages addressed by page number (LIMIT/OFFSET), with
+    an exact COUNT(*) as the data manager used to do on every request
+  * the same deep page reached by following next_cursor (keyset), with
+    only the final request timed and the planner estimate as total
+  * a substring search (ILIKE '%term%', served by the pg_trgm indexes)
+
+Runs against the database configured in Settings (.env). The project and
+its requirements are deleted afterwards (ON DELETE CASCADE).
+
+Usage:
+    python scripts/benchmark_workbench_pagination.py [--count 50000] [--page-size 50] [--user-id UUID]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from psycopg2.extras import execute_values  # noqa: E402
+
+from backend.schemas.workbench_data import PaginationParams, WorkbenchQueryRequest, WorkbenchType  # noqa: E402
+from backend.services.config import Settings  # noqa: E402
+from backend.services.data_manager import WorkbenchDataManager  # noqa: E402
+from backend.services.db import DatabaseService  # noqa: E402
+
+WORDS = ["navigation", "telemetry", "propulsion", "thermal", "guidance", "payload", "sensor", "datalink"]
+
+
+def seed(cur, user_id: str, count: int, run: str) -> str:
+    project_id = str(uuid.uuid4())
+    cur.execute(
+        "INSERT INTO projects (project_id, name, created_by) VALUES (%s, %s, %s)",
+        (project_id, f"bench-wb-{run}", user_id),
+    )
+    cur.execute(
+        "INSERT INTO project_members (user_id, project_id, role) VALUES (%s, %s, 'owner')",
+        (user_id, project_id),
+    )
+    execute_values(cur, """
+        INSERT INTO requirements_enhanced (
+            project_id, requirement_identifier, requirement_title, requirement_text,
+            requirement_type, created_by, updated_at
+        ) VALUES %s
+    """, [
+        (project_id, f"REQ-{n:06d}", f"{WORDS[n % len(WORDS)]} requirement {n}",
+         f"The {WORDS[(n * 7) % len(WORDS)]} subsystem shall meet limit {n}.", "functional", user_id,
+         "2024-01-01T00:00:00Z")
+        for n in range(count)
+    ], page_size=2000)
+    cur.execute("ANALYZE requirements_enhanced")
+    return project_id
+
+
+async def timed(manager, request, user_id):
+    start = time.perf_counter()
+    response = await manager.query_workbench_data(request, user_id)
+    if not response.success:
+        raise RuntimeError(response.message)
+    return (time.perf_counter() - start) * 1000, response.data
+
+
+async def main(count: int, page_size: int, user_id: str) -> None:
+    db = DatabaseService(Settings())
+    manager = WorkbenchDataManager(db, Settings())
+    run = uuid.uuid4().hex[:8]
+    conn = db._conn()
+    try:
+        with conn.cursor() as cur:
+            if not user_id:
+                cur.execute("SELECT user_id FROM users ORDER BY created_at LIMIT 1")
+                row = cur.fetchone()
+                if not row:
+                    print("No users found; pass --user-id")
+                    return
+                user_id = str(row[0])
+            project_id = seed(cur, user_id, count, run)
+        conn.commit()
+
+        def request(**pagination):
+            return WorkbenchQueryRequest(
+                project_id=project_id, workbench_type=WorkbenchType.REQUIREMENTS,
+                pagination=PaginationParams(page_size=page_size, **pagination),
+            )
+
+        last_page = count // page_size
+        print(f"Workbench pagination benchmark ({count} requirements, page size {page_size})")
+        for page in (1, last_page // 2, last_page):
+            ms, data = await timed(manager, request(page=page, exact_count=True), user_id)
+            print(f"  offset page {page:>6} + COUNT(*): {ms:8.1f} ms (total {data.total_count})")
+
+        cursor, page = None, 1
+        while page < last_page:
+            _, data = await timed(manager, request(cursor=cursor) if cursor else request(), user_id)
+            cursor, page = data.next_cursor, page + 1
+        ms, data = await timed(manager, request(cursor=cursor), user_id)
+        print(f"  keyset page {page:>6} + estimate: {ms:8.1f} ms (total ~{data.total_count}, "
+              f"first id {data.items[0]['requirement_identifier'] if data.items else '-'})")
+
+        search = WorkbenchQueryRequest(
+            project_id=project_id, workbench_type=WorkbenchType.REQUIREMENTS,
+            search_query="telemetry subsystem", pagination=PaginationParams(page_size=page_size),
+        )
+        ms, data = await timed(manager, search, user_id)
+        print(f"  search 'telemetry subsystem':      {ms:8.1f} ms (total ~{data.total_count})")
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM projects WHERE name = %s", (f"bench-wb-{run}",))
+        conn.commit()
+        db._return(conn)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--user-id", default=None, help="Existing user to own the benchmark project")
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.page_size, args.user_id))
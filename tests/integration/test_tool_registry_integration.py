@@ -130,7 +130,13 @@ class TestDASToolRegistryIntegration:
         
         assert updated is True
         
-        # Verify usage count
+        # Verify usage count (pending usage is included before it is flushed)
+        tool = await registry.get_tool(tool_id)
+        assert tool.usage_count == 5
+        assert tool.last_used_at is not None
+        
+        # Verify the flushed count is stored
+        assert registry.flush_usage() == 1
         tool = await registry.get_tool(tool_id)
         assert tool.usage_count == 5
         assert tool.last_used_at is not None
@@ -0,0 +1,208 @@
+"""
+Unit tests for the authentication token cache.
+
+Tests the single-query validation on a cache miss, expiry- and TTL-checked
+cache hits, the LRU bound, revocation broadcast and its local fallback, and
+batched last_used_at writes against a mocked database and Redis.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+from fastapi import HTTPException
+
+from backend.api import core
+from backend.services import auth
+from backend.services.auth import TokenCache, TokenRevocationBus, TokenUsageRecorder
+
+TOKEN = "secret-token"
+HEADER = f"Bearer {TOKEN}"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(auth, "_db_service", db)
+    monkeypatch.setattr(auth, "_settings", SimpleNamespace(auth_revocation_pubsub=True))
+    monkeypatch.setattr(auth, "TOKENS_CACHE", TokenCache())
+    monkeypatch.setattr(auth, "TOKEN_USAGE", TokenUsageRecorder(flush_interval_s=3600))
+    revocations = Mock()
+    revocations.ensure_subscribed.return_value = True
+    monkeypatch.setattr(auth, "REVOCATIONS", revocations)
+    return db
+
+
+def cursor_of(db):
+    return db._conn.return_value.cursor.return_value.__enter__.return_value
+
+
+def token_row(expires_in=timedelta(hours=1), tenant_id="tenant-1"):
+    expires_at = datetime.now(timezone.utc) + expires_in
+    return ("user-1", "alice", False, expires_at, tenant_id, expires_in < timedelta(0))
+
+
+class TestGetUser:
+    """Test validation and caching in get_user."""
+
+    def test_miss_runs_one_query_without_a_commit_then_hits(self, db):
+        cursor = cursor_of(db)
+        cursor.fetchone.return_value = token_row(tenant_id=None)
+
+        user = auth.get_user(HEADER)
+
+        assert user == {"user_id": "user-1", "username": "alice", "is_admin": False,
+                        "tenant_id": auth.SYSTEM_TENANT_ID}
+        assert cursor.execute.call_count == 1
+        db._conn.return_value.commit.assert_not_called()
+        db._return.assert_called_once()
+
+        assert auth.get_user(HEADER) == user
+        assert cursor.execute.call_count == 1 and db._conn.call_count == 1
+
+    def test_token_expired_in_the_database_is_rejected(self, db):
+        cursor = cursor_of(db)
+        cursor.fetchone.return_value = token_row(expires_in=-timedelta(minutes=1))
+
+        with pytest.raises(HTTPException) as error:
+            auth.get_user(HEADER)
+
+        assert error.value.detail == "Token expired"
+        assert "is_active = FALSE" in cursor.execute.call_args.args[0]
+        assert auth._hash_token(TOKEN) not in auth.TOKENS_CACHE
+
+    def test_unknown_token_is_rejected(self, db):
+        cursor_of(db).fetchone.return_value = None
+
+        with pytest.raises(HTTPException) as error:
+            auth.get_user(HEADER)
+
+        assert error.value.status_code == 401 and error.value.detail == "Invalid token"
+
+
+class TestTokenCache:
+    """Test expiry, TTL and size bounds."""
+
+    def test_cached_token_is_not_served_past_its_expiry(self):
+        cache = TokenCache(ttl_s=3600)
+        cache.put("a", {"user_id": "u"}, datetime.now(timezone.utc) - timedelta(seconds=1))
+        cache.put("b", {"user_id": "u"}, datetime.now(timezone.utc) + timedelta(hours=1))
+
+        assert cache.get("a") is None and cache.get("b") == {"user_id": "u"}
+
+    def test_entries_expire_after_the_ttl(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(auth.time, "monotonic", lambda: clock[0])
+        cache = TokenCache(ttl_s=60)
+        cache.put("a", {"user_id": "u"}, None)
+
+        clock[0] += 59
+        assert cache.get("a") is not None
+        clock[0] += 2
+        assert cache.get("a") is None
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = TokenCache(max_entries=2)
+        cache.put("a", {}, None)
+        cache.put("b", {}, None)
+        cache.get("a")
+        cache.put("c", {}, None)
+
+        assert "a" in cache and "c" in cache and "b" not in cache and len(cache) == 2
+
+
+class TestRevocation:
+    """Test revocation across workers."""
+
+    def test_invalidate_drops_the_local_entry_and_broadcasts(self, db):
+        token_hash = auth._hash_token(TOKEN)
+        auth.TOKENS_CACHE.put(token_hash, {"user_id": "u"}, None)
+
+        auth.invalidate_token(TOKEN)
+
+        assert token_hash not in auth.TOKENS_CACHE
+        auth.REVOCATIONS.publish.assert_called_once_with(token_hash)
+
+    def test_logout_all_clears_the_cache_everywhere(self, db, monkeypatch):
+        monkeypatch.setattr(core, "db", db)
+        auth.TOKENS_CACHE.put(auth._hash_token(TOKEN), {"user_id": "u"}, None)
+
+        core.logout_all()
+
+        cursor_of(db).execute.assert_called_once_with("DELETE FROM auth_tokens")
+        assert len(auth.TOKENS_CACHE) == 0
+        auth.REVOCATIONS.publish.assert_called_once_with("*")
+
+    def test_broadcast_messages_update_other_workers_caches(self):
+        cache = TokenCache()
+        cache.put("a", {}, None)
+        cache.put("b", {}, None)
+        bus = TokenRevocationBus("redis://localhost:6379", "revoked", cache)
+
+        bus._on_message({"data": b"a"})
+        assert "a" not in cache and "b" in cache
+
+        bus._on_message({"data": b"*"})
+        assert len(cache) == 0
+
+    def test_without_redis_revocation_is_local_and_reconnects_are_throttled(self, monkeypatch):
+        bus = TokenRevocationBus("redis://localhost:6379", "revoked", TokenCache(), retry_s=30)
+        connect = Mock(side_effect=ConnectionError("refused"))
+        monkeypatch.setattr(bus, "_connect", connect)
+
+        assert bus.publish("a") is False
+        assert bus.publish("b") is False
+        assert connect.call_count == 1
+
+    def test_subscription_clears_the_cache_and_publishes(self, monkeypatch):
+        cache = TokenCache()
+        cache.put("stale", {}, None)
+        client = MagicMock()
+        client.pubsub.return_value.run_in_thread.return_value.is_alive.return_value = True
+        bus = TokenRevocationBus("redis://localhost:6379", "revoked", cache)
+        monkeypatch.setattr(bus, "_connect", lambda: client)
+
+        assert bus.publish("a") is True
+
+        client.publish.assert_called_once_with("revoked", "a")
+        assert client.pubsub.return_value.subscribe.call_args.kwargs == {"revoked": bus._on_message}
+        assert len(cache) == 0
+
+
+class TestUsageRecorder:
+    """Test coalesced last_used_at writes."""
+
+    def test_uses_are_coalesced_into_one_batched_update(self, db, monkeypatch):
+        execute_values = Mock()
+        monkeypatch.setattr(auth, "execute_values", execute_values)
+        recorder = TokenUsageRecorder(flush_interval_s=3600)
+
+        for token_hash in ["a", "b", "a", "a"]:
+            recorder.record(token_hash)
+        assert execute_values.call_count == 0
+
+        recorder.flush()
+
+        values = execute_values.call_args.args[2]
+        assert sorted(token_hash for token_hash, _ in values) == ["a", "b"]
+        assert db._conn.return_value.commit.call_count == 1
+        assert recorder.flush() == 0
+
+    def test_flush_is_triggered_by_the_interval(self, db, monkeypatch):
+        execute_values = Mock()
+        monkeypatch.setattr(auth, "execute_values", execute_values)
+        recorder = TokenUsageRecorder(flush_interval_s=0)
+
+        recorder.record("a")
+
+        assert execute_values.call_count == 1
+
+    def test_failed_flush_keeps_pending_uses(self, db, monkeypatch):
+        monkeypatch.setattr(auth, "execute_values", Mock(side_effect=RuntimeError("db down")))
+        recorder = TokenUsageRecorder(flush_interval_s=3600)
+        recorder.record("a")
+
+        assert recorder.flush() == 0
+        assert list(recorder._pending) == ["a"]
+        db._conn.return_value.rollback.assert_called_once()
@@ -6,8 +6,10 @@ Tests security restrictions and resource limits.
 
 import pytest
 import asyncio
+import threading
 
-from backend.services.code_executor import SandboxedCodeExecutor
+from backend.services import code_executor
+from backend.services.code_executor import SandboxedCodeExecutor, shutdown_code_executors
 from backend.services.code_executor_interface import ExecutionStatus
 from backend.services.config import Settings
 
@@ -178,3 +180,137 @@ result = undefined_variable + 1
             status = await executor.get_execution_status(execution_id)
             assert status is not None
             assert status.status == ExecutionStatus.COMPLETED
+
+
+@pytest.fixture
+async def pool_executor():
+    """SandboxedCodeExecutor with a single worker and small result retention."""
+    executor = SandboxedCodeExecutor(Settings(
+        code_executor_pool_size=1,
+        code_executor_max_retained_results=3,
+    ))
+    yield executor
+    await executor.shutdown()
+
+
+class TestSandboxWorkerPool:
+    """Test process isolation, limits and result retention."""
+    
+    @pytest.mark.asyncio
+    async def test_timeout_kills_and_replaces_worker(self, pool_executor):
+        """Test that a timed-out worker process is killed and replaced."""
+        await pool_executor.start()
+        (worker,) = pool_executor._workers
+        
+        result = await pool_executor.execute("while True:\n    pass", timeout_seconds=1)
+        
+        assert result.status == ExecutionStatus.TIMEOUT
+        assert not worker.process.is_alive()
+        result = await pool_executor.execute("result = 'still serving'")
+        assert result.return_value == "still serving"
+        assert worker not in pool_executor._workers
+    
+    @pytest.mark.asyncio
+    async def test_worker_is_reused_between_executions(self, pool_executor):
+        """Test that successful executions reuse the warm worker."""
+        await pool_executor.execute("result = 1")
+        (worker,) = pool_executor._workers
+        await pool_executor.execute("result = 2")
+        
+        assert pool_executor._workers == {worker}
+        assert worker.executions == 2
+    
+    @pytest.mark.asyncio
+    async def test_memory_limit_enforced(self, pool_executor):
+        """Test that allocations beyond memory_limit_mb fail."""
+        result = await pool_executor.execute("data = 'x' * (256 * 1024 * 1024)", memory_limit_mb=64)
+        
+        assert result.status == ExecutionStatus.FAILED
+        assert "memory" in result.error.lower()
+        result = await pool_executor.execute("result = len('x' * 1024)")
+        assert result.return_value == 1024
+    
+    @pytest.mark.asyncio
+    async def test_cancel_running_execution(self, pool_executor):
+        """Test cancelling an execution kills its worker."""
+        task = asyncio.create_task(pool_executor.execute("import time\ntime.sleep(30)"))
+        while not pool_executor._running:
+            await asyncio.sleep(0.01)
+        execution_id = next(iter(pool_executor._running))
+        
+        assert await pool_executor.cancel_execution(execution_id) is True
+        result = await asyncio.wait_for(task, timeout=5)
+        
+        assert result.status == ExecutionStatus.CANCELLED
+        assert (await pool_executor.get_execution_status(execution_id)).status == ExecutionStatus.CANCELLED
+    
+    @pytest.mark.asyncio
+    async def test_unpicklable_return_value_is_repr(self, pool_executor):
+        """Test that results which cannot leave the worker are returned as repr."""
+        result = await pool_executor.execute("result = (lambda: 1)")
+        
+        assert result.status == ExecutionStatus.COMPLETED
+        assert "lambda" in result.return_value
+    
+    @pytest.mark.asyncio
+    async def test_retained_results_are_bounded(self, pool_executor):
+        """Test that only the most recent results are retained."""
+        ids = []
+        for n in range(5):
+            result = await pool_executor.execute(f"result = {n}")
+            ids.append(result.metadata["execution_id"])
+        
+        assert len(pool_executor._executions) == 3
+        assert await pool_executor.get_execution_status(ids[0]) is None
+        assert (await pool_executor.get_execution_status(ids[-1])).return_value == 4
+    
+    @pytest.mark.asyncio
+    async def test_worker_replacement_runs_off_the_event_loop(self, pool_executor, monkeypatch):
+        """Test that killing and starting workers after a timeout happens in threads."""
+        threads = []
+        kill, init = code_executor._SandboxWorker.kill, code_executor._SandboxWorker.__init__
+
+        def recording(method):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return method(*args)
+            return wrapper
+
+        await pool_executor.start()
+        monkeypatch.setattr(code_executor._SandboxWorker, "kill", recording(kill))
+        monkeypatch.setattr(code_executor._SandboxWorker, "__init__", recording(init))
+        
+        result = await pool_executor.execute("while True:\n    pass", timeout_seconds=1)
+        
+        assert result.status == ExecutionStatus.TIMEOUT
+        assert len(threads) == 2 and threading.main_thread() not in threads
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_code_executors_stops_worker_processes(self, pool_executor):
+        """Test that app shutdown stops the workers of started executors."""
+        await pool_executor.execute("result = 1")
+        (worker,) = pool_executor._workers
+        
+        await shutdown_code_executors()
+        
+        assert not worker.process.is_alive()
+        assert not pool_executor._workers and pool_executor not in code_executor._executors
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_with_executions_in_flight(self, pool_executor):
+        """Test that running and waiting executions finish cleanly when the pool shuts down."""
+        running = asyncio.create_task(pool_executor.execute("import time\ntime.sleep(0.3)\nresult = 'done'"))
+        while not pool_executor._running:
+            await asyncio.sleep(0.01)
+        waiting = asyncio.create_task(pool_executor.execute("result = 2"))
+        await asyncio.sleep(0.05)
+        (worker,) = pool_executor._workers
+        
+        await pool_executor.shutdown()
+        finished = await asyncio.wait_for(asyncio.gather(running, waiting), timeout=5)
+        
+        assert finished[0].return_value == "done"
+        assert finished[1].status == ExecutionStatus.FAILED and "shut down" in finished[1].error
+        assert not worker.process.is_alive() and not pool_executor._workers
+        result = await pool_executor.execute("result = 3")
+        assert result.status == ExecutionStatus.FAILED
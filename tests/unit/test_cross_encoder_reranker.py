@@ -0,0 +1,162 @@
+"""
+Unit tests for CrossEncoderReranker.
+
+Tests off-loop micro-batched inference, score caching, RRF degradation and
+per-query metrics using a fake cross-encoder model.
+"""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from backend.rag.core.modular_rag_service import ModularRAGService
+from backend.rag.retrieval.reranker import CrossEncoderReranker, collect_rerank_metrics
+
+
+class FakeCrossEncoder:
+    """Scores a pair by text length; optionally sleeps to simulate inference."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def predict(self, pairs):
+        self.calls.append(len(pairs))
+        if self.delay:
+            time.sleep(self.delay)
+        return [float(len(text)) for _, text in pairs]
+
+
+def make_results(texts, prefix="c"):
+    return [
+        {"id": f"{prefix}{i}", "score": 0.5, "payload": {"chunk_id": f"{prefix}{i}", "content": text}}
+        for i, text in enumerate(texts)
+    ]
+
+
+def make_reranker(model, **kwargs):
+    reranker = CrossEncoderReranker(**kwargs)
+    reranker.model = model
+    return reranker
+
+
+class TestCrossEncoderReranker:
+    """Test CrossEncoderReranker batching, caching and budgets."""
+
+    @pytest.mark.asyncio
+    async def test_reranks_by_model_score(self):
+        reranker = make_reranker(FakeCrossEncoder(), batch_window_ms=0)
+
+        reranked = await reranker.rerank("q", make_results(["a", "aaa", "aa"]))
+
+        assert [r["payload"]["content"] for r in reranked] == ["aaa", "aa", "a"]
+        assert reranked[0]["rerank_score"] == 3.0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_model_call(self):
+        model = FakeCrossEncoder()
+        reranker = make_reranker(model, batch_window_ms=20)
+
+        await asyncio.gather(
+            reranker.rerank("q1", make_results(["a", "bb"], "x")),
+            reranker.rerank("q2", make_results(["ccc", "d"], "y")),
+        )
+
+        assert model.calls == [4]
+
+    @pytest.mark.asyncio
+    async def test_cached_scores_skip_the_model(self):
+        model = FakeCrossEncoder()
+        reranker = make_reranker(model, batch_window_ms=0)
+
+        await reranker.rerank("q", make_results(["a", "bb"]))
+        await reranker.rerank("q", make_results(["a", "bb"]))
+
+        assert model.calls == [2]
+        assert reranker.recent_metrics[-1]["cache_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_inference_does_not_block_event_loop(self):
+        reranker = make_reranker(FakeCrossEncoder(delay=0.2), batch_window_ms=0, latency_budget_ms=2000)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await reranker.rerank("q", make_results(["a", "bb"]))
+        task.cancel()
+
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_latency_budget_degrades_to_rrf_order(self):
+        reranker = make_reranker(FakeCrossEncoder(delay=0.3), batch_window_ms=0, latency_budget_ms=20)
+        results = make_results(["a", "bbb", "cc"])
+        for rank, result in enumerate(results):
+            result["rrf_score"] = 1.0 / (60 + rank)
+
+        reranked = await reranker.rerank("q", results)
+
+        assert [r["payload"]["content"] for r in reranked] == ["a", "bbb", "cc"]
+        assert reranker.recent_metrics[-1]["degraded"] == "latency_budget"
+
+    def test_limits_come_from_settings(self):
+        reranker = ModularRAGService._create_cross_encoder(SimpleNamespace(
+            rag_rerank_max_candidates=20, rag_rerank_batch_window_ms=2.0,
+            rag_rerank_max_batch_pairs=32, rag_rerank_max_pending_pairs=512,
+        ))
+
+        assert (reranker.max_candidates, reranker.batch_window) == (20, 0.002)
+        assert (reranker.max_batch_pairs, reranker.max_pending_pairs) == (32, 512)
+
+    @pytest.mark.asyncio
+    async def test_only_max_candidates_are_scored(self):
+        model = FakeCrossEncoder()
+        reranker = make_reranker(model, batch_window_ms=0, max_candidates=2)
+
+        reranked = await reranker.rerank("q", make_results(["a", "bb", "cccc"]))
+
+        assert model.calls == [2]
+        assert reranked[-1]["payload"]["content"] == "cccc"
+        assert "rerank_score" not in reranked[-1]
+
+
+class TestRerankMetrics:
+    """Test that per-query rerank metrics reach the query's metadata."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_are_collected_only_inside_the_block(self):
+        reranker = make_reranker(FakeCrossEncoder(), batch_window_ms=0)
+
+        with collect_rerank_metrics() as metrics:
+            await reranker.rerank("q", make_results(["a", "bb"], "x"))
+            await reranker.rerank("q", make_results(["a", "bb"], "x"))
+        await reranker.rerank("q", make_results(["dddd"], "z"))
+
+        assert [m["candidates"] for m in metrics] == [2, 2]
+        assert metrics[1]["cache_hits"] == 2 and "rerank_ms" in metrics[1]
+
+    @pytest.mark.asyncio
+    async def test_query_metadata_includes_rerank_metrics(self):
+        reranker = make_reranker(FakeCrossEncoder(), batch_window_ms=0)
+        service = ModularRAGService(
+            SimpleNamespace(rag_hybrid_search="false", opensearch_enabled="false"),
+            vector_store=Mock(), retriever=Mock(), reranker=reranker, db_service=Mock(), llm_team=Mock(),
+        )
+
+        async def retrieve(question, **kwargs):
+            return await reranker.rerank(question, make_results(["a", "bb"]))
+
+        service._retrieve_relevant_chunks = retrieve
+
+        rag_context = await service.query_knowledge_base("q", {"project_id": "p1"})
+
+        assert len(rag_context.chunks) == 2
+        [metrics] = rag_context.query_metadata["rerank"]
+        assert metrics["candidates"] == 2 and metrics["model_pairs"] == 2
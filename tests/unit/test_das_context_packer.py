@@ -0,0 +1,148 @@
+"""
+Unit tests for the DAS context packer.
+
+Tests token budgeting, near-duplicate removal, MMR selection and the
+packing statistics surfaced through DASPromptBuilder.
+"""
+
+import pytest
+
+from backend.services import das_context_packer as packer_module
+from backend.rag.core.context_models import RAGChunk, RAGContext, RAGSource
+from backend.services.das_context_packer import ContextPacker
+from backend.services.das_prompt_builder import DASPromptBuilder
+
+SOURCE = RAGSource(source_id="doc-1", source_type="project", title="Spec")
+
+TEXT_A = ("The air vehicle shall carry a payload of at least twenty kilograms "
+          "while maintaining a cruise speed of ninety knots at sea level.")
+TEXT_B = ("The ground control station shall display telemetry from up to four "
+          "air vehicles simultaneously with a refresh period under one second.")
+TEXT_C = ("Operators shall be able to abort a mission from any screen using a "
+          "single confirmed action that returns the vehicle to its launch point.")
+
+
+def chunk(chunk_id, content, score, **metadata):
+    return RAGChunk(chunk_id=chunk_id, content=content, relevance_score=score, source=SOURCE, metadata=metadata)
+
+
+def make_packer(**kwargs):
+    values = {"model": "llama3:8b-instruct", "token_budget": 10000}
+    values.update(kwargs)
+    return ContextPacker(**values)
+
+
+class TestTokenBudget:
+    """Test budget accounting."""
+
+    def test_unavailable_tokenizer_falls_back_to_the_estimate(self, monkeypatch):
+        class OfflineTiktoken:
+            @staticmethod
+            def encoding_for_model(model):
+                raise ConnectionError("cannot download cl100k_base.tiktoken")
+
+        monkeypatch.setattr(packer_module, "tiktoken", OfflineTiktoken)
+
+        packer = ContextPacker(model="gpt-4o-mini")
+
+        assert packer.count_tokens("x" * 400) == 100
+
+    def test_budget_leaves_room_for_prompt_and_answer(self):
+        packer = make_packer(token_budget=6000, answer_reserve=2000)
+
+        assert packer.context_window == 8192
+        assert packer.budget_for() == 6000
+        assert packer.budget_for(reserved_tokens=3000) == 3192
+        assert packer.budget_for(reserved_tokens=9000) == 0
+
+    def test_chunks_beyond_budget_are_dropped_but_smaller_ones_fill_in(self):
+        packer = make_packer()
+        big = chunk("big", TEXT_C * 5, 0.8)
+        small = chunk("small", TEXT_B, 0.7)
+        budget = packer.count_tokens(TEXT_A) + packer.count_tokens(TEXT_B)
+
+        selected, stats = packer.pack([chunk("top", TEXT_A, 0.9), big, small], token_budget=budget)
+
+        assert [c.chunk_id for c in selected] == ["top", "small"]
+        assert stats.dropped_over_budget == 1
+        assert stats.packed_tokens <= stats.token_budget
+
+    def test_empty_candidates(self):
+        selected, stats = make_packer().pack([])
+
+        assert selected == [] and stats.candidates == 0
+
+
+class TestDeduplication:
+    """Test near-duplicate removal."""
+
+    def test_near_duplicate_text_is_removed(self):
+        packer = make_packer()
+        near_copy = TEXT_A + " Verified by flight test."
+
+        selected, stats = packer.pack([chunk("a", TEXT_A, 0.9), chunk("a2", near_copy, 0.85), chunk("b", TEXT_B, 0.5)])
+
+        assert [c.chunk_id for c in selected] == ["a", "b"]
+        assert stats.duplicates_removed == 1
+
+    def test_embeddings_take_precedence_over_minhash(self):
+        packer = make_packer()
+        chunks = [chunk("a", TEXT_A, 0.9, embedding=[1.0, 0.0]), chunk("c", TEXT_C, 0.8, embedding=[1.0, 0.01])]
+
+        selected, stats = packer.pack(chunks)
+
+        assert [c.chunk_id for c in selected] == ["a"]
+        assert stats.duplicates_removed == 1
+
+
+class TestMaximalMarginalRelevance:
+    """Test diversity-aware selection order."""
+
+    def test_diverse_chunk_is_preferred_over_redundant_one(self):
+        packer = make_packer(dedup_threshold=1.1, mmr_lambda=0.5)
+        partial_copy = TEXT_A.split(" while ")[0] + " while " + TEXT_C.split(" using ")[0]
+        chunks = [chunk("a", TEXT_A, 0.9), chunk("overlap", partial_copy, 0.85), chunk("b", TEXT_B, 0.8)]
+
+        selected, _ = packer.pack(chunks)
+
+        assert [c.chunk_id for c in selected] == ["a", "b", "overlap"]
+
+    def test_lambda_one_is_pure_relevance(self):
+        packer = make_packer(dedup_threshold=1.1, mmr_lambda=1.0)
+        chunks = [chunk("b", TEXT_B, 0.8), chunk("a", TEXT_A, 0.9), chunk("a2", TEXT_A, 0.85)]
+
+        selected, _ = packer.pack(chunks)
+
+        assert [c.chunk_id for c in selected] == ["a", "a2", "b"]
+
+
+class TestPromptBuilderIntegration:
+    """Test packing through DASPromptBuilder."""
+
+    def test_build_prompt_records_packing_stats(self):
+        context = RAGContext(query="q", chunks=[chunk("a", TEXT_A, 0.9), chunk("a2", TEXT_A, 0.8)])
+
+        prompt = DASPromptBuilder.build_prompt(context, "q", packer=make_packer())
+
+        assert prompt.count(TEXT_A) == 1
+        assert "[Context 2]" not in prompt
+        assert context.query_metadata["packing"]["duplicates_removed"] == 1
+
+    @pytest.mark.parametrize("reserved, expected", [(0, 3), (8192, 0)])
+    def test_pack_context_respects_reserved_tokens(self, reserved, expected):
+        context = RAGContext(query="q", chunks=[chunk("a", TEXT_A, 0.9), chunk("b", TEXT_B, 0.8),
+                                                chunk("c", TEXT_C, 0.7)])
+
+        section, stats = DASPromptBuilder.pack_context(context, reserved_tokens=reserved, packer=make_packer())
+
+        assert stats.selected == expected
+        assert section.count("[Context") == expected
+
+    def test_packed_chunks_are_the_ones_in_the_prompt(self):
+        context = RAGContext(query="q", chunks=[chunk("a", TEXT_A, 0.9), chunk("a2", TEXT_A, 0.8),
+                                                chunk("b", TEXT_B, 0.7)])
+
+        DASPromptBuilder.pack_context(context, packer=make_packer())
+
+        assert [c.chunk_id for c in DASPromptBuilder.packed_chunks(context)] == ["a", "b"]
+        assert DASPromptBuilder.packed_chunks(RAGContext(query="q", chunks=context.chunks)) == []
@@ -0,0 +1,164 @@
+"""
+Unit tests for the events admin API statistics and history.
+
+Tests dashboard statistics from the hourly rollup, one-time installation of
+the rollup triggers and keyset pagination of the event history.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+
+from backend.api import events
+from backend.api.events import (
+    decode_history_cursor,
+    encode_history_cursor,
+    get_event_history,
+    query_rollup_statistics,
+)
+from backend.db.event_queries import EVENT_ROLLUP_DDL, EVENT_ROLLUP_TRIGGERS, ensure_event_rollup
+
+ADMIN = {"user_id": "u1", "username": "admin", "is_admin": True}
+
+
+class ScriptedCursor:
+    """Cursor returning canned results per executed query, recording the SQL"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+        self._current = None
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        self._current = self.results.pop(0)
+
+    def fetchone(self):
+        return self._current[0] if self._current else None
+
+    def fetchall(self):
+        return self._current
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def make_db(cursor):
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    db = MagicMock()
+    db._conn.return_value = conn
+    return db
+
+
+def event_row(n, created_at):
+    return (f"e{n}", "das_question", None, "p1", "Project", "u1", created_at, {"n": n}, {})
+
+
+class TestRollupStatistics:
+    """Test dashboard statistics computed from project_event_hourly."""
+
+    def test_statistics_come_from_grouping_sets(self):
+        h1 = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+        h2 = datetime(2025, 1, 1, 11, tzinfo=timezone.utc)
+        cur = ScriptedCursor([
+            [(12, 40, 2)],
+            [
+                ("das_question", None, None, 8, events._BY_TYPE),
+                ("file_uploaded", None, None, 4, events._BY_TYPE),
+                (None, "p1", None, 9, events._BY_PROJECT),
+                (None, "p2", None, 3, events._BY_PROJECT),
+                (None, None, h2, 7, events._BY_HOUR),
+                (None, None, h1, 5, events._BY_HOUR),
+            ],
+            [("Alpha",)],
+        ])
+
+        stats = query_rollup_statistics(cur)
+
+        assert (stats["total_events_24h"], stats["total_events_7d"], stats["active_projects_24h"]) == (12, 40, 2)
+        assert stats["top_event_types"][0] == {"event_type": "das_question", "count": 8}
+        assert stats["most_active_project"] == {"project_id": "p1", "project_name": "Alpha", "event_count": 9}
+        assert [h["count"] for h in stats["events_by_hour"]] == [5, 7]
+        assert all("project_event_hourly" in sql for sql, _ in cur.executed[:2])
+        assert cur.executed[2][1] == ("p1",)
+
+    def test_empty_rollup(self):
+        cur = ScriptedCursor([[(0, 0, 0)], []])
+
+        stats = query_rollup_statistics(cur)
+
+        assert stats["most_active_project"] is None
+        assert stats["events_by_hour"] == []
+        assert len(cur.executed) == 2
+
+
+class TestEventHistory:
+    """Test keyset pagination of /api/events/history."""
+
+    def test_cursor_round_trip(self):
+        created = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+
+        assert decode_history_cursor(encode_history_cursor(created, "e9")) == (created, "e9")
+        with pytest.raises(ValueError):
+            decode_history_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_first_page_returns_next_cursor(self):
+        times = [datetime(2025, 1, 1, 12, m, tzinfo=timezone.utc) for m in (3, 2, 1)]
+        cur = ScriptedCursor([[(50,)], [event_row(n, t) for n, t in enumerate(times)]])
+
+        page = await get_event_history(per_page=2, cursor=None, event_type=None, project_id="p1",
+                                       start_date=None, end_date=None, user=ADMIN, db=make_db(cur))
+
+        assert [e.event_id for e in page.events] == ["e0", "e1"]
+        assert page.has_more and page.total_count == 50 and not page.total_is_estimate
+        assert decode_history_cursor(page.next_cursor) == (times[1], "e1")
+        sql, params = cur.executed[1]
+        assert "OFFSET" not in sql
+        assert "ORDER BY pe.created_at DESC, pe.event_id DESC" in sql
+        assert params == ["p1", 3]
+
+    @pytest.mark.asyncio
+    async def test_cursor_continues_after_last_row(self):
+        after = datetime(2025, 1, 1, 12, 2, tzinfo=timezone.utc)
+        cur = ScriptedCursor([[(50,)], [event_row(2, datetime(2025, 1, 1, 12, 1, tzinfo=timezone.utc))]])
+
+        page = await get_event_history(per_page=2, cursor=encode_history_cursor(after, "e1"), event_type=None,
+                                       project_id=None, start_date=after, end_date=None,
+                                       user=ADMIN, db=make_db(cur))
+
+        sql, params = cur.executed[1]
+        assert "(pe.created_at, pe.event_id) < (%s, %s)" in sql
+        assert params[-3:] == [after, "e1", 3]
+        assert not page.has_more and page.next_cursor is None
+        assert page.total_is_estimate
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(HTTPException) as exc:
+            await get_event_history(per_page=20, cursor="garbage", event_type=None, project_id=None,
+                                    start_date=None, end_date=None, user=ADMIN, db=MagicMock())
+
+        assert exc.value.status_code == 400
+
+
+class TestRollupInstall:
+    """Test that the rollup DDL and backfill run only once."""
+
+    def test_installed_triggers_skip_the_ddl(self):
+        cursor = ScriptedCursor([[(len(EVENT_ROLLUP_TRIGGERS),)]])
+
+        assert ensure_event_rollup(cursor) is False
+        assert len(cursor.executed) == 1 and "pg_trigger" in cursor.executed[0][0]
+
+    def test_missing_triggers_install_the_rollup(self):
+        cursor = ScriptedCursor([[(1,)], None])
+
+        assert ensure_event_rollup(cursor) is True
+        assert cursor.executed[1][0] == EVENT_ROLLUP_DDL
@@ -0,0 +1,189 @@
+"""
+Unit tests for EventCapture2 Redis stream consumption.
+
+Tests batched persistence, acknowledgement and pending-entry reclaim with a
+mocked Redis client and SQL-first manager.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from backend.db import event_queries
+from backend.services.eventcapture2 import EventCapture2, EnhancedEvent, EventType
+from backend.services.eventcapture2_worker import EventCapture2Worker
+
+
+def make_entry(entry_id: bytes, project_id: str = "proj-1", user_id: str = "user-1", timestamp=None):
+    """Build a raw stream entry as returned by redis-py (bytes keys)."""
+    event = EnhancedEvent(
+        event_id=f"evt_{entry_id.decode()}",
+        event_type=EventType.ONTOLOGY_MODIFIED,
+        timestamp=timestamp or datetime.now(),
+        user_id=user_id,
+        username="tester",
+        project_id=project_id,
+        summary="tester modified ontology",
+        details={},
+        context={},
+    )
+    return entry_id, {b"event": json.dumps(event.to_dict()).encode()}
+
+
+@pytest.fixture
+def mock_redis():
+    redis = AsyncMock()
+    redis.xack = AsyncMock(return_value=1)
+    redis.xadd = AsyncMock(return_value=b"1-0")
+    return redis
+
+
+@pytest.fixture
+def mock_manager():
+    manager = Mock()
+    manager.get_or_create_project_thread = AsyncMock(
+        side_effect=lambda project_id, user_id: {"project_thread_id": f"thread-{project_id}"}
+    )
+    manager.capture_events_bulk = AsyncMock(return_value=[])
+    return manager
+
+
+@pytest.fixture
+def capture(mock_redis, mock_manager):
+    return EventCapture2(redis_client=mock_redis, sql_first_manager=mock_manager)
+
+
+class TestEventCapture2Streams:
+    """Test EventCapture2 stream producer and batch consumer."""
+
+    @pytest.mark.asyncio
+    async def test_store_event_appends_to_stream(self, capture, mock_redis, mock_manager):
+        """Capturing an event is a single XADD, not a synchronous SQL write."""
+        _, fields = make_entry(b"1-0")
+        event = EnhancedEvent.from_dict(json.loads(fields[b"event"]))
+
+        assert await capture._store_event(event) is True
+
+        mock_redis.xadd.assert_awaited_once()
+        assert mock_redis.xadd.call_args.args[0] == capture.event_stream
+        mock_manager.get_or_create_project_thread.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_resolves_each_thread_once_and_bulk_inserts(self, capture, mock_redis, mock_manager):
+        """A batch does one thread lookup per project and one bulk insert."""
+        entries = [
+            make_entry(b"1-0", "proj-1"),
+            make_entry(b"2-0", "proj-1"),
+            make_entry(b"3-0", "proj-2"),
+        ]
+        mock_redis.xreadgroup = AsyncMock(return_value=[[capture.event_stream.encode(), entries]])
+
+        processed = await capture.read_batch("consumer-1", count=10)
+
+        assert processed == 3
+        assert mock_manager.get_or_create_project_thread.await_count == 2
+        mock_manager.capture_events_bulk.assert_awaited_once()
+        rows = mock_manager.capture_events_bulk.call_args.args[0]
+        assert [row["project_thread_id"] for row in rows] == ["thread-proj-1", "thread-proj-1", "thread-proj-2"]
+        mock_redis.xack.assert_awaited_once_with(
+            capture.event_stream, capture.consumer_group, b"1-0", b"2-0", b"3-0"
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_bulk_insert_leaves_entries_pending(self, capture, mock_redis, mock_manager):
+        """Entries are not acknowledged when storage fails, so they can be reclaimed."""
+        mock_redis.xreadgroup = AsyncMock(return_value=[[capture.event_stream.encode(), [make_entry(b"1-0")]]])
+        mock_manager.capture_events_bulk = AsyncMock(side_effect=RuntimeError("db down"))
+
+        processed = await capture.read_batch("consumer-1", count=10)
+
+        assert processed == 0
+        mock_redis.xack.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redelivered_entry_keeps_event_id(self, capture):
+        """SQL event ids derive from the stream entry id so redelivery is idempotent."""
+        assert capture._stream_event_id(b"5-1") == capture._stream_event_id("5-1")
+        assert capture._stream_event_id(b"5-1") != capture._stream_event_id(b"5-2")
+
+    @pytest.mark.asyncio
+    async def test_reclaim_dead_letters_poison_entries(self, capture, mock_redis, mock_manager):
+        """Entries delivered too often go to the dead-letter stream; the rest are retried."""
+        poison, retry = make_entry(b"1-0"), make_entry(b"2-0")
+        mock_redis.xautoclaim = AsyncMock(return_value=[b"0-0", [poison, retry], []])
+        mock_redis.xpending_range = AsyncMock(return_value=[
+            {"message_id": b"1-0", "times_delivered": capture.max_deliveries + 1},
+            {"message_id": b"2-0", "times_delivered": 2},
+        ])
+
+        processed = await capture.reclaim_pending("consumer-2", min_idle_ms=1000)
+
+        assert processed == 1
+        assert mock_redis.xadd.call_args.args[0] == capture.dead_letter_stream
+        acked = [call.args[2:] for call in mock_redis.xack.await_args_list]
+        assert (b"1-0",) in acked and (b"2-0",) in acked
+
+    @pytest.mark.asyncio
+    async def test_events_keep_the_time_they_happened(self, capture, mock_redis, mock_manager):
+        """Late or reclaimed entries are stored with their own timestamp, not the flush time."""
+        happened = datetime.now(timezone.utc) - timedelta(hours=2)
+        mock_redis.xreadgroup = AsyncMock(return_value=[[capture.event_stream.encode(),
+                                                          [make_entry(b"1-0", timestamp=happened)]]])
+
+        await capture.read_batch("consumer-1", count=10)
+
+        rows = mock_manager.capture_events_bulk.call_args.args[0]
+        assert rows[0]["created_at"] == happened
+
+
+class TestBulkEventInsert:
+    """Test insert_project_events_bulk timestamps."""
+
+    def test_created_at_comes_from_the_event_and_last_activity_only_moves_forward(self, monkeypatch):
+        execute_values = Mock(side_effect=[[("e1",), ("e2",), ("e3",)], None])
+        monkeypatch.setattr("psycopg2.extras.execute_values", execute_values)
+        conn = MagicMock()
+        old, new = datetime(2026, 1, 1, 9, tzinfo=timezone.utc), datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        event = {"project_thread_id": "t1", "project_id": "p1", "user_id": "u1", "event_type": "x"}
+
+        event_queries.insert_project_events_bulk(conn, [
+            dict(event, event_id="e1", created_at=new),
+            dict(event, event_id="e2", created_at=old.isoformat()),
+            dict(event, event_id="e3", project_thread_id="t2"),
+        ])
+
+        inserted = execute_values.call_args_list[0].args[2]
+        assert [row[8] for row in inserted[:2]] == [new, old]
+        assert inserted[2][8] >= new  # no timestamp: the flush time
+        sql, activity = execute_values.call_args_list[1].args[1:3]
+        assert "GREATEST(t.last_activity" in sql
+        assert activity[0] == ("t1", new)
+
+
+class TestWorkerShutdown:
+    """Test stopping the stream consumers."""
+
+    @pytest.mark.asyncio
+    async def test_stop_lets_the_batch_in_flight_finish(self, monkeypatch):
+        stored = []
+
+        async def read_batch(consumer, count, block_ms):
+            await asyncio.sleep(0.05)
+            stored.append(consumer)
+            return 1
+
+        event_capture = SimpleNamespace(redis=object(), ensure_consumer_group=AsyncMock(),
+                                        reclaim_pending=AsyncMock(return_value=0), read_batch=read_batch)
+        monkeypatch.setattr("backend.services.eventcapture2.get_event_capture", lambda: event_capture)
+        settings = SimpleNamespace(eventcapture_workers=1, eventcapture_batch_size=10, eventcapture_block_ms=100,
+                                   eventcapture_claim_idle_ms=60000)
+        worker = EventCapture2Worker(redis_client=object(), settings=settings)
+
+        await worker.start()
+        await asyncio.sleep(0.01)
+        await worker.stop()
+
+        assert len(stored) == 1 and worker.worker_tasks == []
@@ -0,0 +1,275 @@
+"""
+Unit tests for federated file and knowledge delivery.
+
+Tests ETag / Last-Modified revalidation, byte ranges, file metadata
+visibility and the per-version knowledge content cache, with the database
+and storage mocked out.
+"""
+
+import uuid
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend.api import federated_access
+from backend.api.federated_access import _parse_range
+
+UPDATED_AT = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+CONTENT = bytes(range(256)) * 4
+
+
+def make_request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def make_db(fetchone=None, fetchall=None, description=None):
+    cur = MagicMock()
+    cur.fetchone.return_value = fetchone
+    cur.fetchall.return_value = fetchall or []
+    cur.description = description
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    db = MagicMock()
+    db._conn.return_value = conn
+    return db, cur
+
+
+class FakeStorage:
+    """Storage service recording which byte ranges were read."""
+
+    def __init__(self, content=CONTENT):
+        self.content = content
+        self.reads = []
+
+    async def iter_file(self, file_id, start=0, end=None, chunk_size=100):
+        self.reads.append((start, end))
+        data = self.content[start:None if end is None else end + 1]
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+
+def file_row(visibility="public"):
+    return {
+        "id": "f1", "filename": "spec.pdf", "content_type": "application/pdf",
+        "file_size": len(CONTENT), "hash_sha256": "abc123", "created_at": UPDATED_AT,
+        "updated_at": UPDATED_AT, "iri": "iri:f1", "tags": None, "visibility": visibility,
+    }
+
+
+async def body_of(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+
+    @pytest.mark.parametrize("header,expected", [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=1000-", (1000, 1023)),
+        ("bytes=-24", (1000, 1023)),
+        ("bytes=1000-5000", (1000, 1023)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        (None, None),
+    ])
+    def test_ranges(self, header, expected):
+        assert _parse_range(header, 1024) == expected
+
+    def test_unsatisfiable_range(self):
+        with pytest.raises(HTTPException) as exc:
+            _parse_range("bytes=2048-", 1024)
+        assert exc.value.status_code == 416
+        assert exc.value.headers["Content-Range"] == "bytes */1024"
+
+
+class TestFederatedDownload:
+    """Test conditional and ranged file downloads."""
+
+    @pytest.mark.asyncio
+    async def test_full_download_has_validators(self):
+        db, _ = make_db(fetchone=file_row())
+        storage = FakeStorage()
+
+        response = await federated_access.federated_download_file(str(uuid.uuid4()), make_request(), storage, db)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["last-modified"] == "Thu, 02 Jan 2025 03:04:05 GMT"
+        assert response.headers["accept-ranges"] == "bytes"
+        assert "max-age" in response.headers["cache-control"]
+        assert await body_of(response) == CONTENT
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [
+        {"if_none_match": 'W/"other", "abc123"'},
+        {"if_modified_since": "Thu, 02 Jan 2025 03:04:05 GMT"},
+    ])
+    async def test_not_modified_skips_storage(self, headers):
+        db, _ = make_db(fetchone=file_row())
+        storage = FakeStorage()
+
+        response = await federated_access.federated_download_file(str(uuid.uuid4()), make_request(**headers), storage, db)
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123"'
+        assert storage.reads == []
+
+    @pytest.mark.asyncio
+    async def test_changed_etag_is_not_304(self):
+        db, _ = make_db(fetchone=file_row())
+        request = make_request(if_none_match='"stale"', if_modified_since="Thu, 02 Jan 2025 03:04:05 GMT")
+
+        response = await federated_access.federated_download_file(str(uuid.uuid4()), request, FakeStorage(), db)
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_range_request_reads_only_range(self):
+        db, _ = make_db(fetchone=file_row())
+        storage = FakeStorage()
+
+        response = await federated_access.federated_download_file(
+            str(uuid.uuid4()), make_request(range="bytes=10-19"), storage, db
+        )
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+        assert response.headers["content-length"] == "10"
+        assert await body_of(response) == CONTENT[10:20]
+        assert storage.reads == [(10, 19)]
+
+    @pytest.mark.asyncio
+    async def test_if_range_mismatch_serves_full_file(self):
+        db, _ = make_db(fetchone=file_row())
+
+        response = await federated_access.federated_download_file(
+            str(uuid.uuid4()), make_request(range="bytes=10-19", if_range='"old"'), FakeStorage(), db
+        )
+
+        assert response.status_code == 200
+        assert await body_of(response) == CONTENT
+
+    @pytest.mark.asyncio
+    async def test_private_and_missing_files(self):
+        db, _ = make_db(fetchone=file_row(visibility="private"))
+        with pytest.raises(HTTPException) as exc:
+            await federated_access.federated_download_file(str(uuid.uuid4()), make_request(), FakeStorage(), db)
+        assert exc.value.status_code == 403
+
+        db, _ = make_db(fetchone=file_row())
+        with pytest.raises(HTTPException) as exc:
+            await federated_access.federated_download_file(str(uuid.uuid4()), make_request(), FakeStorage(b""), db)
+        assert exc.value.status_code == 404
+
+
+class TestFederatedFileMetadata:
+    """Test public file metadata."""
+
+    @pytest.fixture
+    def iri_services(self, monkeypatch):
+        calls = []
+
+        def get_installation_iri_service(settings=None, db_service=None):
+            calls.append(db_service)
+            return SimpleNamespace(
+                settings=SimpleNamespace(installation_name="odras", installation_type="usn",
+                                         installation_organization="Org", authority_contact="ops@org",
+                                         installation_program_office="PO"),
+                installation_base_uri="https://org.example",
+            )
+
+        monkeypatch.setattr(federated_access, "get_installation_iri_service", get_installation_iri_service)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_visibility_comes_from_file_metadata(self, iri_services):
+        db, _ = make_db(fetchone=file_row())
+
+        metadata = await federated_access.federated_get_file_metadata(str(uuid.uuid4()), db)
+
+        assert metadata["file_id"] == "f1" and metadata["size"] == len(CONTENT)
+        assert metadata["iri"] == "iri:f1" and metadata["tags"] == {}
+        assert metadata["installation"] == {"organization": "Org", "contact": "ops@org",
+                                            "base_uri": "https://org.example"}
+        assert iri_services == [db]  # built on the shared pool
+
+        db, _ = make_db(fetchone=file_row(visibility="private"))
+        with pytest.raises(HTTPException) as exc:
+            await federated_access.federated_get_file_metadata(str(uuid.uuid4()), db)
+        assert exc.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_discovery_uses_the_shared_pool(self, iri_services):
+        db, _ = make_db()
+
+        result = await federated_access.discover_installation(db)
+
+        assert result["installation"]["base_uri"] == "https://org.example"
+        assert iri_services == [db]
+
+
+class TestFederatedKnowledgeContent:
+    """Test knowledge content revalidation and caching."""
+
+    COLUMNS = ["id", "iri", "title", "document_type", "status", "traceability_status", "created_at",
+               "updated_at", "version", "source_filename", "chunk_count", "chunks_changed_at"]
+
+    def asset_row(self, version="1.0.0"):
+        return ("a1", "iri:a1", "Spec", "specification", "active", "linked", UPDATED_AT,
+                UPDATED_AT, version, "spec.pdf", 2, UPDATED_AT)
+
+    def make_db(self, version="1.0.0"):
+        return make_db(
+            fetchone=self.asset_row(version),
+            fetchall=[("first", "text", 0, 3, {}), ("second", "text", 1, 4, None)],
+            description=[(c,) for c in self.COLUMNS],
+        )
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        federated_access._knowledge_content_cache.clear()
+        yield
+        federated_access._knowledge_content_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_content_is_assembled_once_per_version(self):
+        asset_id = str(uuid.uuid4())
+        db, cur = self.make_db()
+
+        first = await federated_access.federated_get_knowledge_content(asset_id, make_request(), db)
+        second = await federated_access.federated_get_knowledge_content(asset_id, make_request(), db)
+
+        assert first.status_code == second.status_code == 200
+        assert b'"content":"first\\n\\nsecond"' in first.body
+        assert b'"total_tokens":7' in first.body
+        assert cur.fetchall.call_count == 1
+        assert first.headers["etag"] == second.headers["etag"]
+
+        db, cur = self.make_db(version="1.0.1")
+        third = await federated_access.federated_get_knowledge_content(asset_id, make_request(), db)
+
+        assert cur.fetchall.call_count == 1
+        assert third.headers["etag"] != first.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_returns_304_without_chunks(self):
+        asset_id = str(uuid.uuid4())
+        db, _ = self.make_db()
+        first = await federated_access.federated_get_knowledge_content(asset_id, make_request(), db)
+
+        db, cur = self.make_db()
+        response = await federated_access.federated_get_knowledge_content(
+            asset_id, make_request(if_none_match=first.headers["etag"]), db
+        )
+
+        assert response.status_code == 304
+        cur.fetchall.assert_not_called()
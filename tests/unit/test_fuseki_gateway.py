@@ -0,0 +1,229 @@
+"""
+Unit tests for the shared Fuseki gateway.
+
+Tests the versioned result cache, Graph Store Protocol writes, concurrency
+caps, the HTTP transport and client lifecycle against the in-memory rdflib
+stand-in and a mocked httpx transport.
+"""
+
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+
+import httpx
+
+from backend.services import fuseki_gateway
+from backend.services.fuseki_gateway import (
+    FusekiGateway,
+    InMemoryFusekiGateway,
+    close_fuseki_gateways,
+    get_fuseki_gateway,
+    set_fuseki_gateway,
+)
+
+GRAPH = "http://example.org/g1"
+CLASSES = f"SELECT ?c WHERE {{ GRAPH <{GRAPH}> {{ ?c a <http://www.w3.org/2002/07/owl#Class> }} }}"
+
+
+def insert_class(name):
+    return (f"INSERT DATA {{ GRAPH <{GRAPH}> {{ <http://example.org/{name}> a "
+            f"<http://www.w3.org/2002/07/owl#Class> }} }}")
+
+
+def class_names(result):
+    return sorted(b["c"]["value"].rsplit("/", 1)[-1] for b in result["results"]["bindings"])
+
+
+class TestResultCache:
+    """Test caching of read queries keyed by dataset version."""
+
+    def test_repeated_query_is_served_from_cache(self):
+        gateway = InMemoryFusekiGateway()
+        gateway.update(insert_class("A"))
+
+        first = gateway.query(CLASSES)
+        second = gateway.query(CLASSES)
+
+        assert class_names(first) == class_names(second) == ["A"]
+        assert gateway.requests == 2  # one update, one query
+        assert gateway.cache_stats()["hits"] == 1
+
+    def test_update_invalidates_cached_results(self):
+        gateway = InMemoryFusekiGateway()
+        gateway.update(insert_class("A"))
+        gateway.query(CLASSES)
+
+        gateway.update(insert_class("B"))
+
+        assert class_names(gateway.query(CLASSES)) == ["A", "B"]
+        assert gateway.cache_stats()["version"] == 2
+
+    def test_cached_results_are_not_shared_between_callers(self):
+        gateway = InMemoryFusekiGateway()
+        gateway.update(insert_class("A"))
+
+        gateway.query(CLASSES)["results"]["bindings"].clear()
+
+        assert class_names(gateway.query(CLASSES)) == ["A"]
+
+    def test_result_from_before_a_write_is_not_cached(self):
+        gateway = InMemoryFusekiGateway()
+        key = gateway._cache_key(CLASSES, fuseki_gateway.SPARQL_JSON)
+        started_at = gateway.version
+
+        gateway.invalidate()  # a write completes while the query is in flight
+        gateway._cache_put(key, started_at, b"{}")
+
+        assert gateway.cache_stats()["entries"] == 0
+
+    def test_lru_is_bounded(self):
+        gateway = InMemoryFusekiGateway(cache_entries=2)
+
+        for n in range(3):
+            gateway.query(f"ASK {{ ?s ?p {n} }}")
+
+        assert gateway.cache_stats()["entries"] == 2
+
+    def test_failed_update_still_invalidates(self):
+        gateway = InMemoryFusekiGateway()
+        gateway.query(CLASSES)
+
+        with pytest.raises(Exception):
+            gateway.update("NOT SPARQL")
+
+        assert gateway.cache_stats()["entries"] == 0
+
+
+class TestGraphStore:
+    """Test Graph Store Protocol writes and reads."""
+
+    def test_put_replaces_named_graph(self):
+        gateway = InMemoryFusekiGateway()
+        gateway.put_graph("<http://example.org/A> a <http://www.w3.org/2002/07/owl#Class> .", graph=GRAPH)
+        gateway.query(CLASSES)
+
+        gateway.put_graph("<http://example.org/B> a <http://www.w3.org/2002/07/owl#Class> .", graph=GRAPH)
+
+        assert class_names(gateway.query(CLASSES)) == ["B"]
+        assert "http://example.org/B" in gateway.get_graph(GRAPH)
+
+    @pytest.mark.asyncio
+    async def test_async_post_adds_to_graph(self):
+        gateway = InMemoryFusekiGateway()
+        await gateway.aput_graph("<http://example.org/A> a <http://www.w3.org/2002/07/owl#Class> .", graph=GRAPH)
+        await gateway.apost_graph("<http://example.org/B> a <http://www.w3.org/2002/07/owl#Class> .", graph=GRAPH)
+
+        assert class_names(await gateway.aquery(CLASSES)) == ["A", "B"]
+
+
+class TestConcurrency:
+    """Test the per-dataset cap on in-flight requests."""
+
+    @pytest.mark.asyncio
+    async def test_async_requests_are_capped(self):
+        in_flight = []
+        peak = []
+
+        class SlowGateway(InMemoryFusekiGateway):
+            async def _asend_query(self, sparql, accept, timeout):
+                in_flight.append(1)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.pop()
+                return json.dumps({"boolean": True}).encode()
+
+        gateway = SlowGateway(max_concurrency=2)
+
+        await asyncio.gather(*(gateway.aquery("ASK {}", use_cache=False) for _ in range(8)))
+
+        assert max(peak) == 2
+
+
+class TestHttpTransport:
+    """Test requests sent to Fuseki over the pooled client."""
+
+    def make_gateway(self, handler):
+        gateway = FusekiGateway("http://fuseki:3030/odras/")
+        gateway._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return gateway
+
+    def test_query_and_update_endpoints(self):
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, str(request.url), request.headers["content-type"]))
+            return httpx.Response(200, json={"head": {"vars": []}, "results": {"bindings": []}})
+
+        gateway = self.make_gateway(handler)
+        gateway.query("SELECT * WHERE { ?s ?p ?o }")
+        gateway.update("CLEAR DEFAULT")
+        gateway.put_graph("<a:b> <a:c> <a:d> .", graph="http://example.org/g")
+
+        assert seen == [
+            ("POST", "http://fuseki:3030/odras/query", "application/sparql-query"),
+            ("POST", "http://fuseki:3030/odras/update", "application/sparql-update"),
+            ("PUT", "http://fuseki:3030/odras/data?graph=http%3A%2F%2Fexample.org%2Fg", "text/turtle"),
+        ]
+
+    def test_http_errors_propagate(self):
+        gateway = self.make_gateway(lambda request: httpx.Response(400, text="Parse error"))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            gateway.query("SELECT")
+        assert gateway.cache_stats()["entries"] == 0
+
+
+class TestClientLifecycle:
+    """Test that pooled async clients are closed."""
+
+    @pytest.mark.asyncio
+    async def test_client_of_a_previous_loop_is_closed(self):
+        gateway = FusekiGateway("http://fuseki:3030/odras")
+
+        async def first_client():
+            return gateway._async_state()[0]
+
+        stale = await asyncio.to_thread(asyncio.run, first_client())
+        current, _ = gateway._async_state()
+        await asyncio.gather(*gateway._closing)
+
+        assert stale is not current and stale.is_closed and not current.is_closed
+        await gateway.aclose()
+        assert current.is_closed
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_every_shared_gateway(self, monkeypatch):
+        monkeypatch.setattr(fuseki_gateway, "_gateways", {})
+        settings = SimpleNamespace(fuseki_url="http://fuseki:3030/odras")
+        gateways = [get_fuseki_gateway(url, settings) for url in ("http://fuseki:3030/a", "http://fuseki:3030/b")]
+        clients = [gateway._async_state()[0] for gateway in gateways]
+        gateways[0]._sync_client()
+
+        assert await close_fuseki_gateways() == 2
+
+        assert all(client.is_closed for client in clients)
+        assert gateways[0]._client is None and gateways[0]._async_client is None
+
+
+class TestRegistry:
+    """Test process-wide gateway lookup."""
+
+    def test_one_gateway_per_dataset(self, monkeypatch):
+        monkeypatch.setattr(fuseki_gateway, "_gateways", {})
+        settings = SimpleNamespace(fuseki_url="http://fuseki:3030/odras", fuseki_user="u", fuseki_password="p",
+                                   fuseki_max_concurrency=3)
+
+        gateway = get_fuseki_gateway(settings=settings)
+
+        assert get_fuseki_gateway("http://fuseki:3030/odras/", settings) is gateway
+        assert get_fuseki_gateway("http://fuseki:3030/other", settings) is not gateway
+        assert gateway.auth == ("u", "p") and gateway.max_concurrency == 3
+
+    def test_override_applies_to_every_dataset(self):
+        stand_in = InMemoryFusekiGateway()
+        set_fuseki_gateway(stand_in)
+        try:
+            assert get_fuseki_gateway("http://anything:3030/ds") is stand_in
+        finally:
+            set_fuseki_gateway(None)
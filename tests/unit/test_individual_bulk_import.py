@@ -0,0 +1,281 @@
+"""
+Unit tests for streaming bulk import of ontology individuals.
+
+Tests source parsing and mapping, cached class constraints, literal escaping
+and typing, and chunked writes (one execute_values insert and one INSERT DATA
+per chunk) with per-row errors, duplicates, Fuseki failures and progress,
+against an in-memory Fuseki gateway and a fake database connection.
+"""
+
+import io
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from rdflib import Literal, URIRef
+
+from backend.services import individual_bulk_import as bulk
+from backend.services.fuseki_gateway import InMemoryFusekiGateway
+from backend.services.individual_bulk_import import (
+    ClassConstraintCache,
+    IndividualBulkImporter,
+    iter_source_rows,
+    map_row,
+    sparql_literal,
+)
+
+GRAPH = "http://example.org/projects/p1/ontologies/uav"
+
+STRUCTURE = {
+    "datatype_properties": [
+        {"name": "serialNumber", "domain": "Aircraft", "range": "xsd:string",
+         "constraints": {"min_count": 1}},
+        {"name": "wingspan", "domain": "Aircraft", "range": "xsd:decimal"},
+        {"name": "engines", "domain": "Aircraft", "range": "xsd:integer"},
+        {"name": "payload", "domain": "Sensor", "range": "xsd:integer", "constraints": {"min_count": 1}},
+    ],
+}
+
+
+class FakeConnection:
+    """psycopg2 connection over the individuals tables, with transactions"""
+
+    def __init__(self, structure=STRUCTURE):
+        self.structure = structure
+        self.table = None
+        self.instances = {}  # (class_name, instance_name) -> row, committed
+        self.pending = {}
+        self.history = []
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        conn = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=()):
+                self.result = conn.execute(sql, params)
+
+            def fetchone(self):
+                return self.result
+
+        return Cursor()
+
+    def execute(self, sql, params):
+        if "SELECT table_id, updated_at" in sql:
+            return self.table
+        if "INSERT INTO individual_tables_config" in sql:
+            self.table = ("table-1", datetime(2026, 1, 1, tzinfo=timezone.utc))
+            return self.table
+        if "SELECT ontology_structure" in sql:
+            return (self.structure,)
+        if "INSERT INTO individual_import_history" in sql:
+            return ("import-1",)
+        if "UPDATE individual_import_history" in sql:
+            self.history.append(params[:4])
+            return None
+        raise AssertionError(sql)
+
+    def insert(self, rows):
+        inserted = []
+        for table_id, class_name, name, uri, properties, *_ in rows:
+            key = (class_name, name)
+            if key not in self.instances and key not in self.pending:
+                self.pending[key] = (uri, properties)
+                inserted.append((uri,))
+        return inserted
+
+    def commit(self):
+        self.instances.update(self.pending)
+        self.pending.clear()
+        self.commits += 1
+
+    def rollback(self):
+        self.pending.clear()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def conn():
+    return FakeConnection()
+
+
+@pytest.fixture
+def inserts(monkeypatch, conn):
+    calls = []
+
+    def execute_values(cur, sql, rows, page_size=None, fetch=False):
+        calls.append(len(rows))
+        assert page_size == len(rows)
+        return conn.insert(rows)
+
+    monkeypatch.setattr(bulk, "execute_values", execute_values)
+    return calls
+
+
+def make_importer(conn, gateway=None, batch_size=1000, **settings):
+    settings = SimpleNamespace(individual_import_batch_size=batch_size, individual_import_max_errors=100,
+                               **settings)
+    return IndividualBulkImporter(settings, connect=lambda: conn, gateway=gateway or InMemoryFusekiGateway(),
+                                  constraint_cache=ClassConstraintCache())
+
+
+def aircraft(n, **extra):
+    return dict({"Name": f"UAV-{n}", "Serial": f"SN{n}", "Span": "12.5", "Engines": "2"}, **extra)
+
+
+MAPPING = {"Name": "name", "Serial": "serialNumber", "Span": "wingspan", "Engines": "engines"}
+
+
+def individuals(gateway):
+    graph = gateway.dataset.graph(URIRef(GRAPH))
+    return set(graph.subjects(URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type"),
+                              URIRef(GRAPH + "#Aircraft")))
+
+
+class TestSourcesAndMapping:
+    """Test row sources and the mapping configuration."""
+
+    def test_csv_json_and_jsonl_sources(self):
+        csv_text = "Name,Serial\nUAV-1,SN1\nUAV-2,SN2\n"
+
+        assert list(iter_source_rows(csv_text, "csv")) == [{"Name": "UAV-1", "Serial": "SN1"},
+                                                            {"Name": "UAV-2", "Serial": "SN2"}]
+        assert list(iter_source_rows(io.BytesIO(b"\xef\xbb\xbf" + csv_text.encode()), "csv"))[0]["Name"] == "UAV-1"
+        assert list(iter_source_rows('[{"a": 1}, {"a": 2}]', "json")) == [{"a": 1}, {"a": 2}]
+        assert list(iter_source_rows(b'{"a": 1}\n\n{"a": 2}\n', "jsonl")) == [{"a": 1}, {"a": 2}]
+        with pytest.raises(ValueError):
+            list(iter_source_rows("", "xml"))
+
+    def test_mapping_names_the_individual_and_drops_empty_values(self):
+        name, properties = map_row({"Name": " UAV-1 ", "Serial": "", "Span": "3"}, MAPPING)
+
+        assert name == "UAV-1" and properties == {"wingspan": "3"}
+        assert map_row({"name": "a", "x": 1}, {}) == ("a", {"x": 1})
+
+    def test_literals_are_escaped_and_typed(self):
+        assert sparql_literal('say "hi"\nbye\\') == '"say \\"hi\\"\\nbye\\\\"'
+        assert sparql_literal("2", "integer") == f'"2"^^<{bulk.XSD}integer>'
+        assert sparql_literal(0.00001, "decimal") == f'"0.00001"^^<{bulk.XSD}decimal>'
+        assert sparql_literal(False) == f'"false"^^<{bulk.XSD}boolean>'
+
+
+class TestBulkImport:
+    """Test chunked, validated writes to Postgres and Fuseki."""
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_in_one_insert_and_one_update_per_chunk(self, conn, inserts):
+        gateway = InMemoryFusekiGateway()
+        importer = make_importer(conn, gateway, batch_size=10)
+
+        result = await importer.import_rows("p1", GRAPH, "Aircraft", (aircraft(n) for n in range(25)), MAPPING)
+
+        assert result["status"] == "completed"
+        assert (result["processed"], result["imported"], result["failed"]) == (25, 25, 0)
+        assert inserts == [10, 10, 5] and gateway.requests == 3
+        assert len(individuals(gateway)) == 25 and len(conn.instances) == 25
+        assert conn.instances[("Aircraft", "UAV-3")][1] == '{"serialNumber": "SN3", "wingspan": 12.5, "engines": 2}'
+        assert conn.history[-1] == (25, 25, 0, "completed") and conn.closed
+
+        subject = next(iter(individuals(gateway)))
+        graph = gateway.dataset.graph(URIRef(GRAPH))
+        assert graph.value(subject, URIRef(GRAPH + "#engines")) == Literal(2)
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_are_reported_and_the_rest_imported(self, conn, inserts):
+        rows = [
+            aircraft(1),
+            aircraft(2, Serial=""),
+            aircraft(3, Engines="two"),
+            aircraft(4, Span="wide"),
+            {"Serial": "SN5"},
+            aircraft(6, Name='Quote "6"'),
+        ]
+
+        result = await make_importer(conn).import_rows("p1", GRAPH, "Aircraft", rows, MAPPING)
+
+        assert result["status"] == "partial" and result["imported"] == 2
+        assert [(e["row"], e["name"]) for e in result["errors"]] == [
+            (2, "UAV-2"), (3, "UAV-3"), (4, "UAV-4"), (5, None)
+        ]
+        assert result["errors"][0]["errors"] == ["Field 'serialNumber' is required"]
+        assert "invalid integer" in result["errors"][1]["errors"][0]
+
+    @pytest.mark.asyncio
+    async def test_existing_names_are_skipped_in_both_stores(self, conn, inserts):
+        gateway = InMemoryFusekiGateway()
+        importer = make_importer(conn, gateway)
+        await importer.import_rows("p1", GRAPH, "Aircraft", [aircraft(1)], MAPPING)
+
+        result = await importer.import_rows("p1", GRAPH, "Aircraft", [aircraft(1), aircraft(2), aircraft(2)], MAPPING)
+
+        assert result["imported"] == 1 and [e["row"] for e in result["errors"]] == [1, 3]
+        assert "already exists" in result["errors"][0]["errors"][0]
+        assert len(individuals(gateway)) == 2
+
+    @pytest.mark.asyncio
+    async def test_a_failed_fuseki_update_rolls_back_its_chunk(self, conn, inserts):
+        gateway = InMemoryFusekiGateway()
+        importer = make_importer(conn, gateway, batch_size=2)
+        gateway.aupdate = AsyncMock(side_effect=[None, RuntimeError("fuseki down"), None])
+
+        result = await importer.import_rows("p1", GRAPH, "Aircraft", [aircraft(n) for n in range(5)], MAPPING)
+
+        assert result["imported"] == 3 and result["failed"] == 2
+        assert sorted(name for _, name in conn.instances) == ["UAV-0", "UAV-1", "UAV-4"]
+        assert result["errors"][0]["errors"] == ["Import failed: fuseki down"]
+
+    @pytest.mark.asyncio
+    async def test_progress_is_reported_after_every_chunk(self, conn, inserts):
+        progress = []
+
+        await make_importer(conn, batch_size=2).import_rows(
+            "p1", GRAPH, "Aircraft", [aircraft(n) for n in range(5)], MAPPING, progress=progress.append
+        )
+
+        assert [(p["processed"], p["imported"], p["status"]) for p in progress] == [
+            (2, 2, "pending"), (4, 4, "pending"), (5, 5, "completed")
+        ]
+        assert [h[0] for h in conn.history] == [2, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_unreadable_source_fails_the_import(self, conn, inserts):
+        with pytest.raises(ValueError):
+            await make_importer(conn).import_rows(
+                "p1", GRAPH, "Aircraft", iter_source_rows('{"Name": ', "json"), MAPPING
+            )
+
+        assert conn.history[-1][3] == "failed" and conn.closed
+
+
+class TestConstraintCache:
+    """Test reuse of analyzed class constraints."""
+
+    @pytest.mark.asyncio
+    async def test_constraints_are_analyzed_once_per_structure_version(self, conn, inserts, monkeypatch):
+        analyze = Mock(wraps=bulk.ConstraintAnalyzer().analyze_property_constraints)
+        importer = make_importer(conn)
+        monkeypatch.setattr(importer.analyzer, "analyze_property_constraints", analyze)
+
+        for n in range(3):
+            await importer.import_rows("p1", GRAPH, "Aircraft", [aircraft(n)], MAPPING)
+        assert analyze.call_count == 1
+
+        conn.table = ("table-1", datetime(2026, 2, 1, tzinfo=timezone.utc))
+        await importer.import_rows("p1", GRAPH, "Aircraft", [aircraft(9)], MAPPING)
+        assert analyze.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_only_properties_of_the_target_class_apply(self, conn, inserts):
+        result = await make_importer(conn).import_rows("p1", GRAPH, "Sensor", [{"name": "camera"}], {})
+
+        assert result["errors"][0]["errors"] == ["Field 'payload' is required"]
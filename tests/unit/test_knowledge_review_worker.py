@@ -42,30 +42,68 @@ class TestKnowledgeReviewWorker:
     
     @pytest.mark.asyncio
     async def test_handle_chunk_access_event(self, worker):
-        """Test handling chunk access event."""
+        """Test chunk access events are buffered instead of written per event."""
+        chunk_id = "6f1c1c7e-6a4f-4b4e-9a55-2f7f4d1a0b01"
+        event = {
+            "type": "knowledge.chunk.accessed",
+            "payload": {"chunk_id": chunk_id},
+        }
+        
+        await worker._handle_event(event)
+        await worker._handle_event(event)
+        
+        worker.db_service._conn.assert_not_called()
+        assert worker.access_aggregator.pending == 1
+        assert worker.access_aggregator._counts[chunk_id] == 2
+    
+    @pytest.mark.asyncio
+    async def test_access_flush_writes_one_batched_increment(self, worker):
+        """Test flushing aggregated access counts as a single upsert batch."""
         mock_conn = Mock()
         mock_cursor = Mock()
-        
-        # Setup context manager for cursor
         mock_cursor.__enter__ = Mock(return_value=mock_cursor)
         mock_cursor.__exit__ = Mock(return_value=None)
         mock_conn.cursor.return_value = mock_cursor
-        
-        # Mock metadata query
-        mock_cursor.fetchone.return_value = ({"access_count": 5},)
-        mock_cursor.execute.return_value = None
-        
         worker.db_service._conn.return_value = mock_conn
         
-        event = {
-            "type": "knowledge.chunk.accessed",
-            "payload": {"chunk_id": "test-chunk-id"},
-        }
+        chunk_a = "6f1c1c7e-6a4f-4b4e-9a55-2f7f4d1a0b01"
+        chunk_b = "0a6b8c9d-1e2f-4a3b-8c4d-5e6f7a8b9c0d"
+        for chunk_id in (chunk_a, chunk_b, chunk_a, chunk_a):
+            worker.access_aggregator.record(chunk_id)
+        
+        with patch("backend.workers.knowledge_review_worker.execute_values") as mock_execute_values:
+            flushed = await worker.access_aggregator.flush()
+        
+        assert flushed == 2
+        mock_execute_values.assert_called_once()
+        sql, rows = mock_execute_values.call_args.args[1:3]
+        assert "access_count = chunk_access_stats.access_count + EXCLUDED.access_count" in sql
+        assert [(row[0], row[1]) for row in rows] == [(chunk_b, 1), (chunk_a, 3)]
+        mock_conn.commit.assert_called_once()
+        assert worker.access_aggregator.pending == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_access_flush_keeps_counts(self, worker):
+        """Test counts survive a failed flush and are retried."""
+        worker.db_service._conn.side_effect = Exception("database unavailable")
+        chunk_id = "6f1c1c7e-6a4f-4b4e-9a55-2f7f4d1a0b01"
+        worker.access_aggregator.record(chunk_id)
         
-        await worker._handle_event(event)
+        assert await worker.access_aggregator.flush() == 0
         
-        # Verify metadata was updated
-        assert mock_cursor.execute.call_count >= 1
+        worker.access_aggregator.record(chunk_id)
+        assert worker.access_aggregator._counts[chunk_id] == 2
+        assert worker.access_aggregator.metrics["flush_errors"] == 1
+    
+    def test_full_access_buffer_requests_early_flush(self, worker):
+        """Test reaching max_pending wakes the flush loop."""
+        worker.access_aggregator.max_pending = 2
+        worker.access_aggregator.record("6f1c1c7e-6a4f-4b4e-9a55-2f7f4d1a0b01")
+        assert not worker.access_aggregator.flush_requested.is_set()
+        
+        worker.access_aggregator.record("0a6b8c9d-1e2f-4a3b-8c4d-5e6f7a8b9c0d")
+        assert worker.access_aggregator.flush_requested.is_set()
+        assert not worker.access_aggregator.record("not-a-uuid")
     
     @pytest.mark.asyncio
     async def test_review_by_domain(self, worker):
@@ -0,0 +1,205 @@
+"""
+Unit tests for concurrent multi-persona requirement analysis in LLMTeam.
+
+Uses a fake LLM with fixed latency to test concurrent persona calls, the
+global concurrency limit, streamed results, the deterministic-call cache and
+the speedup over sequential analysis; also covers the Camunda LLM task.
+"""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+
+from backend.services import camunda_tasks
+from backend.services.llm_team import AnalysisCache, LLMTeam, get_llm_limit
+
+PERSONAS = [
+    {"name": "Extractor", "system_prompt": "extract"},
+    {"name": "Reviewer", "system_prompt": "review"},
+]
+
+
+class FakeLLMTeam(LLMTeam):
+    """LLMTeam whose model calls sleep for `latency` and record concurrency"""
+
+    def __init__(self, latency=0.02, max_concurrency=8, temperature=0.2, fail_on=None):
+        settings = SimpleNamespace(llm_provider="fake", llm_model="fake-1", llm_max_concurrency=max_concurrency,
+                                   llm_analysis_temperature=temperature)
+        super().__init__(settings, cache=AnalysisCache())
+        self.latency = latency
+        self.fail_on = fail_on
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def _call_model(self, requirement_text, system_prompt, schema):
+        self.calls.append((requirement_text, system_prompt))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        if requirement_text == self.fail_on:
+            raise RuntimeError("model unavailable")
+        return {"text": requirement_text, "persona": system_prompt, system_prompt: True}
+
+
+def requirements(count):
+    return [f"The system shall meet requirement {n}." for n in range(count)]
+
+
+async def sequential(team, texts, iterations):
+    """The previous behaviour: one requirement, iteration and persona at a time"""
+    results = []
+    for _ in range(iterations):
+        for text in texts:
+            outputs = []
+            for name, system in team.personas(PERSONAS):
+                outputs.append(await team._call_model(text, system, {}))
+            results.append(team._merge_json(outputs))
+    return results
+
+
+class TestConcurrentAnalysis:
+    """Test persona fan-out, limits and streaming."""
+
+    @pytest.mark.asyncio
+    async def test_personas_run_concurrently_and_merge_in_persona_order(self):
+        team = FakeLLMTeam(latency=0.05)
+
+        started = time.perf_counter()
+        merged = await team.analyze_requirement("req", {}, custom_personas=PERSONAS)
+
+        assert time.perf_counter() - started < 0.09
+        assert team.peak == 2
+        assert merged == {"text": "req", "persona": "extract", "extract": True, "review": True}
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_the_global_concurrency_limit(self):
+        team = FakeLLMTeam(latency=0.01, max_concurrency=5)
+        texts = requirements(10)
+
+        items = [item async for item in team.analyze_requirements(texts, {}, 3, PERSONAS)]
+
+        assert sorted((i["requirement_index"], i["iteration"]) for i in items) == [
+            (r, i) for r in range(10) for i in range(3)
+        ]
+        assert len(team.calls) == 60 and team.peak == 5
+        assert all(item["result"]["text"] == texts[item["requirement_index"]] for item in items)
+
+    @pytest.mark.asyncio
+    async def test_teams_share_one_limit_per_process(self):
+        first, second = FakeLLMTeam(latency=0.01, max_concurrency=3), FakeLLMTeam(latency=0.01, max_concurrency=3)
+        active, peak = 0, 0
+
+        async def call_model(requirement_text, system_prompt, schema):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"text": requirement_text}
+
+        first._call_model = second._call_model = call_model
+
+        async def drain(team):
+            return [item async for item in team.analyze_requirements(requirements(5), {}, 1, PERSONAS)]
+
+        batches = await asyncio.gather(drain(first), drain(second))
+
+        assert [len(items) for items in batches] == [5, 5]
+        assert peak == 3
+        assert first._limit() is second._limit() is get_llm_limit()
+
+    @pytest.mark.asyncio
+    async def test_results_stream_before_the_batch_finishes(self):
+        team = FakeLLMTeam(latency=0.01, max_concurrency=2)
+
+        stream = team.analyze_requirements(requirements(20), {}, 1, PERSONAS)
+        first = await stream.__anext__()
+        calls_at_first_result = len(team.calls)
+        await stream.aclose()
+
+        assert "result" in first and calls_at_first_result < 40
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_is_reported_per_item(self):
+        team = FakeLLMTeam(latency=0, fail_on="bad")
+
+        items = [item async for item in team.analyze_requirements(["good", "bad"], {}, 1, PERSONAS)]
+
+        by_index = {item["requirement_index"]: item for item in items}
+        assert "result" in by_index[0] and by_index[1]["error"] == "model unavailable"
+
+    @pytest.mark.asyncio
+    async def test_speedup_over_sequential_analysis(self):
+        texts = requirements(20)
+        latency, iterations = 0.01, 3
+
+        started = time.perf_counter()
+        baseline = await sequential(FakeLLMTeam(latency=latency), texts, iterations)
+        sequential_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        items = [i async for i in FakeLLMTeam(latency=latency, max_concurrency=40).analyze_requirements(
+            texts, {}, iterations, PERSONAS)]
+        concurrent_s = time.perf_counter() - started
+
+        assert len(items) == len(baseline) == 60
+        # 120 calls of 10ms each: ~1.2s sequentially, a few rounds of 40 concurrently
+        assert sequential_s / concurrent_s > 5
+
+
+class TestAnalysisCache:
+    """Test caching of deterministic calls."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_calls_are_made_once_per_text_persona_and_schema(self):
+        team = FakeLLMTeam(latency=0.01, temperature=0)
+        texts = requirements(4)
+
+        first = [i async for i in team.analyze_requirements(texts, {"type": "object"}, 5, PERSONAS)]
+        assert len(first) == 20 and len(team.calls) == 8  # concurrent duplicates share one call
+
+        again = [i async for i in team.analyze_requirements(texts, {"type": "object"}, 2, PERSONAS)]
+        assert len(again) == 8 and len(team.calls) == 8
+        assert team.cache.stats["hits"] >= 8
+
+        await team.analyze_requirement(texts[0], {"type": "array"}, custom_personas=PERSONAS)
+        assert len(team.calls) == 10  # a different schema is a different call
+
+    @pytest.mark.asyncio
+    async def test_sampled_calls_and_error_placeholders_are_not_cached(self):
+        team = FakeLLMTeam(latency=0)
+        await team.analyze_requirement("req", {}, custom_personas=PERSONAS)
+        await team.analyze_requirement("req", {}, custom_personas=PERSONAS)
+        assert len(team.calls) == 4
+
+        cache = AnalysisCache()
+        key = AnalysisCache.key("req", "Extractor", "extract", {}, "fake:fake-1")
+
+        async def failing():
+            return {"text": "req", "originates_from": "timeout"}
+
+        await cache.get_or_call(key, failing)
+        assert cache.get(key) is None
+
+
+class TestCamundaTask:
+    """Test the synchronous Camunda external task."""
+
+    def test_llm_task_awaits_every_analysis(self, monkeypatch):
+        team = FakeLLMTeam(latency=0)
+        monkeypatch.setattr(camunda_tasks, "LLMTeam", lambda settings: team)
+        reqs = [{"id": f"req_{n}", "text": text} for n, text in enumerate(requirements(3))]
+
+        result = camunda_tasks.process_requirements_with_llm(reqs, "openai", "gpt-4o-mini", iterations=2)
+
+        processed = result["processed_requirements"]
+        assert [p["successful_iterations"] for p in processed] == [2, 2, 2]
+        response = processed[1]["iterations"][1]["llm_response"]
+        assert isinstance(response, dict) and response["text"] == reqs[1]["text"]
+        assert [it["iteration"] for it in processed[0]["iterations"]] == [1, 2]
+        assert len(team.calls) == 12
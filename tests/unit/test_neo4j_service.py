@@ -0,0 +1,179 @@
+"""
+Unit tests for the Neo4j knowledge graph service.
+
+Tests UNWIND-batched writes, index-anchored bounded traversals and
+count-store statistics against a recording fake driver.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from backend.services import neo4j_service
+from backend.services.neo4j_service import ID_LABELS, Neo4jService
+
+
+class FakeResult(list):
+    """Query result stand-in supporting iteration, single() and data()"""
+
+    def single(self):
+        return self[0] if self else None
+
+    def data(self):
+        return list(self)
+
+
+class FakeSession:
+    """Session / transaction stand-in recording every statement"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        self.driver.statements.append((query, params))
+        return FakeResult(self.driver.respond(query, params))
+
+    def execute_write(self, work, *args):
+        self.driver.transactions += 1
+        return work(self, *args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeDriver:
+    def __init__(self, respond=None):
+        self.statements = []
+        self.transactions = 0
+        self.respond = respond or (lambda query, params: [])
+
+    def session(self):
+        return FakeSession(self)
+
+
+def make_service(respond=None, **settings):
+    values = {"neo4j_write_batch_size": 2, "neo4j_max_traversal_depth": 4, "neo4j_traversal_limit": 50}
+    values.update(settings)
+    driver = FakeDriver(respond)
+    with patch.object(neo4j_service.GraphDatabase, "driver", return_value=driver):
+        service = Neo4jService(SimpleNamespace(**values))
+    driver.statements.clear()
+    return service, driver
+
+
+def echo_ids(query, params):
+    return [(row.get("id") or row.get("from_id"),) for row in params.get("rows", [])]
+
+
+class TestBatchedWrites:
+    """Test UNWIND-batched node and relationship creation."""
+
+    def test_chunks_are_unwound_in_batches_in_one_transaction(self):
+        service, driver = make_service(echo_ids)
+        chunks = [{"id": f"c{n}", "content": "text"} for n in range(5)]
+
+        created = service.create_chunk_nodes(chunks)
+
+        assert created == [f"c{n}" for n in range(5)]
+        assert driver.transactions == 1
+        assert [len(params["rows"]) for _, params in driver.statements] == [2, 2, 1]
+        assert all("UNWIND $rows AS row" in query for query, _ in driver.statements)
+
+    def test_relationships_are_grouped_by_type_and_labels(self):
+        service, driver = make_service(echo_ids)
+        rels = [
+            {"from_id": "r1", "to_id": "c1", "relationship_type": "IMPLEMENTS",
+             "from_label": "Requirement", "to_label": "Component"},
+            {"from_id": "r2", "to_id": "c2", "relationship_type": "IMPLEMENTS",
+             "from_label": "Requirement", "to_label": "Component", "properties": {"weight": 1}},
+            {"from_id": "d1", "to_id": "k1", "relationship_type": "CONTAINS"},
+        ]
+
+        assert service.create_relationships(rels) == 3
+
+        assert driver.transactions == 1
+        labelled, unlabelled = (query for query, _ in driver.statements)
+        assert "MATCH (src:Requirement {id: row.from_id})" in labelled
+        assert "MATCH (dst:Component {id: row.to_id})" in labelled
+        assert "CREATE (src)-[r:CONTAINS]->(dst)" in unlabelled
+        assert unlabelled.count("WITH row MATCH (n:") == 2 * len(ID_LABELS)
+        assert driver.statements[0][1]["rows"][1]["properties"] == {"weight": 1}
+
+    def test_invalid_relationship_type_is_rejected(self):
+        service, driver = make_service()
+
+        assert service.create_relationship("a", "b", "X]->() DETACH DELETE (n") is None
+        assert not driver.statements
+
+
+class TestTraversals:
+    """Test index-anchored, bounded traversal queries."""
+
+    def test_find_paths_anchors_on_label_with_bounded_depth(self):
+        service, driver = make_service()
+
+        service.find_paths("r1", relationship_types=["DEPENDS_ON"], max_depth=10, start_label="Requirement")
+
+        query, params = driver.statements[0]
+        assert "MATCH (start:Requirement {id: $start_id})" in query
+        assert "-[:DEPENDS_ON*1..4]->" in query
+        assert "LIMIT $limit" in query and params["limit"] == 50
+
+    def test_unlabelled_anchor_unions_constrained_labels(self):
+        service, driver = make_service()
+
+        service.find_paths("r1", end_node_id="c9", max_depth=2)
+
+        query, params = driver.statements[0]
+        assert "MATCH (start {" not in query
+        assert query.count("RETURN n AS start") == len(ID_LABELS)
+        assert query.count("RETURN n AS target") == len(ID_LABELS)
+        assert params["end_id"] == "c9"
+
+    @pytest.mark.parametrize("analysis_type, pattern", [
+        ("downstream", "(start)-[:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..2]->(node)"),
+        ("upstream", "(node)-[:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..2]->(start)"),
+        ("bidirectional", "(start)-[:DEPENDS_ON|IMPLEMENTS|DERIVES_FROM*1..2]-(node)"),
+    ])
+    def test_impact_analysis_honours_depth_and_limit(self, analysis_type, pattern):
+        node = SimpleNamespace(labels={"Component"}, get=lambda key: "c1", items=lambda: [("id", "c1")])
+        service, driver = make_service(lambda query, params: [{"node": node, "depth": 1}])
+
+        result = service.impact_analysis("r1", analysis_type, max_depth=2, node_label="Requirement", limit=1)
+
+        query, params = driver.statements[0]
+        assert pattern in query
+        assert "min(length(path))" in query
+        assert params == {"node_id": "r1", "limit": 1}
+        assert result["affected_nodes"][0]["id"] == "c1"
+        assert result["truncated"]
+
+
+class TestGraphStats:
+    """Test statistics read from the count store."""
+
+    def test_counts_are_per_label_and_type(self):
+        def respond(query, params):
+            if "db.labels" in query:
+                return [{"label": "Chunk"}, {"label": "Requirement"}]
+            if "db.relationshipTypes" in query:
+                return [{"relationshipType": "CONTAINS"}]
+            if "UNION ALL" in query:
+                return [{"label": "Chunk", "count": 3}, {"label": "Requirement", "count": 7}]
+            if "-[r:`CONTAINS`]->" in query:
+                return [{"type": "CONTAINS", "count": 2}]
+            return [{"total": 10}]
+
+        service, driver = make_service(respond)
+
+        stats = service.get_graph_stats()
+
+        assert stats["node_counts_by_label"][0] == {"label": "Requirement", "count": 7}
+        assert stats["relationship_counts_by_type"] == [{"type": "CONTAINS", "count": 2}]
+        assert "labels(n)" not in " ".join(query for query, _ in driver.statements)
+        union = next(params for query, params in driver.statements if "UNION ALL" in query)
+        assert union == {"name0": "Chunk", "name1": "Requirement"}
@@ -0,0 +1,178 @@
+"""
+Unit tests for graph-based ontology change detection.
+
+Tests element extraction from parsed Turtle, fingerprint-bucketed rename
+matching, the saved-version snapshot cache and the single affected-MT query,
+against an in-memory Fuseki gateway.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from backend.services import ontology_change_detector as detector_module
+from backend.services.fuseki_gateway import InMemoryFusekiGateway, set_fuseki_gateway
+from backend.services.ontology_change_detector import OntologyChangeDetector, parse_snapshot
+
+GRAPH = "http://example.org/projects/p1/ontologies/uav"
+
+PREFIXES = """
+@prefix : <http://example.org/uav#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+"""
+
+OLD = PREFIXES + """
+:Aircraft a owl:Class ; rdfs:label "Aircraft" ; rdfs:comment "A flying vehicle" .
+:Sensor a owl:Class ;
+    rdfs:label "Sensor" ;
+    rdfs:subClassOf :Component .
+:Component a owl:Class ; rdfs:label "Component" .
+:hasSensor a owl:ObjectProperty ; rdfs:label "has sensor" ; rdfs:domain :Aircraft ; rdfs:range :Sensor .
+:maxSpeed a owl:DatatypeProperty ; rdfs:label "max speed" ; rdfs:domain :Aircraft ; rdfs:range xsd:decimal .
+:uav-1 rdf:type :Aircraft ; rdfs:label "UAV \\"One\\"" .
+"""
+
+# Sensor renamed to Detector (same superclass), maxSpeed renamed to topSpeed,
+# Aircraft relabelled, a class added
+NEW = PREFIXES + """
+:Aircraft a owl:Class ; rdfs:label "Air Vehicle" ; rdfs:comment "A flying vehicle" .
+:Detector a owl:Class ;
+    rdfs:label "Detector" ;
+    rdfs:subClassOf :Component .
+:Component a owl:Class ; rdfs:label "Component" .
+:Payload a owl:Class ; rdfs:label "Payload" ; rdfs:subClassOf owl:Thing .
+:hasSensor a owl:ObjectProperty ; rdfs:label "has sensor" ; rdfs:domain :Aircraft ; rdfs:range :Detector .
+:topSpeed a owl:DatatypeProperty ; rdfs:label "top speed" ; rdfs:domain :Aircraft ; rdfs:range xsd:decimal .
+:uav-1 rdf:type :Aircraft ; rdfs:label "UAV \\"One\\"" .
+"""
+
+UAV = "http://example.org/uav#"
+
+
+@pytest.fixture
+def gateway():
+    gateway = InMemoryFusekiGateway()
+    set_fuseki_gateway(gateway)
+    detector_module._snapshot_cache = None
+    yield gateway
+    set_fuseki_gateway(None)
+    detector_module._snapshot_cache = None
+
+
+@pytest.fixture
+def detector(gateway):
+    db = MagicMock()
+    db._conn.return_value.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+    return OntologyChangeDetector(db, gateway.dataset_url)
+
+
+def by_type(result):
+    return {(c.change_type, c.old_iri or c.element_iri, c.new_iri) for c in result.changes}
+
+
+class TestExtraction:
+    """Test element extraction from parsed graphs."""
+
+    def test_elements_from_predicate_lists_and_rdf_type(self):
+        elements = parse_snapshot(OLD).elements
+
+        assert elements[UAV + "Sensor"] == {"type": "Class", "label": "Sensor", "comment": ""}
+        assert elements[UAV + "Aircraft"]["comment"] == "A flying vehicle"
+        assert elements[UAV + "hasSensor"]["type"] == "ObjectProperty"
+        assert elements[UAV + "maxSpeed"]["type"] == "DatatypeProperty"
+        assert elements[UAV + "uav-1"] == {"type": "Individual", "label": 'UAV "One"', "comment": ""}
+        assert len(elements) == 6
+
+    def test_invalid_turtle_reports_no_changes(self, gateway, detector):
+        gateway.put_graph(OLD, graph=GRAPH)
+
+        result = detector.detect_changes(GRAPH, OLD + " :broken a ")
+
+        assert result.changes == [] and result.snapshot is None
+
+
+class TestChangeDetection:
+    """Test change and rename detection."""
+
+    def test_renames_are_matched_by_fingerprint(self, gateway, detector):
+        gateway.put_graph(OLD, graph=GRAPH)
+
+        result = detector.detect_changes(GRAPH, NEW)
+
+        assert by_type(result) == {
+            ("renamed", UAV + "Sensor", UAV + "Detector"),
+            ("renamed", UAV + "maxSpeed", UAV + "topSpeed"),
+            ("added", UAV + "Payload", None),
+            ("modified", UAV + "Aircraft", None),
+        }
+        assert (result.total_renamed, result.total_added, result.total_deleted) == (2, 1, 0)
+        renamed = {c.old_iri: c for c in result.changes if c.change_type == "renamed"}
+        assert renamed[UAV + "Sensor"].change_details["confidence"] == "high"
+        assert detector.classify_change(renamed[UAV + "Sensor"]) == "breaking"
+
+        assert detector.detect_property_renames(result.changes) == [{
+            "old_name": "max speed", "new_name": "top speed",
+            "old_iri": UAV + "maxSpeed", "new_iri": UAV + "topSpeed",
+            "old_local_name": "maxSpeed", "new_local_name": "topSpeed",
+            "property_type": "DatatypeProperty", "confidence": "high",
+        }]
+        assert [r["new_name"] for r in detector.detect_class_renames(result.changes)] == ["Detector"]
+
+    def test_a_single_changed_element_of_a_type_is_a_medium_confidence_rename(self, detector):
+        old = parse_snapshot(PREFIXES + ':speed a owl:DatatypeProperty ; rdfs:label "speed" .')
+        new = parse_snapshot(PREFIXES + ':velocity a owl:DatatypeProperty ; rdfs:label "velocity" ; '
+                                        'rdfs:range xsd:decimal .')
+
+        changes = detector._compare_elements(old.elements, new.elements, old.fingerprints, new.fingerprints)
+
+        assert [(c.change_type, c.change_details["confidence"]) for c in changes] == [("renamed", "medium")]
+
+    def test_ambiguous_candidates_stay_added_and_deleted(self, detector):
+        old = parse_snapshot(PREFIXES + ':a a owl:DatatypeProperty ; rdfs:label "a" . '
+                                        ':b a owl:DatatypeProperty ; rdfs:label "b" .')
+        new = parse_snapshot(PREFIXES + ':c a owl:DatatypeProperty ; rdfs:label "c" . '
+                                        ':d a owl:DatatypeProperty ; rdfs:label "d" .')
+
+        changes = detector._compare_elements(old.elements, new.elements, old.fingerprints, new.fingerprints)
+
+        assert sorted(c.change_type for c in changes) == ["added", "added", "deleted", "deleted"]
+
+    def test_affected_mts_are_found_in_one_query(self, gateway, detector):
+        gateway.put_graph(OLD, graph=GRAPH)
+        cursor = detector.db._conn.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [("mt-1",), ("mt-2",)]
+
+        result = detector.detect_changes(GRAPH, NEW)
+
+        assert sorted(result.affected_mts) == ["mt-1", "mt-2"]
+        assert cursor.execute.call_count == 1
+        assert cursor.execute.call_args.args[1][1] == sorted({c.element_iri for c in result.changes})
+        detector.db._return.assert_called_once()
+
+
+class TestSnapshotCache:
+    """Test reuse of the saved version between saves."""
+
+    def test_saved_version_is_reused_until_the_dataset_changes(self, gateway, detector):
+        gateway.put_graph(OLD, graph=GRAPH)
+        first = detector.detect_changes(GRAPH, NEW)
+        gateway.put_graph(NEW, graph=GRAPH)
+        detector.remember_snapshot(GRAPH, first.snapshot)
+        requests = gateway.requests
+
+        second = OntologyChangeDetector(detector.db, gateway.dataset_url).detect_changes(GRAPH, NEW)
+
+        assert gateway.requests == requests and second.changes == []
+
+        gateway.update(f"INSERT DATA {{ GRAPH <{GRAPH}> {{ <{UAV}Extra> a <http://www.w3.org/2002/07/owl#Class> }} }}")
+        third = detector.detect_changes(GRAPH, NEW)
+
+        assert gateway.requests == requests + 2  # the update and one graph fetch
+        assert by_type(third) == {("deleted", UAV + "Extra", None)}
+
+    def test_missing_graph_has_no_elements(self, detector):
+        result = detector.detect_changes(GRAPH, OLD)
+
+        assert result.total_added == 6 and result.total_deleted == 0
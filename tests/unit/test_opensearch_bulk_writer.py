@@ -0,0 +1,261 @@
+"""
+Unit tests for the OpenSearch bulk writer and zero-downtime reindex.
+
+Tests size- and time-based flushing, retries, the background writer used by
+synchronous callers, the atomic alias swap and streaming reindexes against
+in-memory stores and cursors.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.rag.storage import text_search_factory
+from backend.rag.storage.opensearch_bulk_writer import BackgroundBulkWriter, OpenSearchBulkWriter
+from backend.rag.storage.opensearch_store import OpenSearchTextStore
+from backend.services.opensearch_sync_service import CHUNKS_ALIAS, OpenSearchSyncService
+
+
+class FakeStore:
+    """Records bulk requests; the first `failures` requests fail"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.bulks = []
+        self.documents = []
+        self.ensured = []
+        self.events = []
+
+    async def ensure_index(self, index, settings=None):
+        self.ensured.append((index, settings))
+        return True
+
+    async def bulk_index(self, index, documents, refresh=False):
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.bulks.append((index, [d["chunk_id"] for d in documents], refresh))
+        self.documents.extend(documents)
+        self.events.append(("bulk", index))
+        return True
+
+    async def update_index_settings(self, index, settings):
+        self.events.append(("settings", index, settings))
+
+    async def refresh(self, index):
+        self.events.append(("refresh", index))
+
+    async def swap_alias(self, alias, index):
+        self.events.append(("swap", alias, index))
+        return ["knowledge_chunks_v1"]
+
+    async def delete_index(self, index):
+        self.events.append(("delete", index))
+
+
+def docs(count, start=0):
+    return [{"chunk_id": f"c{i}"} for i in range(start, start + count)]
+
+
+class TestBulkWriter:
+    """Test batching, flushing and retries."""
+
+    @pytest.mark.asyncio
+    async def test_full_batches_are_sent_without_refresh(self):
+        store = FakeStore()
+        writer = OpenSearchBulkWriter(store, batch_size=3, flush_interval_s=0.05)
+
+        await writer.submit("idx", docs(7))
+        await writer.close()
+
+        assert [len(ids) for _, ids, _ in store.bulks] == [3, 3, 1]
+        assert [i for _, ids, _ in store.bulks for i in ids] == [f"c{i}" for i in range(7)]
+        assert not any(refresh for _, _, refresh in store.bulks)
+        assert store.ensured == [("idx", None)] and writer.stats["indexed"] == 7
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_sent_after_the_flush_interval(self):
+        store = FakeStore()
+        writer = OpenSearchBulkWriter(store, batch_size=100, flush_interval_s=0.02)
+
+        await writer.submit("idx", docs(2))
+        await asyncio.sleep(0.2)
+
+        assert store.bulks == [("idx", ["c0", "c1"], False)]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_requests_are_retried_then_dropped(self):
+        store = FakeStore(failures=2)
+        writer = OpenSearchBulkWriter(store, batch_size=10, flush_interval_s=0.01, max_retries=2, retry_backoff_s=0)
+
+        await writer.submit("idx", docs(2))
+        await writer.flush()
+        assert writer.stats == {"indexed": 2, "failed": 0, "batches": 1, "retries": 2}
+
+        store.failures = 5
+        await writer.submit("idx", docs(1, 2))
+        await writer.close()
+        assert writer.stats["failed"] == 1 and writer.stats["indexed"] == 2
+
+    def test_background_writer_accepts_synchronous_submits(self, monkeypatch):
+        store = FakeStore()
+        monkeypatch.setattr(text_search_factory, "create_text_search_store", lambda settings: store)
+        settings = SimpleNamespace(opensearch_bulk_batch_size=2, opensearch_bulk_flush_interval_s=0.01)
+        background = BackgroundBulkWriter(settings)
+
+        assert background.submit("knowledge_chunks", docs(3))
+        background.close(timeout=5)
+
+        assert [i for _, ids, _ in store.bulks for i in ids] == ["c0", "c1", "c2"]
+
+
+class TestAliasSwap:
+    """Test the atomic alias update."""
+
+    def make_store(self, aliases=None, concrete=False):
+        store = OpenSearchTextStore(SimpleNamespace(opensearch_url="http://localhost:9200"))
+        indices = MagicMock()
+        indices.exists_alias = AsyncMock(return_value=aliases is not None)
+        indices.get_alias = AsyncMock(return_value={name: {} for name in aliases or []})
+        indices.exists = AsyncMock(return_value=concrete)
+        indices.update_aliases = AsyncMock()
+        store.client = SimpleNamespace(indices=indices)
+        return store
+
+    @pytest.mark.asyncio
+    async def test_swap_moves_the_alias_in_one_call(self):
+        store = self.make_store(aliases=["kc_v1"])
+
+        previous = await store.swap_alias("kc", "kc_v2")
+
+        actions = store.client.indices.update_aliases.await_args.kwargs["body"]["actions"]
+        assert previous == ["kc_v1"]
+        assert actions == [{"add": {"index": "kc_v2", "alias": "kc"}}, {"remove": {"index": "kc_v1", "alias": "kc"}}]
+
+    @pytest.mark.asyncio
+    async def test_swap_replaces_a_concrete_index_of_the_same_name(self):
+        store = self.make_store(concrete=True)
+
+        assert await store.swap_alias("kc", "kc_v2") == []
+        actions = store.client.indices.update_aliases.await_args.kwargs["body"]["actions"]
+        assert actions[1] == {"remove_index": {"index": "kc"}}
+
+
+class FakeCursor:
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.conn.queries.append(query)
+        rows = self.conn.doc_rows if "FROM doc_chunk" in query else self.conn.rows
+        self.rows = [] if "created_at >=" in query else list(rows)
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, rows, doc_rows=()):
+        self.rows = rows
+        self.doc_rows = doc_rows
+        self.queries = []
+        self.fetch_sizes = []
+        self.cursor_names = []
+        self.rolled_back = 0
+
+    def cursor(self, name=None):
+        self.cursor_names.append(name)
+        return FakeCursor(self, name)
+
+    def rollback(self):
+        self.rolled_back += 1
+
+
+def make_service(store, rows, doc_rows=()):
+    conn = FakeConnection(rows, doc_rows)
+    db = MagicMock()
+    db._conn.return_value = conn
+    settings = SimpleNamespace(opensearch_bulk_batch_size=4, opensearch_bulk_flush_interval_s=0.01,
+                               opensearch_bulk_retry_backoff_s=0, opensearch_reindex_fetch_size=5)
+    return OpenSearchSyncService(settings, db_service=db, text_search_store=store), conn
+
+
+ROWS = [(f"c{i}", f"text {i}", i, "doc-1", "proj-1", "Spec", None, datetime(2025, 1, 1)) for i in range(12)]
+DOC_ROWS = [(f"d{i}", f"upload {i}", i, "upload-1", "proj-1", 2, 1, 0, 8, datetime(2025, 1, 2)) for i in range(3)]
+
+
+class TestReindex:
+    """Test streaming reindex into a versioned index."""
+
+    @pytest.mark.asyncio
+    async def test_full_reindex_streams_into_a_new_index_then_swaps(self):
+        store = FakeStore()
+        service, conn = make_service(store, ROWS)
+
+        result = await service.reindex_all_chunks()
+
+        new_index = result["index"]
+        assert result["success"] and result["chunks_indexed"] == result["total_chunks"] == 12
+        assert new_index.startswith(f"{CHUNKS_ALIAS}_v") and store.ensured[0] == (new_index, {"refresh_interval": "-1"})
+        assert all(cursor for cursor in conn.cursor_names) and set(conn.fetch_sizes) == {5}
+        assert {index for index, _, _ in store.bulks} == {new_index}
+        steps = [event[0] for event in store.events]
+        # the alias moves only after every document is in, then the old index goes
+        assert steps[-4:] == ["settings", "refresh", "swap", "delete"] and set(steps[:-4]) == {"bulk"}
+        assert store.events[-1] == ("delete", "knowledge_chunks_v1")
+        assert conn.rolled_back == 2  # the load and the catch-up pass
+
+    @pytest.mark.asyncio
+    async def test_failed_load_keeps_the_current_index(self):
+        store = FakeStore(failures=1000)
+        service, _ = make_service(store, ROWS)
+
+        result = await service.reindex_all_chunks()
+
+        assert not result["success"] and result["chunks_failed"] == 12
+        assert [event[0] for event in store.events] == ["delete"]
+
+    @pytest.mark.asyncio
+    async def test_project_reindex_writes_in_place(self):
+        store = FakeStore()
+        service, conn = make_service(store, ROWS[:3])
+
+        result = await service.reindex_all_chunks(project_id="proj-1")
+
+        assert result["success"] and result["chunks_indexed"] == 3
+        assert {index for index, _, _ in store.bulks} == {CHUNKS_ALIAS}
+        assert "WHERE ka.project_id = %s" in conn.queries[0]
+
+    @pytest.mark.asyncio
+    async def test_uploaded_document_chunks_survive_a_full_reindex(self):
+        store = FakeStore()
+        service, conn = make_service(store, ROWS, DOC_ROWS)
+
+        result = await service.reindex_all_chunks()
+
+        assert result["success"] and result["chunks_indexed"] == 15
+        uploaded = {d["chunk_id"]: d for d in store.documents if d["doc_id"] == "upload-1"}
+        assert set(uploaded) == {"d0", "d1", "d2"}
+        assert uploaded["d1"] == {
+            "chunk_id": "d1", "original_chunk_id": "d1", "content": "upload 1", "text": "upload 1",
+            "title": "", "project_id": "proj-1", "asset_id": "upload-1", "doc_id": "upload-1",
+            "chunk_index": 1, "version": 2, "page": 1, "start_char": 0, "end_char": 8,
+            "document_type": "document", "created_at": "2025-01-02T00:00:00",
+        }
+        # the catch-up pass after the swap reads both tables too
+        catch_up = [q for q in conn.queries if "created_at >=" in q]
+        assert any("FROM doc_chunk" in q and "dc.created_at >= %s" in q for q in catch_up)
+        assert any("FROM knowledge_chunks" in q and "kc.created_at >= %s" in q for q in catch_up)
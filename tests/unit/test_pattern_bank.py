@@ -0,0 +1,138 @@
+"""
+Unit tests for the single-pass pattern bank.
+
+Tests that a bank reports what running each pattern separately would, and
+that the requirements and metadata extractors built on it classify and
+extract as before.
+"""
+
+import re
+import pytest
+
+from backend.services.metadata_extraction import MetadataExtractionService
+from backend.services.pattern_bank import PatternBank
+from backend.services.requirements_extraction import (
+    ConstraintType,
+    ExtractionConfig,
+    RequirementType,
+    RequirementsExtractionEngine,
+)
+
+# Overlapping patterns: one contains another's match, two match at the same
+# position, one has groups and one is lazy up to a lookahead
+PATTERNS = [
+    r"\b([A-Z][a-z ]*(?:System|Module))\b",
+    r"\b(Navigation|Sensor)\b",
+    r"\bNav\w*",
+    r"\b(?:shall|must)\b.*?(?=\.|$)",
+    r"\b(REQ)-(\d+)(?:\.(\d+))?",
+]
+
+TEXT = ("Navigation System REQ-12 shall route data to the Sensor Module. "
+        "The Sensor must report REQ-3.1 within 5 s. Navigation Module shall log.")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RequirementsExtractionEngine(metadata_service=MetadataExtractionService())
+
+
+def per_pattern(patterns, text, flags=0):
+    return sorted(
+        (i, m.span(), m.groups()) for i, pattern in enumerate(patterns) for m in re.finditer(pattern, text, flags)
+    )
+
+
+class TestPatternBank:
+    """Test the bank against per-pattern re calls."""
+
+    @pytest.mark.parametrize("flags", [0, re.IGNORECASE])
+    def test_finditer_matches_per_pattern_finditer(self, flags):
+        bank = PatternBank(enumerate(PATTERNS), flags)
+
+        matches = list(bank.finditer(TEXT))
+
+        assert sorted((m.index, m.span(), m.groups()) for m in matches) == per_pattern(PATTERNS, TEXT, flags)
+        assert [m.start() for m in matches] == sorted(m.start() for m in matches)
+        assert {m.group(1) for m in matches if m.label == 1} == {"Navigation", "Sensor"}
+
+    def test_first_follows_pattern_order_not_position(self):
+        bank = PatternBank(enumerate(PATTERNS))
+
+        match = bank.first("Sensor feeds the Navigation System")
+
+        assert (match.label, match.group(1)) == (0, "Navigation System")
+        assert bank.first("Sensor only").group(0) == "Sensor"
+        assert bank.first("nothing here") is None
+
+    def test_labels_include_patterns_hidden_by_an_earlier_match(self):
+        bank = PatternBank([("long", r"navigation \w+"), ("short", r"gation"), ("word", r"\bsystem\b")])
+
+        assert bank.labels("the navigation system") == {"long", "short", "word"}
+        assert bank.labels("navigator") == set()
+
+    def test_non_overlapping_bank_counts_like_findall(self):
+        patterns = {"req": r"\b(?:shall|must)\b", "doc": r"\b(?:guide|manual)\b"}
+        text = "the manual says you shall and must read the guide; guidelines shall"
+        bank = PatternBank(patterns.items(), overlapping=False)
+
+        assert bank.count(text) == {label: len(re.findall(p, text)) for label, p in patterns.items()}
+
+    def test_empty_bank(self):
+        bank = PatternBank([])
+
+        assert list(bank.finditer("text")) == [] and bank.first("text") is None and bank.labels("text") == set()
+
+
+class TestExtractors:
+    """Test the extractors that scan through pattern banks."""
+
+    @pytest.mark.parametrize("sentence, expected_type, expected_confidence", [
+        ("The system shall encrypt all stored data", RequirementType.FUNCTIONAL, 0.94),
+        # the functional "shall provide" sits inside the security marker's match
+        ("Encrypted storage shall provide integrity checks", RequirementType.FUNCTIONAL, 0.94),
+        ("Response time should stay low under load", RequirementType.PERFORMANCE, 0.76),
+        ("Operators may review the emergency log", RequirementType.SAFETY, 0.52),
+        ("Nothing obligatory in this sentence", RequirementType.FUNCTIONAL, 0.0),
+    ])
+    def test_sentence_classification(self, engine, sentence, expected_type, expected_confidence):
+        confidence, req_type = engine._classify_requirement_sentence(sentence, ExtractionConfig())
+
+        assert req_type == expected_type
+        assert confidence == pytest.approx(expected_confidence)
+
+    def test_identifier_prefers_pattern_order(self, engine):
+        assert engine._extract_requirement_identifier("See 3.2.1 and NAV-0042 for details") == "NAV-0042"
+        assert engine._extract_requirement_identifier("See 3.2.1 for details") == "3.2.1"
+        assert engine._extract_requirement_identifier("no identifier") is None
+
+    def test_matching_keywords_use_the_config(self, engine):
+        config = ExtractionConfig(performance_keywords=["Latency"])
+
+        keywords = engine._extract_matching_keywords("The latency shall not exceed the threshold", config)
+
+        assert sorted(keywords) == ["Latency", "not exceed", "shall", "threshold"]
+
+    def test_constraints_keep_per_pattern_order(self, engine):
+        section = ("Threshold: 5 s. Maximum of 12 kg. Objective: 20 Hz. "
+                   "KPP: range of 40 km. Minimum 3 m between nodes.")
+
+        constraints = engine._extract_constraints_from_section(section, "Limits", ExtractionConfig(), 1)
+
+        expected = [
+            (constraint_type, m.group(0))
+            for constraint_type, patterns in engine.constraint_patterns.items()
+            for pattern in patterns
+            for m in re.finditer(pattern, section, re.IGNORECASE)
+        ]
+        assert [(c.constraint_type, c.description) for c in constraints[:len(expected)]] == expected
+        assert constraints[0].constraint_type == ConstraintType.THRESHOLD and constraints[0].numeric_value == 5.0
+
+    def test_document_type_counts(self):
+        service = MetadataExtractionService()
+        text = "The system shall and must meet each requirement. See the design guide."
+
+        doc_type, confidence = service.classify_document_type(text)
+
+        assert doc_type == "requirements"
+        assert confidence == pytest.approx(0.3)
@@ -0,0 +1,178 @@
+"""
+Unit tests for proactive worker event dispatch.
+
+Tests bounded per-worker inboxes, overflow policies, consumer concurrency,
+lag/latency metrics and isolation between workers in WorkerRegistry.
+"""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from backend.services.proactive_workers import BaseProactiveWorker, WorkerRegistry
+
+
+def make_settings(**overrides):
+    values = {
+        "proactive_worker_inbox_size": 1000,
+        "proactive_worker_concurrency": 1,
+        "proactive_worker_overflow_policy": "drop_oldest",
+        "proactive_worker_enqueue_timeout_s": 1.0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class RecordingWorker(BaseProactiveWorker):
+    """Worker that records handled events, optionally sleeping in a thread first."""
+
+    def __init__(self, name: str = "recording-worker", delay: float = 0.0, **settings):
+        super().__init__(make_settings(**settings))
+        self._name = name
+        self.delay = delay
+        self.handled: List[Dict[str, Any]] = []
+
+    @property
+    def worker_name(self) -> str:
+        return self._name
+
+    @property
+    def worker_type(self) -> str:
+        return "monitor"
+
+    @property
+    def schedule_interval(self) -> Optional[int]:
+        return None
+
+    @property
+    def subscribed_events(self) -> List[str]:
+        return ["test.event"]
+
+    async def _handle_event(self, event: Dict[str, Any]) -> None:
+        if self.delay:
+            await self._run_blocking(time.sleep, self.delay)
+        self.handled.append(event)
+
+    async def _execute_scheduled_task(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+def event(n: int) -> Dict[str, Any]:
+    return {"type": "test.event", "payload": {"n": n}}
+
+
+class TestWorkerInbox:
+    """Test bounded inbox overflow handling."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_events(self):
+        worker = RecordingWorker(proactive_worker_inbox_size=2)
+
+        for n in range(5):
+            await worker.process_event(event(n))
+
+        queued = [worker._event_queue.get_nowait()[1]["payload"]["n"] for _ in range(2)]
+        assert queued == [3, 4]
+        assert worker._inbox.dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_keeps_oldest_events(self):
+        worker = RecordingWorker(proactive_worker_inbox_size=2, proactive_worker_overflow_policy="drop_newest")
+
+        for n in range(5):
+            await worker.process_event(event(n))
+
+        queued = [worker._event_queue.get_nowait()[1]["payload"]["n"] for _ in range(2)]
+        assert queued == [0, 1]
+        assert worker._inbox.dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_block_policy_times_out_and_drops(self):
+        worker = RecordingWorker(
+            proactive_worker_inbox_size=1,
+            proactive_worker_overflow_policy="block",
+            proactive_worker_enqueue_timeout_s=0.05,
+        )
+
+        await worker.process_event(event(0))
+        start = time.monotonic()
+        await worker.process_event(event(1))
+
+        assert time.monotonic() - start >= 0.05
+        assert worker._inbox.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_consumers_record_lag_and_latency(self):
+        worker = RecordingWorker()
+        await worker.start()
+        try:
+            for n in range(3):
+                await worker.process_event(event(n))
+            await asyncio.wait_for(worker._event_queue.join(), timeout=1)
+        finally:
+            await worker.stop()
+
+        status = await worker.get_status()
+        assert [e["payload"]["n"] for e in worker.handled] == [0, 1, 2]
+        assert status["events_processed"] == 3
+        assert status["inbox"]["enqueued"] == 3
+        assert status["inbox"]["lag_ms_p50"] is not None
+        assert status["inbox"]["latency_ms_p95"] is not None
+
+    @pytest.mark.asyncio
+    async def test_concurrency_runs_handlers_in_parallel(self):
+        worker = RecordingWorker(delay=0.1, proactive_worker_concurrency=4)
+        await worker.start()
+        try:
+            start = time.monotonic()
+            for n in range(4):
+                await worker.process_event(event(n))
+            await asyncio.wait_for(worker._event_queue.join(), timeout=1)
+            elapsed = time.monotonic() - start
+        finally:
+            await worker.stop()
+
+        assert len(worker.handled) == 4
+        assert elapsed < 0.3
+
+
+class TestWorkerRegistryDispatch:
+    """Test event distribution across workers."""
+
+    @pytest.mark.asyncio
+    async def test_blocked_worker_does_not_delay_others(self):
+        registry = WorkerRegistry()
+        slow = RecordingWorker(
+            "slow", proactive_worker_inbox_size=1,
+            proactive_worker_overflow_policy="block", proactive_worker_enqueue_timeout_s=0.2,
+        )
+        fast = RecordingWorker("fast")
+        registry.register(slow)
+        registry.register(fast)
+        await registry.distribute_event(event(0))  # fills the slow worker's inbox
+
+        delivered_at = {}
+
+        async def watch_fast():
+            while fast._event_queue.qsize() < 2:
+                await asyncio.sleep(0.005)
+            delivered_at["fast"] = time.monotonic()
+
+        start = time.monotonic()
+        watcher = asyncio.create_task(watch_fast())
+        await registry.distribute_event(event(1))
+        await watcher
+
+        assert delivered_at["fast"] - start < 0.1
+        assert slow._inbox.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_get_all_status_includes_inbox_metrics(self):
+        registry = WorkerRegistry()
+        registry.register(RecordingWorker("a"))
+
+        statuses = await registry.get_all_status()
+
+        assert statuses["a"]["inbox"]["capacity"] == 1000
@@ -0,0 +1,199 @@
+"""
+Unit tests for the project thread manager's keyed store.
+
+Tests per-event SQL updates, Redis read-through caching and the debounced
+background refresh of thread vectors.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.services import project_thread_manager as ptm
+from backend.services.project_thread_manager import (
+    ProjectEvent,
+    ProjectEventType,
+    ProjectThreadContext,
+    ProjectThreadManager,
+)
+
+
+class RecordingPipeline:
+    """Pipeline stand-in that records queued commands"""
+
+    def __init__(self):
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        return [True] * len(self.commands)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_redis():
+    redis = MagicMock()
+    redis.pipelines = []
+
+    def pipeline(transaction=True):
+        pipe = RecordingPipeline()
+        redis.pipelines.append(pipe)
+        return pipe
+
+    redis.pipeline.side_effect = pipeline
+    redis.get = AsyncMock(return_value=None)
+    redis.delete = AsyncMock()
+    return redis
+
+
+def make_thread(**overrides):
+    values = dict(
+        project_thread_id="t1", project_id="p1", created_by="alice",
+        created_at=datetime(2025, 1, 1), last_activity=datetime(2025, 1, 1),
+        conversation_history=[], project_events=[], active_ontologies=[], recent_documents=[],
+        current_workbench="ontology", project_goals=None, key_decisions=[], learned_patterns=[],
+        contextual_references={}, similar_projects=[], applied_patterns=[],
+    )
+    values.update(overrides)
+    return ProjectThreadContext(**values)
+
+
+def make_manager(redis=None, qdrant=None, debounce=0.0):
+    settings = SimpleNamespace(project_thread_cache_ttl_s=3600, project_thread_vector_debounce_s=debounce)
+    manager = ProjectThreadManager(settings, redis, qdrant, db_service=MagicMock())
+    manager._sql = AsyncMock(return_value=None)
+    return manager
+
+
+def make_event(event_type, **data):
+    return ProjectEvent(
+        event_id="e1", project_id="p1", project_thread_id="t1", user_id="alice",
+        timestamp=datetime(2025, 1, 2), event_type=event_type, event_data=data, context_snapshot={},
+    )
+
+
+class TestEventUpdates:
+    """Test the per-event UPDATE statement."""
+
+    @pytest.mark.parametrize("event_type, data, key", [
+        (ProjectEventType.DAS_QUESTION, {}, None),
+        (ProjectEventType.ONTOLOGY_CREATED, {"ontology_id": "o1"}, "active_ontologies"),
+        (ProjectEventType.DOCUMENT_UPLOADED, {"document_id": "d1"}, "recent_documents"),
+        (ProjectEventType.WORKBENCH_CHANGED, {"workbench": "files"}, "current_workbench"),
+        (ProjectEventType.PROJECT_GOAL_SET, {"goals": "ship"}, "project_goals"),
+    ])
+    def test_update_sql_parameters_match_placeholders(self, event_type, data, key):
+        sql, params = make_manager()._event_update_sql(make_event(event_type, **data))
+
+        assert sql.count("%s") == len(params)
+        assert "'project_events'" in sql
+        assert params[-1] == "t1"
+        if key:
+            assert f"'{key}'" in sql
+
+    def test_event_summary_is_appended_not_rewritten(self):
+        sql, params = make_manager()._event_update_sql(make_event(ProjectEventType.DAS_QUESTION, q="hi"))
+
+        appended = json.loads(params[2])
+        assert [e["event_id"] for e in appended] == ["e1"]
+        assert f"LIMIT {ptm.MAX_PROJECT_EVENTS}" in sql
+
+    @pytest.mark.asyncio
+    async def test_event_refreshes_caches_from_returned_row(self):
+        redis = make_redis()
+        manager = make_manager(redis)
+        updated = make_thread(current_workbench="files").to_dict()
+        manager._sql.return_value = {"thread_data": updated}
+
+        assert await manager.capture_project_event(
+            "p1", "t1", "alice", ProjectEventType.WORKBENCH_CHANGED, {"workbench": "files"}
+        )
+
+        assert manager.project_threads["t1"].current_workbench == "files"
+        queued = [name for name, _, _ in redis.pipelines[0].commands]
+        cached = [name for name, _, _ in redis.pipelines[1].commands]
+        assert queued == ["lpush", "publish"]
+        assert cached == ["set", "set"]
+
+
+class TestReadThrough:
+    """Test lookups through Redis and SQL."""
+
+    @pytest.mark.asyncio
+    async def test_load_prefers_redis(self):
+        redis = make_redis()
+        redis.get.return_value = json.dumps(make_thread().to_dict()).encode()
+        manager = make_manager(redis)
+
+        thread = await manager.get_project_thread("t1")
+
+        assert thread.project_id == "p1"
+        manager._sql.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_find_falls_back_to_sql_and_caches(self):
+        redis = make_redis()
+        manager = make_manager(redis)
+        manager._sql.return_value = {"thread_data": make_thread().to_dict()}
+
+        thread = await manager._find_project_thread("p1")
+
+        assert thread.project_thread_id == "t1"
+        assert redis.pipelines[0].commands[1][1] == ("project_index:p1", "t1")
+
+    @pytest.mark.asyncio
+    async def test_create_returns_concurrently_created_thread(self):
+        manager = make_manager()
+        existing = make_thread(project_thread_id="other")
+        manager._find_project_thread = AsyncMock(side_effect=[None, existing])
+        manager._sql.return_value = False
+
+        thread = await manager.create_project_thread("p1", "alice")
+
+        assert thread is existing
+
+
+class TestVectorRefresh:
+    """Test debounced re-embedding with the shared model."""
+
+    @pytest.mark.asyncio
+    async def test_bursts_are_embedded_once(self):
+        qdrant = MagicMock()
+        manager = make_manager(qdrant=qdrant, debounce=0.05)
+        embedder = MagicMock()
+        embedder.generate_embeddings.return_value = [[0.1, 0.2]]
+
+        with patch.object(ptm, "get_thread_embedding_service", return_value=embedder):
+            for goals in ("a", "b", "c"):
+                thread = make_thread(project_goals=goals)
+                manager.project_threads["t1"] = thread
+                manager._schedule_vector_refresh(thread)
+            await asyncio.wait_for(manager._vector_tasks["t1"], timeout=1)
+
+        embedder.generate_embeddings.assert_called_once()
+        assert "goals:c" in embedder.generate_embeddings.call_args.args[0][0]
+        payload = qdrant.store_vectors.call_args.args[1][0]["payload"]
+        assert "thread_data" not in payload
+
+    @pytest.mark.asyncio
+    async def test_unchanged_text_is_not_reembedded(self):
+        manager = make_manager(qdrant=MagicMock())
+        thread = make_thread()
+        manager._embedded_text["t1"] = manager._create_thread_searchable_text(thread)
+
+        manager._schedule_vector_refresh(thread)
+
+        assert not manager._vector_tasks
+        await manager.close()
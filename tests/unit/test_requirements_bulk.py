@@ -0,0 +1,121 @@
+"""
+Unit tests for set-based requirements publishing and import.
+
+Tests the per-row planning used by batch publish / import and checks that
+the batch publish endpoint issues a constant number of statements.
+"""
+
+import uuid
+import pytest
+from unittest.mock import MagicMock
+
+from backend.api import requirements
+from backend.api.requirements import (
+    BatchPublishRequest,
+    _normalize_requirement_ids,
+    _plan_batch_publish,
+    _plan_import,
+)
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+class TestNormalizeRequirementIds:
+    """Test ID canonicalization ahead of ANY(%s::uuid[]) queries."""
+
+    def test_invalid_and_duplicate_ids_are_skipped(self):
+        req_id = new_id()
+
+        requested, skipped = _normalize_requirement_ids([req_id, "not-a-uuid", req_id.upper()])
+
+        assert requested == {req_id: req_id}
+        assert [s["reason"] for s in skipped] == ["Invalid requirement ID", "Duplicate requirement ID in request"]
+
+
+class TestPlanBatchPublish:
+    """Test publish eligibility decisions."""
+
+    def test_keeps_per_row_skip_reasons(self):
+        approved, draft, published, missing = new_id(), new_id(), new_id(), new_id()
+        rows = {
+            approved: {"state": "approved", "requirement_identifier": "REQ-1"},
+            draft: {"state": "draft", "requirement_identifier": "REQ-2"},
+            published: {"state": "published", "requirement_identifier": "REQ-3"},
+        }
+        requested, _ = _normalize_requirement_ids([approved, draft, published, missing])
+
+        to_publish, skipped = _plan_batch_publish(requested, rows, force=False)
+
+        assert to_publish == [approved]
+        reasons = {s["requirement_id"]: s["reason"] for s in skipped}
+        assert "force=true" in reasons[draft]
+        assert reasons[published] == "Already published"
+        assert reasons[missing] == "Requirement not found"
+
+    def test_force_publishes_drafts(self):
+        draft = new_id()
+        requested, _ = _normalize_requirement_ids([draft])
+
+        to_publish, skipped = _plan_batch_publish(
+            requested, {draft: {"state": "draft", "requirement_identifier": "REQ-1"}}, force=True
+        )
+
+        assert to_publish == [draft]
+        assert skipped == []
+
+
+class TestPlanImport:
+    """Test import conflict detection done ahead of the bulk insert."""
+
+    def test_detects_conflicts_before_insert(self):
+        source_project = new_id()
+        fresh, imported, clash, missing = new_id(), new_id(), new_id(), new_id()
+        source_rows = {
+            fresh: {"requirement_id": fresh, "requirement_identifier": "REQ-1"},
+            imported: {"requirement_id": imported, "requirement_identifier": "REQ-2"},
+            clash: {"requirement_id": clash, "requirement_identifier": "REQ-3"},
+        }
+        target_rows = [
+            {"requirement_id": new_id(), "requirement_identifier": "core.REQ-2",
+             "source_requirement_id": imported, "source_project_id": source_project},
+            {"requirement_id": new_id(), "requirement_identifier": "core.REQ-3",
+             "source_requirement_id": None, "source_project_id": None},
+        ]
+        requested, _ = _normalize_requirement_ids([fresh, imported, clash, missing])
+
+        to_import, failed = _plan_import(requested, source_rows, target_rows, source_project, "core")
+
+        assert [(row["requirement_id"], ident) for row, ident in to_import] == [(fresh, "core.REQ-1")]
+        reasons = {f["requirement_id"]: f["reason"] for f in failed}
+        assert reasons[imported] == "Already imported from this source"
+        assert "already exists" in reasons[clash]
+        assert reasons[missing] == "Not found or not published"
+
+
+class TestBatchPublishEndpoint:
+    """Test the batch publish endpoint against a mocked connection."""
+
+    @pytest.mark.asyncio
+    async def test_round_trips_do_not_grow_with_batch_size(self, monkeypatch):
+        ids = [new_id() for _ in range(200)]
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = [
+            [{"requirement_id": i, "state": "approved", "requirement_identifier": f"REQ-{n}",
+              "requirement_title": "t"} for n, i in enumerate(ids)],
+            [{"requirement_id": i, "requirement_identifier": f"REQ-{n}", "requirement_title": "t"}
+             for n, i in enumerate(ids)],
+        ]
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+        monkeypatch.setattr(requirements, "get_db_connection", lambda: conn)
+        monkeypatch.setattr(requirements, "get_db_service", lambda: None)
+
+        result = await requirements.batch_publish_requirements(
+            new_id(), BatchPublishRequest(requirement_ids=ids), {"user_id": new_id(), "username": "u"}
+        )
+
+        assert cursor.execute.call_count == 2
+        assert result["summary"]["published_count"] == 200
+        conn.commit.assert_called_once()
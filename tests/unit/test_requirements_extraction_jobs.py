@@ -0,0 +1,273 @@
+"""
+Unit tests for background requirements extraction jobs.
+
+Tests ordered checkpointing, cross-section deduplication, resuming from a
+checkpoint, ownership loss, cancellation and progress streaming against an
+in-memory job store and a thread pool standing in for the process pool.
+"""
+
+import asyncio
+import copy
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from backend.services import requirements_extraction_jobs
+from backend.services.requirements_extraction_jobs import ExtractionJobManager, extraction_config
+
+DOCUMENT = """Scope of this specification for the navigation and safety subsystems.
+
+1. Navigation Requirements
+
+REQ-001: The navigation system shall provide position updates to the autopilot.
+REQ-002: The navigation system shall support operation without satellite signals.
+
+2. Safety Requirements
+
+REQ-003: The flight computer shall perform an emergency shutdown when a fault occurs.
+REQ-001: The navigation system shall provide position updates to the autopilot.
+
+3. Operator Requirements
+
+REQ-004: The operator station shall support a manual override during every flight phase.
+"""
+
+
+class FakeStore:
+    """In-memory ExtractionJobStore"""
+
+    batch_size = 500
+
+    def __init__(self):
+        self.jobs = {}
+        self.requirements = []
+        self.constraints = []
+        self.checkpoints = []
+
+    def ensure_schema(self):
+        pass
+
+    def create(self, job_id, project_id, job_name, source_document_id, extraction_type, options, user_id):
+        self.jobs[job_id] = {
+            "job_id": job_id, "project_id": project_id, "source_document_id": source_document_id,
+            "created_by": user_id, "job_config": options, "status": "pending", "sections_completed": 0,
+            "sections_total": 0, "progress_percent": 0, "requirements_found": 0, "constraints_found": 0,
+            "requirements_created": 0, "constraints_created": 0, "processing_log": None, "error_message": None,
+        }
+
+    def claim(self, job_id, stale_after_s):
+        job = self.jobs.get(job_id)
+        if not job or job["status"] != "pending":
+            return None
+        job["status"] = "running"
+        return copy.deepcopy(job)
+
+    def claimable(self, stale_after_s, limit=50):
+        return [job_id for job_id, job in self.jobs.items() if job["status"] == "pending"]
+
+    def seen_texts(self, job_id):
+        return {row[3].lower() for row in self.requirements if row[12] == job_id}
+
+    def checkpoint(self, job_id, expected_sections, sections_completed, sections_total, batch):
+        job = self.jobs[job_id]
+        if job["status"] != "running" or job["sections_completed"] != expected_sections:
+            return False
+        self.checkpoints.append(sections_completed)
+        job.update(sections_completed=sections_completed, sections_total=sections_total,
+                   progress_percent=int(sections_completed * 100 / sections_total))
+        job["requirements_found"] += batch.requirements_found
+        job["constraints_found"] += batch.constraints_found
+        job["requirements_created"] += len(batch.requirement_rows)
+        job["constraints_created"] += len(batch.constraint_rows)
+        self.requirements.extend(batch.requirement_rows)
+        self.constraints.extend(batch.constraint_rows)
+        return True
+
+    def finish(self, job_id, processing_log):
+        if self.jobs[job_id]["status"] == "running":
+            self.jobs[job_id].update(status="completed", progress_percent=100, processing_log=processing_log)
+
+    def fail(self, job_id, error):
+        if self.jobs[job_id]["status"] == "running":
+            self.jobs[job_id].update(status="failed", error_message=error)
+
+    def release(self, job_id):
+        if self.jobs[job_id]["status"] == "running":
+            self.jobs[job_id]["status"] = "pending"
+
+    def cancel(self, job_id):
+        if self.jobs[job_id]["status"] in ("pending", "running"):
+            self.jobs[job_id]["status"] = "cancelled"
+            return True
+        return False
+
+    def reopen(self, job_id):
+        if self.jobs[job_id]["status"] in ("failed", "cancelled"):
+            self.jobs[job_id]["status"] = "pending"
+            return True
+        return False
+
+    def get(self, job_id):
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+
+class FakeFileStorage:
+    def __init__(self, content=DOCUMENT):
+        self.content = content
+
+    async def get_file_content(self, file_id):
+        return self.content.encode("utf-8")
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def make_manager(executor, store=None, content=DOCUMENT, **settings):
+    values = {"requirements_extraction_workers": 2, "requirements_extraction_flush_interval_s": 0.0}
+    values.update(settings)
+    return ExtractionJobManager(SimpleNamespace(**values), store or FakeStore(), FakeFileStorage(content), executor)
+
+
+def requirement_texts(store):
+    return [row[3] for row in store.requirements]
+
+
+class TestJobExecution:
+    """Test running a job to completion."""
+
+    @pytest.mark.asyncio
+    async def test_sections_are_checkpointed_in_order_and_deduplicated(self, executor):
+        manager = make_manager(executor)
+
+        job_id = await manager.submit("proj-1", "doc-1", "user-1", "spec", options={"min_confidence": 0.5})
+        await manager._tasks[job_id]
+
+        job = manager.store.jobs[job_id]
+        texts = requirement_texts(manager.store)
+        assert job["status"] == "completed" and job["progress_percent"] == 100
+        assert manager.store.checkpoints == sorted(manager.store.checkpoints)
+        assert manager.store.checkpoints[-1] == job["sections_total"] == 4
+        assert sum("REQ-001" in text for text in texts) == 1
+        assert any("REQ-004" in text for text in texts)
+        assert job["requirements_created"] == len(texts)
+        assert all(row[12] == job_id and row[1] == "proj-1" for row in manager.store.requirements)
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_committed_sections(self, executor):
+        store = FakeStore()
+        manager = make_manager(executor, store)
+        store.create("job-1", "proj-1", "spec", "doc-1", "document", {"min_confidence": 0.5}, "user-1")
+        store.jobs["job-1"]["sections_completed"] = 2
+        # REQ-001 was stored before the interruption
+        store.requirements.append((None, "proj-1", "", "REQ-001: The navigation system shall provide position "
+                                   "updates to the autopilot", *[None] * 8, "job-1", None, None, "{}"))
+
+        await manager.schedule("job-1")
+
+        texts = requirement_texts(store)[1:]
+        assert store.checkpoints[0] > 2
+        assert not any("REQ-002" in text or "REQ-001" in text for text in texts)
+        assert any("REQ-003" in text for text in texts) and any("REQ-004" in text for text in texts)
+
+    @pytest.mark.asyncio
+    async def test_job_stops_when_it_loses_ownership(self, executor):
+        store = FakeStore()
+        manager = make_manager(executor, store)
+        store.create("job-1", "proj-1", "spec", "doc-1", "document", {}, "user-1")
+        original = store.checkpoint
+
+        def taken_over(job_id, *args):
+            store.jobs[job_id]["sections_completed"] = 99  # another process advanced it
+            return original(job_id, *args)
+
+        store.checkpoint = taken_over
+        await manager.schedule("job-1")
+
+        assert store.jobs["job-1"]["status"] == "running"
+        assert store.requirements == []
+
+    @pytest.mark.asyncio
+    async def test_section_errors_are_logged_and_the_job_completes(self, executor, monkeypatch):
+        real = requirements_extraction_jobs.extract_section
+
+        def flaky(title, text, config, number):
+            if number == 2:
+                raise RuntimeError("bad section")
+            return real(title, text, config, number)
+
+        monkeypatch.setattr(requirements_extraction_jobs, "extract_section", flaky)
+        manager = make_manager(executor)
+
+        job_id = await manager.submit("proj-1", "doc-1", "user-1", "spec")
+        await manager._tasks[job_id]
+
+        job = manager.store.jobs[job_id]
+        assert job["status"] == "completed"
+        assert job["processing_log"] == "Section 2: bad section"
+
+    @pytest.mark.asyncio
+    async def test_empty_document_fails(self, executor):
+        manager = make_manager(executor, content="")
+
+        job_id = await manager.submit("proj-1", "doc-1", "user-1", "spec")
+        await manager._tasks[job_id]
+
+        assert manager.store.jobs[job_id]["status"] == "failed"
+
+
+class TestJobControl:
+    """Test cancellation, shutdown and progress streaming."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_then_resume(self, executor):
+        store = FakeStore()
+        manager = make_manager(executor, store)
+        store.create("job-1", "proj-1", "spec", "doc-1", "document", {}, "user-1")
+
+        assert await manager.cancel("job-1")
+        assert await manager.sweep() == []
+
+        assert await manager.resume("job-1")
+        await manager._tasks["job-1"]
+        assert store.jobs["job-1"]["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_hands_running_jobs_back(self, executor):
+        store = FakeStore()
+        manager = make_manager(executor, store)
+        started = asyncio.Event()
+
+        class SlowStorage(FakeFileStorage):
+            async def get_file_content(self, file_id):
+                started.set()
+                await asyncio.sleep(10)
+
+        manager._file_storage = SlowStorage()
+        job_id = await manager.submit("proj-1", "doc-1", "user-1", "spec")
+        await started.wait()
+
+        await manager.shutdown()
+
+        assert store.jobs[job_id]["status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_watch_streams_progress_until_done(self, executor):
+        manager = make_manager(executor)
+        job_id = await manager.submit("proj-1", "doc-1", "user-1", "spec")
+
+        updates = [job async for job in manager.watch(job_id, poll_interval_s=0.05)]
+
+        assert updates[-1]["status"] == "completed"
+        assert [u["progress_percent"] for u in updates] == sorted(u["progress_percent"] for u in updates)
+
+
+def test_extraction_config_ignores_unknown_and_empty_options():
+    config = extraction_config({"min_confidence": 0.4, "section_filters": None, "job_name": "x"})
+
+    assert config.min_confidence == 0.4
+    assert config.section_filters == []
@@ -0,0 +1,134 @@
+"""
+Unit tests for SessionCaptureMiddleware.
+
+Tests the compiled capture router, zero-buffering passthrough for uncaptured
+routes, and background hand-off of captured requests.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.middleware import session_capture
+from backend.middleware.session_capture import CaptureRouter, SessionCaptureMiddleware
+
+
+def make_scope(method: str, path: str, query: bytes = b"", auth: bool = True):
+    headers = [(b"content-type", b"application/json")]
+    if auth:
+        headers.append((b"authorization", b"Bearer test-token"))
+    return {"type": "http", "method": method, "path": path, "query_string": query, "headers": headers}
+
+
+def make_receive(body: bytes):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    return receive
+
+
+def make_app(status: int = 200):
+    """Minimal ASGI app that reads the full body then responds."""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["receive"] = receive
+        if scope["method"] in ("POST", "PUT"):
+            message = await receive()
+            seen["body"] = message.get("body")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app, seen
+
+
+async def send_noop(message):
+    pass
+
+
+class TestCaptureRouter:
+    """Test compiled capture rule matching."""
+
+    @pytest.mark.parametrize("method,path,handler", [
+        ("POST", "/api/projects", "_capture_project_created"),
+        ("PUT", "/api/projects/abc", "_capture_project_updated"),
+        ("PUT", "/api/ontology/", "_capture_ontology_modified"),
+        ("POST", "/api/ontology/save", "_capture_ontology_saved"),
+        ("PUT", "/api/ontology/layout", "_capture_ontology_layout_modified"),
+        ("POST", "/api/files/upload", "_capture_file_uploaded"),
+        ("DELETE", "/api/files/123", "_capture_file_deleted"),
+        ("POST", "/api/knowledge/assets", "_capture_knowledge_asset_created"),
+        ("PUT", "/api/knowledge/assets/a1/public", "_capture_knowledge_asset_published"),
+        ("PUT", "/api/knowledge/assets/a1", "_capture_knowledge_asset_updated"),
+        ("POST", "/api/knowledge/query", "_capture_knowledge_rag_query"),
+    ])
+    def test_matches_capture_rules(self, method, path, handler):
+        assert CaptureRouter().match(method, path).handler == handler
+
+    @pytest.mark.parametrize("method,path", [
+        ("GET", "/api/projects"),
+        ("POST", "/api/projects/abc/members"),
+        ("POST", "/api/knowledge/assets/a1/content"),
+        ("POST", "/api/health"),
+    ])
+    def test_skips_uncaptured_routes(self, method, path):
+        assert CaptureRouter().match(method, path) is None
+
+
+class TestSessionCaptureMiddleware:
+    """Test request handling in the pure-ASGI middleware."""
+
+    @pytest.fixture(autouse=True)
+    def redis_client(self, monkeypatch):
+        monkeypatch.setattr(session_capture, "_global_redis_client", object())
+
+    @pytest.mark.asyncio
+    async def test_uncaptured_route_is_passed_through(self):
+        """Non-matching routes get the original receive callable (no buffering)."""
+        app, seen = make_app()
+        middleware = SessionCaptureMiddleware(app)
+        receive = make_receive(b"")
+
+        await middleware(make_scope("GET", "/api/projects"), receive, send_noop)
+
+        assert seen["receive"] is receive
+        assert middleware._queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_captured_route_queues_parsed_body(self):
+        """Captured routes parse the body once and queue work after responding."""
+        app, seen = make_app()
+        middleware = SessionCaptureMiddleware(app)
+        middleware._run_capture = AsyncMock(return_value=True)
+        body = json.dumps({"query": "radar range", "project_id": "p1"}).encode()
+
+        await middleware(make_scope("POST", "/api/knowledge/search"), make_receive(body), send_noop)
+        await asyncio.wait_for(middleware._queue.join(), timeout=1)
+
+        assert seen["body"] == body
+        rule, ctx, _ = middleware._run_capture.call_args.args
+        assert rule.handler == "_capture_knowledge_search"
+        assert ctx.body == {"query": "radar range", "project_id": "p1"}
+
+    @pytest.mark.asyncio
+    async def test_failed_response_is_not_captured(self):
+        """Only successful responses produce capture jobs."""
+        app, _ = make_app(status=500)
+        middleware = SessionCaptureMiddleware(app)
+
+        await middleware(make_scope("POST", "/api/knowledge/search"), make_receive(b"{}"), send_noop)
+
+        assert middleware._queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_request_is_not_captured(self):
+        """Requests without a bearer token skip capture entirely."""
+        app, seen = make_app()
+        middleware = SessionCaptureMiddleware(app)
+        receive = make_receive(b"{}")
+
+        await middleware(make_scope("POST", "/api/knowledge/search", auth=False), receive, send_noop)
+
+        assert seen["receive"] is receive
+        assert middleware._queue.empty()
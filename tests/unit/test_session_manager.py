@@ -0,0 +1,276 @@
+"""
+Unit tests for the DAS session manager.
+
+Tests the hash-based session context, field-level updates, pipelined event
+capture and batched draining in SessionEventProcessor, and runs the context
+Lua scripts against fakeredis.
+"""
+
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from redis.exceptions import ResponseError
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis runs EVAL/EVALSHA through lupa
+
+from backend.services.session_manager import (
+    SessionContext,
+    SessionEvent,
+    SessionEventProcessor,
+    SessionManager,
+)
+
+
+class RecordingPipeline:
+    """Pipeline stand-in that records queued commands"""
+
+    def __init__(self):
+        self.commands = []
+        self.executed = False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        self.executed = True
+        return [True] * len(self.commands)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_redis():
+    redis = MagicMock()
+    redis.pipelines = []
+
+    def pipeline(transaction=True):
+        pipe = RecordingPipeline()
+        redis.pipelines.append(pipe)
+        return pipe
+
+    redis.pipeline.side_effect = pipeline
+    redis.register_script.side_effect = lambda script: AsyncMock(name="script", return_value=1)
+    return redis
+
+
+def make_manager(redis=None, **settings):
+    values = {"session_context_ttl_s": 600, "session_event_batch_size": 10}
+    values.update(settings)
+    return SessionManager(SimpleNamespace(**values), redis or make_redis())
+
+
+def make_event(event_type, session_id="s1", **data):
+    return SessionEvent(
+        event_id=f"e-{event_type}",
+        session_id=session_id,
+        user_id="alice",
+        timestamp=datetime(2025, 1, 1, 12, 0),
+        event_type=event_type,
+        event_data=data,
+        context_snapshot={},
+    )
+
+
+class TestSessionContextHash:
+    """Test the session context hash layout."""
+
+    def test_to_hash_round_trips(self):
+        context = SessionContext(session_id="s1", user_id="alice", recent_documents=["d1", "d2"])
+
+        restored = SessionContext.from_dict(context.to_hash())
+
+        assert restored.recent_documents == ["d1", "d2"]
+        assert restored.project_id is None
+        assert restored.start_time == context.start_time
+
+    @pytest.mark.asyncio
+    async def test_get_session_context_reads_hash(self):
+        redis = make_redis()
+        context = SessionContext(session_id="s1", user_id="alice", project_id="p1")
+        redis.hgetall = AsyncMock(return_value={k.encode(): v.encode() for k, v in context.to_hash().items()})
+
+        loaded = await make_manager(redis).get_session_context("s1")
+
+        assert loaded.project_id == "p1"
+        redis.hgetall.assert_awaited_once_with("session:s1:context")
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_context_is_migrated(self):
+        redis = make_redis()
+        context = SessionContext(session_id="s1", user_id="alice")
+        redis.hgetall = AsyncMock(side_effect=ResponseError("WRONGTYPE Operation against a key"))
+        redis.get = AsyncMock(return_value=json.dumps(context.to_dict()))
+
+        loaded = await make_manager(redis).get_session_context("s1")
+
+        assert loaded.user_id == "alice"
+        commands = [name for name, _, _ in redis.pipelines[0].commands]
+        assert commands == ["delete", "hset", "expire"]
+
+
+class TestSessionManagerWrites:
+    """Test field-level updates and pipelined event capture."""
+
+    @pytest.mark.asyncio
+    async def test_update_writes_only_known_changed_fields(self):
+        manager = make_manager()
+        manager.capture_event = AsyncMock(return_value=True)
+
+        assert await manager.update_session_context("s1", {"active_ontology": "o1", "session_ended": True})
+
+        args = manager._update_context_script.await_args.kwargs["args"]
+        pairs = dict(zip(args[3::2], args[4::2]))
+        assert manager._update_context_script.await_args.kwargs["keys"] == ["session:s1:context"]
+        assert args[0] == "600"
+        assert pairs.keys() == {"active_ontology", "last_activity"}
+        assert pairs["active_ontology"] == "o1"
+
+    @pytest.mark.asyncio
+    async def test_update_of_missing_session_fails(self):
+        redis = make_redis()
+        redis.hgetall = AsyncMock(return_value={})
+        manager = make_manager(redis)
+        manager._update_context_script.return_value = 0
+        manager.capture_event = AsyncMock()
+
+        assert not await manager.update_session_context("missing", {"project_id": "p1"})
+        manager.capture_event.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_capture_event_uses_one_script_call_and_one_pipeline(self):
+        redis = make_redis()
+        manager = make_manager(redis)
+        context = SessionContext(session_id="s1", user_id="alice")
+        flat = [item for pair in context.to_hash().items() for item in pair]
+        manager._touch_context_script.return_value = [v.encode() for v in flat]
+
+        assert await manager.capture_event("s1", "das_question", {"q": "hi"})
+
+        pipe = redis.pipelines[0]
+        assert [name for name, _, _ in pipe.commands] == ["lpush", "publish"]
+        queued = json.loads(pipe.commands[0][1][1])
+        assert queued["user_id"] == "alice"
+        assert queued["context_snapshot"]["session_id"] == "s1"
+        assert pipe.commands[1][1] == ("das_watch:s1", pipe.commands[0][1][1])
+
+
+class TestSessionEventProcessor:
+    """Test batched event draining and processing."""
+
+    @pytest.mark.asyncio
+    async def test_next_batch_drains_remaining_events(self):
+        redis = make_redis()
+        events = [json.dumps(make_event("das_question", n=n).to_dict()) for n in range(3)]
+        redis.brpop = AsyncMock(return_value=(b"session_events", events[0]))
+        redis.rpop = AsyncMock(return_value=[events[1], "not json", events[2]])
+        processor = SessionEventProcessor(redis, make_manager(redis))
+
+        batch = await processor._next_batch()
+
+        assert [e.event_data["n"] for e in batch] == [0, 1, 2]
+        redis.rpop.assert_awaited_once_with("session_events", 9)
+
+    @pytest.mark.asyncio
+    async def test_batch_is_written_in_one_pipeline(self):
+        redis = make_redis()
+        manager = make_manager(redis)
+        processor = SessionEventProcessor(redis, manager)
+
+        await processor._process_batch([
+            make_event("document_uploaded", document_id="doc-1"),
+            make_event("workbench_changed", new_workbench="files"),
+            make_event("das_question"),
+        ])
+
+        assert len(redis.pipelines) == 1
+        pipe = redis.pipelines[0]
+        names = [name for name, _, _ in pipe.commands]
+        assert names.count("lpush") == 4  # three history entries and one opportunity list
+        assert names.count("ltrim") == 3
+        assert names.count("expire") == 1
+        assert pipe.executed
+
+        calls = manager._update_context_script.await_args_list
+        assert len(calls) == 2
+        assert all(call.kwargs["client"] is pipe for call in calls)
+        assert calls[0].kwargs["args"][1] == "doc-1"
+        workbench_args = calls[1].kwargs["args"]
+        assert dict(zip(workbench_args[3::2], workbench_args[4::2]))["current_workbench"] == "files"
+
+
+@pytest.fixture
+async def redis_server():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+async def stored_session(redis_server, **fields):
+    manager = make_manager(redis_server)
+    await manager._store_session_context(SessionContext(session_id="s1", user_id="alice", **fields))
+    return manager
+
+
+class TestContextScripts:
+    """Run UPDATE_CONTEXT_SCRIPT and TOUCH_CONTEXT_SCRIPT on (fake) Redis."""
+
+    @pytest.mark.asyncio
+    async def test_update_script_writes_fields_and_keeps_the_rest(self, redis_server):
+        manager = await stored_session(redis_server, project_id="p1")
+        manager.capture_event = AsyncMock(return_value=True)
+
+        assert await manager.update_session_context("s1", {"active_ontology": "o1", "session_goals": None})
+
+        context = await manager.get_session_context("s1")
+        assert (context.active_ontology, context.project_id, context.session_goals) == ("o1", "p1", None)
+        assert context.last_activity > context.start_time
+        assert 0 < await redis_server.ttl("session:s1:context") <= 600
+
+    @pytest.mark.asyncio
+    async def test_update_script_leaves_missing_sessions_alone(self, redis_server):
+        manager = make_manager(redis_server)
+        manager.capture_event = AsyncMock()
+
+        assert not await manager.update_session_context("missing", {"project_id": "p1"})
+        assert not await redis_server.exists("session:missing:context")
+
+    @pytest.mark.asyncio
+    async def test_pipelined_updates_prepend_and_trim_recent_documents(self, redis_server, monkeypatch):
+        monkeypatch.setattr(SessionEventProcessor, "max_recent_documents", 2)
+        manager = await stored_session(redis_server, recent_documents=["doc-0"])
+        processor = SessionEventProcessor(redis_server, manager)
+
+        await processor._process_batch([
+            make_event("document_uploaded", document_id="doc-1"),
+            make_event("workbench_changed", new_workbench="files"),
+            make_event("document_uploaded", document_id="doc-2"),
+        ])
+
+        context = await manager.get_session_context("s1")
+        assert context.recent_documents == ["doc-2", "doc-1"]
+        assert context.current_workbench == "files"
+        assert await redis_server.llen("session:s1:events") == 3
+
+    @pytest.mark.asyncio
+    async def test_touch_script_snapshots_and_bumps_last_activity(self, redis_server):
+        manager = await stored_session(redis_server, active_ontology="o1")
+        before = (await manager.get_session_context("s1")).last_activity
+
+        assert await manager.capture_event("s1", "das_question", {"q": "hi"})
+        assert await manager.capture_event("missing", "das_question", {})
+
+        queued = [json.loads(e) for e in await redis_server.lrange("session_events", 0, -1)]
+        assert queued[1]["context_snapshot"]["active_ontology"] == "o1"
+        assert queued[1]["user_id"] == "alice" and queued[0]["user_id"] == "unknown"
+        assert (await manager.get_session_context("s1")).last_activity > before
+        assert not await redis_server.exists("session:missing:context")
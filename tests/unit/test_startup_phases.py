@@ -0,0 +1,210 @@
+"""
+Unit tests for the startup phase scheduler.
+
+Tests concurrent execution of independent phases, dependency ordering,
+failure propagation, readiness vs background warm-up, and the readiness
+probe while startup runs in the background.
+"""
+
+import asyncio
+import json
+import time
+import pytest
+
+from backend.api.core import liveness_check, readiness_check
+from backend.startup import phases as phases_module
+from backend.startup.phases import (
+    StartupPhase,
+    StartupState,
+    cancel_startup,
+    run_startup_phases,
+    start_in_background,
+)
+
+
+def sleeper(name, delay, log):
+    async def run(results):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return name
+    return run
+
+
+class TestRunStartupPhases:
+    """Test DAG execution of startup phases."""
+
+    @pytest.mark.asyncio
+    async def test_independent_phases_run_concurrently(self):
+        log = []
+        phases = [StartupPhase(name, sleeper(name, 0.1, log)) for name in ("a", "b", "c")]
+
+        start = time.perf_counter()
+        results = await run_startup_phases(phases, StartupState())
+
+        assert time.perf_counter() - start < 0.25
+        assert results == {"a": "a", "b": "b", "c": "c"}
+
+    @pytest.mark.asyncio
+    async def test_dependencies_run_first_and_pass_results(self):
+        log = []
+        seen = {}
+
+        async def consumer(results):
+            seen.update(results)
+
+        phases = [
+            StartupPhase("consumer", consumer, depends_on=("db",)),
+            StartupPhase("db", sleeper("db", 0.01, log)),
+        ]
+
+        await run_startup_phases(phases, StartupState())
+
+        assert seen == {"db": "db"}
+
+    @pytest.mark.asyncio
+    async def test_critical_failure_skips_dependents_and_raises(self):
+        state = StartupState()
+
+        async def broken(results):
+            raise ConnectionError("refused")
+
+        phases = [
+            StartupPhase("db", broken),
+            StartupPhase("services", sleeper("services", 0, []), depends_on=("db",)),
+        ]
+
+        with pytest.raises(RuntimeError):
+            await run_startup_phases(phases, state)
+
+        assert state.phases["db"].status == "failed"
+        assert state.phases["services"].status == "skipped"
+        assert not state.ready
+
+    @pytest.mark.asyncio
+    async def test_warmup_does_not_delay_readiness(self):
+        state = StartupState()
+        log = []
+        phases = [
+            StartupPhase("db", sleeper("db", 0, log)),
+            StartupPhase("training", sleeper("training", 0.2, log), depends_on=("db",), critical=False),
+        ]
+
+        await run_startup_phases(phases, state)
+
+        assert state.ready
+        assert state.warming_up
+        await asyncio.gather(*state.background)
+        assert state.phases["training"].status == "done"
+        assert not state.warming_up
+
+    @pytest.mark.asyncio
+    async def test_warmup_failure_is_reported_not_raised(self):
+        state = StartupState()
+
+        async def broken(results):
+            raise RuntimeError("model download failed")
+
+        await run_startup_phases([StartupPhase("warm", broken, critical=False)], state)
+        await asyncio.gather(*state.background)
+
+        assert state.ready
+        assert state.report()["phases"]["warm"]["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_in_thread_phase_does_not_block_loop(self):
+        finished = []
+
+        async def blocking(results):
+            time.sleep(0.2)
+            finished.append("blocking")
+
+        async def ticker(results):
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            finished.append("ticker")
+
+        await run_startup_phases(
+            [StartupPhase("blocking", blocking, in_thread=True), StartupPhase("ticker", ticker)], StartupState()
+        )
+
+        assert finished == ["ticker", "blocking"]
+
+    @pytest.mark.parametrize("phases", [
+        [StartupPhase("a", None, depends_on=("missing",))],
+        [StartupPhase("a", None, depends_on=("b",)), StartupPhase("b", None, depends_on=("a",))],
+        [StartupPhase("a", None, depends_on=("w",)), StartupPhase("w", None, critical=False)],
+    ])
+    @pytest.mark.asyncio
+    async def test_invalid_graphs_are_rejected(self, phases):
+        with pytest.raises(ValueError):
+            await run_startup_phases(phases, StartupState())
+
+
+def probe(state, monkeypatch):
+    monkeypatch.setattr(phases_module, "startup_state", state)
+    response = readiness_check()
+    return response.status_code, json.loads(response.body)
+
+
+class TestBackgroundStartup:
+    """Test that the app serves probes while critical phases are still running."""
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_critical_phases_finish(self, monkeypatch):
+        state = StartupState()
+        release = asyncio.Event()
+
+        async def database(results):
+            await release.wait()
+
+        task = start_in_background(run_startup_phases([StartupPhase("database", database)], state), state)
+        await asyncio.sleep(0.01)
+
+        assert liveness_check()["status"] == "alive"
+        status, report = probe(state, monkeypatch)
+        assert status == 503 and report["status"] == "starting"
+        assert report["phases"]["database"]["status"] == "running"
+
+        release.set()
+        await task
+        assert probe(state, monkeypatch)[0] == 200
+
+    @pytest.mark.asyncio
+    async def test_critical_failure_is_reported_as_not_ready(self, monkeypatch):
+        state = StartupState()
+
+        async def database(results):
+            raise ConnectionError("refused")
+
+        task = start_in_background(run_startup_phases([StartupPhase("database", database)], state), state)
+        await asyncio.wait([task])
+
+        status, report = probe(state, monkeypatch)
+        assert status == 503 and report["status"] == "failed"
+        assert report["phases"]["database"]["error"] == "refused"
+
+    @pytest.mark.asyncio
+    async def test_a_failure_outside_the_phases_also_fails_startup(self):
+        state = StartupState()
+
+        async def initialize():
+            raise ValueError("bad settings")
+
+        await asyncio.wait([start_in_background(initialize(), state)])
+
+        assert state.failed and state.status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_startup_still_running(self):
+        state = StartupState()
+        phases = [
+            StartupPhase("database", lambda results: asyncio.sleep(10)),
+            StartupPhase("warm", lambda results: asyncio.sleep(10), critical=False),
+        ]
+        task = start_in_background(run_startup_phases(phases, state), state)
+        await asyncio.sleep(0.01)
+
+        await cancel_startup(state)
+
+        assert task.cancelled() and all(t.done() for t in state.background)
@@ -8,6 +8,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock
 from datetime import datetime, timezone
 
+from backend.services import das_tool_registry as registry_module
 from backend.services.das_tool_registry import DASToolRegistry
 from backend.services.tool_registry_interface import ToolType
 from backend.services.config import Settings
@@ -147,7 +148,7 @@ class TestDASToolRegistry:
         assert mock_cursor.execute.call_count == 1
     
     @pytest.mark.asyncio
-    async def test_update_usage(self, registry):
+    async def test_update_usage(self, registry, monkeypatch):
         """Test updating usage statistics."""
         mock_conn = Mock()
         mock_cursor = Mock()
@@ -156,13 +157,17 @@ class TestDASToolRegistry:
         mock_conn.cursor.return_value = mock_cursor
         mock_cursor.rowcount = 1
         mock_conn.commit.return_value = None
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
         
         registry.db_service._conn.return_value = mock_conn
         
         updated = await registry.update_usage("tool-1", increment=5)
         
         assert updated is True
-        assert mock_cursor.execute.call_count == 1
+        assert execute_values.call_count == 0
+        assert registry.flush_usage() == 1
+        assert execute_values.call_count == 1
     
     @pytest.mark.asyncio
     async def test_delete_tool(self, registry):
@@ -215,3 +220,148 @@ class TestDASToolRegistry:
         popular = await registry.get_popular_tools(limit=10)
         
         assert isinstance(popular, list)
+
+
+def make_cursor(registry, rows=()):
+    mock_conn = Mock()
+    mock_cursor = Mock()
+    mock_cursor.__enter__ = Mock(return_value=mock_cursor)
+    mock_cursor.__exit__ = Mock(return_value=None)
+    mock_cursor.fetchall.return_value = list(rows)
+    mock_cursor.rowcount = 1
+    mock_conn.cursor.return_value = mock_cursor
+    registry.db_service._conn.return_value = mock_conn
+    return mock_conn, mock_cursor
+
+
+TOOL_ROW = ("tool-1", "Unit Converter", "Converts units", "calculator", "code", ["calculation"],
+            "user1", datetime.now(timezone.utc), 3, None, ["units"], {})
+
+
+class TestToolDiscovery:
+    """Test indexable lookup predicates and the catalog cache."""
+
+    @pytest.mark.asyncio
+    async def test_filters_use_array_containment_and_escaped_ilike(self, registry):
+        _, cursor = make_cursor(registry, [TOOL_ROW])
+
+        await registry.find_tool(name="50%_off", capability="calculation", tags=["units", "si"], query="convert")
+
+        sql, params = cursor.execute.call_args.args
+        assert "capabilities @> ARRAY[%s]::text[]" in sql and "tags @> %s::text[]" in sql
+        assert "ANY(" not in sql and "LOWER(" not in sql
+        assert "(name ILIKE %s OR description ILIKE %s)" in sql
+        assert params == ["%50\\%\\_off%", "%convert%", "%convert%", "calculation", ["si", "units"]]
+
+    @pytest.mark.asyncio
+    async def test_lookups_are_cached_until_the_catalog_changes(self, registry):
+        _, cursor = make_cursor(registry, [TOOL_ROW])
+
+        first = await registry.find_tool(capability="calculation")
+        second = await registry.find_tool(capability="calculation")
+        assert [t.tool_id for t in second] == [t.tool_id for t in first] == ["tool-1"]
+        assert cursor.execute.call_count == 1
+
+        await registry.update_tool("tool-1", description="Converts SI units")
+        await registry.find_tool(capability="calculation")
+        assert cursor.execute.call_count == 3  # the update and a fresh lookup
+
+        await registry.delete_tool("tool-1")
+        await registry.get_tool("tool-1")
+        await registry.get_tool("tool-1")
+        assert cursor.execute.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_cache_entries_expire(self, registry, monkeypatch):
+        _, cursor = make_cursor(registry, [TOOL_ROW])
+        clock = [100.0]
+        monkeypatch.setattr(registry_module.time, "monotonic", lambda: clock[0])
+
+        await registry.find_tool(tags=["units"])
+        clock[0] += registry.cache_ttl_s + 1
+        await registry.find_tool(tags=["units"])
+
+        assert cursor.execute.call_count == 2
+
+
+class TestUsageCounters:
+    """Test in-memory usage aggregation and batched flushes."""
+
+    @pytest.mark.asyncio
+    async def test_usage_is_aggregated_per_tool_and_flushed_in_one_statement(self, registry, monkeypatch):
+        conn, _ = make_cursor(registry)
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
+        registry.usage_flush_batch = 2
+
+        await registry.update_usage("tool-1")
+        await registry.update_usage("tool-1", increment=2)
+        assert execute_values.call_count == 0
+
+        await registry.update_usage("tool-2")
+
+        sql, values = execute_values.call_args.args[1:]
+        assert "FROM (VALUES %s)" in sql
+        assert {(tool_id, increment) for tool_id, increment, _ in values} == {("tool-1", 3), ("tool-2", 1)}
+        assert conn.commit.call_count == 1
+        assert registry.flush_usage() == 0  # nothing left pending
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_the_counts(self, registry, monkeypatch):
+        conn, _ = make_cursor(registry)
+        monkeypatch.setattr(registry_module, "execute_values", Mock(side_effect=RuntimeError("db down")))
+
+        await registry.update_usage("tool-1", increment=4)
+        assert registry.flush_usage() == 0
+        assert conn.rollback.call_count == 1
+
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
+        await registry.update_usage("tool-1")
+        await registry.close()
+
+        assert [v[:2] for v in execute_values.call_args.args[2]] == [("tool-1", 5)]
+
+    @pytest.mark.asyncio
+    async def test_usage_ordered_listing_flushes_first(self, registry, monkeypatch):
+        make_cursor(registry)
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
+
+        await registry.update_usage("tool-1")
+        await registry.list_tools(sort_by="created_at")
+        assert execute_values.call_count == 0
+
+        await registry.get_popular_tools()
+        assert execute_values.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_lookups_include_pending_usage(self, registry, monkeypatch):
+        make_cursor(registry, [TOOL_ROW])
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
+
+        assert (await registry.get_tool("tool-1")).usage_count == 3
+        await registry.update_usage("tool-1", increment=5)
+
+        tool = await registry.get_tool("tool-1")  # served from the catalog cache
+        assert tool.usage_count == 8 and tool.last_used_at is not None
+        assert (await registry.list_tools())[0].usage_count == 8
+        assert execute_values.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_usage_is_flushed_periodically_and_at_shutdown(self, registry, monkeypatch):
+        make_cursor(registry)
+        execute_values = Mock()
+        monkeypatch.setattr(registry_module, "execute_values", execute_values)
+        registry.usage_flush_interval_s = 0.05
+
+        await registry.update_usage("tool-1")
+        registry._flusher.join(timeout=0.2)  # still running: wait for a flush
+        assert execute_values.call_count == 1
+
+        await registry.update_usage("tool-2")
+        assert registry_module.close_tool_registries() >= 1
+        flushed = [values[0] for call in execute_values.call_args_list for values in call.args[2]]
+        assert flushed.count("tool-2") == 1 and registry.flush_usage() == 0
+        assert registry._flusher is None
@@ -0,0 +1,177 @@
+"""
+Unit tests for the vector/SQL sync monitor.
+
+Tests exact vector counts, the bucketed chunk id comparison between doc_chunk
+and a collection, and batched, rate-limited repair against in-memory SQL rows
+and a fake Qdrant client.
+"""
+
+import pytest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.services import vector_sql_sync_monitor as monitor_module
+from backend.services.vector_sql_sync_monitor import VectorSQLSyncMonitor, chunk_bucket
+
+
+def chunk_ids(count, seed):
+    return [str(uuid.uuid5(uuid.NAMESPACE_OID, f"{seed}-{i}")) for i in range(count)]
+
+
+class FakeQdrantClient:
+    """Scrolls point ids in pages and counts them"""
+
+    def __init__(self, point_ids):
+        self.point_ids = list(point_ids)
+        self.scroll_calls = []
+        self.count = MagicMock(return_value=SimpleNamespace(count=len(self.point_ids)))
+
+    def scroll(self, collection_name, scroll_filter, limit, offset, with_payload, with_vectors):
+        self.scroll_calls.append((with_payload, with_vectors))
+        start = offset or 0
+        page = [SimpleNamespace(id=point_id) for point_id in self.point_ids[start:start + limit]]
+        return page, (start + limit if start + limit < len(self.point_ids) else None)
+
+
+class InMemoryMonitor(VectorSQLSyncMonitor):
+    """Monitor whose doc_chunk queries run over a list of rows"""
+
+    def __init__(self, rows, point_ids, **settings):
+        values = {"vector_sync_checksum_buckets": 16, "vector_sync_scroll_page_size": 7,
+                  "vector_sync_repair_batch_size": 4, "vector_sync_repair_max_chunks_per_s": 0}
+        values.update(settings)
+        qdrant = MagicMock()
+        qdrant.client = FakeQdrantClient(point_ids)
+        embedding = MagicMock()
+        embedding.generate_embeddings.side_effect = lambda texts, model, batch_size: [[0.1] * 3 for _ in texts]
+        super().__init__(SimpleNamespace(**values), db_service=MagicMock(), qdrant_service=qdrant,
+                         embedding_service=embedding)
+        self.rows = {row["chunk_id"]: row for row in rows}
+        self.listed_buckets = []
+
+    def _sql_chunk_checksums(self, project_id):
+        checksums = {}
+        for chunk_id in self.rows:
+            bucket, term = chunk_bucket(chunk_id, self.checksum_buckets)
+            count, total = checksums.get(bucket, (0, 0))
+            checksums[bucket] = (count + 1, total + term)
+        return checksums
+
+    def _sql_chunk_ids(self, project_id, buckets):
+        self.listed_buckets.append(buckets)
+        return {chunk_id for chunk_id in self.rows if chunk_bucket(chunk_id, self.checksum_buckets)[0] in buckets}
+
+    def _fetch_chunks(self, ids):
+        return [self.rows[chunk_id] for chunk_id in ids if chunk_id in self.rows]
+
+
+def make_rows(ids):
+    return [{"chunk_id": chunk_id, "text": f"text {i}", "doc_id": "doc-1", "chunk_index": i, "page": None,
+             "start_char": None, "end_char": None, "project_id": "proj-1", "version": 1}
+            for i, chunk_id in enumerate(ids)]
+
+
+class TestConsistency:
+    """Test counting and the chunk id comparison."""
+
+    @pytest.mark.asyncio
+    async def test_diff_reports_exactly_the_missing_and_orphaned_ids(self):
+        sql_ids = chunk_ids(60, "sql")
+        orphans = chunk_ids(3, "orphan")
+        monitor = InMemoryMonitor(make_rows(sql_ids), sql_ids[5:] + orphans)
+
+        diff = await monitor.diff_chunk_ids("knowledge_chunks", "proj-1")
+
+        assert diff["missing"] == sorted(sql_ids[:5])
+        assert diff["orphaned"] == sorted(orphans)
+        assert (diff["sql_chunks"], diff["vector_points"]) == (60, 58)
+        # only the buckets holding a difference are listed from SQL
+        differing = {chunk_bucket(i, 16)[0] for i in sql_ids[:5] + orphans}
+        assert monitor.listed_buckets == [sorted(differing)]
+        assert monitor.qdrant_service.client.scroll_calls[0] == (False, False)
+
+    @pytest.mark.asyncio
+    async def test_in_sync_collection_lists_no_ids(self):
+        ids = chunk_ids(20, "sync")
+        monitor = InMemoryMonitor(make_rows(ids), reversed(ids))
+
+        diff = await monitor.diff_chunk_ids("knowledge_chunks", None)
+
+        assert diff["missing"] == diff["orphaned"] == [] and diff["mismatched_buckets"] == 0
+        assert monitor.listed_buckets == []
+
+    @pytest.mark.asyncio
+    async def test_vector_counts_are_exact_and_filtered(self):
+        monitor = InMemoryMonitor([], chunk_ids(4, "count"))
+
+        counts = await monitor._get_vector_counts("project_threads", "proj-1")
+
+        kwargs = monitor.qdrant_service.client.count.call_args.kwargs
+        conditions = kwargs["count_filter"].must
+        assert counts == {"total": 4} and kwargs["exact"] is True
+        assert conditions[0].key == "project_id" and conditions[0].match.value == "proj-1"
+        assert conditions[1].is_empty.key == "event_id"
+        assert monitor._vector_filter("knowledge_chunks", None) is None
+
+    def test_chunk_bucket_is_stable(self):
+        assert chunk_bucket("chunk-1", 256) == chunk_bucket("chunk-1", 256)
+        assert 0 <= chunk_bucket("chunk-1", 7)[0] < 7
+
+
+class TestRepair:
+    """Test batched, rate-limited re-embedding."""
+
+    @pytest.mark.asyncio
+    async def test_repair_embeds_and_upserts_per_batch(self):
+        ids = chunk_ids(10, "repair")
+        monitor = InMemoryMonitor(make_rows(ids), [])
+
+        recovered, failed = await monitor.repair_chunk_vectors(ids + ["deleted-since"], "knowledge_chunks")
+
+        store = monitor.qdrant_service.store_vectors
+        assert (recovered, failed) == (10, 0)
+        assert [len(call.args[1]) for call in store.call_args_list] == [4, 4, 2]
+        assert monitor.embedding_service.generate_embeddings.call_count == 3
+        vector = store.call_args_list[0].args[1][0]
+        assert vector["id"] == ids[0] and vector["payload"]["chunk_id"] == ids[0]
+        assert vector["payload"]["sql_first"] and vector["payload"]["recovered"]
+        assert "text" not in vector["payload"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_counted_and_repair_continues(self):
+        ids = chunk_ids(8, "fail")
+        monitor = InMemoryMonitor(make_rows(ids), [])
+        monitor.qdrant_service.store_vectors.side_effect = [RuntimeError("qdrant down"), ["ok"]]
+        log = []
+
+        assert await monitor.repair_chunk_vectors(ids, "knowledge_chunks", log) == (4, 4)
+        assert "qdrant down" in log[0]
+
+    @pytest.mark.asyncio
+    async def test_repair_is_paced_to_the_rate_limit(self, monkeypatch):
+        sleep = AsyncMock()
+        monkeypatch.setattr(monitor_module.asyncio, "sleep", sleep)
+        ids = chunk_ids(8, "rate")
+        monitor = InMemoryMonitor(make_rows(ids), [], vector_sync_repair_max_chunks_per_s=4.0)
+
+        await monitor.repair_chunk_vectors(ids, "knowledge_chunks")
+
+        # batch n of 4 chunks may not finish before n seconds after the start
+        assert [call.args[0] for call in sleep.await_args_list] == [pytest.approx(1.0, abs=0.2),
+                                                                    pytest.approx(2.0, abs=0.2)]
+
+    @pytest.mark.asyncio
+    async def test_emergency_recovery_only_reembeds_missing_chunks(self):
+        ids = chunk_ids(30, "emergency")
+        monitor = InMemoryMonitor(make_rows(ids), ids[3:])
+        monitor._get_sql_counts = AsyncMock(return_value={"total": 30})
+        monitor.check_sync_health = AsyncMock(
+            return_value={"collections": {"knowledge_chunks": {"sync_ratio": 1.0}}}
+        )
+
+        result = await monitor.emergency_sync_recovery("proj-1")
+
+        stored = [v["id"] for call in monitor.qdrant_service.store_vectors.call_args_list for v in call.args[1]]
+        assert result["success"] and result["recovered_chunks"] == 3 and result["failed_chunks"] == 0
+        assert sorted(stored) == sorted(ids[:3])
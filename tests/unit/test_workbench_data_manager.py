@@ -0,0 +1,147 @@
+"""
+Unit tests for WorkbenchDataManager queries.
+
+Tests keyset cursors, SQL generation for sorting/filtering/search and how
+totals are reported, with the database calls mocked out.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.schemas.workbench_data import (
+    FilterCriteria,
+    FilterOperator,
+    PaginationParams,
+    SortCriteria,
+    SortOrder,
+    WorkbenchQueryRequest,
+    WorkbenchType,
+)
+from backend.services.data_manager import WorkbenchDataManager, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def manager():
+    manager = WorkbenchDataManager(MagicMock(), MagicMock())
+    manager._verify_project_access = AsyncMock(return_value=True)
+    return manager
+
+
+def make_request(**kwargs):
+    kwargs.setdefault("pagination", PaginationParams(page_size=2))
+    return WorkbenchQueryRequest(project_id="p1", workbench_type=WorkbenchType.REQUIREMENTS, **kwargs)
+
+
+def rows(*names):
+    return [{"requirement_id": n, "_sort_0": f"2024-01-0{i + 1}", "_sort_1": n} for i, n in enumerate(names)]
+
+
+class TestQueryBuilding:
+    """Test SQL generated for requirements queries."""
+
+    def test_default_sort_uses_single_row_comparison(self, manager):
+        plan = manager._build_requirements_query(make_request(), "u1")
+        cursor = encode_cursor(plan, ["2024-01-01 00:00:00+00", "id-1"])
+
+        query, params = manager._build_page_query(plan, 3, 0, decode_cursor(plan, cursor))
+
+        assert "(COALESCE(r.updated_at, '-infinity'::timestamptz), r.requirement_id) < (%(cursor_0)s, %(cursor_1)s)" in query
+        assert "ORDER BY COALESCE(r.updated_at, '-infinity'::timestamptz) DESC, r.requirement_id DESC LIMIT 3" in query
+        assert "OFFSET" not in query
+        assert params["cursor_1"] == "id-1"
+
+    def test_mixed_directions_expand_keyset_condition(self, manager):
+        plan = manager._build_requirements_query(make_request(sort=[
+            SortCriteria(field="priority", order=SortOrder.ASC),
+            SortCriteria(field="created_at", order=SortOrder.DESC),
+        ]), "u1")
+
+        condition = manager._build_keyset_condition(plan, ["high", "2024", "id"], {})
+
+        assert condition.startswith("(COALESCE(r.priority, '') > %(cursor_0)s OR (COALESCE(r.priority, '') = %(cursor_0)s AND")
+        assert condition.endswith("r.requirement_id < %(cursor_2)s))))")
+
+    def test_search_and_contains_filter_escape_wildcards(self, manager):
+        plan = manager._build_requirements_query(make_request(
+            search_query="100%",
+            filters=[FilterCriteria(field="requirement_title", operator=FilterOperator.STARTS_WITH, value="SYS_")],
+        ), "u1")
+
+        assert plan.params["search"] == "%100\\%%"
+        assert plan.params["filter_0_requirement_title"] == "SYS\\_%"
+        assert "r.requirement_title ILIKE %(filter_0_requirement_title)s" in plan.conditions
+
+    @pytest.mark.parametrize("kwargs", [
+        {"sort": [SortCriteria(field="updated_at; DROP TABLE users")]},
+        {"filters": [FilterCriteria(field="password_hash", value="x")]},
+    ])
+    def test_unknown_fields_are_rejected(self, manager, kwargs):
+        with pytest.raises(ValueError):
+            manager._build_requirements_query(make_request(**kwargs), "u1")
+
+    def test_cursor_from_other_sort_is_rejected(self, manager):
+        by_title = manager._build_requirements_query(make_request(sort=[SortCriteria(field="requirement_title")]), "u1")
+        default = manager._build_requirements_query(make_request(), "u1")
+
+        with pytest.raises(ValueError):
+            decode_cursor(default, encode_cursor(by_title, ["a", "b"]))
+
+
+class TestQueryWorkbenchData:
+    """Test paging and totals in query_workbench_data."""
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_and_estimated_total(self, manager):
+        manager._execute_data_query = AsyncMock(return_value=rows("a", "b", "c"))
+        manager._estimate_count = AsyncMock(return_value=1000)
+        manager._execute_count_query = AsyncMock()
+
+        response = await manager.query_workbench_data(make_request(), "u1")
+
+        data = response.data
+        assert [item["requirement_id"] for item in data.items] == ["a", "b"]
+        assert "_sort_0" not in data.items[0]
+        assert data.has_next and data.next_cursor
+        assert (data.total_count, data.total_is_estimate) == (1000, True)
+        manager._execute_count_query.assert_not_called()
+
+        plan = manager._build_requirements_query(make_request(), "u1")
+        assert decode_cursor(plan, data.next_cursor) == ["2024-01-02", "b"]
+
+    @pytest.mark.asyncio
+    async def test_single_page_total_is_exact_without_count_query(self, manager):
+        manager._execute_data_query = AsyncMock(return_value=rows("a"))
+        manager._estimate_count = AsyncMock()
+        manager._execute_count_query = AsyncMock()
+
+        response = await manager.query_workbench_data(make_request(), "u1")
+
+        assert (response.data.total_count, response.data.total_is_estimate) == (1, False)
+        assert response.data.next_cursor is None
+        manager._estimate_count.assert_not_called()
+        manager._execute_count_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_exact_count_on_request(self, manager):
+        manager._execute_data_query = AsyncMock(return_value=rows("a", "b", "c"))
+        manager._execute_count_query = AsyncMock(return_value=3)
+
+        response = await manager.query_workbench_data(
+            make_request(pagination=PaginationParams(page_size=2, exact_count=True)), "u1"
+        )
+
+        assert (response.data.total_count, response.data.total_is_estimate) == (3, False)
+        count_sql = manager._execute_count_query.call_args[0][0]
+        assert count_sql.startswith("SELECT COUNT(*) FROM requirements_enhanced r")
+        assert "ORDER BY" not in count_sql
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_fails_query(self, manager):
+        manager._execute_data_query = AsyncMock()
+
+        response = await manager.query_workbench_data(
+            make_request(pagination=PaginationParams(cursor="not-a-cursor")), "u1"
+        )
+
+        assert response.success is False
+        manager._execute_data_query.assert_not_called()